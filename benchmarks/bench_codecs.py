@@ -0,0 +1,98 @@
+"""
+Compare JSON codecs on payloads shaped like real PT NAD traffic.
+
+Usage:
+    python benchmarks/bench_codecs.py [--rows 100000] [--items 50000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from ptnad.codec import available_codecs, get_codec
+
+
+def make_bql_response(rows: int, seed: int = 0) -> dict:
+    """Response of ``SELECT id, start, end, src.ip, dst.ip, dst.port, proto, app_proto, bytes.total FROM flow``."""
+    rnd = random.Random(seed)
+    protos = ["tcp", "udp", "icmp"]
+    apps = ["http", "tls", "dns", "smb", "ldap", "kerberos", None]
+    start = 1_740_000_000_000
+    result = []
+    for i in range(rows):
+        begin = start + i * 37
+        result.append([
+            f"{rnd.getrandbits(64):016x}",
+            begin,
+            begin + rnd.randint(1, 600_000),
+            f"10.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}",
+            f"{rnd.randint(1, 223)}.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}",
+            rnd.choice([53, 80, 443, 445, 389, 88, rnd.randint(1024, 65535)]),
+            rnd.choice(protos),
+            rnd.choice(apps),
+            rnd.randint(60, 10_000_000),
+        ])
+    return {"result": result, "took": 1234, "total": rows}
+
+
+def make_bulk_items(items: int, seed: int = 0) -> list:
+    """Payload of ``RepListsAPI.bulk_add_items`` for an IOC feed."""
+    rnd = random.Random(seed)
+    payload = []
+    for i in range(items):
+        if i % 2:
+            value = f"{rnd.randint(1, 223)}.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}"
+        else:
+            value = f"bad-{rnd.getrandbits(40):010x}.example.com"
+        payload.append({
+            "value": value,
+            "attrs": {"source": "feed", "confidence": rnd.randint(0, 100), "tags": ["c2", "phishing"][: rnd.randint(0, 2)]},
+        })
+    return payload
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="BQL result rows")
+    parser.add_argument("--items", type=int, default=50_000, help="bulk_add_items payload size")
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N repetitions")
+    args = parser.parse_args()
+
+    bql = make_bql_response(args.rows)
+    bulk = make_bulk_items(args.items)
+    stdlib = get_codec("stdlib")
+    bql_bytes = stdlib.dumps(bql)
+    bulk_bytes = stdlib.dumps(bulk)
+    print(f"BQL response: {args.rows} rows, {len(bql_bytes) / 1e6:.1f} MB; "
+          f"bulk payload: {args.items} items, {len(bulk_bytes) / 1e6:.1f} MB")
+
+    cases = (
+        ("bql loads", lambda codec: codec.loads(bql_bytes)),
+        ("bql dumps", lambda codec: codec.dumps(bql)),
+        ("bulk dumps", lambda codec: codec.dumps(bulk)),
+        ("bulk loads", lambda codec: codec.loads(bulk_bytes)),
+    )
+    results = {}
+    for name in available_codecs():
+        codec = get_codec(name)
+        results[name] = [best_of(args.repeat, lambda: case(codec)) for _, case in cases]
+
+    header = f"{'codec':<8}" + "".join(f"{label:>18}" for label, _ in cases)
+    print(header)
+    print("-" * len(header))
+    baseline = results["stdlib"]
+    for name, timings in results.items():
+        cells = "".join(f"{f'{t * 1000:.1f}ms ({b / t:.1f}x)':>18}" for t, b in zip(timings, baseline))
+        print(f"{name:<8}{cells}")
+    print("\n(times are best of %d runs; Nx is the speed-up over stdlib)" % args.repeat)
+
+if __name__ == "__main__":
+    main()
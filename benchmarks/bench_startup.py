@@ -0,0 +1,67 @@
+"""
+Measure `import ptnad` and client construction time against a budget.
+
+Every sample runs in a fresh interpreter, so module caches do not hide import cost.
+Exits with status 1 when the median of a stage exceeds its budget, which makes the
+script usable as a CI gate.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 15] [--import-budget-ms 30] [--client-budget-ms 250]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import ptnad
+t1 = time.perf_counter()
+client = ptnad.PTNADClient("https://nad.example.com", verify_ssl=False)
+t2 = time.perf_counter()
+client.bql
+t3 = time.perf_counter()
+print(json.dumps({
+    "import": t1 - t0,
+    "client": t2 - t1,
+    "first_namespace": t3 - t2,
+    "heavy_modules": sorted(m for m in ("sqlite3", "logging.handlers", "ptnad.api.storage") if m in sys.modules),
+}))
+"""
+
+
+def sample() -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15, help="number of fresh interpreters")
+    parser.add_argument("--import-budget-ms", type=float, default=30.0, help="budget for `import ptnad`")
+    parser.add_argument("--client-budget-ms", type=float, default=250.0,
+                        help="budget for the first PTNADClient() (includes importing requests)")
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.runs)]
+    budgets = {"import": args.import_budget_ms, "client": args.client_budget_ms, "first_namespace": None}
+    failed = False
+    print(f"{'stage':<16} {'median':>10} {'min':>10} {'max':>10} {'budget':>10}")
+    for stage, budget in budgets.items():
+        values = [s[stage] * 1000 for s in samples]
+        median = statistics.median(values)
+        over = budget is not None and median > budget
+        failed |= over
+        print(f"{stage:<16} {median:>8.1f}ms {min(values):>8.1f}ms {max(values):>8.1f}ms "
+              f"{'-' if budget is None else f'{budget:.0f}ms':>10}{'  OVER BUDGET' if over else ''}")
+    heavy = samples[0]["heavy_modules"]
+    if heavy:
+        failed = True
+        print(f"modules that should be deferred were imported: {', '.join(heavy)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
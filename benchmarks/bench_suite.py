@@ -0,0 +1,367 @@
+"""
+Benchmark the client's hot paths offline and compare them with a stored baseline.
+
+Every case runs in a fresh interpreter against in-memory transports with fixed
+seeds, so results do not depend on a NAD server or on the other cases, and the
+peak RSS of a case is its own. For each case the suite reports iterations per
+second, items per second, p50/p99 latency of one iteration and peak RSS.
+
+Compared with the baseline, a case regresses when its p50 latency (fastest run
+for cases timed in a subprocess) or peak RSS grows by more than --tolerance in
+--confirm + 1 consecutive runs; the script then exits with status 1.
+
+Baselines are machine-specific, so none is committed: benchmarks/baseline.json
+is ignored by git. Record one on the machine that runs the comparison, from the
+commit to compare against, then run the suite on the change:
+
+    git stash  # or check out the base branch
+    python benchmarks/bench_suite.py --save-baseline
+    git stash pop
+    python benchmarks/bench_suite.py
+
+Usage:
+    python benchmarks/bench_suite.py [--case NAME ...] [--repeat N] [--scale 0.1]
+                                     [--baseline PATH] [--save-baseline] [--tolerance 0.25] [--confirm 1]
+"""
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Case -> (default repeat, items per iteration at scale 1)
+CASES: Dict[str, Tuple[int, int]] = {
+    "bql_decode_flows": (20, 20_000),
+    "hosts_get_all_hosts": (20, 20_000),
+    "replists_bulk_add_payload": (20, 50_000),
+    "storage_filter_old_flows": (5, 100_000),
+    "auth_login": (200, 1),
+    "import_time": (15, 1),
+    "columnar_traffic_by_app": (10, 100_000),
+    "bql_cached_range": (10, 50_000),
+}
+
+
+def _client(transport):
+    from ptnad import PTNADClient
+
+    return PTNADClient("https://nad.bench", transport=transport, single_flight=False)
+
+
+def case_bql_decode_flows(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Decode a BQL response of ``SELECT *`` rows and build a Flow per row."""
+    from ptnad.emulator.data import SyntheticData
+    from ptnad.models import Flow
+    from ptnad.transport import MemoryTransport
+
+    data = SyntheticData(items, 1000, 1_740_000_000_000, 86_400_000)
+    body = json.dumps({"result": [data.flow(i) for i in range(items)], "took": 10, "total": items}).encode()
+    transport = MemoryTransport()
+    transport.add_route("POST", "/api/v2/bql", lambda request: (200, body, [("Content-Type", "application/json")]))
+    client = _client(transport)
+
+    def run():
+        return [Flow(row) for row in client.bql.execute("SELECT * FROM flow")]
+    return run, None
+
+
+def case_hosts_get_all_hosts(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Fetch the whole host inventory with cursor pagination, 1000 hosts per page."""
+    from ptnad.emulator.data import SyntheticData
+    from ptnad.transport import MemoryTransport
+
+    data = SyntheticData(0, items, 1_740_000_000_000, 86_400_000)
+    page_size = 1000
+    pages = {}
+    for number, offset in enumerate(range(0, items, page_size)):
+        last = offset + page_size >= items
+        pages[str(number)] = json.dumps({
+            "results": [data.host(i) for i in range(offset, min(offset + page_size, items))],
+            "next": None if last else f"https://nad.bench/api/v2/hosts?limit={page_size}&cursor={number + 1}",
+            "previous": None,
+        }).encode()
+    transport = MemoryTransport()
+    transport.add_route("GET", "/api/v2/hosts", lambda request: (
+        200, pages[request.query.get("cursor", "0")], [("Content-Type", "application/json")]))
+    client = _client(transport)
+
+    def run():
+        return client.hosts.get_all_hosts(limit=page_size)
+    return run, None
+
+
+def case_replists_bulk_add_payload(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Encode and send a ``bulk_add_items`` payload of IOC items."""
+    from ptnad.transport import MemoryTransport
+
+    payload = [{"value": f"198.51.{i // 256 % 256}.{i % 256}" if i % 2 else f"bad-{i:08x}.example.com",
+                "attrs": {"source": "feed", "confidence": i % 100, "tags": ["c2"]}} for i in range(items)]
+    transport = MemoryTransport()
+    transport.add_route("POST", "/api/v2/replists/dynamic/feed/_bulk", lambda request: (200, b"{}"))
+    client = _client(transport)
+
+    def run():
+        client.replists.bulk_add_items("feed", payload)
+    return run, None
+
+
+def case_storage_filter_old_flows(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Deduplicate flows against the saved-flows database, half of them already saved."""
+    import logging
+    import sqlite3
+
+    from ptnad.models import Flow
+
+    directory = tempfile.mkdtemp(prefix="ptnad-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    seeded = os.path.join(directory, "seeded.db")
+    working = os.path.join(directory, "working.db")
+    storage = _client(None).storage
+    storage.db_file = seeded
+    storage.logger = logging.getLogger("ptnad.bench")
+    storage._create_db()
+    flows = [Flow({"id": f"{i:016x}", "start": i, "end": i + 1}) for i in range(items)]
+    with sqlite3.connect(seeded) as conn:
+        conn.executemany("INSERT INTO saved_flows VALUES(?, ?, ?, ?, ?)",
+                         [(flow.id, flow.start, flow.end, "2", "1") for flow in flows[::2]])
+    storage.db_file = working
+
+    def prepare():
+        shutil.copyfile(seeded, working)
+
+    def run():
+        return storage._filter_old_flows(flows, "2", "1")
+    return run, prepare
+
+
+def case_columnar_traffic_by_app(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Filter web flows of a columnar BQL result and sum their traffic per app protocol (numpy if installed)."""
+    from ptnad.columnar import ColumnarResult
+    from ptnad.emulator.data import SyntheticData
+
+    data = SyntheticData(items, 1000, 1_740_000_000_000, 86_400_000)
+    fields = ["id", "dst.port", "app_proto", "src.ip", "bytes.total"]
+    flows = ColumnarResult.from_rows(([data.flow(i)[name] for name in fields] for i in range(items)), fields)
+
+    def run():
+        web = flows["dst.port"].isin([80, 443, 8080]) & flows["app_proto"].notnull()
+        return flows.select("app_proto", "bytes.total").filter(web).group_by("app_proto").sum("bytes.total")
+    return run, None
+
+
+def case_bql_cached_range(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Re-run a query over the last 24 hours with the closed part already in the BQL result cache."""
+    from ptnad.emulator import EmulatorConfig, NADEmulator
+    from ptnad.models import TimeRange
+    from ptnad.resultcache import BQLResultCache
+
+    directory = tempfile.mkdtemp(prefix="ptnad-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    now = int(time.time() * 1000)
+    emulator = NADEmulator(EmulatorConfig(flows=items, hosts=1000, start=now - 86_400_000, span=86_400_000))
+    client = _client(emulator)
+    client.bql_cache = BQLResultCache(os.path.join(directory, "bql.sqlite"))
+    client.set_auth(username="bench", password="bench")
+    client.login()
+    day = TimeRange(now - 86_400_000, now)
+    query = "SELECT id, src.ip, dst.ip, app_proto, bytes.total FROM flow"
+    for _ in client.bql.execute_range(query, day):
+        pass
+
+    def run():
+        return list(client.bql.execute_range(query, day))
+    return run, None
+
+
+def case_auth_login(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """Local login: POST auth/login, cookie and CSRF handling, status check."""
+    from ptnad.transport import MemoryTransport
+
+    transport = MemoryTransport()
+    transport.add_route("POST", "/api/v2/auth/login", lambda request: (200, {}, [
+        ("Set-Cookie", "csrftoken=0123456789abcdef; Path=/"),
+        ("Set-Cookie", "sessionid=fedcba9876543210; Path=/; HttpOnly"),
+    ]))
+    transport.add_route("GET", "/api/v2/monitoring/status", lambda request: {"status": "green", "problems": []})
+    client = _client(transport)
+    client.set_auth(username="bench", password="bench")
+
+    def run():
+        client.login()
+    return run, None
+
+
+def case_import_time(items: int) -> Tuple[Callable[[], Any], Callable[[], None] | None]:
+    """``import ptnad`` and client construction in a fresh interpreter."""
+    probe = ("import time; t = time.perf_counter(); import ptnad; "
+             "ptnad.PTNADClient('https://nad.bench'); print(time.perf_counter() - t)")
+
+    def run():
+        output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout
+        return float(output)
+    # run() returns the time measured in the child, and the child's RSS is the one that matters
+    run.in_subprocess = True
+    return run, None
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    rank = q * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def measure(name: str, repeat: int, scale: float) -> Dict[str, Any]:
+    """Run one case in this process; called in a child interpreter."""
+    items = max(1, int(CASES[name][1] * scale))
+    run, prepare = globals()[f"case_{name}"](items)
+    in_subprocess = getattr(run, "in_subprocess", False)
+    # Warm-up: imports, codec and connection setup
+    if prepare:
+        prepare()
+    run()
+    timings = []
+    for _ in range(repeat):
+        if prepare:
+            prepare()
+        gc.collect()
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+        timings.append(result if in_subprocess else elapsed)
+    p50 = percentile(timings, 0.5)
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN if in_subprocess else resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    return {
+        "items": items,
+        "repeat": repeat,
+        "ops_per_sec": 1 / p50,
+        "items_per_sec": items / p50,
+        "min_ms": min(timings) * 1000,
+        "p50_ms": p50 * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "peak_rss_mb": rss_mb,
+        # Interpreter start-up is noisy, so its fastest run is the stable figure
+        "compare": "min_ms" if in_subprocess else "p50_ms",
+    }
+
+
+def run_case(name: str, repeat: int, scale: float) -> Dict[str, Any]:
+    env = {**os.environ, "PYTHONHASHSEED": "0"}
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", name, "--repeat", str(repeat), "--scale", str(scale)],
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _comparable(result: Dict[str, Any], reference: Dict[str, Any] | None) -> bool:
+    """Whether a baseline entry was measured on the same data size with the same metric."""
+    return (reference is not None and reference["items"] == result["items"]
+            and reference.get("compare") == result["compare"])
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> Dict[str, str]:
+    """Regressed cases with a description of the regression."""
+    regressions = {}
+    for name, result in results.items():
+        reference = baseline.get("cases", {}).get(name)
+        if not _comparable(result, reference):
+            continue
+        for metric in (result["compare"], "peak_rss_mb"):
+            if result[metric] > reference[metric] * (1 + tolerance):
+                regressions[name] = (f"{name}: {metric} {reference[metric]:.1f} -> {result[metric]:.1f} "
+                                     f"(+{(result[metric] / reference[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="case to run (repeatable; all by default)")
+    parser.add_argument("--repeat", type=int, help="timed iterations per case (default depends on the case)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the data sizes")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown / RSS growth")
+    parser.add_argument("--confirm", type=int, default=1, help="re-runs of a regressed case before reporting it")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.repeat, args.scale)))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    for name in args.case or CASES:
+        results[name] = run_case(name, args.repeat or CASES[name][0], args.scale)
+    if not args.save_baseline:
+        # Re-run regressed cases and keep their best result, so one noisy run does not fail the suite
+        for _ in range(args.confirm):
+            for name in compare(results, baseline, args.tolerance):
+                rerun = run_case(name, args.repeat or CASES[name][0], args.scale)
+                metric = rerun["compare"]
+                if rerun[metric] < results[name][metric]:
+                    results[name] = rerun
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        header = f"{'case':<28}{'ops/s':>10}{'items/s':>12}{'p50':>11}{'p99':>11}{'peak RSS':>11}{'vs base':>10}"
+        print(header)
+        print("-" * len(header))
+        for name, result in results.items():
+            reference = baseline.get("cases", {}).get(name)
+            delta = "-"
+            if _comparable(result, reference):
+                metric = result["compare"]
+                delta = f"{(result[metric] / reference[metric] - 1) * 100:+.0f}%"
+            print(f"{name:<28}{result['ops_per_sec']:>10.1f}{result['items_per_sec']:>12.0f}"
+                  f"{result['p50_ms']:>9.1f}ms{result['p99_ms']:>9.1f}ms{result['peak_rss_mb']:>8.1f} MB{delta:>10}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "platform": platform.platform(),
+                "cases": {**baseline.get("cases", {}), **results},
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nNo baseline to compare with; create one with --save-baseline")
+        return 0
+    if baseline.get("python") != platform.python_version() or baseline.get("machine") != platform.machine():
+        print(f"\nNote: baseline was recorded on Python {baseline.get('python')} / {baseline.get('machine')}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions (over {:.0f}% tolerance):".format(args.tolerance * 100))
+        for line in regressions.values():
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions against {os.path.relpath(args.baseline)} (tolerance {args.tolerance * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
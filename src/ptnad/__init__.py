@@ -1,17 +1,57 @@
-from .client import PTNADClient
+from typing import TYPE_CHECKING
+
 from .exceptions import (
     PTNADException, PTNADAPIError,
 )
-from .api import (
-    BQLAPI,
-    MonitoringAPI,
-    RepListsAPI,
-    SignaturesAPI,
-    StorageAPI,
-)
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .resultcache import BQLResultCache
+    from .client import PTNADClient
+    from .federation import FederatedPTNADClient
+    from .codec import JSONCodec, get_codec
+    from .metrics import MetricsRegistry
+    from .pool import PoolConfig
+    from .retry import RetryBudget, RetryPolicy
+    from .api import (
+        BQLAPI,
+        MonitoringAPI,
+        RepListsAPI,
+        SignaturesAPI,
+        StorageAPI,
+    )
+
+# Submodules are imported on first attribute access, so that `import ptnad` stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'PTNADClient': '.client',
+    'FederatedPTNADClient': '.federation',
+    'JSONCodec': '.codec',
+    'get_codec': '.codec',
+    'MetricsRegistry': '.metrics',
+    'PoolConfig': '.pool',
+    'ResponseCache': '.cache',
+    'BQLResultCache': '.resultcache',
+    'RetryPolicy': '.retry',
+    'RetryBudget': '.retry',
+    'BQLAPI': '.api',
+    'MonitoringAPI': '.api',
+    'RepListsAPI': '.api',
+    'SignaturesAPI': '.api',
+    'StorageAPI': '.api',
+})
 
 __all__ = [
     'PTNADClient',
+    'FederatedPTNADClient',
+    'JSONCodec',
+    'get_codec',
+    'MetricsRegistry',
+    'PoolConfig',
+    'ResponseCache',
+    'BQLResultCache',
+    'RetryPolicy',
+    'RetryBudget',
     'PTNADException',
     'PTNADAPIError',
     'BQLAPI',
@@ -0,0 +1,17 @@
+from ptnad.aio.client import AsyncPTNADClient
+from ptnad.aio.auth import (
+    AsyncAuth,
+    AsyncAuthStrategy,
+    AsyncLocalAuth,
+    AsyncSSOAuth,
+    AsyncApiKeyAuth,
+)
+
+__all__ = [
+    "AsyncPTNADClient",
+    "AsyncAuth",
+    "AsyncAuthStrategy",
+    "AsyncLocalAuth",
+    "AsyncSSOAuth",
+    "AsyncApiKeyAuth",
+]
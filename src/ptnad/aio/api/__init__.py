@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING
+
+from ptnad.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ptnad.aio.api.bql import AsyncBQLAPI
+    from ptnad.aio.api.monitoring import AsyncMonitoringAPI
+    from ptnad.aio.api.replists import AsyncRepListsAPI
+    from ptnad.aio.api.signatures import AsyncSignaturesAPI
+    from ptnad.aio.api.sensors import AsyncSensorsAPI
+    from ptnad.aio.api.sources import AsyncSourcesAPI
+    from ptnad.aio.api.filters import AsyncFiltersAPI
+    from ptnad.aio.api.hosts import AsyncHostsAPI
+    from ptnad.aio.api.storage import AsyncStorageAPI
+    from ptnad.aio.api.variables import AsyncVariablesAPI
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "AsyncBQLAPI": "ptnad.aio.api.bql",
+    "AsyncMonitoringAPI": "ptnad.aio.api.monitoring",
+    "AsyncRepListsAPI": "ptnad.aio.api.replists",
+    "AsyncSignaturesAPI": "ptnad.aio.api.signatures",
+    "AsyncSensorsAPI": "ptnad.aio.api.sensors",
+    "AsyncSourcesAPI": "ptnad.aio.api.sources",
+    "AsyncFiltersAPI": "ptnad.aio.api.filters",
+    "AsyncHostsAPI": "ptnad.aio.api.hosts",
+    "AsyncStorageAPI": "ptnad.aio.api.storage",
+    "AsyncVariablesAPI": "ptnad.aio.api.variables",
+})
+
+__all__ = [
+    "AsyncBQLAPI",
+    "AsyncMonitoringAPI",
+    "AsyncRepListsAPI",
+    "AsyncSignaturesAPI",
+    "AsyncSensorsAPI",
+    "AsyncSourcesAPI",
+    "AsyncFiltersAPI",
+    "AsyncHostsAPI",
+    "AsyncStorageAPI",
+    "AsyncVariablesAPI",
+]
@@ -0,0 +1,18 @@
+from typing import Any
+
+from ptnad.api.bql import BQLAPI, BQLResponse
+
+
+class AsyncBQLAPI:
+    """Coroutine counterpart of :class:`ptnad.api.bql.BQLAPI` for single queries."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def execute(self, query: str, source: str = "2") -> Any:
+        """See :meth:`ptnad.api.bql.BQLAPI.execute`."""
+        return await self.client.call(BQLAPI._execute_call(query, source))
+
+    async def execute_raw(self, query: str, source: str = "2") -> BQLResponse:
+        """See :meth:`ptnad.api.bql.BQLAPI.execute_raw`."""
+        return await self.client.call(BQLAPI._execute_raw_call(query, source))
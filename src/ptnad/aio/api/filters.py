@@ -0,0 +1,12 @@
+from ptnad.api.filters import FiltersAPI
+
+
+class AsyncFiltersAPI:
+    """Coroutine counterpart of :class:`ptnad.api.filters.FiltersAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def compile(self, user_filter: str) -> str:
+        """See :meth:`ptnad.api.filters.FiltersAPI.compile`."""
+        return await self.client.call(FiltersAPI._compile_call(user_filter))
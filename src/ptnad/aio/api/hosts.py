@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Optional, Union
+
+from ptnad.api.hosts import HostsAPI
+
+
+class AsyncHostsAPI:
+    """Coroutine counterpart of :class:`ptnad.api.hosts.HostsAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get_hosts(
+        self,
+        id: Optional[Union[str, List[str]]] = None,
+        host: Optional[Union[str, List[str]]] = None,
+        type: Optional[Union[str, List[str]]] = None,
+        role: Optional[Union[str, List[str]]] = None,
+        groups: Optional[Union[str, List[str]]] = None,
+        traffic_incoming: Optional[Union[str, List[str]]] = None,
+        traffic_outgoing: Optional[Union[str, List[str]]] = None,
+        has_redef: Optional[bool] = None,
+        comment: Optional[bool] = None,
+        ordering: Optional[str] = None,
+        history_depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.hosts.HostsAPI.get_hosts`."""
+        response = await self.client.call(HostsAPI._get_hosts_call(
+            id=id,
+            host=host,
+            type=type,
+            role=role,
+            groups=groups,
+            traffic_incoming=traffic_incoming,
+            traffic_outgoing=traffic_outgoing,
+            has_redef=has_redef,
+            comment=comment,
+            ordering=ordering,
+            history_depth=history_depth,
+        ))
+        return response["results"]
+
+    async def get_all_hosts(
+        self,
+        id: Optional[Union[str, List[str]]] = None,
+        host: Optional[Union[str, List[str]]] = None,
+        type: Optional[Union[str, List[str]]] = None,
+        role: Optional[Union[str, List[str]]] = None,
+        groups: Optional[Union[str, List[str]]] = None,
+        traffic_incoming: Optional[Union[str, List[str]]] = None,
+        traffic_outgoing: Optional[Union[str, List[str]]] = None,
+        has_redef: Optional[bool] = None,
+        comment: Optional[bool] = None,
+        ordering: Optional[str] = None,
+        history_depth: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.hosts.HostsAPI.get_all_hosts`."""
+        all_hosts = []
+        cursor = None
+
+        while True:
+            response = await self.client.call(HostsAPI._get_hosts_call(
+                id=id,
+                host=host,
+                type=type,
+                role=role,
+                groups=groups,
+                traffic_incoming=traffic_incoming,
+                traffic_outgoing=traffic_outgoing,
+                has_redef=has_redef,
+                comment=comment,
+                ordering=ordering,
+                history_depth=history_depth,
+                limit=limit,
+                cursor=cursor,
+            ))
+            all_hosts.extend(response["results"])
+
+            if response["next"] is None:
+                break
+
+            cursor = HostsAPI._extract_cursor_from_url(response["next"])
+
+        return all_hosts
+
+    async def get_host(self, host_id: str, history_depth: Optional[int] = None) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.hosts.HostsAPI.get_host`."""
+        return await self.client.call(HostsAPI._get_host_call(host_id, history_depth))
@@ -0,0 +1,33 @@
+from typing import List
+
+from ptnad.api.monitoring import MonitoringAPI, MonitoringStatus, Trigger
+
+
+class AsyncMonitoringAPI:
+    """Coroutine counterpart of :class:`ptnad.api.monitoring.MonitoringAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get_status(self) -> MonitoringStatus:
+        """See :meth:`ptnad.api.monitoring.MonitoringAPI.get_status`."""
+        return await self.client.call(MonitoringAPI._get_status_call())
+
+    async def get_triggers(self) -> List[Trigger]:
+        """See :meth:`ptnad.api.monitoring.MonitoringAPI.get_triggers`."""
+        return await self.client.call(MonitoringAPI._get_triggers_call())
+
+    async def get_trigger_by_id(self, trigger_id: str) -> Trigger | None:
+        """See :meth:`ptnad.api.monitoring.MonitoringAPI.get_trigger_by_id`."""
+        triggers = await self.get_triggers()
+        return next((trigger for trigger in triggers if trigger.id == trigger_id), None)
+
+    async def get_active_triggers(self) -> List[Trigger]:
+        """See :meth:`ptnad.api.monitoring.MonitoringAPI.get_active_triggers`."""
+        triggers = await self.get_triggers()
+        return [trigger for trigger in triggers if trigger.status != "green"]
+
+    async def get_triggers_by_type(self, trigger_type: str) -> List[Trigger]:
+        """See :meth:`ptnad.api.monitoring.MonitoringAPI.get_triggers_by_type`."""
+        triggers = await self.get_triggers()
+        return [trigger for trigger in triggers if trigger.type == trigger_type]
@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Union
+
+from ptnad.api.replists import RepListsAPI
+
+
+class AsyncRepListsAPI:
+    """Coroutine counterpart of :class:`ptnad.api.replists.RepListsAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get_lists(self, search: str | None = None, ordering: str | None = None,
+                        limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.get_lists`."""
+        response = await self.client.call(RepListsAPI._get_lists_call(search, ordering, limit, offset))
+        return response["results"]
+
+    async def get_all_lists(self, search: str | None = None, ordering: str | None = None,
+                            limit: int = 100) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.get_all_lists`."""
+        all_lists = []
+        offset = 0
+
+        while True:
+            response = await self.client.call(RepListsAPI._get_lists_call(search, ordering, limit, offset))
+            all_lists.extend(response["results"])
+
+            if response["next"] is None:
+                break
+
+            offset += limit
+
+        return all_lists
+
+    async def create_list(self, name: str, type: str, color: str, description: str | None = None,
+                          content: Union[str, List[str], None] = None,
+                          external_key: str | None = None) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.create_list`."""
+        return await self.client.call(
+            RepListsAPI._create_list_call(name, type, color, description, content, external_key)
+        )
+
+    async def get_list(self, list_id: int) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.get_list`."""
+        return await self.client.call(RepListsAPI._get_list_call(list_id))
+
+    async def update_list(self, list_id: int, **kwargs) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.update_list`."""
+        return await self.client.call(RepListsAPI._update_list_call(list_id, kwargs))
+
+    async def delete_list(self, list_id: int) -> None:
+        """See :meth:`ptnad.api.replists.RepListsAPI.delete_list`."""
+        await self.client.call(RepListsAPI._delete_list_call(list_id))
+
+    async def add_dynamic_list_item(self, external_key: str, value: str,
+                                    attributes: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.add_dynamic_list_item`."""
+        return await self.client.call(RepListsAPI._add_dynamic_list_item_call(external_key, value, attributes))
+
+    async def remove_item(self, external_key: str, value: str) -> None:
+        """See :meth:`ptnad.api.replists.RepListsAPI.remove_item`."""
+        await self.client.call(RepListsAPI._remove_item_call(external_key, value))
+
+    async def get_dynamic_list_items(self, external_key: str, ordering: str | None = None) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.get_dynamic_list_items`."""
+        return await self.client.call(RepListsAPI._get_dynamic_list_items_call(external_key, ordering))
+
+    async def bulk_add_items(self, external_key: str, items: List[Dict[str, Any]]) -> None:
+        """See :meth:`ptnad.api.replists.RepListsAPI.bulk_add_items`."""
+        await self.client.call(RepListsAPI._bulk_add_items_call(external_key, items))
+
+    async def bulk_delete_items(self, external_key: str, values: List[str]) -> None:
+        """See :meth:`ptnad.api.replists.RepListsAPI.bulk_delete_items`."""
+        await self.client.call(RepListsAPI._bulk_delete_items_call(external_key, values))
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.replists.RepListsAPI.get_stats`."""
+        return await self.client.call(RepListsAPI._get_stats_call())
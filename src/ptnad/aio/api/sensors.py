@@ -0,0 +1,18 @@
+from typing import Any, Dict, List
+
+from ptnad.api.sensors import SensorsAPI
+
+
+class AsyncSensorsAPI:
+    """Coroutine counterpart of :class:`ptnad.api.sensors.SensorsAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get_sensors(self) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.sensors.SensorsAPI.get_sensors`."""
+        return await self.client.call(SensorsAPI._get_sensors_call())
+
+    async def get_sensor(self, sensor_id: int) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.sensors.SensorsAPI.get_sensor`."""
+        return await self.client.call(SensorsAPI._get_sensor_call(sensor_id))
@@ -0,0 +1,40 @@
+from typing import Any, Dict, List
+
+from ptnad.api.signatures import SignaturesAPI
+
+
+class AsyncSignaturesAPI:
+    """Coroutine counterpart of :class:`ptnad.api.signatures.SignaturesAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get_classes(self, search: str | None = None, ordering: str | None = None,
+                          **filters) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.get_classes`."""
+        return await self.client.call(SignaturesAPI._get_classes_call(search, ordering, filters))
+
+    async def get_rules(self, search: str | None = None, ordering: str | None = None,
+                        limit: int = 100, offset: int = 0, **filters) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.get_rules`."""
+        return await self.client.call(SignaturesAPI._get_rules_call(search, ordering, limit, offset, filters))
+
+    async def get_rule(self, rule_id: int) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.get_rule`."""
+        return await self.client.call(SignaturesAPI._get_rule_call(rule_id))
+
+    async def update_rule(self, rule_id: int, **kwargs) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.update_rule`."""
+        return await self.client.call(SignaturesAPI._update_rule_call(rule_id, kwargs))
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.get_stats`."""
+        return await self.client.call(SignaturesAPI._get_stats_call())
+
+    async def apply_changes(self) -> Dict[str, str]:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.apply_changes`."""
+        return await self.client.call(SignaturesAPI._apply_changes_call())
+
+    async def revert_changes(self) -> None:
+        """See :meth:`ptnad.api.signatures.SignaturesAPI.revert_changes`."""
+        await self.client.call(SignaturesAPI._revert_changes_call())
@@ -0,0 +1,18 @@
+from typing import Any, Dict, List
+
+from ptnad.api.sources import SourcesAPI
+
+
+class AsyncSourcesAPI:
+    """Coroutine counterpart of :class:`ptnad.api.sources.SourcesAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get_sources(self, search: str | None = None, ordering: str | None = None) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.sources.SourcesAPI.get_sources`."""
+        return await self.client.call(SourcesAPI._get_sources_call(search, ordering))
+
+    async def get_source(self, source_id: int) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.sources.SourcesAPI.get_source`."""
+        return await self.client.call(SourcesAPI._get_source_call(source_id))
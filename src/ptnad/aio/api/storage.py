@@ -0,0 +1,55 @@
+import asyncio
+from typing import List, Optional
+
+from ptnad.api.storage import StorageAPI
+from ptnad.models import Flow, TimeRange
+
+
+class AsyncStorageAPI(StorageAPI):
+    """Asynchronous API for working with PT NAD storage.
+
+    The SQLite bookkeeping, logging and requests are shared with
+    :class:`ptnad.api.storage.StorageAPI`; only the network calls are awaited.
+    """
+
+    async def get_flows(
+        self,
+        time_range: TimeRange,
+        storage_idx: str,
+        nad_filter: Optional[str] = None
+    ) -> List[Flow]:
+        """See :meth:`ptnad.api.storage.StorageAPI.get_flows`."""
+        query = self._flows_query(time_range, nad_filter)
+        result = await self.client.bql.execute(query, source=storage_idx)
+
+        return Flow.from_rows(result, ("id", "start", "end"))
+
+    async def save_flows(
+        self,
+        nad_filter: str,
+        persist_idx: str,
+        storage_idx: str = "2",
+        delta_hours: Optional[int] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        storage_dir: Optional[str] = None,
+        poll_interval: float = 10
+    ) -> None:
+        """See :meth:`ptnad.api.storage.StorageAPI.save_flows`."""
+        time_range = self._prepare_save(nad_filter, delta_hours, start_time, end_time, storage_dir)
+        flows = await self.get_flows(time_range, storage_idx, nad_filter)
+        new_flows = await asyncio.to_thread(self._new_flows, flows, storage_idx, persist_idx)
+        if not new_flows:
+            return
+
+        try:
+            result = await self.client.call(self._save_call(new_flows, storage_idx, persist_idx, time_range))
+            while self._task_pending(result):
+                await asyncio.sleep(poll_interval)
+                result = await self.client.call(self._task_call(result))
+
+            self.logger.info(f"Task completed with state: {result.get('state')}")
+
+        except Exception as e:
+            self.logger.error(f"Error during flow saving: {str(e)}")
+            raise
@@ -0,0 +1,36 @@
+from typing import Any, Dict, List
+
+from ptnad.api.variables import VariablesAPI
+
+
+class AsyncVariablesAPI:
+    """Coroutine counterpart of :class:`ptnad.api.variables.VariablesAPI`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def create_group(self, name: str, type: str = "ip", value: str | None = None,
+                           comment: str | None = None) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.variables.VariablesAPI.create_group`."""
+        return await self.client.call(VariablesAPI._create_group_call(name, type, value, comment))
+
+    async def get_groups(self, search: str | None = None) -> List[Dict[str, Any]]:
+        """See :meth:`ptnad.api.variables.VariablesAPI.get_groups`."""
+        return await self.client.call(VariablesAPI._get_groups_call(search))
+
+    async def get_group(self, group_id: int) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.variables.VariablesAPI.get_group`."""
+        return await self.client.call(VariablesAPI._get_group_call(group_id))
+
+    async def update_group(self, group_id: int, value: str | None = None,
+                           comment: str | None = None) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.variables.VariablesAPI.update_group`."""
+        return await self.client.call(VariablesAPI._update_group_call(group_id, value, comment))
+
+    async def delete_group(self, group_id: int) -> bool:
+        """See :meth:`ptnad.api.variables.VariablesAPI.delete_group`."""
+        return await self.client.call(VariablesAPI._delete_group_call(group_id))
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """See :meth:`ptnad.api.variables.VariablesAPI.get_stats`."""
+        return await self.client.call(VariablesAPI._get_stats_call())
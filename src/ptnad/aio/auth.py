@@ -0,0 +1,149 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from ptnad.exceptions import AuthenticationError
+
+
+class AsyncAuthStrategy(ABC):
+    @abstractmethod
+    async def authenticate(self, client: Any) -> None:
+        pass
+
+    @abstractmethod
+    async def deauthenticate(self, client: Any) -> None:
+        pass
+
+
+class AsyncLocalAuth(AsyncAuthStrategy):
+    def __init__(self, username: str, password: str) -> None:
+        self.username = username
+        self.password = password
+
+    async def authenticate(self, client: Any) -> None:
+        data = {
+            "username": self.username,
+            "password": self.password,
+        }
+
+        try:
+            response = await client.post("/auth/login", json=data)
+        except Exception as e:
+            raise AuthenticationError(f"Local Authentication failed: {str(e)}")
+
+        if response.status_code != 200:
+            raise AuthenticationError(
+                f"Authentication failed with status code: {response.status_code}"
+            )
+
+        # Verify authentication by checking status
+        await client.get("monitoring/status")
+
+    async def deauthenticate(self, client: Any) -> None:
+        try:
+            await client.post("/auth/logout")
+        except Exception as e:
+            raise AuthenticationError(f"Local Logout failed: {str(e)}")
+
+
+class AsyncSSOAuth(AsyncAuthStrategy):
+    def __init__(
+        self,
+        sso_url: str,
+        client_id: str,
+        client_secret: str,
+        username: str,
+        password: str,
+        sso_type: str | None = None
+    ) -> None:
+        self.sso_url = sso_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.username = username
+        self.password = password
+        self.sso_type = sso_type
+
+    async def authenticate(self, client: Any) -> None:
+        auth_data = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "password",
+            "response_type": "code id_token",
+            "scope": (
+                f"openid profile offline_access authorization {self.client_id}.api"
+            ),
+            "username": self.username,
+            "password": self.password,
+        }
+
+        # Add amr parameter if sso_type is ldap
+        if self.sso_type == "ldap":
+            auth_data["amr"] = "ldap"
+
+        try:
+            response = await client.session.post(f"{self.sso_url}/connect/token", data=auth_data)
+        except Exception as e:
+            raise AuthenticationError(f"SSO Authentication failed: {str(e)}")
+        if response.status_code >= 400:
+            raise AuthenticationError(f"SSO Authentication failed: {str(response.text)}")
+
+        client.set_auth_headers({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+        try:
+            # Verify authentication by checking status
+            await client.get("monitoring/status")
+        except Exception as e:
+            raise AuthenticationError(f"Failed to authenticate with SSO Token in PT NAD: {str(e)}")
+
+    async def deauthenticate(self, client: Any) -> None:
+        try:
+            client.set_auth_headers(None)
+            client.session.cookies.clear()
+        except Exception as e:
+            raise AuthenticationError(f"SSO Logout failed: {str(e)}")
+
+
+class AsyncApiKeyAuth(AsyncAuthStrategy):
+    def __init__(
+        self,
+        apikey: str
+    ) -> None:
+        self.api_key = apikey
+
+    async def authenticate(self, client: Any) -> None:
+        client.set_auth_headers({"Authorization": f"Bearer {self.api_key}"})
+
+        try:
+            # Verify authentication by checking status
+            await client.get("monitoring/status")
+        except Exception as e:
+            raise AuthenticationError(f"Failed to authenticate with API Key: {str(e)}")
+
+    async def deauthenticate(self, client: Any) -> None:
+        try:
+            client.set_auth_headers(None)
+            client.session.cookies.clear()
+        except Exception as e:
+            raise AuthenticationError(f"Logout failed: {str(e)}")
+
+
+class AsyncAuth:
+    def __init__(self, client: Any) -> None:
+        self.client = client
+        self.strategy: AsyncAuthStrategy | None = None
+
+    def set_strategy(self, strategy: AsyncAuthStrategy) -> None:
+        self.strategy = strategy
+
+    async def login(self) -> None:
+        if self.strategy is None:
+            raise AuthenticationError(
+                "Authentication type not set. Use set_auth() first."
+            )
+        await self.strategy.authenticate(self.client)
+
+    async def logout(self) -> None:
+        if self.strategy is None:
+            raise AuthenticationError(
+                "Authentication type not set. Use set_auth() first."
+            )
+        await self.strategy.deauthenticate(self.client)
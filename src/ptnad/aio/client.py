@@ -0,0 +1,326 @@
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Literal, Mapping, overload
+from urllib.parse import urljoin
+
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "AsyncPTNADClient requires httpx. Install it with: pip install 'ptnad-client[async]'"
+    ) from e
+
+from ptnad.api.calls import APICall, api_errors
+from ptnad.aio.auth import AsyncApiKeyAuth, AsyncAuth, AsyncLocalAuth, AsyncSSOAuth
+from ptnad.circuit import CircuitBreaker
+from ptnad.compression import CompressionConfig, record_compression
+from ptnad.codec import JSONCodec, get_codec
+from ptnad.exceptions import PTNADAPIError
+from ptnad.lazy import LazyAPI
+from ptnad.metrics import MetricsRegistry, endpoint_template
+from ptnad.retry import RetryPolicy
+from ptnad.singleflight import copy_response, request_key
+from ptnad.aio.singleflight import AsyncSingleFlight
+
+
+class AsyncPTNADClient:
+    """
+    Asynchronous PT NAD client built on top of ``httpx.AsyncClient``.
+
+    Mirrors :class:`ptnad.client.PTNADClient`: the same API namespaces are available,
+    but every method is a coroutine, so many requests can be in flight on one event loop.
+
+    Example:
+        async with AsyncPTNADClient("https://1.3.3.7", verify_ssl=False) as client:
+            client.set_auth(username="user", password="pass")
+            await client.login()
+            rows = await client.bql.execute("SELECT src.ip FROM flow LIMIT 10")
+
+    Failed requests are not retried unless ``retry=True`` or a
+    :class:`ptnad.retry.RetryPolicy` is passed, as for the synchronous client.
+
+    With ``single_flight=True``, identical reads awaited concurrently share one HTTP
+    request (see :class:`ptnad.aio.singleflight.AsyncSingleFlight`), and every caller
+    gets its own copy of the response. Coalescing is off by default. A :class:`ptnad.circuit.CircuitBreaker` and request compression
+    can be configured as for the synchronous client.
+
+    """
+
+    monitoring = LazyAPI("ptnad.aio.api.monitoring:AsyncMonitoringAPI")
+    signatures = LazyAPI("ptnad.aio.api.signatures:AsyncSignaturesAPI")
+    replists = LazyAPI("ptnad.aio.api.replists:AsyncRepListsAPI")
+    sources = LazyAPI("ptnad.aio.api.sources:AsyncSourcesAPI")
+    sensors = LazyAPI("ptnad.aio.api.sensors:AsyncSensorsAPI")
+    variables = LazyAPI("ptnad.aio.api.variables:AsyncVariablesAPI")
+    hosts = LazyAPI("ptnad.aio.api.hosts:AsyncHostsAPI")
+    bql = LazyAPI("ptnad.aio.api.bql:AsyncBQLAPI")
+    filters = LazyAPI("ptnad.aio.api.filters:AsyncFiltersAPI")
+    storage = LazyAPI("ptnad.aio.api.storage:AsyncStorageAPI")
+
+    def __init__(self, base_url: str, verify_ssl: bool = True, timeout: float | None = None,
+                 max_connections: int = 100, retry: RetryPolicy | bool = False,
+                 metrics: MetricsRegistry | None = None, codec: JSONCodec | str = "auto",
+                 single_flight: AsyncSingleFlight | bool = False,
+                 circuit_breaker: CircuitBreaker | None = None,
+                 compression: CompressionConfig | bool = False) -> None:
+        self.base_url = base_url.rstrip("/") + "/api/v2/"
+        self.verify_ssl = verify_ssl
+        if retry is True:
+            retry = RetryPolicy()
+        self.retry = retry or RetryPolicy(max_retries=0)
+        self.metrics = metrics
+        self.codec = get_codec(codec)
+        if single_flight is True:
+            single_flight = AsyncSingleFlight()
+        self.single_flight = single_flight if single_flight is not False else None
+        self.circuit_breaker = circuit_breaker
+        if compression is True:
+            compression = CompressionConfig()
+        self.compression = compression or None
+        self.session = httpx.AsyncClient(
+            verify=self.verify_ssl,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+        self.csrf_token = None
+        # Sent with every request instead of being written to session.headers, as in PTNADClient
+        self._auth_headers: Mapping[str, str] = MappingProxyType({})
+        self.auth = AsyncAuth(self)
+
+    async def __aenter__(self) -> "AsyncPTNADClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.session.aclose()
+
+    @overload
+    def set_auth(self, auth_type: Literal["local"], *, username: str, password: str) -> None:
+        ...
+
+    @overload
+    def set_auth(self, auth_type: Literal["sso"], *,
+                sso_url: str, client_id: str, client_secret: str,
+                username: str, password: str, sso_type: str | None = None) -> None:
+        ...
+
+    @overload
+    def set_auth(self, auth_type: Literal["apikey"], *, apikey: str) -> None:
+        ...
+
+    def set_auth(self, auth_type: str = "local", **kwargs):
+        if auth_type == "local":
+            self.auth.set_strategy(AsyncLocalAuth(**kwargs))
+        elif auth_type == "sso":
+            self.auth.set_strategy(AsyncSSOAuth(**kwargs))
+        elif auth_type == "apikey":
+            self.auth.set_strategy(AsyncApiKeyAuth(**kwargs))
+        else:
+            raise ValueError(f"Unsupported auth type: {auth_type}")
+
+    async def login(self) -> None:
+        await self.auth.login()
+        self.csrf_token = self.session.cookies.get("csrftoken")
+
+    async def logout(self) -> None:
+        await self.auth.logout()
+        self.csrf_token = None
+
+    @property
+    def auth_headers(self) -> Mapping[str, str]:
+        """Read-only snapshot of the headers added to every request by the auth strategy."""
+        return self._auth_headers
+
+    def set_auth_headers(self, headers: Dict[str, str] | None) -> None:
+        """
+        Replace the authentication headers sent with every request.
+
+        Args:
+            headers (Optional[Dict[str, str]]): New headers, or None to drop them.
+
+        """
+        self._auth_headers = MappingProxyType(dict(headers or {}))
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        if self.single_flight is not None:
+            key = request_key(method, endpoint, kwargs, self.codec.dumps)
+            if key is not None:
+                response, shared = await self.single_flight.do(key, lambda: self._send(method, endpoint, **kwargs))
+                if shared and self.metrics is not None:
+                    self.metrics.inc("coalesced_requests", help="Requests served by an identical in-flight request.",
+                                     method=method.upper(), endpoint=endpoint_template(endpoint))
+                # Every caller, the one that sent the request included, gets its own copy
+                return copy_response(response)
+        return await self._send(method, endpoint, **kwargs)
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        url = urljoin(self.base_url, endpoint.lstrip("/"))
+        headers = {**self._auth_headers, **kwargs.pop("headers", {})}
+        if self.csrf_token:
+            headers["X-CSRFToken"] = self.csrf_token
+        headers["Referer"] = self.base_url
+        if "json" in kwargs:
+            kwargs["content"] = self.codec.dumps(kwargs.pop("json"))
+            headers.setdefault("Content-Type", "application/json")
+        if self.compression is not None:
+            self._compress(endpoint, headers, kwargs)
+
+        self.retry.budget.deposit()
+        started = time.perf_counter()
+        attempt = 0
+        response = None
+        error = None
+        try:
+            while True:
+                response = None
+                try:
+                    response = await self._attempt(method, endpoint, url, headers, kwargs)
+                except httpx.HTTPError as e:
+                    delay = None
+                    if isinstance(e, httpx.TransportError) and not self._is_ssl_error(e):
+                        delay = self.retry.next_delay(
+                            method, endpoint, attempt,
+                            connect_error=isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+                        )
+                    if delay is None:
+                        self._handle_request_exception(e)
+                else:
+                    if response.status_code < 400:
+                        return response
+                    delay = self.retry.next_delay(
+                        method, endpoint, attempt,
+                        status_code=response.status_code,
+                        retry_after=response.headers.get("Retry-After"),
+                    )
+                    if delay is None:
+                        self._handle_http_error(response)
+                await asyncio.sleep(delay)
+                attempt += 1
+        except Exception as e:
+            error = type(e).__name__
+            if self.metrics is not None and isinstance(e, PTNADAPIError):
+                # Counted by operation once the API method that called us names it
+                e._track(self.metrics)
+            raise
+        finally:
+            if self.metrics is not None:
+                self._record_metrics(method, endpoint, started, response, attempt, error)
+
+    def _compress(self, endpoint: str, headers, kwargs) -> None:
+        """Negotiate response encoding and compress a large request body in place."""
+        headers.setdefault("Accept-Encoding", self.compression.accept_encoding)
+        body = kwargs.get("content")
+        if not self.compression.should_compress(body, headers):
+            return
+        if isinstance(body, str):
+            body = body.encode()
+        compressed = self.compression.compress(body)
+        if len(compressed) >= len(body):
+            return
+        kwargs["content"] = compressed
+        headers["Content-Encoding"] = self.compression.algorithm
+        if self.metrics is not None:
+            record_compression(self.metrics, "request", endpoint_template(endpoint), len(body), len(compressed))
+
+    async def _attempt(self, method: str, endpoint: str, url: str, headers, kwargs) -> httpx.Response:
+        """Send one HTTP attempt through the circuit breaker, if set."""
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return await self.session.request(method, url, headers=headers, **kwargs)
+        breaker.allow(self.base_url, endpoint)
+        started = time.perf_counter()
+        status = None
+        try:
+            response = await self.session.request(method, url, headers=headers, **kwargs)
+            status = response.status_code
+            return response
+        except asyncio.CancelledError:
+            breaker.release(self.base_url, endpoint)
+            started = None
+            raise
+        finally:
+            if started is not None:
+                breaker.record(self.base_url, endpoint, status, time.perf_counter() - started)
+
+    def _record_metrics(self, method, endpoint, started, response, retries, error) -> None:
+        duration = time.perf_counter() - started
+        if response is None:
+            self.metrics.record_request(method, endpoint, None, duration, retries=retries, error=error or "Error")
+            return
+        self.metrics.record_request(
+            method, endpoint, response.status_code, duration,
+            request_bytes=len(response.request.content),
+            response_bytes=len(response.content),
+            retries=retries,
+        )
+        if response.headers.get("Content-Encoding"):
+            record_compression(self.metrics, "response", endpoint_template(endpoint),
+                               len(response.content), response.num_bytes_downloaded)
+
+    @staticmethod
+    def _is_ssl_error(exception) -> bool:
+        return isinstance(exception, httpx.ConnectError) and "CERTIFICATE_VERIFY_FAILED" in str(exception)
+
+    def _handle_request_exception(self, exception):
+        if isinstance(exception, httpx.TimeoutException):
+            raise TimeoutError("Request timed out")
+        if self._is_ssl_error(exception):
+            raise ConnectionError("SSL certificate verification failed")
+        if isinstance(exception, httpx.TransportError):
+            raise ConnectionError("Connection error occurred")
+        raise PTNADAPIError(f"Unexpected error: {str(exception)}")
+
+    def _handle_http_error(self, response):
+        error_message = f"HTTP error occurred: {response.status_code} {response.reason_phrase}. Response content: {response.text}"
+        raise PTNADAPIError(error_message, status_code=response.status_code, response=response)
+
+    def decode(self, response) -> Any:
+        """
+        Decode a JSON response body with the client codec.
+
+        Args:
+            response: HTTP response returned by request().
+
+        Returns:
+            Any: The decoded document.
+
+        """
+        return self.codec.loads(response.content)
+
+    async def call(self, call: APICall) -> Any:
+        """
+        Send a request described by an :class:`ptnad.api.calls.APICall` and parse the response.
+
+        Args:
+            call (APICall): The request, as built by the API namespaces.
+
+        Returns:
+            Any: The result of ``call.parse``.
+
+        Raises:
+            PTNADAPIError: If the request fails or its response cannot be parsed; its
+                ``operation`` is ``call.operation``.
+
+        """
+        with api_errors(call.operation):
+            response = await self.request(call.method, call.endpoint, **call.request_kwargs("content"))
+            return call.parse(self, response)
+
+    async def get(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", endpoint, **kwargs)
+
+    async def put(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", endpoint, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", endpoint, **kwargs)
+
+    async def patch(self, endpoint: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", endpoint, **kwargs)
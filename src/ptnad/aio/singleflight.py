@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class AsyncSingleFlight:
+    """
+    Share one in-flight coroutine between tasks that ask for the same key.
+
+    Asyncio counterpart of :class:`ptnad.singleflight.SingleFlight`. The call runs in
+    its own task, so cancelling one waiting caller does not cancel the request for
+    the others.
+
+    Attributes:
+        shared (int): Number of calls that were served by another caller's request.
+    """
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await ``fn()`` unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call.
+            fn (Callable[[], Awaitable[Any]]): Coroutine function performing the call.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared with another caller.
+
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.shared += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            task.exception()
@@ -1,11 +1,28 @@
-from ptnad.api.bql import BQLAPI
-from ptnad.api.monitoring import MonitoringAPI
-from ptnad.api.replists import RepListsAPI
-from ptnad.api.signatures import SignaturesAPI
-from ptnad.api.sensors import SensorsAPI
-from ptnad.api.sources import SourcesAPI
-from ptnad.api.filters import FiltersAPI
-from ptnad.api.hosts import HostsAPI
-from ptnad.api.storage import StorageAPI
+from typing import TYPE_CHECKING
+
+from ptnad.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ptnad.api.bql import BQLAPI
+    from ptnad.api.monitoring import MonitoringAPI
+    from ptnad.api.replists import RepListsAPI
+    from ptnad.api.signatures import SignaturesAPI
+    from ptnad.api.sensors import SensorsAPI
+    from ptnad.api.sources import SourcesAPI
+    from ptnad.api.filters import FiltersAPI
+    from ptnad.api.hosts import HostsAPI
+    from ptnad.api.storage import StorageAPI
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BQLAPI": "ptnad.api.bql",
+    "MonitoringAPI": "ptnad.api.monitoring",
+    "RepListsAPI": "ptnad.api.replists",
+    "SignaturesAPI": "ptnad.api.signatures",
+    "SensorsAPI": "ptnad.api.sensors",
+    "SourcesAPI": "ptnad.api.sources",
+    "FiltersAPI": "ptnad.api.filters",
+    "HostsAPI": "ptnad.api.hosts",
+    "StorageAPI": "ptnad.api.storage",
+})
 
 __all__ = ["BQLAPI", "MonitoringAPI", "RepListsAPI", "SignaturesAPI", "SensorsAPI", "SourcesAPI", "FiltersAPI", "HostsAPI", "StorageAPI"]
@@ -1,6 +1,32 @@
-from typing import Any, Dict
+import base64
+import contextvars
+import hashlib
+import json
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
+from ptnad.api.calls import APICall, api_errors
 from ptnad.exceptions import PTNADAPIError, ValidationError
+from ptnad.models import TimeRange
+from ptnad.streaming import JSONArrayStream
+
+if TYPE_CHECKING:
+    # Only needed by the methods that use them, which import them when called
+    from ptnad.columnar import ColumnarResult
+    from ptnad.planner import AdaptivePlanner
+    from ptnad.resultcache import BQLResultCache
+
+# SELECT <fields> FROM <table> [WHERE <filter>] [ORDER BY ...] [LIMIT n]
+_QUERY = re.compile(
+    r"^\s*select\s+(?P<fields>.+?)\s+from\s+(?P<table>\S+)"
+    r"(?:\s+where\s+(?P<where>.+?))?"
+    r"(?:\s+order\s+by\s+(?P<order>.+?))?"
+    r"(?:\s+limit\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CHECKPOINT_VERSION = 1
 
 
 class BQLResponse:
@@ -20,6 +46,200 @@ class BQLResponse:
             response_dict["debug"] = self.debug
         return str(response_dict)
 
+def _bql_response(response: Dict[str, Any]) -> BQLResponse:
+    return BQLResponse(
+        result=response["result"],
+        took=response["took"],
+        total=response["total"],
+        debug=response.get("debug")
+    )
+
+
+def _literal(value: Any) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _probe_query(query: str) -> str:
+    """Turn a query into a count probe that fetches one row, for the ``total`` of the response."""
+    match = _QUERY.match(query)
+    if match is None:
+        raise ValueError(f"Expected 'SELECT ... FROM ... [WHERE ...]', got: {query!r}")
+    where = f" WHERE {match.group('where')}" if match.group("where") else ""
+    return f"SELECT id FROM {match.group('table')}{where} LIMIT 1"
+
+
+def _counted(chunks: Iterable[bytes], stats: Dict[str, Any]) -> Iterator[bytes]:
+    for chunk in chunks:
+        stats["bytes"] += len(chunk)
+        yield chunk
+
+
+def _adaptive_windows(time_range: TimeRange, planner: "AdaptivePlanner") -> Iterator[Tuple[TimeRange, bool]]:
+    """Cut windows off the front of the range as they are needed, each as wide as the planner says."""
+    start = time_range.start
+    while True:
+        end = min(start + planner.window_width(time_range.end - start), time_range.end)
+        yield TimeRange(start, end), end >= time_range.end
+        if end >= time_range.end:
+            return
+        start = end
+
+
+def _window_query(template: str, window: TimeRange, last: bool) -> str:
+    """
+    Restrict a query to flows ending in a window: ``[start, end)``, or ``[start, end]``
+    for the last window of an inclusive range.
+
+    ``{start}`` and ``{end}`` placeholders always receive half-open bounds, with
+    ``{end}`` one past the range end for the last window, so templates written as
+    ``end >= {start} and end < {end}`` give disjoint windows.
+    """
+    upper = "<=" if last else "<"
+    if "{start}" in template or "{end}" in template:
+        end = window.end + 1 if last else window.end
+        return template.replace("{start}", str(window.start)).replace("{end}", str(end))
+    match = _QUERY.match(template)
+    if match is None:
+        raise ValueError(f"Expected 'SELECT ... FROM ... [WHERE ...]', got: {template!r}")
+    if match.group("order") or match.group("limit"):
+        raise ValueError("Windowed queries are ordered and paged by the executor; remove ORDER BY and LIMIT")
+    conditions = [f"({match.group('where')})"] if match.group("where") else []
+    conditions.append(f"end >= {window.start} and end {upper} {window.end}")
+    return f"SELECT {match.group('fields')} FROM {match.group('table')} WHERE {' and '.join(conditions)}"
+
+
+class BQLCursor:
+    """
+    Iterator over all rows of a BQL query, fetched page by page.
+
+    Pages are ordered by ``end`` and ``id`` and each one continues after the last
+    row of the previous one (keyset pagination), so paging stays correct and cheap
+    however deep it goes, unlike LIMIT/OFFSET. Every page is decoded as a stream,
+    so memory use is bounded by one row.
+
+    After every row, :attr:`checkpoint` holds a token that resumes the iteration
+    right after that row: pass it to ``BQLAPI.iterate(..., checkpoint=token)`` after
+    a failure.
+
+    Attributes:
+        checkpoint: Token of the position after the last yielded row; None before the
+            first row of a fresh iteration.
+        rows: Number of rows yielded, including those before the checkpoint resumed from.
+        pages: Number of pages requested by this cursor.
+    """
+
+    def __init__(self, api: "BQLAPI", query: str, source: str, page_size: int,
+                 descending: bool, checkpoint: str | None,
+                 planner: "AdaptivePlanner | None" = None, probe: bool = False) -> None:
+        match = _QUERY.match(query)
+        if match is None:
+            raise ValueError(f"Expected 'SELECT ... FROM ... [WHERE ...] [LIMIT n]', got: {query!r}")
+        if match.group("order"):
+            raise ValueError("iterate() orders rows by end and id itself; remove ORDER BY from the query")
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+        self._api = api
+        self._source = source
+        self._page_size = page_size
+        self._descending = descending
+        self._planner = planner
+        self._probe = probe
+        self._table = match.group("table")
+        self._where = match.group("where")
+        self._limit = int(match.group("limit")) if match.group("limit") else None
+        fields = [field.strip() for field in match.group("fields").split(",")]
+        self._star = fields == ["*"]
+        # Keyset columns are appended when not selected, and removed from the yielded rows
+        self._fields = fields
+        self._extra = [] if self._star else [name for name in ("end", "id") if name not in fields]
+        selected = fields + self._extra
+        self._end_index = None if self._star else selected.index("end")
+        self._id_index = None if self._star else selected.index("id")
+        self._query_hash = hashlib.sha256(f"{query}\0{source}\0{descending}".encode()).hexdigest()[:16]
+        self._position: tuple | None = None
+        self.rows = 0
+        self.pages = 0
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            self._restore(checkpoint)
+
+    def _restore(self, token: str) -> None:
+        try:
+            state = json.loads(base64.urlsafe_b64decode(token.encode()))
+            version, query_hash, end, flow_id, rows = (state["v"], state["q"], state["end"], state["id"], state["n"])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid BQL checkpoint token")
+        if version != _CHECKPOINT_VERSION or query_hash != self._query_hash:
+            raise ValueError("The checkpoint belongs to a different query")
+        self._position = (end, flow_id)
+        self.rows = rows
+
+    def _token(self) -> str:
+        end, flow_id = self._position
+        state = {"v": _CHECKPOINT_VERSION, "q": self._query_hash, "end": end, "id": flow_id, "n": self.rows}
+        return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+    def _where_clause(self) -> str:
+        conditions = [f"({self._where})"] if self._where else []
+        if self._position is not None:
+            end, flow_id = (_literal(value) for value in self._position)
+            op = "<" if self._descending else ">"
+            conditions.append(f"(end {op} {end} or (end == {end} and id {op} {flow_id}))")
+        return f" WHERE {' and '.join(conditions)}" if conditions else ""
+
+    def _page_query(self, size: int) -> str:
+        direction = "DESC" if self._descending else "ASC"
+        fields = "*" if self._star else ", ".join(self._fields + self._extra)
+        return (f"SELECT {fields} FROM {self._table}{self._where_clause()} "
+                f"ORDER BY end {direction}, id {direction} LIMIT {size}")
+
+    def _key(self, row: Any) -> tuple:
+        if self._star:
+            key = (row.get("end"), row.get("id"))
+        else:
+            key = (row[self._end_index], row[self._id_index])
+        if None in key:
+            raise PTNADAPIError("BQL rows have no end or id, so they cannot be paged by keyset")
+        return key
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._iterate()
+
+    def _iterate(self, keyed: bool = False) -> Iterator[Any]:
+        """Yield the rows, or ``(end, row)`` pairs when ``keyed``."""
+        extra = len(self._extra)
+        planner = self._planner
+        first_page = None
+        if self._probe:
+            response = self._api.execute_raw(f"SELECT id FROM {self._table}{self._where_clause()} LIMIT 1",
+                                             self._source)
+            first_page = planner.probe(response.total)
+            if response.total == 0:
+                return
+        while self._limit is None or self.rows < self._limit:
+            size = self._page_size if planner is None else planner.page_size
+            if first_page is not None:
+                size, first_page = min(size, first_page), None
+            if self._limit is not None:
+                size = min(size, self._limit - self.rows)
+            self.pages += 1
+            received = 0
+            stats = {"bytes": 0}
+            for row in self._api._stream(self._page_query(size), self._source, stats=stats):
+                received += 1
+                self._position = self._key(row)
+                self.rows += 1
+                self.checkpoint = self._token()
+                row = row[:-extra] if extra else row
+                yield (self._position[0], row) if keyed else row
+            if planner is not None:
+                planner.observe(received, stats.get("took"), stats["bytes"])
+            if received < size:
+                return
+
+
 class BQLAPI:
     def __init__(self, client) -> None:
         self.client = client
@@ -39,14 +259,7 @@ class BQLAPI:
             PTNADAPIError: If there's an error executing the query.
 
         """
-        try:
-            response = self._send_query(query, source)
-            return response["result"]
-        except PTNADAPIError as e:
-            e.operation = "execute BQL query"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to execute BQL query: {str(e)}")
+        return self.client.call(self._execute_call(query, source))
 
     def execute_raw(self, query: str, source: str = "2") -> BQLResponse:
         """
@@ -63,48 +276,384 @@ class BQLAPI:
             PTNADAPIError: If there's an error executing the query.
 
         """
+        return self.client.call(self._execute_raw_call(query, source))
+
+    def execute_columnar(self, query: str, source: str = "2", fields: List[str] | None = None) -> "ColumnarResult":
+        """
+        Execute a BQL query and return the result as typed columns.
+
+        Rows are streamed and converted to columns in chunks, so the result never
+        exists as a list of row lists. See :class:`ptnad.columnar.ColumnarResult` for
+        the column types and the vectorized operations.
+
+        Args:
+            query (str): The BQL query to execute.
+            source (str): The identifier of the storage to query. Defaults to "2" (live).
+            fields (Optional[List[str]]): Column names for the selected fields. By
+                default they are taken from the SELECT clause, or from the rows for
+                ``SELECT *``.
+
+        Returns:
+            ColumnarResult: One column per selected field.
+
+        Raises:
+            PTNADAPIError: If there's an error executing the query.
+
+        """
+        from ptnad.columnar import ColumnarResult
+
+        if fields is None:
+            match = _QUERY.match(query)
+            selected = [field.strip() for field in match.group("fields").split(",")] if match else None
+            fields = None if selected == ["*"] else selected
         try:
-            response = self._send_query(query, source)
-            return BQLResponse(
-                result=response["result"],
-                took=response["took"],
-                total=response["total"],
-                debug=response.get("debug")
-            )
+            return ColumnarResult.from_rows(self.stream(query, source), fields)
         except PTNADAPIError as e:
-            e.operation = "execute BQL query"
+            e.operation = "execute columnar BQL query"
             raise
         except Exception as e:
-            raise PTNADAPIError(f"Failed to execute BQL query: {str(e)}")
+            raise PTNADAPIError(f"Failed to execute columnar BQL query: {str(e)}")
 
-    def _send_query(self, query: str, source: str) -> Dict[str, Any]:
+    def stream(self, query: str, source: str = "2", chunk_size: int = 64 * 1024) -> Iterator[Any]:
         """
-        Send a BQL query to the API.
+        Execute a BQL query and yield result rows as they arrive.
+
+        The response body is decoded incrementally, so memory use is bounded by a
+        single row and the first rows are available before the response is complete.
 
         Args:
             query (str): The BQL query to execute.
-            source (str): The identifier of the storage to query.
+            source (str): The identifier of the storage to query. Defaults to "2" (live).
+            chunk_size (int): Number of bytes read from the socket at a time.
+
+        Yields:
+            Any: Result rows, in the order returned by the server.
+
+        Raises:
+            ValidationError: If the API reports an error for the query.
+            PTNADAPIError: If there's an error executing the query.
+
+        """
+        yield from self._stream(query, source, chunk_size)
+
+    def _stream(self, query: str, source: str, chunk_size: int = 64 * 1024,
+                stats: Dict[str, Any] | None = None) -> Iterator[Any]:
+        """Stream a query; ``stats`` receives the payload ``bytes`` and the ``took`` of the response."""
+        call = self._query_call(query, source)
+        with api_errors("stream BQL query"):
+            response = self.client.request(call.method, call.endpoint, stream=True, **call.request_kwargs("data"))
+            with closing(response):
+                chunks = response.iter_content(chunk_size=chunk_size)
+                if stats is not None:
+                    chunks = _counted(chunks, stats)
+                rows = JSONArrayStream(chunks, "result", loads=self.client.codec.loads)
+                yield from rows
+
+        if "error" in rows.fields:
+            raise ValidationError(rows.fields["error"])
+        if stats is not None:
+            stats["took"] = rows.fields.get("took")
+
+    def iterate(self, query: str, source: str = "2", page_size: int = 10_000,
+                checkpoint: str | None = None, descending: bool = False,
+                planner: "AdaptivePlanner | None" = None) -> BQLCursor:
+        """
+        Iterate over all rows of a query, paging through the result automatically.
+
+        The query is sent page by page with ``ORDER BY end, id LIMIT page_size``, each
+        page continuing after the last ``(end, id)`` seen, and rows are decoded as they
+        arrive. ``end`` and ``id`` are added to the selected fields when missing and
+        stripped from the yielded rows. A ``LIMIT`` in the query caps the total number
+        of rows.
+
+        With a ``planner``, a count probe is sent first and the page size is adapted
+        to the measured server time and payload size of every page instead of
+        staying at ``page_size``.
+
+        Args:
+            query (str): ``SELECT ... FROM ... [WHERE ...] [LIMIT n]``, without ORDER BY.
+            source (str): The identifier of the storage to query. Defaults to "2" (live).
+            page_size (int): Rows requested per page.
+            checkpoint (Optional[str]): Token from ``BQLCursor.checkpoint`` of an earlier
+                iteration of the same query, to resume after its last row.
+            descending (bool): Newest flows first.
+            planner (Optional[AdaptivePlanner]): Sizes the pages adaptively.
 
         Returns:
-            Dict[str, Any]: The raw response from the API.
+            BQLCursor: Iterator over the rows, with the current ``checkpoint``.
+
+        Raises:
+            ValueError: If the query has ORDER BY, cannot be parsed, or the checkpoint
+                belongs to another query.
+
+        Example:
+            cursor = client.bql.iterate("SELECT src.ip, dst.ip FROM flow WHERE end > 2025.02.25")
+            try:
+                for row in cursor:
+                    process(row)
+            except PTNADAPIError:
+                resume_later(cursor.checkpoint)
+
+        """
+        return BQLCursor(self, query, source, page_size, descending, checkpoint,
+                         planner=planner, probe=planner is not None)
+
+    def execute_windows(self, query: str, time_range: TimeRange, windows: int | None = None,
+                        window_size: int | None = None, source: str = "2", max_workers: int = 4,
+                        ordered: bool = True, page_size: int = 10_000,
+                        planner: "AdaptivePlanner | None" = None) -> Iterator[Any]:
+        """
+        Run a query over a long time range as parallel queries over shorter windows.
+
+        The range is split into windows on ``end``, every window is read with
+        :meth:`iterate` (so it is paged and ordered by ``end``, ``id``), and at most
+        ``max_workers`` windows run at once. With ``ordered=True`` rows are yielded in
+        time order: a window's rows are yielded as soon as it and all earlier windows
+        are complete. With ``ordered=False`` each window's rows are yielded as soon as
+        that window completes. Memory holds at most ``max_workers`` windows.
+
+        Windows are disjoint: each one holds the flows with ``start <= end < stop``,
+        except the last one, which also holds flows ending at ``time_range.end``. The
+        window condition is added to the WHERE clause of ``query``. Alternatively
+        ``query`` may contain ``{start}`` and ``{end}`` placeholders, which are replaced
+        with these half-open bounds in milliseconds (``{end}`` is exclusive), so write
+        them as ``end >= {start} and end < {end}``.
+
+        With a ``planner``, windows are not fixed in advance: a count probe over the
+        whole range gives the average flow density, and every window is then cut as
+        wide as one adaptively sized page, using the density measured in the windows
+        read so far. Busy periods get narrow windows and quiet ones wide windows.
+
+        Args:
+            query (str): ``SELECT ... FROM ... [WHERE ...]``, without ORDER BY and LIMIT.
+            time_range (TimeRange): Range of flow ``end`` times in milliseconds, inclusive.
+            windows (Optional[int]): Number of windows.
+            window_size (Optional[int]): Window width in milliseconds, instead of ``windows``.
+                Without either, the range is split into ``max_workers`` windows.
+            source (str): The identifier of the storage to query. Defaults to "2" (live).
+            max_workers (int): Windows queried concurrently.
+            ordered (bool): Yield rows in time order rather than as windows complete.
+            page_size (int): Rows per request within a window.
+            planner (Optional[AdaptivePlanner]): Sizes windows and pages adaptively,
+                instead of ``windows``, ``window_size`` and ``page_size``.
+
+        Yields:
+            Any: Result rows.
 
         Raises:
-            ValidationError: If the query is invalid or the API returns an error.
+            ValueError: If more than one of ``windows``, ``window_size`` and ``planner``
+                is given, or the query has ORDER BY or LIMIT.
+            PTNADAPIError: If a window fails; the remaining windows are cancelled.
+
+        """
+        if sum(option is not None for option in (windows, window_size, planner)) > 1:
+            raise ValueError("Pass only one of windows, window_size and planner")
+        if planner is not None:
+            # Fail on a bad query now rather than on the first window
+            _window_query(query, time_range, True)
+            parts = self._planned_windows(query, time_range, source, planner)
+        else:
+            if window_size is not None:
+                windows = max(1, -(-time_range.duration // window_size))
+            split = time_range.split(windows or max_workers)
+            parts = [(window, i == len(split) - 1) for i, window in enumerate(split)]
+        queries = ((window, _window_query(query, window, last)) for window, last in parts)
+        return self._run_windows(queries, source, max_workers, ordered, page_size, planner)
 
+    def execute_range(self, query: str, time_range: TimeRange, source: str = "2",
+                      page_size: int = 10_000) -> Iterator[Any]:
         """
+        Run a query over a time range, reusing rows cached for closed windows.
+
+        With a :class:`ptnad.resultcache.BQLResultCache` set as ``client.bql_cache``,
+        the part of the range whose flows are final (``end`` more than ``settle``
+        seconds ago) is read from the cache, and only the windows not cached yet are
+        fetched from the server and stored. The open tail of the range is always
+        fetched and never stored. A range that is closed and fully cached is served
+        without any request. Without a cache, the whole range is fetched.
+
+        Rows are read with :meth:`iterate` and yielded in ``end``, ``id`` order. As with
+        :meth:`execute_windows`, the window condition is added to the WHERE clause of
+        ``query``, or substituted for ``{start}`` and ``{end}`` placeholders, which
+        delimit half-open windows: ``end >= {start} and end < {end}``. Aggregates
+        over the range cannot be assembled from cached parts, so select the flows and
+        aggregate them locally, e.g. with :class:`ptnad.columnar.ColumnarResult`.
+
+        Args:
+            query (str): ``SELECT ... FROM ... [WHERE ...]``, without ORDER BY and LIMIT.
+            time_range (TimeRange): Range of flow ``end`` times in milliseconds, inclusive.
+            source (str): The identifier of the storage to query. Defaults to "2" (live).
+            page_size (int): Rows per request.
+
+        Yields:
+            Any: Result rows.
+
+        Raises:
+            ValueError: If the query has ORDER BY or LIMIT or cannot be parsed.
+            PTNADAPIError: If there's an error executing the query or using the cache.
+
+        Example:
+            now = int(time.time() * 1000)
+            day = TimeRange(now - 86_400_000, now)
+            rows = client.bql.execute_range("SELECT app_proto, bytes.total FROM flow", day)
+
+        """
+        # Fail on a bad query now rather than on the first window
+        _window_query(query, time_range, True)
+        return self._execute_range(query, time_range, source, page_size)
+
+    def _execute_range(self, query: str, time_range: TimeRange, source: str, page_size: int) -> Iterator[Any]:
+        cache = getattr(self.client, "bql_cache", None)
+        # Windows below are half-open, [start, end)
+        start, end = time_range.start, time_range.end + 1
+        try:
+            if cache is None:
+                window = _window_query(query, TimeRange(start, end), False)
+                yield from BQLCursor(self, window, source, page_size, False, None)
+                return
+            key = cache.key(self.client.base_url, source, query)
+            closed = max(start, min(end, cache.closed_before()))
+            pieces = cache.plan(key, start, closed)
+            # A gap right before the open tail (typically what closed since the last
+            # run) is fetched together with the tail, in one request
+            tail = pieces.pop()[0] if pieces and not pieces[-1][2] else closed
+            for low, high, cached in pieces:
+                if cached:
+                    cache.hits += 1
+                    yield from cache.read(key, low, high)
+                else:
+                    cache.misses += 1
+                    yield from self._fill_window(cache, key, query, TimeRange(low, high), high, source, page_size)
+            if tail < closed:
+                cache.misses += 1
+            if tail < end:
+                yield from self._fill_window(cache, key, query, TimeRange(tail, end), closed, source, page_size)
+        except PTNADAPIError as e:
+            e.operation = "execute BQL query over a cached range"
+            raise
+        except Exception as e:
+            raise PTNADAPIError(f"Failed to execute BQL query over a cached range: {str(e)}")
+
+    def _fill_window(self, cache: "BQLResultCache", key: str, query: str, window: TimeRange, closed: int,
+                     source: str, page_size: int) -> Iterator[Any]:
+        """Fetch a window, yielding its rows and storing those that ended before ``closed`` chunk by chunk."""
+        cursor = BQLCursor(self, _window_query(query, window, False), source, page_size, False, None)
+        covered = window.start
+        storing = covered < closed
+        ends: List[int] = []
+        rows: List[Any] = []
+        for flow_end, row in cursor._iterate(keyed=True):
+            if storing and flow_end >= closed:
+                cache.store(key, covered, closed, ends, rows)
+                storing = False
+            elif storing:
+                # A chunk ends only between two ``end`` values, so it holds every flow
+                # of the window it covers: [covered, flow_end)
+                if len(rows) >= cache.chunk_rows and flow_end > ends[-1]:
+                    cache.store(key, covered, flow_end, ends, rows)
+                    covered, ends, rows = flow_end, [], []
+                ends.append(flow_end)
+                rows.append(row)
+            yield row
+        if storing:
+            cache.store(key, covered, closed, ends, rows)
+
+    def _planned_windows(self, query: str, time_range: TimeRange, source: str,
+                         planner: "AdaptivePlanner") -> Iterator[Tuple[TimeRange, bool]]:
+        probe = self.execute_raw(_probe_query(_window_query(query, time_range, True)), source)
+        planner.probe(probe.total, time_range.duration)
+        yield from _adaptive_windows(time_range, planner)
+
+    def _read_window(self, query: str, window: TimeRange, source: str, page_size: int,
+                     planner: "AdaptivePlanner | None") -> List[Any]:
+        rows = list(BQLCursor(self, query, source, page_size, False, None, planner=planner))
+        if planner is not None:
+            planner.observe_window(len(rows), window.duration)
+        return rows
+
+    def _run_windows(self, queries: Iterator[Tuple[TimeRange, str]], source: str, max_workers: int,
+                     ordered: bool, page_size: int, planner: "AdaptivePlanner | None") -> Iterator[Any]:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ptnad-bql")
+        running: Dict[Future, int] = {}
+        windows: Dict[int, TimeRange] = {}
+        done: Dict[int, List[Any]] = {}
+        submitted = 0
+        next_window = 0
+        exhausted = False
+        try:
+            while not exhausted or running:
+                # Completed windows waiting for an earlier one count against the limit too.
+                # Windows are taken from ``queries`` only here, so planned windows use the
+                # density measured in the windows completed so far.
+                while not exhausted and len(running) + len(done) < max_workers:
+                    item = next(queries, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    window, query = item
+                    # Each window gets a copy of the caller's context, e.g. its request priority
+                    context = contextvars.copy_context()
+                    future = executor.submit(context.run, self._read_window, query, window, source,
+                                             page_size, planner)
+                    running[future] = submitted
+                    windows[submitted] = window
+                    submitted += 1
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    window = windows.pop(index)
+                    try:
+                        rows = future.result()
+                    except PTNADAPIError as e:
+                        e.operation = f"execute BQL query over window {window.start}-{window.end}"
+                        raise
+                    except Exception as e:
+                        raise PTNADAPIError(f"Failed to execute BQL query over window "
+                                            f"{window.start}-{window.end}: {str(e)}")
+                    if ordered:
+                        done[index] = rows
+                    else:
+                        yield from rows
+                while ordered and next_window in done:
+                    yield from done.pop(next_window)
+                    next_window += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _execute_call(query: str, source: str) -> APICall:
+        return BQLAPI._query_call(query, source, lambda response: response["result"])
+
+    @staticmethod
+    def _execute_raw_call(query: str, source: str) -> APICall:
+        return BQLAPI._query_call(query, source, _bql_response)
+
+    @staticmethod
+    def _query_call(query: str, source: str, parse: Callable[[Dict[str, Any]], Any] | None = None) -> APICall:
+        """
+        Build the request of a BQL query.
+
+        Args:
+            query (str): The BQL query to execute.
+            source (str): The identifier of the storage to query.
+            parse (Optional[Callable]): Turns the decoded response into the result.
+
+        Returns:
+            APICall: The request; its result raises ValidationError if the API returns an error.
+
+        """
+        def checked(client, response) -> Any:
+            response = client.decode(response)
+
+            if "error" in response:
+                raise ValidationError(response["error"])
+
+            return response if parse is None else parse(response)
+
         headers = {
             "Content-Type": "text/plain",
-            "Referer": self.client.base_url
         }
-        response = self.client.post(
-            "/bql",
-            params={"source": source},
-            data=query,
-            headers=headers,
-            cookies=self.client.session.cookies.get_dict()
-        ).json()
-
-        if "error" in response:
-            raise ValidationError(response["error"])
-
-        return response
+        return APICall("POST", "/bql", "execute BQL query", params={"source": source},
+                       content=query.encode(), headers=headers, parse=checked)
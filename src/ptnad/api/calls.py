@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator
+
+from ptnad.exceptions import PTNADAPIError
+
+
+def decode(client: Any, response: Any) -> Any:
+    """Default :attr:`APICall.parse`: the response body decoded with the client codec."""
+    return client.decode(response)
+
+
+def results(client: Any, response: Any) -> Any:
+    """:attr:`APICall.parse` for paginated endpoints: the ``results`` of the decoded body."""
+    return client.decode(response)["results"]
+
+
+def expect(*statuses: int, parse: Callable[[Any, Any], Any] | None = decode) -> Callable[[Any, Any], Any]:
+    """
+    :attr:`APICall.parse` for endpoints that answer a specific success status.
+
+    Args:
+        *statuses (int): Accepted status codes; any other one raises PTNADAPIError.
+        parse (Optional[Callable]): Parses accepted responses; None returns None.
+
+    """
+    def check(client: Any, response: Any) -> Any:
+        if response.status_code not in statuses:
+            raise PTNADAPIError(f"Unexpected status code: {response.status_code}. Error: {response.text}",
+                                status_code=response.status_code, response=response)
+        return None if parse is None else parse(client, response)
+
+    return check
+
+
+@contextmanager
+def api_errors(operation: str) -> Iterator[None]:
+    """Name the failed ``operation`` on PTNADAPIError and wrap any other exception in one."""
+    try:
+        yield
+    except PTNADAPIError as e:
+        e.operation = operation
+        raise
+    except Exception as e:
+        raise PTNADAPIError(f"Failed to {operation}: {str(e)}")
+
+
+@dataclass(frozen=True)
+class APICall:
+    """
+    One API request and the way to read its response, without any I/O.
+
+    The namespaces in :mod:`ptnad.api` build their requests as APICalls and send them
+    with ``PTNADClient.call``, and their :mod:`ptnad.aio.api` counterparts pass the
+    same calls to ``AsyncPTNADClient.call``. Both clients therefore send identical
+    requests and parse responses with the same code.
+
+    Attributes:
+        method: HTTP method.
+        endpoint: Endpoint relative to the API root.
+        operation: What the call does, for errors, e.g. ``get sensor 3``.
+        params: Query string parameters.
+        json: JSON request body; None sends no JSON body.
+        content: Raw request body.
+        headers: Extra request headers.
+        parse: Turns ``(client, response)`` into the result; the decoded body by default.
+    """
+    method: str
+    endpoint: str
+    operation: str
+    params: Dict[str, Any] | None = None
+    json: Any = None
+    content: bytes | None = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    parse: Callable[[Any, Any], Any] = decode
+
+    def request_kwargs(self, content_arg: str) -> Dict[str, Any]:
+        """
+        Keyword arguments for the client's ``request()``.
+
+        Args:
+            content_arg (str): Name of the raw body argument of the HTTP library
+                (``data`` for requests, ``content`` for httpx).
+
+        """
+        kwargs: Dict[str, Any] = {}
+        if self.params is not None:
+            kwargs["params"] = self.params
+        if self.json is not None:
+            kwargs["json"] = self.json
+        if self.content is not None:
+            kwargs[content_arg] = self.content
+        if self.headers:
+            kwargs["headers"] = dict(self.headers)
+        return kwargs
@@ -1,4 +1,4 @@
-from ptnad.exceptions import PTNADAPIError
+from ptnad.api.calls import APICall
 
 
 class FiltersAPI:
@@ -19,15 +19,12 @@ class FiltersAPI:
             PTNADAPIError: If the filter compilation fails.
 
         """
+        return self.client.call(self._compile_call(user_filter))
+
+    @staticmethod
+    def _compile_call(user_filter: str) -> APICall:
         data = {
             "user_filter": user_filter
         }
-
-        try:
-            response = self.client.post("/filters/compile", json=data).json()
-            return response["compiled_filter"]
-        except PTNADAPIError as e:
-            e.operation = "compile filter"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to compile filter: {str(e)}")
+        return APICall("POST", "/filters/compile", "compile filter", json=data,
+                       parse=lambda client, response: client.decode(response)["compiled_filter"])
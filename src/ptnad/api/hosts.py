@@ -1,7 +1,10 @@
-from typing import Any, Dict, List, Optional, Union
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Union
 from urllib.parse import urlparse, parse_qs
 
-from ptnad.exceptions import PTNADAPIError
+from ptnad.api.calls import APICall, api_errors
+from ptnad.scheduler import Priority, with_priority
+from ptnad.streaming import stream_array
 
 
 def _normalize_list_param(param: Optional[Union[str, List[str]]]) -> Optional[List[str]]:
@@ -21,105 +24,58 @@ def _normalize_list_param(param: Optional[Union[str, List[str]]]) -> Optional[Li
     return param
 
 
+def _build_hosts_params(
+    id: Optional[Union[str, List[str]]] = None,
+    host: Optional[Union[str, List[str]]] = None,
+    type: Optional[Union[str, List[str]]] = None,
+    role: Optional[Union[str, List[str]]] = None,
+    groups: Optional[Union[str, List[str]]] = None,
+    traffic_incoming: Optional[Union[str, List[str]]] = None,
+    traffic_outgoing: Optional[Union[str, List[str]]] = None,
+    has_redef: Optional[bool] = None,
+    comment: Optional[bool] = None,
+    ordering: Optional[str] = None,
+    history_depth: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build URL parameters for the /hosts endpoint."""
+    url_params = {}
+    list_params = {
+        "id": id,
+        "host": host,
+        "type": type,
+        "role": role,
+        "groups": groups,
+        "traffic_incoming": traffic_incoming,
+        "traffic_outgoing": traffic_outgoing,
+    }
+    for name, value in list_params.items():
+        value = _normalize_list_param(value)
+        if value:
+            url_params[name] = ",".join(value)
+    if has_redef is not None:
+        url_params["has_redef"] = str(has_redef).lower()
+    if comment is not None:
+        url_params["comment"] = str(comment).lower()
+    if ordering:
+        url_params["ordering"] = ordering
+    if history_depth is not None:
+        url_params["history_depth"] = history_depth
+    if limit is not None:
+        url_params["limit"] = limit
+    if offset is not None:
+        url_params["offset"] = offset
+    if cursor:
+        url_params["cursor"] = cursor
+    return url_params
+
+
 class HostsAPI:
     def __init__(self, client) -> None:
         self.client = client
 
-    def _get_hosts_data(
-        self,
-        id: Optional[Union[str, List[str]]] = None,
-        host: Optional[Union[str, List[str]]] = None,
-        type: Optional[Union[str, List[str]]] = None,
-        role: Optional[Union[str, List[str]]] = None,
-        groups: Optional[Union[str, List[str]]] = None,
-        traffic_incoming: Optional[Union[str, List[str]]] = None,
-        traffic_outgoing: Optional[Union[str, List[str]]] = None,
-        has_redef: Optional[bool] = None,
-        comment: Optional[bool] = None,
-        ordering: Optional[str] = None,
-        history_depth: Optional[int] = None,
-        limit: Optional[int] = None,
-        offset: Optional[int] = None,
-    ) -> Dict[str, Any]:
-        """
-        Internal method to get the full response from the Hosts API.
-
-        Args:
-            id (Optional[Union[str, List[str]]]): Filter by host IDs. Can be a single string or list of strings.
-            host (Optional[Union[str, List[str]]]): Filter by host identifiers (id, ip.ip, hostname, user_hostname, dns.dns). Can be a single string or list of strings.
-            type (Optional[Union[str, List[str]]]): Filter by host type IDs (filters by both type and user_type). Can be a single string or list of strings.
-            role (Optional[Union[str, List[str]]]): Filter by role IDs. Can be a single string or list of strings.
-            groups (Optional[Union[str, List[str]]]): Filter by host groups. Can be a single string or list of strings.
-            traffic_incoming (Optional[Union[str, List[str]]]): Filter by incoming traffic (protocol, port, banner). Can be a single string or list of strings.
-            traffic_outgoing (Optional[Union[str, List[str]]]): Filter by outgoing traffic (protocol, banner). Can be a single string or list of strings.
-            has_redef (Optional[bool]): Filter by presence of user-defined overrides (type or roles).
-            comment (Optional[bool]): Filter hosts with/without comments.
-            ordering (Optional[str]): Field to sort the results by. Sorting is possible by id, ip,
-                first_seen, last_seen, has_redef, hostname, comment. To sort in descending order,
-                add a minus sign before the field name (e.g., ordering=-last_seen).
-            history_depth (Optional[int]): Number of nested document records to return. Default is 5.
-                Set to -1 to show all history for all hosts.
-            limit (Optional[int]): Maximum number of hosts to return.
-            offset (Optional[int]): Number of hosts to skip.
-
-        Returns:
-            Dict[str, Any]: Full API response
-
-        Raises:
-            PTNADAPIError: If there's an error retrieving the hosts.
-
-        Note:
-            By default, hosts are sorted by -last_seen and -id.
-            Nested lists (ip, os, dns, server_services, client_services, credentials) are sorted by -last_seen and -id.
-        """
-        # Normalize parameters to list format
-        id = _normalize_list_param(id)
-        host = _normalize_list_param(host)
-        type = _normalize_list_param(type)
-        role = _normalize_list_param(role)
-        groups = _normalize_list_param(groups)
-        traffic_incoming = _normalize_list_param(traffic_incoming)
-        traffic_outgoing = _normalize_list_param(traffic_outgoing)
-
-        url_params = {}
-
-        # Add filter parameters if provided
-        if id:
-            url_params["id"] = ",".join(id)
-        if host:
-            url_params["host"] = ",".join(host)
-        if type:
-            url_params["type"] = ",".join(type)
-        if role:
-            url_params["role"] = ",".join(role)
-        if groups:
-            url_params["groups"] = ",".join(groups)
-        if traffic_incoming:
-            url_params["traffic_incoming"] = ",".join(traffic_incoming)
-        if traffic_outgoing:
-            url_params["traffic_outgoing"] = ",".join(traffic_outgoing)
-        if has_redef is not None:
-            url_params["has_redef"] = str(has_redef).lower()
-        if comment is not None:
-            url_params["comment"] = str(comment).lower()
-        if ordering:
-            url_params["ordering"] = ordering
-        if history_depth is not None:
-            url_params["history_depth"] = history_depth
-        if limit is not None:
-            url_params["limit"] = limit
-        if offset is not None:
-            url_params["offset"] = offset
-
-        try:
-            response = self.client.get("/hosts", params=url_params).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "get hosts"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get hosts: {str(e)}")
-
     def get_hosts(
         self,
         id: Optional[Union[str, List[str]]] = None,
@@ -163,7 +119,7 @@ class HostsAPI:
             By default, hosts are sorted by -last_seen and -id.
             Nested lists (ip, os, dns, server_services, client_services, credentials) are sorted by -last_seen and -id.
         """
-        response = self._get_hosts_data(
+        return self.client.call(self._get_hosts_call(
             id=id,
             host=host,
             type=type,
@@ -174,10 +130,10 @@ class HostsAPI:
             has_redef=has_redef,
             comment=comment,
             ordering=ordering,
-            history_depth=history_depth
-        )
-        return response["results"]
+            history_depth=history_depth,
+        ))["results"]
 
+    @with_priority(Priority.BACKGROUND)
     def get_all_hosts(
         self,
         id: Optional[Union[str, List[str]]] = None,
@@ -227,38 +183,21 @@ class HostsAPI:
         cursor = None
 
         while True:
-            # Use cursor if available, otherwise start with offset 0
-            if cursor:
-                response = self._get_hosts_data_with_cursor(
-                    id=id,
-                    host=host,
-                    type=type,
-                    role=role,
-                    groups=groups,
-                    traffic_incoming=traffic_incoming,
-                    traffic_outgoing=traffic_outgoing,
-                    has_redef=has_redef,
-                    comment=comment,
-                    ordering=ordering,
-                    history_depth=history_depth,
-                    limit=limit,
-                    cursor=cursor
-                )
-            else:
-                response = self._get_hosts_data(
-                    id=id,
-                    host=host,
-                    type=type,
-                    role=role,
-                    groups=groups,
-                    traffic_incoming=traffic_incoming,
-                    traffic_outgoing=traffic_outgoing,
-                    has_redef=has_redef,
-                    comment=comment,
-                    ordering=ordering,
-                    history_depth=history_depth,
-                    limit=limit
-                )
+            response = self.client.call(self._get_hosts_call(
+                id=id,
+                host=host,
+                type=type,
+                role=role,
+                groups=groups,
+                traffic_incoming=traffic_incoming,
+                traffic_outgoing=traffic_outgoing,
+                has_redef=has_redef,
+                comment=comment,
+                ordering=ordering,
+                history_depth=history_depth,
+                limit=limit,
+                cursor=cursor,
+            ))
 
             hosts = response["results"]
             all_hosts.extend(hosts)
@@ -271,16 +210,8 @@ class HostsAPI:
 
         return all_hosts
 
-    def _extract_cursor_from_url(self, url: str) -> Optional[str]:
-        """Extract cursor parameter from pagination URL."""
-        try:
-            parsed_url = urlparse(url)
-            query_params = parse_qs(parsed_url.query)
-            return query_params.get("cursor", [None])[0]
-        except Exception:
-            return None
-
-    def _get_hosts_data_with_cursor(
+    @with_priority(Priority.BACKGROUND)
+    def iter_all_hosts(
         self,
         id: Optional[Union[str, List[str]]] = None,
         host: Optional[Union[str, List[str]]] = None,
@@ -294,58 +225,64 @@ class HostsAPI:
         ordering: Optional[str] = None,
         history_depth: Optional[int] = None,
         limit: int = 100,
-        cursor: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Internal method to get hosts data using cursor-based pagination.
-        """
-        # Normalize parameters to list format
-        id = _normalize_list_param(id)
-        host = _normalize_list_param(host)
-        type = _normalize_list_param(type)
-        role = _normalize_list_param(role)
-        groups = _normalize_list_param(groups)
-        traffic_incoming = _normalize_list_param(traffic_incoming)
-        traffic_outgoing = _normalize_list_param(traffic_outgoing)
+        Yield all hosts one at a time, following cursor pagination.
 
-        url_params = {}
+        Streaming counterpart of get_all_hosts(): each page is decoded incrementally,
+        so memory use is bounded by a single host instead of the whole inventory.
+        Takes the same filters as get_all_hosts().
 
-        # Add filter parameters if provided
-        if id:
-            url_params["id"] = ",".join(id)
-        if host:
-            url_params["host"] = ",".join(host)
-        if type:
-            url_params["type"] = ",".join(type)
-        if role:
-            url_params["role"] = ",".join(role)
-        if groups:
-            url_params["groups"] = ",".join(groups)
-        if traffic_incoming:
-            url_params["traffic_incoming"] = ",".join(traffic_incoming)
-        if traffic_outgoing:
-            url_params["traffic_outgoing"] = ",".join(traffic_outgoing)
-        if has_redef is not None:
-            url_params["has_redef"] = str(has_redef).lower()
-        if comment is not None:
-            url_params["comment"] = str(comment).lower()
-        if ordering:
-            url_params["ordering"] = ordering
-        if history_depth is not None:
-            url_params["history_depth"] = history_depth
-        url_params["limit"] = limit
-        if cursor:
-            url_params["cursor"] = cursor
+        Args:
+            limit (int): Number of hosts to fetch per request (default: 100).
+            chunk_size (int): Number of bytes read from the socket at a time.
+
+        Yields:
+            Dict[str, Any]: Host information.
+
+        Raises:
+            PTNADAPIError: If there's an error retrieving the hosts.
+
+        """
+        cursor = None
+        while True:
+            call = self._get_hosts_call(
+                id=id,
+                host=host,
+                type=type,
+                role=role,
+                groups=groups,
+                traffic_incoming=traffic_incoming,
+                traffic_outgoing=traffic_outgoing,
+                has_redef=has_redef,
+                comment=comment,
+                ordering=ordering,
+                history_depth=history_depth,
+                limit=limit,
+                cursor=cursor,
+            )
+            with api_errors(call.operation):
+                response = self.client.get(call.endpoint, params=call.params, stream=True)
+                with closing(response):
+                    page = stream_array(response, "results", chunk_size=chunk_size, loads=self.client.codec.loads)
+                    yield from page
+
+            if page.fields.get("next") is None:
+                break
+            cursor = self._extract_cursor_from_url(page.fields["next"])
 
+    @staticmethod
+    def _extract_cursor_from_url(url: str) -> Optional[str]:
+        """Extract cursor parameter from pagination URL."""
         try:
-            response = self.client.get("/hosts", params=url_params).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "get hosts"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get hosts: {str(e)}")
+            parsed_url = urlparse(url)
+            query_params = parse_qs(parsed_url.query)
+            return query_params.get("cursor", [None])[0]
+        except Exception:
+            return None
 
+    @with_priority(Priority.INTERACTIVE)
     def get_host(self, host_id: str, history_depth: Optional[int] = None) -> Dict[str, Any]:
         """
         Get information about a specific host by its id.
@@ -361,15 +298,16 @@ class HostsAPI:
         Raises:
             PTNADAPIError: If there's an error retrieving the host information.
         """
+        return self.client.call(self._get_host_call(host_id, history_depth))
+
+    @staticmethod
+    def _get_hosts_call(**kwargs) -> APICall:
+        """Accepts the filters of :meth:`get_hosts` plus ``limit``, ``offset`` and ``cursor``."""
+        return APICall("GET", "/hosts", "get hosts", params=_build_hosts_params(**kwargs))
+
+    @staticmethod
+    def _get_host_call(host_id: str, history_depth: Optional[int]) -> APICall:
         url_params = {}
         if history_depth is not None:
             url_params["history_depth"] = history_depth
-
-        try:
-            response = self.client.get(f"/hosts/{host_id}", params=url_params).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"get host {host_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get host {host_id}: {str(e)}")
+        return APICall("GET", f"/hosts/{host_id}", f"get host {host_id}", params=url_params)
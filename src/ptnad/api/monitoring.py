@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Any, Dict, List
 
-from ptnad.exceptions import PTNADAPIError
+from ptnad.api.calls import APICall
 
 
 class Status(str, Enum):
@@ -66,14 +66,7 @@ class MonitoringAPI:
             PTNADAPIError: If there's an error retrieving the status.
 
         """
-        try:
-            response = self.client.get("/monitoring/status").json()
-            return MonitoringStatus(**response)
-        except PTNADAPIError as e:
-            e.operation = "get monitoring status"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get monitoring status: {str(e)}")
+        return self.client.call(self._get_status_call())
 
     def get_triggers(self) -> List[Trigger]:
         """
@@ -86,14 +79,7 @@ class MonitoringAPI:
             PTNADAPIError: If there's an error retrieving the triggers.
 
         """
-        try:
-            response = self.client.get("/monitoring/triggers").json()
-            return [Trigger(**trigger) for trigger in response.get("results", [])]
-        except PTNADAPIError as e:
-            e.operation = "get triggers"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get triggers: {str(e)}")
+        return self.client.call(self._get_triggers_call())
 
     def get_trigger_by_id(self, trigger_id: str) -> Trigger | None:
         """
@@ -142,3 +128,15 @@ class MonitoringAPI:
         """
         triggers = self.get_triggers()
         return [trigger for trigger in triggers if trigger.type == trigger_type]
+
+    @staticmethod
+    def _get_status_call() -> APICall:
+        return APICall("GET", "/monitoring/status", "get monitoring status",
+                       parse=lambda client, response: MonitoringStatus(**client.decode(response)))
+
+    @staticmethod
+    def _get_triggers_call() -> APICall:
+        def parse(client, response) -> List[Trigger]:
+            return [Trigger(**trigger) for trigger in client.decode(response).get("results", [])]
+
+        return APICall("GET", "/monitoring/triggers", "get triggers", parse=parse)
@@ -1,48 +1,17 @@
 import re
-from typing import Any, Dict, List, Union
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Union
 
-from ptnad.exceptions import PTNADAPIError, ValidationError
+from ptnad.api.calls import APICall, api_errors, expect, results
+from ptnad.exceptions import ValidationError
+from ptnad.scheduler import Priority, with_priority
+from ptnad.streaming import stream_array
 
 
 class RepListsAPI:
     def __init__(self, client) -> None:
         self.client = client
 
-    def _get_lists_data(self, search: str | None = None, ordering: str | None = None,
-                        limit: int = 100, offset: int = 0) -> Dict[str, Any]:
-        """
-        Internal method to get the full response from the Replists API.
-
-        Args:
-            search (Optional[str]): Keyword to filter the lists by name, description, or vendor name.
-            ordering (Optional[str]): Field to sort the results by (id, name, color, type, created, modified, items_count, description, vendor__name). Use prefix '-' for descending order.
-            limit (int): Maximum number of lists to return.
-            offset (int): Number of lists to skip.
-
-        Returns:
-            Dict[str, Any]: Full API response
-
-        Raises:
-            PTNADAPIError: If there's an error retrieving the lists.
-
-        """
-        params = {}
-        if search:
-            params["search"] = search
-        if ordering:
-            params["ordering"] = ordering
-        params["limit"] = limit
-        params["offset"] = offset
-
-        try:
-            response = self.client.get("/replists", params=params).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "get reputation lists"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get reputation lists: {str(e)}")
-
     def get_lists(self, search: str | None = None, ordering: str | None = None,
                   limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """
@@ -61,8 +30,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error retrieving the lists.
 
         """
-        response = self._get_lists_data(search, ordering, limit, offset)
-        return response["results"]
+        return self.client.call(self._get_lists_call(search, ordering, limit, offset))["results"]
 
     def get_all_lists(self, search: str | None = None, ordering: str | None = None,
                       limit: int = 100) -> List[Dict[str, Any]]:
@@ -85,7 +53,7 @@ class RepListsAPI:
         offset = 0
 
         while True:
-            response = self._get_lists_data(search, ordering, limit, offset)
+            response = self.client.call(self._get_lists_call(search, ordering, limit, offset))
             lists = response["results"]
             all_lists.extend(lists)
 
@@ -126,37 +94,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error creating the list.
 
         """
-        if not self._is_valid_slug(name):
-            raise ValidationError("Name must be a valid slug consisting of letters, numbers, underscores or hyphens.")
-
-        data = {
-            "name": name,
-            "type": type,
-            "color": color,
-        }
-        if description:
-            data["description"] = description
-        if content:
-            # Convert list of strings to newline-separated string if needed
-            if isinstance(content, list):
-                data["content"] = "\n".join(content)
-            else:
-                data["content"] = content
-        if external_key:
-            data["external_key"] = external_key
-
-        try:
-            response = self.client.post("/replists", json=data)
-            if response.status_code == 201:
-                return response.json()
-            error_message = response.json() if response.headers.get("Content-Type") == "application/json" else response.text
-            raise PTNADAPIError(f"Failed to create reputation list. Status code: {response.status_code}. Error: {error_message}")
-        except PTNADAPIError as e:
-            e.operation = "create reputation list"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to create reputation list: {str(e)}")
-
+        return self.client.call(self._create_list_call(name, type, color, description, content, external_key))
 
     def get_list(self, list_id: int) -> Dict[str, Any]:
         """
@@ -172,14 +110,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error retrieving the list.
 
         """
-        try:
-            response = self.client.get(f"/replists/{list_id}").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"get reputation list {list_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get reputation list {list_id}: {str(e)}")
+        return self.client.call(self._get_list_call(list_id))
 
     def update_list(self, list_id: int, **kwargs) -> Dict[str, Any]:
         """
@@ -196,14 +127,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error updating the list.
 
         """
-        try:
-            response = self.client.patch(f"/replists/{list_id}", json=kwargs).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"update reputation list {list_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to update reputation list {list_id}: {str(e)}")
+        return self.client.call(self._update_list_call(list_id, kwargs))
 
     def delete_list(self, list_id: int) -> None:
         """
@@ -216,15 +140,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error deleting the reputation list.
 
         """
-        try:
-            response = self.client.delete(f"/replists/{list_id}")
-            if response.status_code != 204:
-                raise PTNADAPIError(f"Failed to delete reputation list {list_id}: {response.text}")
-        except PTNADAPIError as e:
-            e.operation = f"delete reputation list {list_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to delete reputation list {list_id}: {str(e)}")
+        self.client.call(self._delete_list_call(list_id))
 
     def add_dynamic_list_item(self, external_key: str, value: str, attributes: Dict[str, Any] | None = None) -> Dict[str, Any]:
         """
@@ -242,16 +158,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error adding the item.
 
         """
-        try:
-            response = self.client.post(f"/replists/dynamic/{external_key}/{value}", json=attributes or {})
-            if response.status_code in (200, 201):
-                return response.json()
-            raise PTNADAPIError(f"Failed to add item to reputation list {external_key}: {response.text}")
-        except PTNADAPIError as e:
-            e.operation = f"add item to reputation list {external_key}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to add item to reputation list {external_key}: {str(e)}")
+        return self.client.call(self._add_dynamic_list_item_call(external_key, value, attributes))
 
     def remove_item(self, external_key: str, value: str) -> None:
         """
@@ -265,15 +172,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error removing the item.
 
         """
-        try:
-            response = self.client.delete(f"/replists/dynamic/{external_key}/{value}")
-            if response.status_code != 204:
-                raise PTNADAPIError(f"Failed to remove item from reputation list {external_key}: {response.text}")
-        except PTNADAPIError as e:
-            e.operation = f"remove item from reputation list {external_key}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to remove item from reputation list {external_key}: {str(e)}")
+        self.client.call(self._remove_item_call(external_key, value))
 
     def get_dynamic_list_items(self, external_key: str, ordering: str | None = None) -> List[Dict[str, Any]]:
         """
@@ -290,19 +189,36 @@ class RepListsAPI:
             PTNADAPIError: If there's an error retrieving the items.
 
         """
-        params = {}
-        if ordering:
-            params["ordering"] = ordering
+        return self.client.call(self._get_dynamic_list_items_call(external_key, ordering))
+
+    @with_priority(Priority.BACKGROUND)
+    def iter_dynamic_list_items(self, external_key: str, ordering: str | None = None,
+                                chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+        """
+        Yield items of a dynamic reputation list as they arrive.
+
+        Streaming counterpart of get_dynamic_list_items(): the response is decoded
+        incrementally, so memory use is bounded by a single item.
+
+        Args:
+            external_key (str): External key of the reputation list.
+            ordering (Optional[str]): Field to sort the results by (value or modified).
+            chunk_size (int): Number of bytes read from the socket at a time.
+
+        Yields:
+            Dict[str, Any]: Items of the reputation list.
+
+        Raises:
+            PTNADAPIError: If there's an error retrieving the items.
 
-        try:
-            response = self.client.get(f"/replists/dynamic/{external_key}", params=params).json()
-            return response["results"]
-        except PTNADAPIError as e:
-            e.operation = f"get items from reputation list {external_key}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get items from reputation list {external_key}: {str(e)}")
+        """
+        call = self._get_dynamic_list_items_call(external_key, ordering)
+        with api_errors(call.operation):
+            response = self.client.get(call.endpoint, params=call.params, stream=True)
+            with closing(response):
+                yield from stream_array(response, "results", chunk_size=chunk_size, loads=self.client.codec.loads)
 
+    @with_priority(Priority.BACKGROUND)
     def bulk_add_items(self, external_key: str, items: List[Dict[str, Any]]) -> None:
         """
         Add multiple items to a dynamic reputation list.
@@ -315,14 +231,9 @@ class RepListsAPI:
             PTNADAPIError: If there's an error adding the items.
 
         """
-        try:
-            self.client.post(f"/replists/dynamic/{external_key}/_bulk", json=items)
-        except PTNADAPIError as e:
-            e.operation = f"bulk add items to reputation list {external_key}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to bulk add items to reputation list {external_key}: {str(e)}")
+        self.client.call(self._bulk_add_items_call(external_key, items))
 
+    @with_priority(Priority.BACKGROUND)
     def bulk_delete_items(self, external_key: str, values: List[str]) -> None:
         """
         Delete multiple items from a dynamic reputation list.
@@ -335,15 +246,7 @@ class RepListsAPI:
             PTNADAPIError: If there's an error deleting the items.
 
         """
-        try:
-            response = self.client.post(f"/replists/dynamic/{external_key}/_delete", json=values)
-            if response.status_code != 204:
-                raise PTNADAPIError(f"Failed to bulk delete items from reputation list {external_key}: {response.text}")
-        except PTNADAPIError as e:
-            e.operation = f"bulk delete items from reputation list {external_key}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to bulk delete items from reputation list {external_key}: {str(e)}")
+        self.client.call(self._bulk_delete_items_call(external_key, values))
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -356,11 +259,85 @@ class RepListsAPI:
             PTNADAPIError: If there's an error retrieving the statistics.
 
         """
-        try:
-            response = self.client.get("/replists/stats").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "get reputation lists statistics"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get reputation lists statistics: {str(e)}")
+        return self.client.call(self._get_stats_call())
+
+    @staticmethod
+    def _get_lists_call(search: str | None, ordering: str | None, limit: int, offset: int) -> APICall:
+        params = {}
+        if search:
+            params["search"] = search
+        if ordering:
+            params["ordering"] = ordering
+        params["limit"] = limit
+        params["offset"] = offset
+        return APICall("GET", "/replists", "get reputation lists", params=params)
+
+    @staticmethod
+    def _create_list_call(name: str, type: str, color: str, description: str | None,
+                          content: Union[str, List[str], None], external_key: str | None) -> APICall:
+        if not RepListsAPI._is_valid_slug(name):
+            raise ValidationError("Name must be a valid slug consisting of letters, numbers, underscores or hyphens.")
+
+        data = {
+            "name": name,
+            "type": type,
+            "color": color,
+        }
+        if description:
+            data["description"] = description
+        if content:
+            # Convert list of strings to newline-separated string if needed
+            if isinstance(content, list):
+                data["content"] = "\n".join(content)
+            else:
+                data["content"] = content
+        if external_key:
+            data["external_key"] = external_key
+        return APICall("POST", "/replists", "create reputation list", json=data, parse=expect(201))
+
+    @staticmethod
+    def _get_list_call(list_id: int) -> APICall:
+        return APICall("GET", f"/replists/{list_id}", f"get reputation list {list_id}")
+
+    @staticmethod
+    def _update_list_call(list_id: int, fields: Dict[str, Any]) -> APICall:
+        return APICall("PATCH", f"/replists/{list_id}", f"update reputation list {list_id}", json=fields)
+
+    @staticmethod
+    def _delete_list_call(list_id: int) -> APICall:
+        return APICall("DELETE", f"/replists/{list_id}", f"delete reputation list {list_id}",
+                       parse=expect(204, parse=None))
+
+    @staticmethod
+    def _add_dynamic_list_item_call(external_key: str, value: str, attributes: Dict[str, Any] | None) -> APICall:
+        return APICall("POST", f"/replists/dynamic/{external_key}/{value}",
+                       f"add item to reputation list {external_key}", json=attributes or {}, parse=expect(200, 201))
+
+    @staticmethod
+    def _remove_item_call(external_key: str, value: str) -> APICall:
+        return APICall("DELETE", f"/replists/dynamic/{external_key}/{value}",
+                       f"remove item from reputation list {external_key}", parse=expect(204, parse=None))
+
+    @staticmethod
+    def _get_dynamic_list_items_call(external_key: str, ordering: str | None) -> APICall:
+        params = {}
+        if ordering:
+            params["ordering"] = ordering
+        return APICall("GET", f"/replists/dynamic/{external_key}", f"get items from reputation list {external_key}",
+                       params=params, parse=results)
+
+    @staticmethod
+    def _bulk_add_items_call(external_key: str, items: List[Dict[str, Any]]) -> APICall:
+        return APICall("POST", f"/replists/dynamic/{external_key}/_bulk",
+                       f"bulk add items to reputation list {external_key}", json=items,
+                       parse=lambda client, response: None)
+
+    @staticmethod
+    def _bulk_delete_items_call(external_key: str, values: List[str]) -> APICall:
+        return APICall("POST", f"/replists/dynamic/{external_key}/_delete",
+                       f"bulk delete items from reputation list {external_key}", json=values,
+                       parse=expect(204, parse=None))
+
+    @staticmethod
+    def _get_stats_call() -> APICall:
+        return APICall("GET", "/replists/stats", "get reputation lists statistics")
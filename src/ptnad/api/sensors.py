@@ -1,6 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
-from ptnad.exceptions import PTNADAPIError
+from ptnad.api.calls import APICall, results
 
 
 class SensorsAPI:
@@ -19,14 +19,7 @@ class SensorsAPI:
             PTNADAPIError: If there's an error retrieving the sensors information.
 
         """
-        try:
-            response = self.client.get("/sensors").json()
-            return response["results"]
-        except PTNADAPIError as e:
-            e.operation = "get sensors"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get sensors: {str(e)}")
+        return self.client.call(self._get_sensors_call())
 
     def get_sensor(self, sensor_id: int) -> Dict[str, Any]:
         """
@@ -42,11 +35,12 @@ class SensorsAPI:
             PTNADAPIError: If there's an error retrieving the ptdpi module information.
 
         """
-        try:
-            response = self.client.get(f"/sensors/{sensor_id}").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"get sensor {sensor_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get sensor {sensor_id}: {str(e)}")
+        return self.client.call(self._get_sensor_call(sensor_id))
+
+    @staticmethod
+    def _get_sensors_call() -> APICall:
+        return APICall("GET", "/sensors", "get sensors", parse=results)
+
+    @staticmethod
+    def _get_sensor_call(sensor_id: int) -> APICall:
+        return APICall("GET", f"/sensors/{sensor_id}", f"get sensor {sensor_id}")
@@ -1,6 +1,8 @@
 from typing import Any, Dict, List
 
+from ptnad.api.calls import APICall, results
 from ptnad.exceptions import PTNADAPIError
+from ptnad.scheduler import Priority, with_priority
 
 
 class SignaturesAPI:
@@ -23,85 +25,7 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error retrieving the classes.
 
         """
-        params = {k: v for k, v in filters.items() if v is not None}
-        if search:
-            params["search"] = search
-        if ordering:
-            params["ordering"] = ordering
-
-        try:
-            response = self.client.get("/signatures/classes", params=params).json()
-            return response["results"]
-        except PTNADAPIError as e:
-            e.operation = "get signature classes"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get signature classes: {str(e)}")
-
-    def _get_rules_data(self, search: str | None = None, ordering: str | None = None,
-                           limit: int = 100, offset: int = 0, **filters) -> Dict[str, Any]:
-        """
-        Internal method to get the full response from the Signatures API.
-
-        Args:
-            search (Optional[str]): Keyword to filter the rules.
-            ordering (Optional[str]): Field to sort the results by.
-            limit (int): Maximum number of rules to return.
-            offset (int): Number of rules to skip.
-            **filters: Additional filters. Available filters:
-                sid: Filter by sid (can be a single value or a list)
-                sid__gte: sid greater than or equal to
-                sid__lt: sid less than
-                vendor: Filter by vendor name (can be a single value or a list)
-                enabled: Filter by enabled status (true or false)
-                has_redef: Filter by has_redef status (true or false)
-                has_exceptions: Filter by has_exceptions status (true or false)
-                priority: Filter by priority (if priority=4, finds all rules with priority>=4)
-                cls: Filter by class name (can be a single value or a list)
-                diff: Filter by rule changes, valid values (can be a list): added (+), updated (*), removed (-), unchanged (=). Available in PT NAD 12.2+
-                has_error: Filter by has_error status (true or false)
-                client: Search for IP address in src_adr and dst_adr
-                server: Search for IP address in src_adr and dst_adr
-
-        Returns:
-            Dict[str, Any]: Full API response
-
-        Raises:
-            PTNADAPIError: If there's an error retrieving the rules.
-
-        """
-        # Separate pagination, search and ordering parameters from filters
-        url_params = {}
-        if search:
-            url_params["search"] = search
-        if ordering:
-            url_params["ordering"] = ordering
-        url_params["limit"] = limit
-        url_params["offset"] = offset
-
-        # Extract filter parameters
-        filter_params = {k: v for k, v in filters.items() if v is not None}
-
-        # If we have filters, send them in the JSON payload
-        if filter_params:
-            try:
-                response = self.client.get("/signatures/rules", params=url_params, json={"filter": filter_params}).json()
-                return response
-            except PTNADAPIError as e:
-                e.operation = "get Rules"
-                raise
-            except Exception as e:
-                raise PTNADAPIError(f"Failed to get Rules: {str(e)}")
-        else:
-            # No filters, use regular GET request
-            try:
-                response = self.client.get("/signatures/rules", params=url_params).json()
-                return response
-            except PTNADAPIError as e:
-                e.operation = "get Rules"
-                raise
-            except Exception as e:
-                raise PTNADAPIError(f"Failed to get Rules: {str(e)}")
+        return self.client.call(self._get_classes_call(search, ordering, filters))
 
     def get_rules(self, search: str | None = None, ordering: str | None = None,
                   limit: int = 100, offset: int = 0, **filters) -> List[Dict[str, Any]]:
@@ -135,9 +59,9 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error retrieving the rules.
 
         """
-        response = self._get_rules_data(search, ordering, limit, offset, **filters)
-        return response["results"]
+        return self.client.call(self._get_rules_call(search, ordering, limit, offset, filters))
 
+    @with_priority(Priority.INTERACTIVE)
     def get_rule(self, rule_id: int) -> Dict[str, Any]:
         """
         Get information about a specific Rule.
@@ -152,14 +76,7 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error retrieving the rule.
 
         """
-        try:
-            response = self.client.get(f"/signatures/rules/{rule_id}").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"get Rule {rule_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get rule {rule_id}: {str(e)}")
+        return self.client.call(self._get_rule_call(rule_id))
 
     def update_rule(self, rule_id: int, **kwargs) -> Dict[str, Any]:
         """
@@ -176,14 +93,7 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error updating the rule.
 
         """
-        try:
-            response = self.client.patch(f"/signatures/rules/{rule_id}", json=kwargs).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"update Rule {rule_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to update Rule {rule_id}: {str(e)}")
+        return self.client.call(self._update_rule_call(rule_id, kwargs))
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -196,14 +106,7 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error retrieving the statistics.
 
         """
-        try:
-            response = self.client.get("/signatures/stats").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "get Rules statistics"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get Rules statistics: {str(e)}")
+        return self.client.call(self._get_stats_call())
 
     def apply_changes(self) -> Dict[str, str]:
         """
@@ -216,23 +119,7 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error applying the changes.
 
         """
-        try:
-            response = self.client.post("/signatures/commit").json()
-            if "hashsum" in response:
-                return response
-            if "fatal_error" in response or "other_errors" in response:
-                errors = []
-                if response.get("fatal_error"):
-                    errors.append(response["fatal_error"])
-                if response.get("other_errors"):
-                    errors.extend(response["other_errors"])
-                raise PTNADAPIError(f"Failed to commit signature changes: {', '.join(errors)}")
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"commit signature changes: {', '.join(errors)}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to apply Rule changes: {str(e)}")
+        return self.client.call(self._apply_changes_call())
 
     def revert_changes(self) -> None:
         """
@@ -242,10 +129,61 @@ class SignaturesAPI:
             PTNADAPIError: If there's an error reverting the changes.
 
         """
-        try:
-            self.client.post("/signatures/rollback")
-        except PTNADAPIError as e:
-            e.operation = "revert Rule changes"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to revert Rule changes: {str(e)}")
+        self.client.call(self._revert_changes_call())
+
+    @staticmethod
+    def _get_classes_call(search: str | None, ordering: str | None, filters: Dict[str, Any]) -> APICall:
+        params = {k: v for k, v in filters.items() if v is not None}
+        if search:
+            params["search"] = search
+        if ordering:
+            params["ordering"] = ordering
+        return APICall("GET", "/signatures/classes", "get signature classes", params=params, parse=results)
+
+    @staticmethod
+    def _get_rules_call(search: str | None, ordering: str | None, limit: int, offset: int,
+                        filters: Dict[str, Any]) -> APICall:
+        # Separate pagination, search and ordering parameters from filters
+        url_params = {}
+        if search:
+            url_params["search"] = search
+        if ordering:
+            url_params["ordering"] = ordering
+        url_params["limit"] = limit
+        url_params["offset"] = offset
+
+        # Filters are sent in the JSON payload; without them this is a regular GET request
+        filter_params = {k: v for k, v in filters.items() if v is not None}
+        return APICall("GET", "/signatures/rules", "get Rules", params=url_params,
+                       json={"filter": filter_params} if filter_params else None, parse=results)
+
+    @staticmethod
+    def _get_rule_call(rule_id: int) -> APICall:
+        return APICall("GET", f"/signatures/rules/{rule_id}", f"get Rule {rule_id}")
+
+    @staticmethod
+    def _update_rule_call(rule_id: int, fields: Dict[str, Any]) -> APICall:
+        return APICall("PATCH", f"/signatures/rules/{rule_id}", f"update Rule {rule_id}", json=fields)
+
+    @staticmethod
+    def _get_stats_call() -> APICall:
+        return APICall("GET", "/signatures/stats", "get Rules statistics")
+
+    @staticmethod
+    def _apply_changes_call() -> APICall:
+        def parse(client, response) -> Dict[str, str]:
+            response = client.decode(response)
+            if "hashsum" not in response and ("fatal_error" in response or "other_errors" in response):
+                errors = []
+                if response.get("fatal_error"):
+                    errors.append(response["fatal_error"])
+                if response.get("other_errors"):
+                    errors.extend(response["other_errors"])
+                raise PTNADAPIError(", ".join(errors))
+            return response
+
+        return APICall("POST", "/signatures/commit", "apply Rule changes", parse=parse)
+
+    @staticmethod
+    def _revert_changes_call() -> APICall:
+        return APICall("POST", "/signatures/rollback", "revert Rule changes", parse=lambda client, response: None)
@@ -1,6 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
-from ptnad.exceptions import PTNADAPIError
+from ptnad.api.calls import APICall, results
 
 
 class SourcesAPI:
@@ -26,20 +26,7 @@ class SourcesAPI:
             PTNADAPIError: If there's an error retrieving the sources.
 
         """
-        url_params = {}
-        if search:
-            url_params["search"] = search
-        if ordering:
-            url_params["ordering"] = ordering
-
-        try:
-            response = self.client.get("/sources", params=url_params).json()
-            return response["results"]
-        except PTNADAPIError as e:
-            e.operation = "get sources"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get sources: {str(e)}")
+        return self.client.call(self._get_sources_call(search, ordering))
 
     def get_source(self, source_id: int) -> Dict[str, Any]:
         """
@@ -55,11 +42,17 @@ class SourcesAPI:
             PTNADAPIError: If there's an error retrieving the storage source.
 
         """
-        try:
-            response = self.client.get(f"/sources/{source_id}").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"get source {source_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get source {source_id}: {str(e)}")
+        return self.client.call(self._get_source_call(source_id))
+
+    @staticmethod
+    def _get_sources_call(search: str | None, ordering: str | None) -> APICall:
+        url_params = {}
+        if search:
+            url_params["search"] = search
+        if ordering:
+            url_params["ordering"] = ordering
+        return APICall("GET", "/sources", "get sources", params=url_params, parse=results)
+
+    @staticmethod
+    def _get_source_call(source_id: int) -> APICall:
+        return APICall("GET", f"/sources/{source_id}", f"get source {source_id}")
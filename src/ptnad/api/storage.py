@@ -1,13 +1,13 @@
+from contextlib import closing
 from typing import List, Optional
-import sqlite3
 from datetime import datetime, timedelta
 import logging
-from logging.handlers import TimedRotatingFileHandler
 from time import sleep
 import os
 
-from ..exceptions import PTNADAPIError
+from .calls import APICall
 from ..models import Flow, TimeRange
+from ..scheduler import Priority, with_priority
 
 class StorageAPI:
     """API for working with PT NAD storage."""
@@ -39,6 +39,9 @@ class StorageAPI:
 
     def _setup_logger(self, log_level: str, log_file: str) -> logging.Logger:
         """Setup logger with file handler."""
+        # Imported here so that importing the client does not pay for it
+        from logging.handlers import TimedRotatingFileHandler
+
         logger = logging.getLogger(__name__)
         
         logger.handlers = []
@@ -55,6 +58,8 @@ class StorageAPI:
 
     def _create_db(self):
         """Create SQLite database."""
+        import sqlite3
+
         self.logger.info(f"Connect to SQLite DB in file {self.db_file}")
         conn = sqlite3.connect(self.db_file)
         cur = conn.cursor()
@@ -85,6 +90,13 @@ class StorageAPI:
         Returns:
             List of Flow objects
         """
+        query = self._flows_query(time_range, nad_filter)
+        result = self.client.bql.execute(query, source=storage_idx)
+        
+        return Flow.from_rows(result, ("id", "start", "end"))
+
+    def _flows_query(self, time_range: TimeRange, nad_filter: Optional[str]) -> str:
+        """BQL query of get_flows()."""
         query = f"""
             SELECT id, start, end 
             FROM flow 
@@ -94,18 +106,7 @@ class StorageAPI:
         """
         
         self.logger.debug(f"BQL Query: {query}")
-        result = self.client.bql.execute(query, source=storage_idx)
-        
-        flows = []
-        for row in result:
-            flow_dict = {
-                "id": row[0],
-                "start": row[1],
-                "end": row[2]
-            }
-            flows.append(Flow.from_dict(flow_dict))
-            
-        return flows
+        return query
 
     def _filter_old_flows(
         self,
@@ -114,27 +115,29 @@ class StorageAPI:
         dst_idx: str
     ) -> List[Flow]:
         """Filter out flows that are already in database."""
-        conn = sqlite3.connect(self.db_file)
-        cur = conn.cursor()
+        import sqlite3
+
         new_flows = []
-        
-        for flow in flows:
-            cur.execute(
-                "SELECT * FROM saved_flows WHERE flow_id = ? AND src_idx = ? AND dst_idx = ?",
-                (flow.id, src_idx, dst_idx)
-            )
-            if cur.fetchall():
-                continue
-                
-            cur.execute(
-                "INSERT INTO saved_flows VALUES(?, ?, ?, ?, ?)",
-                [flow.id, flow.start, flow.end, src_idx, dst_idx]
-            )
-            conn.commit()
-            new_flows.append(flow)
-            
+        # One transaction for the whole batch: a commit per flow waits for a disk sync every time
+        with closing(sqlite3.connect(self.db_file)) as conn, conn:
+            cur = conn.cursor()
+            for flow in flows:
+                cur.execute(
+                    "SELECT * FROM saved_flows WHERE flow_id = ? AND src_idx = ? AND dst_idx = ?",
+                    (flow.id, src_idx, dst_idx)
+                )
+                if cur.fetchall():
+                    continue
+
+                cur.execute(
+                    "INSERT INTO saved_flows VALUES(?, ?, ?, ?, ?)",
+                    [flow.id, flow.start, flow.end, src_idx, dst_idx]
+                )
+                new_flows.append(flow)
+
         return new_flows
 
+    @with_priority(Priority.BACKGROUND)
     def save_flows(
         self,
         nad_filter: str,
@@ -143,7 +146,8 @@ class StorageAPI:
         delta_hours: Optional[int] = None,
         start_time: Optional[int] = None,
         end_time: Optional[int] = None,
-        storage_dir: Optional[str] = None
+        storage_dir: Optional[str] = None,
+        poll_interval: float = 10
     ) -> None:
         """Save flows to persistent storage.
         
@@ -155,7 +159,35 @@ class StorageAPI:
             start_time: Start timestamp in milliseconds
             end_time: End timestamp in milliseconds
             storage_dir: Directory for storing database and logs. If None, uses current directory
+            poll_interval: Seconds between task status checks
         """
+        time_range = self._prepare_save(nad_filter, delta_hours, start_time, end_time, storage_dir)
+        flows = self.get_flows(time_range, storage_idx, nad_filter)
+        new_flows = self._new_flows(flows, storage_idx, persist_idx)
+        if not new_flows:
+            return
+
+        try:
+            result = self.client.call(self._save_call(new_flows, storage_idx, persist_idx, time_range))
+            while self._task_pending(result):
+                sleep(poll_interval)
+                result = self.client.call(self._task_call(result))
+
+            self.logger.info(f"Task completed with state: {result.get('state')}")
+            
+        except Exception as e:
+            self.logger.error(f"Error during flow saving: {str(e)}")
+            raise
+
+    def _prepare_save(
+        self,
+        nad_filter: str,
+        delta_hours: Optional[int],
+        start_time: Optional[int],
+        end_time: Optional[int],
+        storage_dir: Optional[str]
+    ) -> TimeRange:
+        """Set up the storage directory, log and database of save_flows() and return its time range."""
         if storage_dir is None:
             self.storage_dir = os.path.join(os.getcwd(), "storage_output")
         else:
@@ -194,27 +226,33 @@ class StorageAPI:
             f"end={time_range.end}, "
             f"filter='{nad_filter}'"
         )
+        return time_range
 
-        flows = self.get_flows(time_range, storage_idx, nad_filter)
+    def _new_flows(self, flows: List[Flow], src_idx: str, dst_idx: str) -> List[Flow]:
+        """Log the received flows and keep those that were not saved before."""
         self.logger.info(f"Received {len(flows)} flows")
         
         if not flows:
             self.logger.warning("No flows found matching the criteria")
-            return
+            return []
 
         self.logger.info("Filtering old flows")
-        new_flows = self._filter_old_flows(
-            flows,
-            storage_idx,
-            persist_idx
-        )
+        new_flows = self._filter_old_flows(flows, src_idx, dst_idx)
 
         self.logger.info(f"New flows to save: {len(new_flows)}")
         
         if not new_flows:
             self.logger.info("No new flows to save")
-            return
+        return new_flows
 
+    def _save_call(
+        self,
+        new_flows: List[Flow],
+        storage_idx: str,
+        persist_idx: str,
+        time_range: TimeRange
+    ) -> APICall:
+        """Request that starts the save task."""
         flow_ids = [flow.id for flow in new_flows]
         self.logger.info(f"Flow IDs to save: {flow_ids}")
         
@@ -228,56 +266,39 @@ class StorageAPI:
         
         self.logger.info(f"Preparing to save flows to target storage {persist_idx}")
         self.logger.info(f"POST data: {post_data}")
-        
-        try:
-            endpoint = "sources/save"
-            self.logger.info(f"Sending POST request to {endpoint}")
-            self.logger.info(f"Full URL: {self.client.base_url}{endpoint}")
-            
-            response = self.client.post(
-                endpoint,
-                json=post_data
-            )
-            
+
+        endpoint = "sources/save"
+        self.logger.info(f"Sending POST request to {endpoint}")
+        self.logger.info(f"Full URL: {self.client.base_url}{endpoint}")
+
+        def parse(client, response):
             self.logger.info(f"Response status: {response.status_code}")
             self.logger.info(f"Response headers: {dict(response.headers)}")
             self.logger.info(f"Response body: {response.text}")
-            
-            if not response.ok:
-                self.logger.error(
-                    f"Server error: {response.status_code}\n{response.text}"
-                )
-                raise PTNADAPIError(
-                    f"Failed to save flows: {response.status_code} {response.text}"
-                )
-                
             self.logger.info(f"Successfully sent request to save {len(new_flows)} flows")
 
-            result = response.json()
+            result = client.decode(response)
             self.logger.info(f"Task ID: {result.get('id')}, State: {result.get('state')}")
-            
-            while result['state'] in ["PENDING", "STARTED", "PROGRESS"]:
-                self.logger.info(f"Checking task status: {result['state']}")
-                task_endpoint = f"tasks/{result['id']}"
-                self.logger.info(f"Sending GET request to {task_endpoint}")
-                
-                response = self.client.get(task_endpoint)
-                self.logger.debug(f"Task status response: {response.status_code}")
-                self.logger.debug(f"Task status body: {response.text}")
-                
-                if not response.ok:
-                    self.logger.error(
-                        f"Server error: {response.status_code}\n{response.text}"
-                    )
-                    raise PTNADAPIError(
-                        f"Failed to check task status: {response.status_code} {response.text}"
-                    )
-                result = response.json()
-                self.logger.debug(f"Task state: {result.get('state')}")
-                sleep(10)
+            return result
 
-            self.logger.info(f"Task completed with state: {result.get('state')}")
-            
-        except Exception as e:
-            self.logger.error(f"Error during flow saving: {str(e)}")
-            raise 
\ No newline at end of file
+        return APICall("POST", endpoint, "save flows", json=post_data, parse=parse)
+
+    def _task_pending(self, result) -> bool:
+        if result['state'] in ["PENDING", "STARTED", "PROGRESS"]:
+            self.logger.info(f"Checking task status: {result['state']}")
+            return True
+        return False
+
+    def _task_call(self, result) -> APICall:
+        """Request that checks the state of the save task."""
+        task_endpoint = f"tasks/{result['id']}"
+        self.logger.info(f"Sending GET request to {task_endpoint}")
+
+        def parse(client, response):
+            self.logger.debug(f"Task status response: {response.status_code}")
+            self.logger.debug(f"Task status body: {response.text}")
+            result = client.decode(response)
+            self.logger.debug(f"Task state: {result.get('state')}")
+            return result
+
+        return APICall("GET", task_endpoint, "check task status", parse=parse)
@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
-from ptnad.exceptions import PTNADAPIError, ValidationError
+from ptnad.api.calls import APICall, results
+from ptnad.exceptions import ValidationError
 
 
 class VariablesAPI:
@@ -30,31 +31,11 @@ class VariablesAPI:
             method from the signatures.
 
         """
-        if type not in ["port", "ip"]:
-            msg = "Type must be 'port' or 'ip'."
-            raise ValidationError(msg)
-
-        data = {
-            "name": name,
-            "type": type
-        }
-        if value is not None:
-            data["value"] = value
-        if comment is not None:
-            data["comment"] = comment
-
-        try:
-            response = self.client.post("/variables", json=data).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "create group"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to create group: {str(e)}")
+        return self.client.call(self._create_group_call(name, type, value, comment))
 
     def get_groups(self, search: str | None = None) -> List[Dict[str, Any]]:
         """
-        Get all Rules using pagination.
+        Get groups of hosts or ports.
 
         Args:
             search (Optional[str]): Keyword to filter the groups (search in name, value, comment).
@@ -66,19 +47,7 @@ class VariablesAPI:
             PTNADAPIError: If there's an error retrieving the group.
 
         """
-        url_params = {}
-        if search:
-            url_params["search"] = search
-
-        try:
-            response = self.client.get("/variables", params=url_params).json()
-            return response["results"]
-        except PTNADAPIError as e:
-            e.operation = "get groups"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get groups: {str(e)}")
-
+        return self.client.call(self._get_groups_call(search))
 
     def get_group(self, group_id: int) -> Dict[str, Any]:
         """
@@ -94,14 +63,7 @@ class VariablesAPI:
             PTNADAPIError: If there's an error retrieving the group.
 
         """
-        try:
-            response = self.client.get(f"/variables/{group_id}").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"get group {group_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get group {group_id}: {str(e)}")
+        return self.client.call(self._get_group_call(group_id))
 
     def update_group(self, group_id: int, value: str | None = None, comment: str | None = None) -> Dict[str, Any]:
         """
@@ -124,23 +86,7 @@ class VariablesAPI:
             method from the signatures.
 
         """
-        data = {}
-        if value is not None:
-            data["value"] = value
-        if comment is not None:
-            data["comment"] = comment
-
-        if not data:
-            raise ValidationError("At least one of 'value' or 'comment' must be provided")
-
-        try:
-            response = self.client.patch(f"/variables/{group_id}", json=data).json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = f"update group {group_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to update group {group_id}: {str(e)}")
+        return self.client.call(self._update_group_call(group_id, value, comment))
 
     def delete_group(self, group_id: int) -> bool:
         """
@@ -160,18 +106,7 @@ class VariablesAPI:
             method from the signatures.
 
         """
-        commit_required = True
-        try:
-            response = self.client.delete(f"/variables/{group_id}")
-            if response.status_code == 204:
-                commit_required = False
-        except PTNADAPIError as e:
-            e.operation = f"delete group {group_id}"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to delete group {group_id}: {str(e)}")
-
-        return commit_required
+        return self.client.call(self._delete_group_call(group_id))
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -184,11 +119,53 @@ class VariablesAPI:
             PTNADAPIError: If there's an error retrieving the statistics.
 
         """
-        try:
-            response = self.client.get("/variables/stats").json()
-            return response
-        except PTNADAPIError as e:
-            e.operation = "get Variables statistics"
-            raise
-        except Exception as e:
-            raise PTNADAPIError(f"Failed to get variables statistics: {str(e)}")
+        return self.client.call(self._get_stats_call())
+
+    @staticmethod
+    def _create_group_call(name: str, type: str, value: str | None, comment: str | None) -> APICall:
+        if type not in ["port", "ip"]:
+            msg = "Type must be 'port' or 'ip'."
+            raise ValidationError(msg)
+
+        data = {
+            "name": name,
+            "type": type
+        }
+        if value is not None:
+            data["value"] = value
+        if comment is not None:
+            data["comment"] = comment
+        return APICall("POST", "/variables", "create group", json=data)
+
+    @staticmethod
+    def _get_groups_call(search: str | None) -> APICall:
+        url_params = {}
+        if search:
+            url_params["search"] = search
+        return APICall("GET", "/variables", "get groups", params=url_params, parse=results)
+
+    @staticmethod
+    def _get_group_call(group_id: int) -> APICall:
+        return APICall("GET", f"/variables/{group_id}", f"get group {group_id}")
+
+    @staticmethod
+    def _update_group_call(group_id: int, value: str | None, comment: str | None) -> APICall:
+        data = {}
+        if value is not None:
+            data["value"] = value
+        if comment is not None:
+            data["comment"] = comment
+
+        if not data:
+            raise ValidationError("At least one of 'value' or 'comment' must be provided")
+        return APICall("PATCH", f"/variables/{group_id}", f"update group {group_id}", json=data)
+
+    @staticmethod
+    def _delete_group_call(group_id: int) -> APICall:
+        # 204 means the group was deleted right away; otherwise a commit is required
+        return APICall("DELETE", f"/variables/{group_id}", f"delete group {group_id}",
+                       parse=lambda client, response: response.status_code != 204)
+
+    @staticmethod
+    def _get_stats_call() -> APICall:
+        return APICall("GET", "/variables/stats", "get Variables statistics")
@@ -1,3 +1,5 @@
+import hashlib
+import time
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -5,6 +7,9 @@ from ptnad.exceptions import AuthenticationError
 
 
 class AuthStrategy(ABC):
+    # Unix time at which the credentials obtained by authenticate() expire, if known
+    expires_at: float | None = None
+
     @abstractmethod
     def authenticate(self, client: Any) -> None:
         pass
@@ -13,6 +18,18 @@ class AuthStrategy(ABC):
     def deauthenticate(self, client: Any) -> None:
         pass
 
+    def refresh(self, client: Any) -> None:
+        """Renew expired or expiring credentials. Strategies without a cheaper flow log in again."""
+        self.authenticate(client)
+
+    def cache_identity(self) -> str | None:
+        """Non-secret identity of the credentials for the credential cache; None disables caching."""
+        return None
+
+    def cache_secret(self) -> str:
+        """Secret the credential cache key may be derived from."""
+        return ""
+
 
 class LocalAuth(AuthStrategy):
     def __init__(self, username: str, password: str) -> None:
@@ -50,6 +67,12 @@ class LocalAuth(AuthStrategy):
         except Exception as e:
             raise AuthenticationError(f"Local Logout failed: {str(e)}")
 
+    def cache_identity(self) -> str | None:
+        return f"local:{self.username}"
+
+    def cache_secret(self) -> str:
+        return self.password
+
 
 class SSOAuth(AuthStrategy):
     def __init__(
@@ -67,6 +90,7 @@ class SSOAuth(AuthStrategy):
         self.username = username
         self.password = password
         self.sso_type = sso_type
+        self.refresh_token: str | None = None
 
     def authenticate(self, client: Any) -> None:
         auth_data = {
@@ -85,31 +109,72 @@ class SSOAuth(AuthStrategy):
         if self.sso_type == "ldap":
             auth_data["amr"] = "ldap"
 
+        self._apply_token(client, self._request_token(client, auth_data))
+
+        try:
+            # Verify authentication by checking status
+            client.get("monitoring/status")
+        except Exception as e:
+            raise AuthenticationError(f"Failed to authenticate with SSO Token in PT NAD: {str(e)}")
+
+    def refresh(self, client: Any) -> None:
+        """
+        Get a new access token with the refresh token, falling back to the password grant.
+
+        Args:
+            client: PTNADClient instance.
+
+        Raises:
+            AuthenticationError: If both grants fail.
+
+        """
+        if self.refresh_token:
+            try:
+                token = self._request_token(client, {
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                })
+            except AuthenticationError:
+                # Refresh token expired or revoked
+                self.refresh_token = None
+            else:
+                self._apply_token(client, token)
+                return
+        self.authenticate(client)
+
+    def _request_token(self, client: Any, data: dict) -> dict:
         response = client.session.post(
             f"{self.sso_url}/connect/token",
-            data=auth_data,
+            data=data,
             verify=False
         )
         if response.status_code >= 400:
             raise AuthenticationError(f"SSO Authentication failed: {str(response.text)}")
+        return response.json()
 
-        client.session.headers.update(
-            {"Authorization": f"Bearer {response.json()['access_token']}"}
-        )
-
-        try:
-            # Verify authentication by checking status
-            client.get("monitoring/status")
-        except Exception as e:
-            raise AuthenticationError(f"Failed to authenticate with SSO Token in PT NAD: {str(e)}")
+    def _apply_token(self, client: Any, token: dict) -> None:
+        # Refresh tokens may be rotated; keep the previous one if none was returned
+        self.refresh_token = token.get("refresh_token", self.refresh_token)
+        self.expires_at = time.time() + float(token["expires_in"]) if "expires_in" in token else None
+        client.set_auth_headers({"Authorization": f"Bearer {token['access_token']}"})
 
     def deauthenticate(self, client: Any) -> None:
         try:
-            client.session.headers.pop("Authorization", None)
+            self.refresh_token = None
+            self.expires_at = None
+            client.set_auth_headers(None)
             client.session.cookies.clear()
         except Exception as e:
             raise AuthenticationError(f"SSO Logout failed: {str(e)}")
 
+    def cache_identity(self) -> str | None:
+        return f"sso:{self.sso_url}:{self.client_id}:{self.username}"
+
+    def cache_secret(self) -> str:
+        return self.password
+
 
 class ApiKeyAuth(AuthStrategy):
     def __init__(
@@ -119,9 +184,7 @@ class ApiKeyAuth(AuthStrategy):
         self.api_key = apikey
 
     def authenticate(self, client: Any) -> None:
-        client.session.headers.update(
-            {"Authorization": f"Bearer {self.api_key}"}
-        )
+        client.set_auth_headers({"Authorization": f"Bearer {self.api_key}"})
 
         try:
             # Verify authentication by checking status
@@ -131,11 +194,17 @@ class ApiKeyAuth(AuthStrategy):
 
     def deauthenticate(self, client: Any) -> None:
         try:
-            client.session.headers.pop("Authorization", None)
+            client.set_auth_headers(None)
             client.session.cookies.clear()
         except Exception as e:
             raise AuthenticationError(f"Logout failed: {str(e)}")
 
+    def cache_identity(self) -> str | None:
+        return "apikey:" + hashlib.sha256(self.api_key.encode()).hexdigest()[:16]
+
+    def cache_secret(self) -> str:
+        return self.api_key
+
 
 class Auth:
     def __init__(self, client: Any) -> None:
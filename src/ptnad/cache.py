@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Tuple
+from urllib.parse import urlencode
+
+from ptnad.metrics import endpoint_template
+
+
+# Reference data that changes rarely. TTLs in seconds, keyed by endpoint template.
+DEFAULT_TTLS = {
+    "/sensors": 60,
+    "/sensors/{id}": 60,
+    "/sources": 60,
+    "/sources/{id}": 60,
+    "/signatures/classes": 300,
+    "/variables": 60,
+    "/variables/{id}": 60,
+    "/replists/stats": 30,
+    "/monitoring/triggers": 30,
+}
+
+# POST endpoints that only read data and must not invalidate anything.
+READ_ONLY_POSTS = frozenset({"bql", "filters/compile"})
+
+
+def is_write(method: str, endpoint: str) -> bool:
+    """Check whether a request may modify server-side state."""
+    method = method.upper()
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return False
+    return not (method == "POST" and endpoint.strip("/").split("?", 1)[0] in READ_ONLY_POSTS)
+
+
+@dataclass
+class CacheEntry:
+    response: Any
+    expires: float
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """
+    In-memory HTTP response cache for rarely changing GET endpoints.
+
+    Entries live for the TTL configured for their endpoint template and are evicted
+    in LRU order once ``max_entries`` or ``max_bytes`` is exceeded. Expired entries
+    that carry an ETag or Last-Modified validator are revalidated with a conditional
+    request instead of being refetched. Any write made through the same client to a
+    resource drops the cached entries of that resource.
+
+    Args:
+        ttls (Optional[Dict[str, float]]): TTL per endpoint template, e.g. ``{"/sensors": 60}``.
+            Endpoints without a TTL are not cached. Defaults to :data:`DEFAULT_TTLS`.
+        max_entries (int): Maximum number of cached responses.
+        max_bytes (int): Maximum total size of cached response bodies.
+
+    """
+
+    def __init__(self, ttls: Dict[str, float] | None = None, max_entries: int = 512,
+                 max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        return self.ttls.get(endpoint_template(endpoint))
+
+    @staticmethod
+    def key(endpoint: str, params: Any = None) -> Tuple[str, str]:
+        path = "/" + endpoint.strip("/")
+        if not params:
+            return (path, "")
+        items = params.items() if isinstance(params, dict) else params
+        return (path, urlencode(sorted((str(k), v) for k, v in items), doseq=True))
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def lookup(self, key: Hashable) -> Tuple[CacheEntry | None, bool]:
+        """
+        Get an entry for a request, counting a hit if it is fresh and a miss otherwise.
+
+        Returns:
+            Tuple[Optional[CacheEntry], bool]: The entry (possibly expired, for
+            revalidation) and whether it may be served as it is.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and entry.fresh
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry, fresh
+
+    def store(self, key: Hashable, response: Any, ttl: float) -> None:
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        entry = CacheEntry(
+            response=response,
+            expires=time.monotonic() + ttl,
+            size=size,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def refresh(self, key: Hashable, ttl: float) -> None:
+        """Extend the lifetime of an entry after a 304 Not Modified."""
+        with self._lock:
+            self.revalidations += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = time.monotonic() + ttl
+
+    def invalidate(self, endpoint: str | None = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            endpoint (Optional[str]): Any endpoint of the resource to invalidate; every cached
+                path that shares its first segment (e.g. ``/variables``) is dropped.
+                None clears the whole cache.
+
+        Returns:
+            int: Number of dropped entries.
+
+        """
+        with self._lock:
+            if endpoint is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return dropped
+            root = "/" + endpoint.strip("/").split("/", 1)[0].split("?", 1)[0]
+            keys = [key for key in self._entries if key[0] == root or key[0].startswith(root + "/")]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).size
+            return len(keys)
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Iterable, Tuple
+
+from ptnad.exceptions import CircuitOpenError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def endpoint_group(endpoint: str) -> str:
+    """Group an endpoint by its first path segment, e.g. ``hosts/10.0.0.1`` -> ``hosts``."""
+    return endpoint.strip("/").split("?", 1)[0].split("/", 1)[0]
+
+
+class _Circuit:
+    __slots__ = ("state", "opened_at", "outcomes", "probes")
+
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        # (finished at, failed, slow) of recent calls while closed
+        self.outcomes: Deque[Tuple[float, bool, bool]] = deque()
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker per NAD base URL and endpoint group.
+
+    While a circuit is closed, the outcome of every call within the last ``window``
+    seconds is tracked. Once at least ``min_calls`` were made and the share of failed
+    calls reaches ``failure_rate`` (or the share of calls slower than
+    ``slow_call_duration`` reaches ``slow_call_rate``), the circuit opens: calls fail
+    immediately with :class:`ptnad.exceptions.CircuitOpenError` instead of waiting for
+    a socket timeout. After ``open_for`` seconds the circuit is half-open and lets
+    ``half_open_probes`` calls through; a successful probe closes it, a failed one
+    opens it again.
+
+    A call fails when no response was received (connection error, timeout) or the
+    status code is in ``failure_statuses``. Other error responses such as 404 mean the
+    server is healthy and count as successes.
+
+    One breaker may be shared by several clients; circuits are keyed by base URL.
+
+    Args:
+        failure_rate (float): Share of failed calls that opens the circuit.
+        slow_call_duration (Optional[float]): Calls slower than this many seconds are slow.
+            None disables the latency threshold.
+        slow_call_rate (float): Share of slow calls that opens the circuit.
+        min_calls (int): Calls in the window required before the circuit may open.
+        window (float): Length of the sliding window in seconds.
+        open_for (float): Seconds the circuit stays open before probing.
+        half_open_probes (int): Concurrent probe calls allowed while half-open.
+        failure_statuses (Iterable[int]): Status codes counted as failures.
+        on_state_change (Optional[Callable[[str, str, CircuitState], None]]): Called with
+            base URL, group and new state on every transition.
+
+    """
+
+    def __init__(self, failure_rate: float = 0.5, slow_call_duration: float | None = None,
+                 slow_call_rate: float = 0.8, min_calls: int = 10, window: float = 60.0,
+                 open_for: float = 30.0, half_open_probes: int = 1,
+                 failure_statuses: Iterable[int] = (500, 502, 503, 504),
+                 on_state_change: Callable[[str, str, CircuitState], None] | None = None) -> None:
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_for = open_for
+        self.half_open_probes = half_open_probes
+        self.failure_statuses = frozenset(failure_statuses)
+        self.on_state_change = on_state_change
+        self._circuits: Dict[Tuple[str, str], _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, base_url: str, endpoint: str) -> CircuitState:
+        """Current state of the circuit that guards ``endpoint``."""
+        with self._lock:
+            circuit = self._circuits.get((base_url, endpoint_group(endpoint)))
+            if circuit is None:
+                return CircuitState.CLOSED
+            if circuit.state == CircuitState.OPEN and time.monotonic() - circuit.opened_at >= self.open_for:
+                return CircuitState.HALF_OPEN
+            return circuit.state
+
+    def reset(self) -> None:
+        """Close all circuits and forget their history."""
+        with self._lock:
+            self._circuits.clear()
+
+    def allow(self, base_url: str, endpoint: str) -> None:
+        """
+        Check whether a call may be sent.
+
+        Every allowed call must be followed by :meth:`record`, or by :meth:`release` if
+        it was never sent.
+
+        Args:
+            base_url (str): Base URL of the NAD API.
+            endpoint (str): Endpoint relative to the base URL.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probes in flight.
+
+        """
+        group = endpoint_group(endpoint)
+        transition = None
+        with self._lock:
+            circuit = self._circuits.setdefault((base_url, group), _Circuit())
+            if circuit.state == CircuitState.OPEN:
+                remaining = self.open_for - (time.monotonic() - circuit.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Circuit for '{group}' at {base_url} is open, retry in {remaining:.1f}s",
+                        group=group, retry_after=remaining,
+                    )
+                circuit.state = transition = CircuitState.HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == CircuitState.HALF_OPEN:
+                if circuit.probes >= self.half_open_probes:
+                    raise CircuitOpenError(
+                        f"Circuit for '{group}' at {base_url} is half-open and waiting for a probe",
+                        group=group, retry_after=0.0,
+                    )
+                circuit.probes += 1
+        if transition is not None:
+            self._notify(base_url, group, transition)
+
+    def release(self, base_url: str, endpoint: str) -> None:
+        """Give back a call allowed by :meth:`allow` that was never sent."""
+        with self._lock:
+            circuit = self._circuits.get((base_url, endpoint_group(endpoint)))
+            if circuit is not None and circuit.state == CircuitState.HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+
+    def record(self, base_url: str, endpoint: str, status_code: int | None, duration: float) -> None:
+        """
+        Record the outcome of a call allowed by :meth:`allow`.
+
+        Args:
+            base_url (str): Base URL of the NAD API.
+            endpoint (str): Endpoint relative to the base URL.
+            status_code (Optional[int]): Response status, or None if no response was received.
+            duration (float): Call duration in seconds.
+
+        """
+        failed = status_code is None or status_code in self.failure_statuses
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+        group = endpoint_group(endpoint)
+        now = time.monotonic()
+        transition = None
+        with self._lock:
+            circuit = self._circuits.setdefault((base_url, group), _Circuit())
+            if circuit.state == CircuitState.HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if failed or slow:
+                    circuit.state = transition = CircuitState.OPEN
+                    circuit.opened_at = now
+                else:
+                    circuit.state = transition = CircuitState.CLOSED
+                    circuit.outcomes.clear()
+            elif circuit.state == CircuitState.CLOSED:
+                outcomes = circuit.outcomes
+                outcomes.append((now, failed, slow))
+                while outcomes and outcomes[0][0] < now - self.window:
+                    outcomes.popleft()
+                if len(outcomes) >= self.min_calls and self._tripped(outcomes):
+                    circuit.state = transition = CircuitState.OPEN
+                    circuit.opened_at = now
+                    outcomes.clear()
+            # Calls finishing while the circuit is open were started before it opened
+        if transition is not None:
+            self._notify(base_url, group, transition)
+
+    def _tripped(self, outcomes: Deque[Tuple[float, bool, bool]]) -> bool:
+        total = len(outcomes)
+        if sum(failed for _, failed, _ in outcomes) >= self.failure_rate * total:
+            return True
+        if self.slow_call_duration is not None:
+            return sum(slow for _, _, slow in outcomes) >= self.slow_call_rate * total
+        return False
+
+    def _notify(self, base_url: str, group: str, state: CircuitState) -> None:
+        if self.on_state_change is not None:
+            self.on_state_change(base_url, group, state)
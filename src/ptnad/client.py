@@ -1,46 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import warnings
-from typing import Literal, Never, overload
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Literal, Mapping, Never, overload
 from urllib.parse import urljoin
 
 import requests
-from urllib3.exceptions import InsecureRequestWarning
-
-from ptnad.api.bql import BQLAPI
-from ptnad.api.filters import FiltersAPI
-from ptnad.api.monitoring import MonitoringAPI
-from ptnad.api.replists import RepListsAPI
-from ptnad.api.signatures import SignaturesAPI
-from ptnad.api.sources import SourcesAPI
-from ptnad.api.sensors import SensorsAPI
-from ptnad.api.variables import VariablesAPI
-from ptnad.api.hosts import HostsAPI
-from ptnad.api.storage import StorageAPI
+from requests.adapters import BaseAdapter
+from urllib3.exceptions import InsecureRequestWarning, NewConnectionError
+
+from ptnad.api.calls import APICall, api_errors
 from ptnad.auth import Auth, LocalAuth, SSOAuth, ApiKeyAuth
 from ptnad.exceptions import (
     PTNADAPIError,
 )
+from ptnad.lazy import LazyAPI
+from ptnad.cache import ResponseCache, is_write
+from ptnad.circuit import CircuitBreaker
+from ptnad.compression import CompressionConfig, record_compression
+from ptnad.credentials import CredentialCache
+from ptnad.codec import JSONCodec, get_codec
+from ptnad.metrics import MetricsRegistry, endpoint_template
+from ptnad.pool import PoolConfig, PooledHTTPAdapter
+from ptnad.retry import RetryPolicy
+from ptnad.scheduler import RequestScheduler, current_priority, endpoint_class
+from ptnad.singleflight import SingleFlight, copy_response, request_key
+
+if TYPE_CHECKING:
+    from ptnad.resultcache import BQLResultCache
 
 
 class PTNADClient:
-    def __init__(self, base_url: str, verify_ssl: bool = True) -> None:
+    """
+    Synchronous PT NAD API client.
+
+    One instance can be shared between worker threads: login/logout are serialized
+    by a lock, and authentication headers are kept as an immutable snapshot that is
+    merged into every request instead of being written to ``session.headers``.
+    Size ``PoolConfig.pool_maxsize`` to the number of worker threads.
+
+    Failed requests are not retried unless ``retry=True`` or a
+    :class:`ptnad.retry.RetryPolicy` is passed. The policy decides which requests
+    may be replayed, including its explicit list of replayable POST endpoints.
+
+    With ``single_flight=True`` (or a :class:`ptnad.singleflight.SingleFlight`),
+    identical reads issued concurrently (GET requests and read-only POSTs such as
+    ``/bql``) are coalesced into one HTTP request. Every caller gets its own copy of
+    the response, with the same body. Coalescing is off by default.
+
+    Pass a :class:`ptnad.scheduler.RequestScheduler` to rate-limit requests per endpoint
+    class and let interactive calls overtake queued background work, and a
+    :class:`ptnad.circuit.CircuitBreaker` to fail fast with ``CircuitOpenError``
+    while the NAD API is unhealthy.
+
+    Pass ``compression=True`` (or a :class:`ptnad.compression.CompressionConfig`) to
+    gzip large request bodies such as bulk replist uploads and BQL queries. The NAD
+    server, or a proxy in front of it, must accept ``Content-Encoding: gzip``.
+
+    With a :class:`ptnad.credentials.CredentialCache`, ``login()`` reuses a session
+    saved by an earlier process and skips authentication while it is still valid.
+    With a :class:`ptnad.resultcache.BQLResultCache`, ``bql.execute_range()`` reads
+    flows of closed time windows from disk and only fetches what is new.
+
+    Credentials with a known lifetime (SSO tokens) are renewed in the background
+    shortly before they expire, with the refresh token when there is one. A request
+    that gets 401 Unauthorized re-authenticates once and is replayed if it is
+    idempotent. Pass ``auth_renewal=False`` to disable the background renewal.
+
+    JSON bodies are encoded and decoded with the fastest installed codec (orjson,
+    ujson, then the stdlib ``json``). Pass ``codec`` to choose one; see
+    :mod:`ptnad.codec` for how they differ.
+
+    Pass a :class:`ptnad.transport.Transport` (or any ``requests`` adapter) as
+    ``transport`` to answer requests without a NAD server, e.g. from Python handlers
+    or from a recorded cassette, for offline tests and benchmarks.
+
+    API namespaces (``client.bql``, ``client.hosts``, ...) are imported and created on
+    first access, so constructing a client only pays for the namespaces it uses.
+    """
+
+    monitoring = LazyAPI("ptnad.api.monitoring:MonitoringAPI")
+    signatures = LazyAPI("ptnad.api.signatures:SignaturesAPI")
+    replists = LazyAPI("ptnad.api.replists:RepListsAPI")
+    sources = LazyAPI("ptnad.api.sources:SourcesAPI")
+    sensors = LazyAPI("ptnad.api.sensors:SensorsAPI")
+    variables = LazyAPI("ptnad.api.variables:VariablesAPI")
+    hosts = LazyAPI("ptnad.api.hosts:HostsAPI")
+    bql = LazyAPI("ptnad.api.bql:BQLAPI")
+    filters = LazyAPI("ptnad.api.filters:FiltersAPI")
+    storage = LazyAPI("ptnad.api.storage:StorageAPI")
+
+    def __init__(self, base_url: str, verify_ssl: bool = True, retry: RetryPolicy | bool = False,
+                 pool: PoolConfig | None = None, metrics: MetricsRegistry | None = None,
+                 cache: ResponseCache | None = None, codec: JSONCodec | str = "auto",
+                 single_flight: SingleFlight | bool = False, scheduler: RequestScheduler | None = None,
+                 circuit_breaker: CircuitBreaker | None = None,
+                 compression: CompressionConfig | bool = False,
+                 credential_cache: CredentialCache | None = None, auth_renewal: bool = True,
+                 transport: BaseAdapter | None = None, bql_cache: "BQLResultCache | None" = None) -> None:
         self.base_url = base_url.rstrip("/") + "/api/v2/"
         self.verify_ssl = verify_ssl
+        if retry is True:
+            retry = RetryPolicy()
+        self.retry = retry or RetryPolicy(max_retries=0)
+        self.pool = pool or PoolConfig()
+        self.metrics = metrics
+        self.codec = get_codec(codec)
+        self.cache = cache
+        if single_flight is True:
+            single_flight = SingleFlight()
+        self.single_flight = single_flight if single_flight is not False else None
+        self.scheduler = scheduler
+        self.circuit_breaker = circuit_breaker
+        if compression is True:
+            compression = CompressionConfig()
+        self.compression = compression or None
+        self.credential_cache = credential_cache
+        self.bql_cache = bql_cache
         self.session = requests.Session()
         self.session.verify = self.verify_ssl
+        self.adapter = transport if transport is not None else PooledHTTPAdapter(self.pool)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
         if not self.verify_ssl:
             warnings.simplefilter("ignore", InsecureRequestWarning)
         self.csrf_token = None
+        self._auth_lock = threading.RLock()
+        self._auth_headers: Mapping[str, str] = MappingProxyType({})
+        # Bumped on every successful (re)authentication, so concurrent 401s re-auth only once
+        self._auth_generation = 0
+        self._auth_local = threading.local()
+        self.auth_renewal = auth_renewal
+        self._renewal_timer: threading.Timer | None = None
         self.auth = Auth(self)
-        self.monitoring = MonitoringAPI(self)
-        self.signatures = SignaturesAPI(self)
-        self.replists = RepListsAPI(self)
-        self.sources = SourcesAPI(self)
-        self.sensors = SensorsAPI(self)
-        self.variables = VariablesAPI(self)
-        self.hosts = HostsAPI(self)
-        self.bql = BQLAPI(self)
-        self.filters = FiltersAPI(self)
-        self.storage = StorageAPI(self)
 
     @overload
     def set_auth(self, auth_type: Literal["local"], *, username: str, password: str) -> None:
@@ -67,29 +160,370 @@ class PTNADClient:
             raise ValueError(f"Unsupported auth type: {auth_type}")
 
     def login(self) -> None:
-        self.auth.login()
+        with self._auth_lock:
+            if not self._restore_session():
+                self._authenticate(self.auth.login)
+            self._schedule_renewal()
+        if self.pool.prewarm:
+            self.prewarm(self.pool.prewarm)
+
+    def _authenticate(self, action) -> None:
+        """Run an auth strategy action and publish the resulting session. Must hold the auth lock."""
+        self._auth_local.active = True
+        try:
+            action()
+        finally:
+            self._auth_local.active = False
         self.csrf_token = self.session.cookies.get("csrftoken")
+        self._auth_generation += 1
+        self._save_session()
+
+    def _reauthenticate(self, generation: int, reason: str) -> None:
+        """
+        Renew the session unless another thread already did since ``generation``.
+
+        Args:
+            generation (int): Auth generation the caller's credentials belong to.
+            reason (str): ``"expiry"`` or ``"unauthorized"``, for metrics.
+
+        """
+        with self._auth_lock:
+            if generation != self._auth_generation or self.auth.strategy is None:
+                return
+            self._authenticate(lambda: self.auth.strategy.refresh(self))
+            self._schedule_renewal()
+        if self.metrics is not None:
+            self.metrics.inc("auth_renewals", help="Sessions renewed by the client.", reason=reason)
+
+    def _schedule_renewal(self) -> None:
+        """Start a timer that renews the credentials shortly before they expire. Must hold the auth lock."""
+        if self._renewal_timer is not None:
+            self._renewal_timer.cancel()
+            self._renewal_timer = None
+        strategy = self.auth.strategy
+        if not self.auth_renewal or strategy is None or strategy.expires_at is None:
+            return
+        lifetime = strategy.expires_at - time.time()
+        # Renew at 90% of the lifetime, but no earlier than a minute before expiry
+        delay = max(1.0, lifetime - min(60.0, lifetime * 0.1))
+        self._renewal_timer = threading.Timer(delay, self._renew, args=(self._auth_generation,))
+        self._renewal_timer.daemon = True
+        self._renewal_timer.start()
+
+    def _renew(self, generation: int) -> None:
+        try:
+            self._reauthenticate(generation, "expiry")
+        except Exception:
+            # Requests will re-authenticate on 401; try again shortly in case it was transient
+            with self._auth_lock:
+                strategy = self.auth.strategy
+                if generation == self._auth_generation and strategy is not None and strategy.expires_at:
+                    if strategy.expires_at > time.time():
+                        self._renewal_timer = threading.Timer(5.0, self._renew, args=(generation,))
+                        self._renewal_timer.daemon = True
+                        self._renewal_timer.start()
+
+    def _cache_key(self):
+        strategy = self.auth.strategy
+        if self.credential_cache is None or strategy is None:
+            return None
+        identity = strategy.cache_identity()
+        if identity is None:
+            return None
+        return self.base_url, identity, strategy.cache_secret()
+
+    def _restore_session(self) -> bool:
+        """Restore a valid session from the credential cache. Returns False on a miss."""
+        key = self._cache_key()
+        if key is None:
+            return False
+        state = self.credential_cache.load(*key)
+        if state is None:
+            return False
+        for cookie in state.get("cookies", []):
+            self.session.cookies.set_cookie(requests.cookies.create_cookie(**cookie))
+        self.csrf_token = state.get("csrf_token")
+        self._auth_headers = MappingProxyType(dict(state.get("auth_headers", {})))
+        self.auth.strategy.expires_at = state.get("token_expires_at")
+        if state.get("refresh_token"):
+            self.auth.strategy.refresh_token = state["refresh_token"]
+        self._auth_generation += 1
+        return True
+
+    def _save_session(self) -> None:
+        key = self._cache_key()
+        if key is None:
+            return
+        cookies = [
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+             "expires": c.expires, "secure": c.secure}
+            for c in self.session.cookies
+        ]
+        token_expires_at = self.auth.strategy.expires_at
+        self.credential_cache.save(*key, {
+            "cookies": cookies,
+            "csrf_token": self.csrf_token,
+            "auth_headers": dict(self._auth_headers),
+            "token_expires_at": token_expires_at,
+            "refresh_token": getattr(self.auth.strategy, "refresh_token", None),
+            "expires_at": self.credential_cache.expiry(token_expires_at, self.session.cookies),
+        })
+
+    def prewarm(self, connections: int) -> int:
+        """
+        Open connections to the NAD server in parallel ahead of time.
+
+        Sends ``connections`` concurrent HEAD requests to the API root, so TLS
+        handshakes are paid up front and concurrently instead of serially on the first
+        requests. Their connections stay in the pool. The response status is ignored.
+
+        Args:
+            connections (int): Number of requests to send (capped by the pool size).
+
+        Returns:
+            int: Number of requests that got a response; 0 with a custom transport.
+
+        """
+        if not isinstance(self.adapter, PooledHTTPAdapter):
+            return 0
+        connections = min(connections, self.pool.pool_maxsize)
+        if connections <= 0:
+            return 0
+
+        def _head(_: int) -> bool:
+            try:
+                self.session.head(self.base_url, allow_redirects=False, timeout=self.pool.timeout)
+            except requests.RequestException:
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(_head, range(connections)))
 
     def logout(self) -> None:
-        self.auth.logout()
-        self.csrf_token = None
+        with self._auth_lock:
+            if self._renewal_timer is not None:
+                self._renewal_timer.cancel()
+                self._renewal_timer = None
+            key = self._cache_key()
+            if key is not None:
+                self.credential_cache.delete(*key[:2])
+            self.auth.logout()
+            self.csrf_token = None
+
+    @property
+    def auth_headers(self) -> Mapping[str, str]:
+        """Read-only snapshot of the headers added to every request by the auth strategy."""
+        return self._auth_headers
+
+    def set_auth_headers(self, headers: Dict[str, str] | None) -> None:
+        """
+        Atomically replace the authentication headers sent with every request.
+
+        Args:
+            headers (Optional[Dict[str, str]]): New headers, or None to drop them.
+
+        """
+        with self._auth_lock:
+            self._auth_headers = MappingProxyType(dict(headers or {}))
 
     def request(self, method: str, endpoint: str, **kwargs):
+        if self.single_flight is not None:
+            key = request_key(method, endpoint, kwargs, self.codec.dumps)
+            if key is not None:
+                response, shared = self.single_flight.do(key, lambda: self._request(method, endpoint, **kwargs))
+                if shared and self.metrics is not None:
+                    self.metrics.inc("coalesced_requests", help="Requests served by an identical in-flight request.",
+                                     method=method.upper(), endpoint=endpoint_template(endpoint))
+                # Every caller, the one that sent the request included, gets its own copy
+                return copy_response(response)
+        return self._request(method, endpoint, **kwargs)
+
+    def _request(self, method: str, endpoint: str, **kwargs):
+        if self.cache is None:
+            return self._send(method, endpoint, **kwargs)
+        if is_write(method, endpoint):
+            try:
+                return self._send(method, endpoint, **kwargs)
+            finally:
+                self.cache.invalidate(endpoint)
+        if method.upper() != "GET" or kwargs.get("stream") or "json" in kwargs:
+            return self._send(method, endpoint, **kwargs)
+        return self._cached_get(endpoint, **kwargs)
+
+    def _cached_get(self, endpoint: str, **kwargs):
+        ttl = self.cache.ttl_for(endpoint)
+        if ttl is None:
+            return self._send("GET", endpoint, **kwargs)
+
+        key = self.cache.key(endpoint, kwargs.get("params"))
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            if self.metrics is not None:
+                self.metrics.inc("cache_hits", help="Requests served from the response cache.",
+                                 endpoint=endpoint_template(endpoint))
+            # Callers get their own copy, so one changing it does not affect later hits
+            return copy_response(entry.response)
+
+        if entry is not None and entry.revalidatable:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **self.cache.conditional_headers(entry)}
+        response = self._send("GET", endpoint, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, ttl)
+            return copy_response(entry.response)
+        if response.status_code == 200:
+            self.cache.store(key, response, ttl)
+        return response
+
+    def _send(self, method: str, endpoint: str, **kwargs):
         url = urljoin(self.base_url, endpoint.lstrip("/"))
-        headers = kwargs.pop("headers", {})
-        if self.csrf_token:
-            headers["X-CSRFToken"] = self.csrf_token
+        # Build a private header dict per request from immutable snapshots of the auth state
+        generation = self._auth_generation
+        headers = {**self._auth_headers, **kwargs.pop("headers", {})}
+        csrf_token = self.csrf_token
+        if csrf_token:
+            headers["X-CSRFToken"] = csrf_token
         headers["Referer"] = self.base_url
+        reauthenticated = False
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            headers.setdefault("Content-Type", "application/json")
+        if self.compression is not None:
+            self._compress(endpoint, headers, kwargs)
+        if self.pool.timeout is not None:
+            kwargs.setdefault("timeout", self.pool.timeout)
 
+        self.retry.budget.deposit()
+        started = time.perf_counter()
+        attempt = 0
         response = None
+        error = None
+        try:
+            while True:
+                response = None
+                try:
+                    response = self._attempt(method, endpoint, url, headers, kwargs)
+                except requests.exceptions.RequestException as e:
+                    delay = None
+                    if not isinstance(e, requests.exceptions.SSLError):
+                        delay = self.retry.next_delay(method, endpoint, attempt, connect_error=self._is_connect_error(e))
+                    if delay is None:
+                        self._handle_request_exception(e, response)
+                else:
+                    if response.status_code < 400:
+                        return response
+                    if response.status_code == 401 and not reauthenticated and self._can_reauthenticate(method, endpoint):
+                        response.close()
+                        self._reauthenticate(generation, "unauthorized")
+                        generation = self._auth_generation
+                        headers.update(self._auth_headers)
+                        if self.csrf_token:
+                            headers["X-CSRFToken"] = self.csrf_token
+                        reauthenticated = True
+                        continue
+                    delay = self.retry.next_delay(
+                        method, endpoint, attempt,
+                        status_code=response.status_code,
+                        retry_after=response.headers.get("Retry-After"),
+                    )
+                    if delay is None:
+                        self._handle_http_error(response)
+                    response.close()
+                self.retry.sleep(delay)
+                attempt += 1
+        except Exception as e:
+            error = type(e).__name__
+            if self.metrics is not None and isinstance(e, PTNADAPIError):
+                # Counted by operation once the API method that called us names it
+                e._track(self.metrics)
+            raise
+        finally:
+            if self.metrics is not None:
+                self._record_metrics(method, endpoint, started, response, attempt, error, kwargs.get("stream"))
+
+    def _can_reauthenticate(self, method: str, endpoint: str) -> bool:
+        """Check whether a 401 response may be answered by re-authenticating and replaying."""
+        if self.auth.strategy is None or getattr(self._auth_local, "active", False):
+            return False
+        if endpoint.strip("/").startswith("auth/"):
+            return False
+        return self.retry.is_replayable(method, endpoint)
+
+    def _compress(self, endpoint: str, headers: Dict[str, str], kwargs: Dict[str, Any]) -> None:
+        """Negotiate response encoding and compress a large request body in place."""
+        headers.setdefault("Accept-Encoding", self.compression.accept_encoding)
+        body = kwargs.get("data")
+        if not self.compression.should_compress(body, headers):
+            return
+        if isinstance(body, str):
+            body = body.encode()
+        compressed = self.compression.compress(body)
+        if len(compressed) >= len(body):
+            return
+        kwargs["data"] = compressed
+        headers["Content-Encoding"] = self.compression.algorithm
+        if self.metrics is not None:
+            record_compression(self.metrics, "request", endpoint_template(endpoint), len(body), len(compressed))
+
+    def _attempt(self, method: str, endpoint: str, url: str, headers: Dict[str, str], kwargs: Dict[str, Any]):
+        """Send one HTTP attempt through the circuit breaker and the scheduler, if set."""
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.allow(self.base_url, endpoint)
+        cls = None
+        started = None
+        status = None
         try:
+            if self.scheduler is not None:
+                cls = endpoint_class(method, endpoint)
+                level = current_priority()
+                waited = self.scheduler.acquire(cls, level)
+                if self.metrics is not None:
+                    self.metrics.observe("scheduler_wait_seconds", waited,
+                                         help="Time requests spent queued by the scheduler.",
+                                         endpoint_class=cls, priority=level.name.lower())
+            started = time.perf_counter()
             response = self.session.request(method, url, headers=headers, **kwargs)
-            if response.status_code >= 400:
-                self._handle_http_error(response)
+            status = response.status_code
             return response
-        except requests.exceptions.RequestException as e:
-            self._handle_request_exception(e, response)
+        finally:
+            if cls is not None:
+                self.scheduler.release(cls)
+            if breaker is not None:
+                if started is None:
+                    breaker.release(self.base_url, endpoint)
+                else:
+                    breaker.record(self.base_url, endpoint, status, time.perf_counter() - started)
 
+    def _record_metrics(self, method, endpoint, started, response, retries, error, stream) -> None:
+        duration = time.perf_counter() - started
+        if response is None:
+            self.metrics.record_request(method, endpoint, None, duration, retries=retries, error=error or "Error")
+            return
+        body = response.request.body if response.request is not None else None
+        if stream:
+            response_bytes = int(response.headers.get("Content-Length") or 0)
+        else:
+            response_bytes = len(response.content)
+            if response.headers.get("Content-Encoding") and hasattr(response.raw, "tell"):
+                record_compression(self.metrics, "response", endpoint_template(endpoint),
+                                   response_bytes, response.raw.tell())
+        self.metrics.record_request(
+            method, endpoint, response.status_code, duration,
+            # Streamed bodies (iterators, files) have no size known up front
+            request_bytes=len(body) if isinstance(body, (bytes, str)) else 0,
+            response_bytes=response_bytes,
+            retries=retries,
+        )
+
+    @staticmethod
+    def _is_connect_error(exception) -> bool:
+        """Check whether the request failed before it could reach the server."""
+        if isinstance(exception, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(exception, requests.exceptions.ConnectionError) and exception.args:
+            return isinstance(getattr(exception.args[0], "reason", None), NewConnectionError)
+        return False
 
     def _handle_request_exception(self, exception, response):
         if isinstance(exception, requests.exceptions.SSLError):
@@ -104,6 +538,38 @@ class PTNADClient:
         error_message = f"HTTP error occurred: {response.status_code} {response.reason}. Response content: {response.text}"
         raise PTNADAPIError(error_message, status_code=response.status_code, response=response)
 
+    def decode(self, response) -> Any:
+        """
+        Decode a JSON response body with the client codec.
+
+        Args:
+            response: HTTP response returned by request().
+
+        Returns:
+            Any: The decoded document.
+
+        """
+        return self.codec.loads(response.content)
+
+    def call(self, call: APICall) -> Any:
+        """
+        Send a request described by an :class:`ptnad.api.calls.APICall` and parse the response.
+
+        Args:
+            call (APICall): The request, as built by the API namespaces.
+
+        Returns:
+            Any: The result of ``call.parse``.
+
+        Raises:
+            PTNADAPIError: If the request fails or its response cannot be parsed; its
+                ``operation`` is ``call.operation``.
+
+        """
+        with api_errors(call.operation):
+            response = self.request(call.method, call.endpoint, **call.request_kwargs("data"))
+            return call.parse(self, response)
+
     def get(self, endpoint: str, **kwargs):
         return self.request("GET", endpoint, **kwargs)
 
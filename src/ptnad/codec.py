@@ -0,0 +1,116 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Type
+
+
+class JSONCodec(ABC):
+    """Encoder/decoder used by the client for request and response bodies."""
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        pass
+
+
+class StdlibCodec(JSONCodec):
+    """Codec backed by the standard library ``json`` module."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec backed by ``orjson``.
+
+    Non-string dict keys (int, float, bool, None) are converted to strings, as by
+    the stdlib codec. Unlike the stdlib and ujson codecs, integers must fit in 64
+    bits: ``dumps`` raises ``TypeError`` on wider ones and ``loads`` decodes them
+    as floats. Use ``codec="stdlib"`` if payloads can hold such numbers.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """Codec backed by ``ujson``."""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._ujson.loads(data)
+
+
+CODECS: Dict[str, Type[JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "stdlib": StdlibCodec,
+}
+
+
+def available_codecs() -> list[str]:
+    """Names of the codecs whose backing library is installed, fastest first."""
+    names = []
+    for name, codec_cls in CODECS.items():
+        try:
+            codec_cls()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(codec: "JSONCodec | str" = "auto") -> JSONCodec:
+    """
+    Resolve a codec.
+
+    Args:
+        codec (Union[JSONCodec, str]): A codec instance, a codec name ("orjson", "ujson",
+            "stdlib"), or "auto" for the fastest installed codec.
+
+    Returns:
+        JSONCodec: The codec instance.
+
+    Raises:
+        ValueError: If the codec name is unknown.
+        ImportError: If the library backing an explicitly named codec is not installed.
+
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == "auto":
+        for codec_cls in CODECS.values():
+            try:
+                return codec_cls()
+            except ImportError:
+                continue
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported JSON codec: {codec}")
+    return CODECS[codec]()
@@ -0,0 +1,1199 @@
+import ipaddress
+import itertools
+import math
+import operator
+import socket
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Rows are converted to typed columns this many at a time
+CHUNK_SIZE = 65_536
+
+AGGREGATIONS = ("count", "sum", "min", "max", "mean")
+
+# Typecodes of 32-bit integers, as the size of "i" and "l" depends on the platform
+_INT32 = next(code for code in "il" if array(code).itemsize == 4)
+_UINT32 = next(code for code in "IL" if array(code).itemsize == 4)
+# IPv4 addresses in IPv6 columns are stored IPv4-mapped (::ffff:a.b.c.d)
+_MAPPED = bytes(10) + b"\xff\xff"
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+    "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """The numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _require_numpy() -> Any:
+    numpy = _numpy()
+    if numpy is None:
+        raise ImportError("to_numpy() requires numpy. Install it with: pip install 'ptnad-client[numpy]'")
+    return numpy
+
+
+def _from_numpy(typecode: str, values: Any) -> array:
+    result = array(typecode)
+    result.frombytes(values.astype(typecode, copy=False).tobytes())
+    return result
+
+
+def _pick(values: Sequence[Any], indexes: Sequence[int]) -> Sequence[Any]:
+    """``values`` at ``indexes``, gathered in a single C call."""
+    if len(indexes) < 2:
+        return [values[index] for index in indexes]
+    return operator.itemgetter(*indexes)(values)
+
+
+def _positions(numpy: Any, indexes: Sequence[int]) -> Any:
+    if isinstance(indexes, array) and indexes.typecode == "q":
+        return numpy.frombuffer(indexes, "q")
+    return numpy.asarray(indexes, "q")
+
+
+def _take(data: array | bytes, indexes: Sequence[int]) -> array | bytes:
+    """Rows of a typed array, or of a byte mask, at ``indexes``."""
+    typecode = data.typecode if isinstance(data, array) else "B"
+    numpy = _numpy()
+    if numpy is not None:
+        picked = numpy.frombuffer(data, typecode)[_positions(numpy, indexes)]
+        return _from_numpy(typecode, picked) if isinstance(data, array) else picked.tobytes()
+    picked = _pick(data, indexes)
+    return array(typecode, picked) if isinstance(data, array) else bytes(picked)
+
+
+def _compress(data: array | bytes, mask: bytes) -> array | bytes:
+    """Rows of a typed array, or of a byte mask, selected by ``mask``."""
+    typecode = data.typecode if isinstance(data, array) else "B"
+    numpy = _numpy()
+    if numpy is not None:
+        selected = numpy.frombuffer(data, typecode)[numpy.frombuffer(mask, bool)]
+        return _from_numpy(typecode, selected) if isinstance(data, array) else selected.tobytes()
+    selected = itertools.compress(data, mask)
+    return array(typecode, selected) if isinstance(data, array) else bytes(selected)
+
+
+def _and(left: bytes, right: bytes | None) -> bytes:
+    """AND two byte masks of 0/1 values, treating a missing mask as all ones."""
+    if right is None:
+        return left
+    size = len(left)
+    return (int.from_bytes(left, "little") & int.from_bytes(right, "little")).to_bytes(size, "little")
+
+
+def _or_none(value: Any, valid: int) -> Any:
+    return value if valid else None
+
+
+def _safe(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    """Compare, treating nulls and values of incomparable types as not matching."""
+    if left is None:
+        return False
+    try:
+        return op(left, right)
+    except TypeError:
+        return False
+
+
+def _is_ip(value: str) -> bool:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, value)
+            return True
+        except (OSError, ValueError):
+            continue
+    return False
+
+
+def _ipv4(value: str) -> int:
+    return int.from_bytes(socket.inet_pton(socket.AF_INET, value), "big")
+
+
+def _ipv6(value: str) -> bytes:
+    try:
+        return _MAPPED + socket.inet_pton(socket.AF_INET, value)
+    except OSError:
+        return socket.inet_pton(socket.AF_INET6, value)
+
+
+def _ntoa4(value: int) -> str:
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+def _ntop6(packed: bytes) -> str:
+    if packed[:12] == _MAPPED:
+        return socket.inet_ntoa(packed[12:])
+    return socket.inet_ntop(socket.AF_INET6, packed)
+
+
+def _ones(size: int) -> bytes:
+    return b"\x01" * size
+
+
+class Mask:
+    """
+    Selection of rows, produced by comparing a column with a value.
+
+    Holds one byte per row, 1 for selected rows. Masks combine with ``&``, ``|``,
+    ``^`` and ``~`` and are applied with :meth:`ColumnarResult.filter`.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[bool]:
+        return map(bool, self.data)
+
+    def count(self) -> int:
+        """Number of selected rows."""
+        return self.data.count(1)
+
+    def _combine(self, other: "Mask", op: Callable[[int, int], int]) -> "Mask":
+        if len(other.data) != len(self.data):
+            raise ValueError("Masks have different lengths")
+        size = len(self.data)
+        value = op(int.from_bytes(self.data, "little"), int.from_bytes(other.data, "little"))
+        return Mask(value.to_bytes(size, "little"))
+
+    def __and__(self, other: "Mask") -> "Mask":
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other: "Mask") -> "Mask":
+        return self._combine(other, operator.or_)
+
+    def __xor__(self, other: "Mask") -> "Mask":
+        return self._combine(other, operator.xor)
+
+    def __invert__(self) -> "Mask":
+        return self ^ Mask(_ones(len(self.data)))
+
+    def to_numpy(self) -> Any:
+        """The mask as a boolean numpy array sharing its memory."""
+        return _require_numpy().frombuffer(self.data, bool)
+
+
+class Column:
+    """
+    One column of a :class:`ColumnarResult`.
+
+    Comparing a column with a value (``column == 443``, ``column >= 1000``) gives a
+    :class:`Mask` of the matching rows; nulls never match, except ``column == None``.
+    Columns are immutable; selections return new columns.
+
+    Attributes:
+        kind: ``"int"``, ``"float"``, ``"ip"``, ``"category"`` or ``"object"``.
+    """
+
+    kind = "object"
+    # Comparisons produce masks, so columns cannot be hashed
+    __hash__ = None  # type: ignore[assignment]
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> Any:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.__getitem__, range(len(self)))
+
+    def __repr__(self) -> str:
+        preview = ", ".join(repr(value) for value in itertools.islice(self, 5))
+        more = ", ..." if len(self) > 5 else ""
+        return f"{type(self).__name__}([{preview}{more}], length={len(self)})"
+
+    def to_list(self) -> List[Any]:
+        return list(self)
+
+    def __eq__(self, value: Any) -> Mask:  # type: ignore[override]
+        return self.compare("==", value)
+
+    def __ne__(self, value: Any) -> Mask:  # type: ignore[override]
+        return self.compare("!=", value)
+
+    def __lt__(self, value: Any) -> Mask:
+        return self.compare("<", value)
+
+    def __le__(self, value: Any) -> Mask:
+        return self.compare("<=", value)
+
+    def __gt__(self, value: Any) -> Mask:
+        return self.compare(">", value)
+
+    def __ge__(self, value: Any) -> Mask:
+        return self.compare(">=", value)
+
+    def compare(self, op: str, value: Any) -> Mask:
+        """
+        Compare every value with ``value``.
+
+        Args:
+            op (str): One of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``.
+            value (Any): Value to compare with; ``None`` selects nulls with ``==``
+                and non-nulls with ``!=``.
+
+        Returns:
+            Mask: The rows where the comparison holds.
+
+        """
+        if op not in _OPERATORS:
+            raise ValueError(f"Unsupported operator {op!r}")
+        if value is None:
+            if op == "==":
+                return self.isnull()
+            if op == "!=":
+                return self.notnull()
+            raise TypeError(f"Cannot compare with None using {op!r}")
+        return Mask(self._compare(_OPERATORS[op], value))
+
+    def _compare(self, op: Callable[[Any, Any], bool], value: Any) -> bytes:
+        return bytes(map(_safe, itertools.repeat(op), self, itertools.repeat(value)))
+
+    def _valid(self) -> bytes:
+        return bytes(map(operator.is_not, self, itertools.repeat(None)))
+
+    def isnull(self) -> Mask:
+        return ~self.notnull()
+
+    def notnull(self) -> Mask:
+        return Mask(self._valid())
+
+    def isin(self, values: Iterable[Any]) -> Mask:
+        """Rows whose value is one of ``values``."""
+        candidates = list(values)
+        return Mask(bytes(value is not None and value in candidates for value in self))
+
+    def take(self, indexes: Sequence[int]) -> "Column":
+        """The values at ``indexes``, in that order."""
+        raise NotImplementedError
+
+    def compress(self, mask: Mask) -> "Column":
+        """The values of the rows selected by ``mask``."""
+        raise NotImplementedError
+
+    def _extend(self, other: "Column") -> None:
+        raise NotImplementedError
+
+    def _sort_key(self) -> Sequence[Any]:
+        """Per-row values that order like the column; only non-null rows are compared."""
+        return self.to_list()
+
+    def _group_key(self) -> Sequence[Any]:
+        """Per-row hashable keys, None for nulls. An ``array`` means numeric keys."""
+        return [tuple(value) if isinstance(value, list) else value for value in self]
+
+    def _numeric(self) -> array | None:
+        """Typed storage for numeric aggregation, or None for non-numeric columns."""
+        return None
+
+    def count(self) -> int:
+        """Number of non-null values."""
+        return self._valid().count(1)
+
+    def sum(self) -> Any:
+        raise TypeError(f"Cannot sum a {self.kind} column")
+
+    def mean(self) -> float | None:
+        raise TypeError(f"Cannot average a {self.kind} column")
+
+    def _extreme(self, function: Callable) -> Any:
+        present = list(itertools.compress(range(len(self)), self._valid()))
+        if not present:
+            return None
+        return self[function(present, key=self._sort_key().__getitem__)]
+
+    def min(self) -> Any:
+        """Smallest non-null value, or None."""
+        return self._extreme(min)
+
+    def max(self) -> Any:
+        """Largest non-null value, or None."""
+        return self._extreme(max)
+
+    def to_numpy(self) -> Any:
+        """The values as a numpy array; see the subclasses for the layout."""
+        numpy = _require_numpy()
+        result = numpy.empty(len(self), dtype=object)
+        for index, value in enumerate(self):
+            result[index] = value
+        return result
+
+
+class ObjectColumn(Column):
+    """Column of arbitrary Python values, for data that fits no typed column."""
+
+    kind = "object"
+
+    def __init__(self, values: List[Any]) -> None:
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+    def take(self, indexes: Sequence[int]) -> "ObjectColumn":
+        return ObjectColumn(list(_pick(self.values, indexes)))
+
+    def compress(self, mask: Mask) -> "ObjectColumn":
+        return ObjectColumn(list(itertools.compress(self.values, mask.data)))
+
+    def _extend(self, other: "ObjectColumn") -> None:
+        self.values.extend(other.values)
+
+
+class _ArrayColumn(Column):
+    typecode = "q"
+    null_value: Any = 0
+
+    def __init__(self, data: array, valid: bytes | None = None) -> None:
+        self.data = data
+        # One byte per row, 0 for nulls; None when there are no nulls
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: List[Any]) -> "_ArrayColumn":
+        valid = None
+        if None in values:
+            valid = bytes(map(operator.is_not, values, itertools.repeat(None)))
+            values = [cls.null_value if value is None else value for value in values]
+        return cls(array(cls.typecode, values), valid)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Any:
+        if self.valid is not None and not self.valid[index]:
+            return None
+        return self.data[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.valid is None:
+            return iter(self.data)
+        return map(_or_none, self.data, self.valid)
+
+    def _valid(self) -> bytes:
+        return _ones(len(self.data)) if self.valid is None else self.valid
+
+    def _compare(self, op: Callable[[Any, Any], bool], value: Any) -> bytes:
+        numpy = _numpy()
+        if numpy is not None and type(value) in (int, float) and abs(value) < 2 ** 63:
+            result = op(numpy.frombuffer(self.data, self.typecode), value).tobytes()
+        else:
+            result = bytes(map(op, self.data, itertools.repeat(value)))
+        return _and(result, self.valid)
+
+    def isin(self, values: Iterable[Any]) -> Mask:
+        candidates = set(values)
+        candidates.discard(None)
+        numpy = _numpy()
+        if numpy is not None and all(type(value) in (int, float) and abs(value) < 2 ** 63 for value in candidates):
+            result = numpy.isin(numpy.frombuffer(self.data, self.typecode), list(candidates)).tobytes()
+        else:
+            result = bytes(map(candidates.__contains__, self.data))
+        return Mask(_and(result, self.valid))
+
+    def take(self, indexes: Sequence[int]) -> "_ArrayColumn":
+        valid = None if self.valid is None else _take(self.valid, indexes)
+        return type(self)(_take(self.data, indexes), valid)
+
+    def compress(self, mask: Mask) -> "_ArrayColumn":
+        valid = None if self.valid is None else _compress(self.valid, mask.data)
+        return type(self)(_compress(self.data, mask.data), valid)
+
+    def _extend(self, other: "_ArrayColumn") -> None:
+        if self.valid is not None or other.valid is not None:
+            self.valid = self._valid() + other._valid()
+        self.data.extend(other.data)
+
+    def _sort_key(self) -> array:
+        return self.data
+
+    def _group_key(self) -> Sequence[Any]:
+        return self.data if self.valid is None else list(self)
+
+    def _numeric(self) -> array:
+        return self.data
+
+    def _present(self) -> array:
+        if self.valid is None:
+            return self.data
+        return array(self.typecode, itertools.compress(self.data, self.valid))
+
+    def count(self) -> int:
+        return len(self.data) if self.valid is None else self.valid.count(1)
+
+    def sum(self) -> int | float:
+        """Sum of the non-null values."""
+        data = self._present()
+        numpy = _numpy()
+        if numpy is not None:
+            return numpy.frombuffer(data, data.typecode).sum().item()
+        return sum(data)
+
+    def mean(self) -> float | None:
+        """Mean of the non-null values, or None."""
+        count = self.count()
+        return self.sum() / count if count else None
+
+    def _extreme(self, function: Callable) -> Any:
+        data = self._present()
+        if not data:
+            return None
+        numpy = _numpy()
+        if numpy is not None:
+            values = numpy.frombuffer(data, data.typecode)
+            return (values.min() if function is min else values.max()).item()
+        return function(data)
+
+    def to_numpy(self) -> Any:
+        """
+        The values as a numpy array sharing the column's memory. Columns with nulls
+        are returned as a masked array.
+        """
+        numpy = _require_numpy()
+        values = numpy.frombuffer(self.data, self.typecode)
+        if self.valid is None:
+            return values
+        return numpy.ma.masked_array(values, mask=~numpy.frombuffer(self.valid, bool))
+
+
+class IntColumn(_ArrayColumn):
+    """Column of 64-bit integers (ports, byte and packet counters, timestamps, ids)."""
+
+    kind = "int"
+    typecode = "q"
+    null_value = 0
+
+
+class FloatColumn(_ArrayColumn):
+    """Column of 64-bit floats."""
+
+    kind = "float"
+    typecode = "d"
+    null_value = math.nan
+
+
+class CategoryColumn(Column):
+    """
+    Dictionary-encoded column: every value is stored as a 32-bit code into
+    :attr:`categories`, with -1 for nulls. Suits repetitive strings such as
+    ``proto`` or ``app_proto``; comparisons run over the codes.
+
+    Attributes:
+        codes: Code of every row.
+        categories: Distinct values, indexed by code.
+    """
+
+    kind = "category"
+
+    def __init__(self, codes: array, categories: List[Any], index: Dict[Any, int] | None = None) -> None:
+        self.codes = codes
+        self.categories = categories
+        self._index = index if index is not None else {value: code for code, value in enumerate(categories)}
+
+    @classmethod
+    def from_values(cls, values: List[Any]) -> "CategoryColumn":
+        index: Dict[Any, int] = {}
+        codes = array(_INT32, [-1 if value is None else index.setdefault(value, len(index)) for value in values])
+        return cls(codes, list(index), index)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Any:
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def __iter__(self) -> Iterator[Any]:
+        # Code -1 picks the trailing None
+        return map((self.categories + [None]).__getitem__, self.codes)
+
+    def _valid(self) -> bytes:
+        numpy = _numpy()
+        if numpy is not None:
+            return (numpy.frombuffer(self.codes, self.codes.typecode) >= 0).tobytes()
+        return bytes(map(operator.ge, self.codes, itertools.repeat(0)))
+
+    def _where(self, selected: set) -> bytes:
+        """Rows whose code is in ``selected``."""
+        if not selected:
+            return bytes(len(self.codes))
+        numpy = _numpy()
+        if numpy is not None:
+            codes = numpy.frombuffer(self.codes, self.codes.typecode)
+            if len(selected) == 1:
+                return (codes == next(iter(selected))).tobytes()
+            return numpy.isin(codes, list(selected)).tobytes()
+        if len(selected) == 1:
+            return bytes(map(next(iter(selected)).__eq__, self.codes))
+        return bytes(map(selected.__contains__, self.codes))
+
+    def _compare(self, op: Callable[[Any, Any], bool], value: Any) -> bytes:
+        # Compare each distinct value once, then select rows by code
+        return self._where({code for code, category in enumerate(self.categories) if _safe(op, category, value)})
+
+    def isin(self, values: Iterable[Any]) -> Mask:
+        return Mask(self._where({self._index[value] for value in values if value in self._index}))
+
+    def take(self, indexes: Sequence[int]) -> "CategoryColumn":
+        return CategoryColumn(_take(self.codes, indexes), self.categories, self._index)
+
+    def compress(self, mask: Mask) -> "CategoryColumn":
+        return CategoryColumn(_compress(self.codes, mask.data), self.categories, self._index)
+
+    def _extend(self, other: "CategoryColumn") -> None:
+        mapping = []
+        for value in other.categories:
+            code = self._index.get(value)
+            if code is None:
+                code = self._index[value] = len(self.categories)
+                self.categories.append(value)
+            mapping.append(code)
+        mapping.append(-1)
+        self.codes.extend(map(mapping.__getitem__, other.codes))
+
+    def _sort_key(self) -> array:
+        ranks = [0] * len(self.categories)
+        for rank, code in enumerate(sorted(range(len(self.categories)), key=self.categories.__getitem__)):
+            ranks[code] = rank
+        ranks.append(len(ranks))
+        return array("q", map(ranks.__getitem__, self.codes))
+
+    def _group_key(self) -> array:
+        return self.codes
+
+    def _extreme(self, function: Callable) -> Any:
+        used = [self.categories[code] for code in set(self.codes) if code >= 0]
+        return function(used) if used else None
+
+    def to_numpy(self) -> Any:
+        """The codes as an int32 numpy array sharing the column's memory; decode them with :attr:`categories`."""
+        return _require_numpy().frombuffer(self.codes, self.codes.typecode)
+
+
+class IPColumn(Column):
+    """
+    Column of packed IP addresses.
+
+    IPv4-only columns hold one unsigned 32-bit integer per row. Once an IPv6 address
+    appears, every address is stored as 16 bytes, with IPv4 addresses IPv4-mapped.
+    Values are returned as strings in their canonical form. Ordering comparisons
+    follow numeric address order.
+
+    Attributes:
+        version: 4 or 6.
+    """
+
+    kind = "ip"
+
+    def __init__(self, data: array | bytearray, version: int, valid: bytes | None = None) -> None:
+        self.data = data
+        self.version = version
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: List[Any]) -> "IPColumn":
+        valid = None
+        if None in values:
+            valid = bytes(map(operator.is_not, values, itertools.repeat(None)))
+        try:
+            return cls(array(_UINT32, [0 if value is None else _ipv4(value) for value in values]), 4, valid)
+        except OSError:
+            packed = b"".join(bytes(16) if value is None else _ipv6(value) for value in values)
+            return cls(bytearray(packed), 6, valid)
+
+    def __len__(self) -> int:
+        return len(self.data) if self.version == 4 else len(self.data) // 16
+
+    def _chunks(self) -> List[bytes]:
+        view = memoryview(self.data)
+        return [bytes(view[offset:offset + 16]) for offset in range(0, len(self.data), 16)]
+
+    def __getitem__(self, index: int) -> str | None:
+        index = range(len(self))[index]
+        if self.valid is not None and not self.valid[index]:
+            return None
+        if self.version == 4:
+            return _ntoa4(self.data[index])
+        return _ntop6(bytes(self.data[16 * index:16 * index + 16]))
+
+    def __iter__(self) -> Iterator[str | None]:
+        values = map(_ntoa4, self.data) if self.version == 4 else map(_ntop6, self._chunks())
+        if self.valid is None:
+            return values
+        return map(_or_none, values, self.valid)
+
+    def _valid(self) -> bytes:
+        return _ones(len(self)) if self.valid is None else self.valid
+
+    def _key(self, value: Any) -> int | bytes | None:
+        """Storage form of an address, or None for an IPv6 address in an IPv4 column."""
+        value = str(value)
+        try:
+            if self.version == 6:
+                return _ipv6(value)
+            try:
+                return _ipv4(value)
+            except OSError:
+                socket.inet_pton(socket.AF_INET6, value)
+                return None
+        except OSError:
+            raise ValueError(f"Not an IP address: {value!r}")
+
+    def _compare(self, op: Callable[[Any, Any], bool], value: Any) -> bytes:
+        key = self._key(value)
+        if key is None:
+            if op is operator.eq:
+                return bytes(len(self))
+            if op is operator.ne:
+                return self._valid()
+            raise ValueError(f"Cannot order IPv4 addresses against {value}")
+        numpy = _numpy()
+        if self.version == 4 and numpy is not None:
+            result = op(numpy.frombuffer(self.data, self.data.typecode), key).tobytes()
+        else:
+            keys = self.data if self.version == 4 else self._chunks()
+            result = bytes(map(op, keys, itertools.repeat(key)))
+        return _and(result, self.valid)
+
+    def isin(self, values: Iterable[Any]) -> Mask:
+        candidates = {key for key in map(self._key, values) if key is not None}
+        keys = self.data if self.version == 4 else self._chunks()
+        return Mask(_and(bytes(map(candidates.__contains__, keys)), self.valid))
+
+    def in_network(self, network: str) -> Mask:
+        """
+        Rows whose address belongs to ``network``.
+
+        Args:
+            network (str): Network in CIDR notation, e.g. ``"10.0.0.0/8"``.
+
+        Returns:
+            Mask: The matching rows.
+
+        """
+        net = ipaddress.ip_network(network, strict=False)
+        numpy = _numpy()
+        if self.version == 4:
+            if net.version == 6:
+                return Mask(bytes(len(self)))
+            netmask, address = int(net.netmask), int(net.network_address)
+            if numpy is not None:
+                values = numpy.frombuffer(self.data, self.data.typecode)
+                result = ((values & netmask) == address).tobytes()
+            else:
+                result = bytes(map(operator.eq, map(netmask.__and__, self.data), itertools.repeat(address)))
+            return Mask(_and(result, self.valid))
+        if net.version == 4:
+            net = ipaddress.ip_network(f"::ffff:{net.network_address}/{96 + net.prefixlen}")
+        if numpy is not None:
+            values = numpy.frombuffer(self.data, "u1").reshape(-1, 16)
+            netmask = numpy.frombuffer(net.netmask.packed, "u1")
+            address = numpy.frombuffer(net.network_address.packed, "u1")
+            result = ((values & netmask) == address).all(axis=1).tobytes()
+        else:
+            netmask, address = int(net.netmask), int(net.network_address)
+            result = bytes((int.from_bytes(chunk, "big") & netmask) == address for chunk in self._chunks())
+        return Mask(_and(result, self.valid))
+
+    def _to_v6(self) -> None:
+        self.data = bytearray(b"".join(_MAPPED + value.to_bytes(4, "big") for value in self.data))
+        self.version = 6
+
+    def take(self, indexes: Sequence[int]) -> "IPColumn":
+        valid = None if self.valid is None else _take(self.valid, indexes)
+        if self.version == 4:
+            return IPColumn(_take(self.data, indexes), 4, valid)
+        numpy = _numpy()
+        if numpy is not None:
+            rows = numpy.frombuffer(self.data, "u1").reshape(-1, 16)[_positions(numpy, indexes)]
+            return IPColumn(bytearray(rows.tobytes()), 6, valid)
+        return IPColumn(bytearray(b"".join(_pick(self._chunks(), indexes))), 6, valid)
+
+    def compress(self, mask: Mask) -> "IPColumn":
+        valid = None if self.valid is None else _compress(self.valid, mask.data)
+        if self.version == 4:
+            return IPColumn(_compress(self.data, mask.data), 4, valid)
+        numpy = _numpy()
+        if numpy is not None:
+            rows = numpy.frombuffer(self.data, "u1").reshape(-1, 16)[numpy.frombuffer(mask.data, bool)]
+            return IPColumn(bytearray(rows.tobytes()), 6, valid)
+        return IPColumn(bytearray(b"".join(itertools.compress(self._chunks(), mask.data))), 6, valid)
+
+    def _extend(self, other: "IPColumn") -> None:
+        if self.version != other.version:
+            if self.version == 4:
+                self._to_v6()
+            else:
+                other = IPColumn(other.data, other.version, other.valid)
+                other._to_v6()
+        if self.valid is not None or other.valid is not None:
+            self.valid = self._valid() + other._valid()
+        self.data.extend(other.data)
+
+    def _sort_key(self) -> Sequence[Any]:
+        return self.data if self.version == 4 else self._chunks()
+
+    def _group_key(self) -> Sequence[Any]:
+        if self.version == 4 and self.valid is None:
+            return self.data
+        keys = self.data if self.version == 4 else self._chunks()
+        return keys if self.valid is None else list(map(_or_none, keys, self.valid))
+
+    def to_numpy(self) -> Any:
+        """
+        The addresses as a numpy array sharing the column's memory: uint32 for IPv4
+        columns, ``(rows, 16)`` uint8 for IPv6 columns. Columns with nulls are
+        returned as a masked array.
+        """
+        numpy = _require_numpy()
+        if self.version == 4:
+            values = numpy.frombuffer(self.data, self.data.typecode)
+        else:
+            values = numpy.frombuffer(self.data, "u1").reshape(-1, 16)
+        if self.valid is None:
+            return values
+        mask = ~numpy.frombuffer(self.valid, bool)
+        return numpy.ma.masked_array(values, mask=mask if self.version == 4 else mask[:, None].repeat(16, axis=1))
+
+
+def _infer(values: List[Any]) -> str | None:
+    """Column kind for a list of values; None when all of them are null."""
+    types = set(map(type, values))
+    types.discard(type(None))
+    if not types:
+        return None
+    if types == {int}:
+        return "int"
+    if types <= {int, float}:
+        return "float"
+    if types == {str}:
+        first = next(value for value in values if value is not None)
+        return "ip" if _is_ip(first) else "category"
+    return "object"
+
+
+def _column(values: List[Any], kind: str | None = None) -> Column:
+    """Build a column of ``kind`` (inferred when None), falling back to a looser kind when values do not fit."""
+    if kind is None:
+        kind = _infer(values)
+    if kind == "ip":
+        try:
+            return IPColumn.from_values(values)
+        except (OSError, TypeError, ValueError):
+            kind = "category"
+    if kind in ("int", "float"):
+        try:
+            return (IntColumn if kind == "int" else FloatColumn).from_values(values)
+        except (OverflowError, TypeError):
+            kind = "object"
+    if kind == "category":
+        try:
+            return CategoryColumn.from_values(values)
+        except TypeError:
+            kind = "object"
+    return ObjectColumn(list(values))
+
+
+def _absorbs(existing: str, kind: str) -> bool:
+    """Whether values of ``kind`` can be stored in a column of ``existing`` kind."""
+    return existing in (kind, "object") or (existing, kind) in (("float", "int"), ("category", "ip"))
+
+
+class _ColumnBuilder:
+    """Converts chunks of values into one column, widening its kind when a chunk does not fit."""
+
+    def __init__(self, nulls: int = 0) -> None:
+        self.column: Column | None = None
+        # Leading nulls, kept until a value tells the kind
+        self.nulls = nulls
+
+    def add(self, values: List[Any]) -> None:
+        kind = _infer(values)
+        if self.column is None:
+            if kind is None:
+                self.nulls += len(values)
+                return
+            if self.nulls:
+                values = [None] * self.nulls + values
+                self.nulls = 0
+            self.column = _column(values, kind)
+            return
+        if kind is None or _absorbs(self.column.kind, kind):
+            kind = self.column.kind
+        chunk = _column(values, kind)
+        if type(chunk) is type(self.column):
+            self.column._extend(chunk)
+        else:
+            self.column = _column(self.column.to_list() + chunk.to_list())
+
+    def build(self) -> Column:
+        return self.column if self.column is not None else ObjectColumn([None] * self.nulls)
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _sort_order(columns: List[Column], descending: List[bool], length: int) -> Sequence[int]:
+    keys = [column._sort_key() for column in columns]
+    nulls = [column.isnull().data for column in columns]
+    numpy = _numpy()
+    if numpy is not None and all(isinstance(key, array) for key in keys) and not any(map(any, nulls)):
+        arrays = []
+        for key, reverse in zip(keys, descending):
+            values = numpy.frombuffer(key, key.typecode)
+            if reverse:
+                values = -values.astype("d" if key.typecode == "d" else "q")
+            arrays.append(values)
+        # lexsort is stable and takes the most significant key last
+        return _from_numpy("q", numpy.lexsort(arrays[::-1]))
+    order = list(range(length))
+    for key, null, reverse in reversed(list(zip(keys, nulls, descending))):
+        if any(null):
+            present = [index for index in order if not null[index]]
+            missing = [index for index in order if null[index]]
+        else:
+            present, missing = order, []
+        # Stable passes from the least significant key; nulls go last
+        present.sort(key=key.__getitem__, reverse=reverse)
+        order = present + missing
+    return order
+
+
+def _group(columns: List[Column]) -> Tuple[array, array]:
+    """Group id of every row and first row of every group, numbering groups by first appearance."""
+    keys = [column._group_key() for column in columns]
+    numpy = _numpy()
+    if numpy is not None and len(keys) == 1 and isinstance(keys[0], array) and len(keys[0]):
+        _, first, inverse = numpy.unique(numpy.frombuffer(keys[0], keys[0].typecode),
+                                         return_index=True, return_inverse=True)
+        order = numpy.argsort(first, kind="stable")
+        rank = numpy.empty_like(order)
+        rank[order] = numpy.arange(len(order))
+        return _from_numpy("q", rank[inverse.reshape(-1)]), _from_numpy("q", first[order])
+    rows = keys[0] if len(keys) == 1 else list(zip(*keys))
+    index = {key: group for group, key in enumerate(dict.fromkeys(rows))}
+    ids = array("q", map(index.__getitem__, rows))
+    # Walking backwards leaves the first row of every group in the dict
+    firsts = dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
+    return ids, array("q", map(firsts.__getitem__, range(len(index))))
+
+
+def _aggregate(column: Column, function: str, ids: array, groups: int) -> Column:
+    if function not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation {function!r}, expected one of {', '.join(AGGREGATIONS)}")
+    valid = column._valid()
+    if function == "count":
+        counts = Counter(itertools.compress(ids, valid))
+        return IntColumn(array("q", map(counts.__getitem__, range(groups))))
+    numeric = column._numeric()
+    if function in ("sum", "mean") and numeric is None:
+        raise TypeError(f"Cannot {function} a {column.kind} column")
+    numpy = _numpy()
+    if numpy is not None and numeric is not None:
+        group_ids = numpy.frombuffer(ids, "q")
+        values = numpy.frombuffer(numeric, numeric.typecode)
+        if column.valid is not None:
+            keep = numpy.frombuffer(valid, bool)
+            group_ids, values = group_ids[keep], values[keep]
+        counts = numpy.bincount(group_ids, minlength=groups)
+        present = (counts > 0).astype("u1").tobytes()
+        if function == "sum" and numeric.typecode == "q":
+            totals = numpy.zeros(groups, "q")
+            numpy.add.at(totals, group_ids, values)
+            return IntColumn(_from_numpy("q", totals))
+        if function in ("sum", "mean"):
+            totals = numpy.bincount(group_ids, weights=values, minlength=groups)
+            if function == "sum":
+                return FloatColumn(_from_numpy("d", totals))
+            with numpy.errstate(invalid="ignore", divide="ignore"):
+                return FloatColumn(_from_numpy("d", totals / counts), None if all(present) else present)
+        if numeric.typecode == "q":
+            limits = numpy.iinfo("q")
+            start = limits.max if function == "min" else limits.min
+        else:
+            start = math.inf if function == "min" else -math.inf
+        result = numpy.full(groups, start, dtype=numeric.typecode)
+        (numpy.minimum if function == "min" else numpy.maximum).at(result, group_ids, values)
+        return type(column)(_from_numpy(numeric.typecode, result), None if all(present) else present)
+    if function in ("sum", "mean"):
+        totals: List[Any] = [0] * groups
+        counts_list = [0] * groups
+        for group, value in itertools.compress(zip(ids, numeric), valid):
+            totals[group] += value
+            counts_list[group] += 1
+        if function == "sum":
+            return type(column).from_values(totals)
+        return FloatColumn.from_values([total / count if count else None
+                                        for total, count in zip(totals, counts_list)])
+    keys = column._sort_key()
+    best: Dict[int, int] = {}
+    better = operator.lt if function == "min" else operator.gt
+    for row in itertools.compress(range(len(column)), valid):
+        group = ids[row]
+        current = best.get(group)
+        if current is None or better(keys[row], keys[current]):
+            best[group] = row
+    values = [column[best[group]] if group in best else None for group in range(groups)]
+    return _column(values, column.kind)
+
+
+class GroupBy:
+    """
+    Rows of a :class:`ColumnarResult` grouped by the values of key columns.
+
+    Aggregations return a new :class:`ColumnarResult` with the key columns followed
+    by the aggregated columns, one row per group, in the order in which the groups
+    first appear. Nulls are skipped by every aggregation but ``count()``.
+    """
+
+    def __init__(self, result: "ColumnarResult", keys: Sequence[str]) -> None:
+        if not keys:
+            raise ValueError("Pass at least one column to group by")
+        self.result = result
+        self.keys = list(keys)
+        self._ids, self._first = _group([result[key] for key in self.keys])
+
+    def __len__(self) -> int:
+        return len(self._first)
+
+    def _keys(self) -> Dict[str, Column]:
+        return {key: self.result[key].take(self._first) for key in self.keys}
+
+    def agg(self, **aggregations: Tuple[str, str]) -> "ColumnarResult":
+        """
+        Compute several aggregations at once.
+
+        Args:
+            **aggregations: Output column name mapped to ``(column, function)``, where
+                ``function`` is one of ``count``, ``sum``, ``min``, ``max`` and ``mean``.
+
+        Returns:
+            ColumnarResult: One row per group.
+
+        Raises:
+            ValueError: If a function is unknown.
+            TypeError: If ``sum`` or ``mean`` is applied to a non-numeric column.
+
+        Example:
+            result.group_by("dst.port").agg(flows=("id", "count"), traffic=("bytes.total", "sum"))
+
+        """
+        columns = self._keys()
+        for name, (column, function) in aggregations.items():
+            columns[name] = _aggregate(self.result[column], function, self._ids, len(self))
+        return ColumnarResult(columns)
+
+    def count(self) -> "ColumnarResult":
+        """Number of rows in every group, in a ``count`` column."""
+        sizes = Counter(self._ids)
+        columns = self._keys()
+        columns["count"] = IntColumn(array("q", map(sizes.__getitem__, range(len(self)))))
+        return ColumnarResult(columns)
+
+    def sum(self, column: str) -> "ColumnarResult":
+        return self.agg(**{column: (column, "sum")})
+
+    def min(self, column: str) -> "ColumnarResult":
+        return self.agg(**{column: (column, "min")})
+
+    def max(self, column: str) -> "ColumnarResult":
+        return self.agg(**{column: (column, "max")})
+
+    def mean(self, column: str) -> "ColumnarResult":
+        return self.agg(**{column: (column, "mean")})
+
+
+class ColumnarResult:
+    """
+    Query result stored column by column, one typed array per column.
+
+    Column types are inferred from the values: integers become :class:`IntColumn`,
+    IP addresses a packed :class:`IPColumn`, other strings a dictionary-encoded
+    :class:`CategoryColumn`, and anything else an :class:`ObjectColumn`. Filtering,
+    sorting and grouping work on the arrays instead of row objects, and use numpy
+    when it is installed; :meth:`to_numpy` then exposes the columns without copying.
+
+    Args:
+        columns (Dict[str, Column | Sequence[Any]]): Columns by name. Plain sequences
+            are converted to the inferred column type.
+
+    Raises:
+        ValueError: If the columns have different lengths.
+
+    Example:
+        flows = client.bql.execute_columnar("SELECT dst.port, bytes.total FROM flow WHERE end > 2025.02.25")
+        web = flows.filter(flows["dst.port"].isin([80, 443]))
+        top = web.group_by("dst.port").sum("bytes.total").sort("bytes.total", descending=True)
+
+    """
+
+    def __init__(self, columns: Dict[str, Column | Sequence[Any]]) -> None:
+        self.columns: Dict[str, Column] = {
+            name: column if isinstance(column, Column) else _column(list(column))
+            for name, column in columns.items()
+        }
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns have different lengths")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any], fields: Sequence[str] | None = None,
+                  chunk_size: int = CHUNK_SIZE) -> "ColumnarResult":
+        """
+        Build a result from rows, converting them to columns a chunk at a time.
+
+        Rows are either lists, in the order of ``fields``, or dicts, whose keys name
+        the columns. Any iterable works, e.g. :meth:`BQLAPI.stream` or
+        :meth:`BQLAPI.iterate`; only one chunk of rows is held at a time.
+
+        Args:
+            rows (Iterable[Any]): Rows as lists or dicts.
+            fields (Optional[Sequence[str]]): Column names, required for list rows.
+            chunk_size (int): Rows converted at a time.
+
+        Returns:
+            ColumnarResult: The columns.
+
+        Raises:
+            ValueError: If list rows come without ``fields`` or with a different
+                number of values.
+
+        """
+        builders: Dict[str, _ColumnBuilder] = {}
+        if fields is not None:
+            builders = {name: _ColumnBuilder() for name in fields}
+        count = 0
+        for chunk in _chunks(rows, chunk_size):
+            if isinstance(chunk[0], dict):
+                for name in dict.fromkeys(itertools.chain.from_iterable(chunk)):
+                    if name not in builders:
+                        builders[name] = _ColumnBuilder(count)
+                for name, builder in builders.items():
+                    builder.add([row.get(name) for row in chunk])
+            else:
+                if fields is None:
+                    raise ValueError("fields are required to build columns from list rows")
+                if any(len(row) != len(builders) for row in chunk):
+                    raise ValueError(f"Expected rows of {len(builders)} values for fields {list(builders)}")
+                for builder, values in zip(builders.values(), zip(*chunk)):
+                    builder.add(list(values))
+            count += len(chunk)
+        return cls({name: builder.build() for name, builder in builders.items()})
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __repr__(self) -> str:
+        kinds = ", ".join(f"{name}: {column.kind}" for name, column in self.columns.items())
+        return f"ColumnarResult({self._length} rows; {kinds})"
+
+    def rows(self) -> Iterator[List[Any]]:
+        """Iterate over the rows as lists, in column order."""
+        return map(list, zip(*self.columns.values()))
+
+    def to_rows(self) -> List[List[Any]]:
+        return list(self.rows())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        names = self.names
+        return [dict(zip(names, row)) for row in zip(*self.columns.values())]
+
+    def select(self, *names: str) -> "ColumnarResult":
+        """A result with only the given columns, sharing their storage."""
+        return ColumnarResult({name: self.columns[name] for name in names})
+
+    def filter(self, mask: Mask) -> "ColumnarResult":
+        """
+        The rows selected by ``mask``.
+
+        Args:
+            mask (Mask): Selection built from column comparisons, e.g.
+                ``(result["dst.port"] == 443) & (result["bytes.total"] > 10_000)``.
+
+        Returns:
+            ColumnarResult: The selected rows.
+
+        """
+        if len(mask) != self._length:
+            raise ValueError("The mask does not match the number of rows")
+        return ColumnarResult({name: column.compress(mask) for name, column in self.columns.items()})
+
+    def take(self, indexes: Sequence[int]) -> "ColumnarResult":
+        """The rows at ``indexes``, in that order."""
+        return ColumnarResult({name: column.take(indexes) for name, column in self.columns.items()})
+
+    def head(self, count: int) -> "ColumnarResult":
+        return self.take(range(min(count, self._length)))
+
+    def sort(self, *by: str, descending: bool | Sequence[bool] = False) -> "ColumnarResult":
+        """
+        The rows sorted by one or more columns. The sort is stable and nulls go last.
+
+        Args:
+            *by (str): Column names, most significant first.
+            descending (bool | Sequence[bool]): Direction for all columns, or one per column.
+
+        Returns:
+            ColumnarResult: The sorted rows.
+
+        """
+        if not by:
+            raise ValueError("Pass at least one column to sort by")
+        directions = [descending] * len(by) if isinstance(descending, bool) else list(descending)
+        if len(directions) != len(by):
+            raise ValueError("Pass one direction per sort column")
+        return self.take(_sort_order([self.columns[name] for name in by], directions, self._length))
+
+    def group_by(self, *keys: str) -> GroupBy:
+        """Group the rows by the values of one or more columns."""
+        return GroupBy(self, keys)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Every column as a numpy array, without copying where the layout allows; see
+        ``to_numpy()`` of the column classes.
+
+        Raises:
+            ImportError: If numpy is not installed.
+
+        """
+        _require_numpy()
+        return {name: column.to_numpy() for name, column in self.columns.items()}
@@ -0,0 +1,66 @@
+import gzip
+import zlib
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+# Buckets for compressed / uncompressed size ratios
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+@dataclass
+class CompressionConfig:
+    """Request body compression and response encoding negotiation.
+
+    Attributes:
+        threshold: Request bodies of at least this many bytes are compressed.
+        algorithm: ``"gzip"`` or ``"deflate"``; sent as the ``Content-Encoding`` header.
+        level: Compression level, 1 (fastest) to 9 (smallest).
+        accept_encoding: ``Accept-Encoding`` header sent with every request. Only list
+            encodings the HTTP library can decode; ``"identity"`` disables compressed
+            responses.
+    """
+    threshold: int = 8 * 1024
+    algorithm: str = "gzip"
+    level: int = 6
+    accept_encoding: str = "gzip, deflate"
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in ("gzip", "deflate"):
+            raise ValueError(f"Unsupported compression algorithm: {self.algorithm}")
+
+    def should_compress(self, body: Any, headers: Mapping[str, str]) -> bool:
+        """Check whether a request body is worth compressing."""
+        if not isinstance(body, (bytes, bytearray, str)) or len(body) < self.threshold:
+            return False
+        return not any(name.lower() == "content-encoding" for name in headers)
+
+    def compress(self, body: bytes | str) -> bytes:
+        if isinstance(body, str):
+            body = body.encode()
+        if self.algorithm == "gzip":
+            # mtime=0 keeps the output deterministic, so identical bodies compress identically
+            return gzip.compress(body, compresslevel=self.level, mtime=0)
+        return zlib.compress(body, self.level)
+
+
+def record_compression(metrics: Any, direction: str, endpoint: str, uncompressed: int, compressed: int) -> None:
+    """
+    Record the sizes of a compressed request or response body.
+
+    Args:
+        metrics (MetricsRegistry): Registry to record into.
+        direction (str): ``"request"`` or ``"response"``.
+        endpoint (str): Endpoint template.
+        uncompressed (int): Body size before compression.
+        compressed (int): Body size on the wire.
+
+    """
+    if not uncompressed:
+        return
+    metrics.inc(f"{direction}_uncompressed_bytes", uncompressed,
+                help=f"Size of compressed {direction} bodies before compression.", endpoint=endpoint)
+    metrics.inc(f"{direction}_compressed_bytes", compressed,
+                help=f"Size of compressed {direction} bodies on the wire.", endpoint=endpoint)
+    metrics.observe(f"{direction}_compression_ratio", compressed / uncompressed,
+                    help=f"Compressed / uncompressed size of {direction} bodies.",
+                    buckets=RATIO_BUCKETS, endpoint=endpoint)
@@ -0,0 +1,162 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from ptnad.exceptions import PTNADException
+
+_MAGIC = b"PTNADCC1"
+_SALT_SIZE = 16
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/ptnad`` or ``~/.cache/ptnad``."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ptnad"
+
+
+class CredentialCache:
+    """
+    Encrypted on-disk cache of authenticated sessions.
+
+    After a successful ``login()`` the client stores its session cookies, CSRF token
+    and authorization headers together with their expiry time. A client created later
+    with the same base URL and credentials restores them in ``login()`` instead of
+    authenticating again, as long as they have not expired.
+
+    Entries are encrypted with Fernet (AES-128-CBC + HMAC-SHA256) from the optional
+    ``cryptography`` package and written with ``0600`` permissions. The key is either
+    given explicitly, or derived from the password / API key of the auth strategy with
+    PBKDF2, so only a process that knows the credentials can read the entry.
+
+    Args:
+        directory (Optional[str | Path]): Cache directory; defaults to :func:`default_cache_dir`.
+        key (Optional[bytes | str]): Fernet key (see ``Fernet.generate_key()``). Falls back to
+            the ``PTNAD_CREDENTIAL_KEY`` environment variable, then to key derivation.
+            An explicit key avoids the PBKDF2 cost on every start.
+        max_age (float): Lifetime in seconds of entries whose expiry is not known
+            from the token or the cookies.
+        expiry_margin (float): Entries are treated as expired this many seconds early.
+        iterations (int): PBKDF2 iterations used for key derivation.
+
+    Raises:
+        ImportError: If ``cryptography`` is not installed.
+
+    """
+
+    def __init__(self, directory: str | Path | None = None, key: bytes | str | None = None,
+                 max_age: float = 3600.0, expiry_margin: float = 60.0, iterations: int = 100_000) -> None:
+        try:
+            from cryptography.fernet import Fernet, InvalidToken
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise ImportError(
+                "CredentialCache requires cryptography. Install it with: pip install 'ptnad-client[cache]'"
+            ) from e
+        self._fernet = Fernet
+        self._invalid_token = InvalidToken
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        key = key or os.environ.get("PTNAD_CREDENTIAL_KEY")
+        self.key = key.encode() if isinstance(key, str) else key
+        self.max_age = max_age
+        self.expiry_margin = expiry_margin
+        self.iterations = iterations
+
+    def path_for(self, base_url: str, identity: str) -> Path:
+        digest = hashlib.sha256(f"{base_url}\0{identity}".encode()).hexdigest()[:32]
+        return self.directory / f"{digest}.session"
+
+    def _cipher(self, secret: str, salt: bytes):
+        if self.key is not None:
+            return self._fernet(self.key)
+        derived = hashlib.pbkdf2_hmac("sha256", secret.encode(), salt, self.iterations)
+        return self._fernet(base64.urlsafe_b64encode(derived))
+
+    def load(self, base_url: str, identity: str, secret: str) -> Dict[str, Any] | None:
+        """
+        Read a cached session.
+
+        Args:
+            base_url (str): API base URL of the client.
+            identity (str): Non-secret identity of the credentials.
+            secret (str): Password or API key, used when the key is derived.
+
+        Returns:
+            Optional[Dict[str, Any]]: The session state, or None if there is no valid entry.
+
+        """
+        path = self.path_for(base_url, identity)
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            return None
+        if not blob.startswith(_MAGIC):
+            return None
+        salt = blob[len(_MAGIC):len(_MAGIC) + _SALT_SIZE]
+        try:
+            state = json.loads(self._cipher(secret, salt).decrypt(blob[len(_MAGIC) + _SALT_SIZE:]))
+        except (self._invalid_token, ValueError):
+            # Wrong key, changed password or corrupted file
+            return None
+        if state.get("base_url") != base_url or state.get("identity") != identity:
+            return None
+        if state.get("expires_at", 0) - self.expiry_margin <= time.time():
+            self.delete(base_url, identity)
+            return None
+        return state
+
+    def save(self, base_url: str, identity: str, secret: str, state: Dict[str, Any]) -> None:
+        """
+        Encrypt and store a session state atomically.
+
+        Args:
+            base_url (str): API base URL of the client.
+            identity (str): Non-secret identity of the credentials.
+            secret (str): Password or API key, used when the key is derived.
+            state (Dict[str, Any]): JSON-serializable session state with ``expires_at``.
+
+        """
+        state = {**state, "base_url": base_url, "identity": identity}
+        salt = os.urandom(_SALT_SIZE)
+        token = self._cipher(secret, salt).encrypt(json.dumps(state).encode())
+        path = self.path_for(base_url, identity)
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_MAGIC + salt + token)
+                os.chmod(tmp, 0o600)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            raise PTNADException(f"Failed to write credential cache {path}: {str(e)}")
+
+    def delete(self, base_url: str, identity: str) -> None:
+        try:
+            self.path_for(base_url, identity).unlink()
+        except FileNotFoundError:
+            pass
+
+    def expiry(self, token_expires_at: float | None, cookies: Any) -> float:
+        """
+        Compute when a session stops being valid.
+
+        Args:
+            token_expires_at (Optional[float]): Expiry of the bearer token, if known.
+            cookies: Session cookie jar.
+
+        Returns:
+            float: Unix time of the earliest known expiry, capped by ``max_age``.
+
+        """
+        candidates = [time.time() + self.max_age]
+        if token_expires_at is not None:
+            candidates.append(token_expires_at)
+        candidates.extend(cookie.expires for cookie in cookies if cookie.expires)
+        return min(candidates)
@@ -0,0 +1,9 @@
+from ptnad.emulator.app import EmulatorConfig, NADEmulator
+from ptnad.emulator.server import EmulatorServer, serve
+
+__all__ = [
+    "EmulatorConfig",
+    "EmulatorServer",
+    "NADEmulator",
+    "serve",
+]
@@ -0,0 +1,63 @@
+import argparse
+
+from ptnad.emulator import EmulatorConfig, NADEmulator, serve
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ptnad.emulator",
+                                     description="Local PT NAD API emulator with synthetic data.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--flows", type=int, default=1_000_000, help="number of synthetic flows")
+    parser.add_argument("--hosts", type=int, default=100_000, help="number of synthetic hosts")
+    parser.add_argument("--rules", type=int, default=50_000, help="number of signature rules")
+    parser.add_argument("--replists", type=int, default=20, help="number of reputation lists")
+    parser.add_argument("--replist-items", type=int, default=1_000, help="items per dynamic list")
+    parser.add_argument("--span-hours", type=float, default=168, help="time range covered by flows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--username", help="accepted login (any by default)")
+    parser.add_argument("--password")
+    parser.add_argument("--api-key", help="accepted bearer token (any by default)")
+    parser.add_argument("--session-ttl", type=float, help="seconds until sessions expire")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random extra latency, up to this much")
+    parser.add_argument("--scan-ms", type=float, default=0, help="BQL cost per million scanned flows")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of requests that fail")
+    parser.add_argument("--error-status", type=int, action="append",
+                        help="status of injected errors (repeatable; 500, 502, 503 by default)")
+    parser.add_argument("--task-seconds", type=float, default=5, help="duration of sources/save tasks")
+    parser.add_argument("--compress", action="store_true", help="gzip large responses")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    config = EmulatorConfig(
+        flows=args.flows,
+        hosts=args.hosts,
+        rules=args.rules,
+        replists=args.replists,
+        replist_items=args.replist_items,
+        span=int(args.span_hours * 3_600_000),
+        seed=args.seed,
+        username=args.username,
+        password=args.password,
+        api_key=args.api_key,
+        session_ttl=args.session_ttl,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        scan_cost=args.scan_ms / 1000,
+        error_rate=args.error_rate,
+        error_statuses=tuple(args.error_status or (500, 502, 503)),
+        task_duration=args.task_seconds,
+    )
+    server = serve(NADEmulator(config), args.host, args.port, compress=args.compress, verbose=args.verbose)
+    print(f"PT NAD emulator listening on {server.url} ({args.flows} flows, {args.hosts} hosts)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
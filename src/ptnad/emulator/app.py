@@ -0,0 +1,541 @@
+import base64
+import random
+import secrets
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from ptnad.emulator import bql
+from ptnad.emulator.data import RULE_CLASSES, SyntheticData
+from ptnad.transport import MemoryTransport, TransportRequest
+
+API = "/api/v2"
+_UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+@dataclass
+class EmulatorConfig:
+    """Volume, behaviour and fault injection of the emulator.
+
+    Attributes:
+        flows: Number of synthetic flows.
+        hosts: Number of synthetic hosts.
+        rules: Number of synthetic signature rules.
+        replists: Number of reputation lists; every other one is dynamic.
+        replist_items: Items per dynamic reputation list.
+        start: Time of the oldest flow end, in milliseconds since the epoch.
+            Defaults to ``span`` before the emulator started.
+        span: Time range covered by flows, in milliseconds.
+        seed: Seed of the synthetic data and of the fault injection.
+        username: Accepted login; any credentials are accepted when None.
+        password: Accepted password.
+        api_key: Accepted bearer token; any token is accepted when None.
+        session_ttl: Seconds a session stays valid; None for no expiry.
+        latency: Seconds added to every response.
+        jitter: Up to this many seconds are added at random to every response.
+        scan_cost: Seconds of simulated BQL work per million scanned flows,
+            added to the response time and reported in ``took``.
+        error_rate: Share of requests answered with an injected error.
+        error_statuses: Status codes of injected errors, chosen at random.
+        max_page_size: Largest ``limit`` accepted by paginated endpoints.
+        task_duration: Seconds a ``sources/save`` task takes to complete.
+    """
+    flows: int = 1_000_000
+    hosts: int = 100_000
+    rules: int = 50_000
+    replists: int = 20
+    replist_items: int = 1_000
+    start: int | None = None
+    span: int = 7 * 86_400_000
+    seed: int = 0
+    username: str | None = None
+    password: str | None = None
+    api_key: str | None = None
+    session_ttl: float | None = None
+    latency: float = 0.0
+    jitter: float = 0.0
+    scan_cost: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (500, 502, 503)
+    max_page_size: int = 1000
+    task_duration: float = 5.0
+
+
+def _page_params(request: TransportRequest, default: int, maximum: int) -> Tuple[int, int]:
+    try:
+        limit = int(request.query.get("limit", default))
+        offset = int(request.query.get("offset", 0))
+    except ValueError:
+        raise _HTTPError(400, "limit and offset must be integers")
+    if limit < 1 or offset < 0:
+        raise _HTTPError(400, "limit must be positive and offset non-negative")
+    return min(limit, maximum), offset
+
+
+def _page_url(request: TransportRequest, **params: Any) -> str:
+    parts = urlsplit(request.url)
+    query = {**request.query, **{k: v for k, v in params.items() if v is not None}}
+    return f"{parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+
+
+def _cookies(request: TransportRequest) -> Dict[str, str]:
+    pairs = (part.strip().split("=", 1) for part in request.headers.get("Cookie", "").split(";") if "=" in part)
+    return {name: value for name, value in pairs}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class NADEmulator(MemoryTransport):
+    """
+    Local emulator of the PT NAD API with synthetic data.
+
+    Implements the endpoints used by the client: ``auth``, ``bql`` (a subset of
+    BQL, see :func:`ptnad.emulator.bql.parse`), ``hosts`` with cursor pagination,
+    ``replists`` with offset pagination and dynamic lists, ``signatures``,
+    ``sources`` and ``tasks``, and ``monitoring``. Flows, hosts and rules are
+    computed on demand, so millions of them cost no memory.
+
+    The emulator is a :class:`ptnad.transport.MemoryTransport`: pass it as
+    ``PTNADClient(transport=...)`` to run in-process, or serve it over HTTP with
+    :func:`ptnad.emulator.serve` / ``python -m ptnad.emulator``.
+
+    Args:
+        config (Optional[EmulatorConfig]): Data volume and fault injection settings.
+
+    """
+
+    def __init__(self, config: EmulatorConfig | None = None) -> None:
+        self.config = config or EmulatorConfig()
+        self._random = random.Random(self.config.seed)
+        super().__init__(latency=self._latency if self.config.latency or self.config.jitter else None)
+        start = self.config.start
+        if start is None:
+            start = int(time.time() * 1000) - self.config.span
+        self.data = SyntheticData(self.config.flows, self.config.hosts, start, self.config.span, self.config.seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, float] = {}
+        self._rule_changes: Dict[int, Dict[str, Any]] = {}
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._replists: Dict[int, Dict[str, Any]] = {}
+        # Items of dynamic lists, created on first access
+        self._items: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._next_list_id = self.config.replists + 1
+        for i in range(self.config.replists):
+            dynamic = i % 2 == 0
+            self._replists[i + 1] = {
+                "id": i + 1, "name": f"list-{i}", "color": "1", "type": "ip",
+                "description": "Synthetic reputation list", "external_key": f"list-{i}" if dynamic else None,
+                "content": None, "created": start, "modified": start,
+                "items_count": self.config.replist_items if dynamic else 0,
+            }
+        self._register_routes()
+
+    def _latency(self, request: TransportRequest) -> float:
+        with self._lock:
+            return self.config.latency + self._random.random() * self.config.jitter
+
+    def _inject_error(self) -> None:
+        if not self.config.error_rate:
+            return
+        with self._lock:
+            if self._random.random() >= self.config.error_rate:
+                return
+            status = self._random.choice(self.config.error_statuses)
+        raise _HTTPError(status, "Injected error")
+
+    def _check_auth(self, request: TransportRequest) -> None:
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            if self.config.api_key is None or authorization[7:] == self.config.api_key:
+                return
+            raise _HTTPError(401, "Invalid token.")
+        cookies = _cookies(request)
+        with self._lock:
+            expires = self._sessions.get(cookies.get("sessionid", ""))
+            if expires is not None and expires <= time.time():
+                del self._sessions[cookies["sessionid"]]
+                expires = None
+        if expires is None:
+            raise _HTTPError(401, "Authentication credentials were not provided.")
+        if request.method in _UNSAFE_METHODS and request.headers.get("X-CSRFToken") != cookies.get("csrftoken"):
+            raise _HTTPError(403, "CSRF Failed: CSRF token missing or incorrect.")
+
+    def _register_routes(self) -> None:
+        routes = [
+            ("POST", "/auth/login", self.login),
+            ("POST", "/auth/logout", self.logout),
+            ("POST", "/bql", self.bql),
+            ("GET", "/hosts", self.hosts),
+            ("GET", r"/hosts/(?P<id>\d+)", self.host),
+            ("GET", "/replists", self.replists),
+            ("POST", "/replists", self.create_replist),
+            ("GET", "/replists/stats", self.replist_stats),
+            ("GET", r"/replists/(?P<id>\d+)", self.replist),
+            ("PATCH", r"/replists/(?P<id>\d+)", self.update_replist),
+            ("DELETE", r"/replists/(?P<id>\d+)", self.delete_replist),
+            ("GET", r"/replists/dynamic/(?P<key>[^/]+)", self.dynamic_items),
+            ("POST", r"/replists/dynamic/(?P<key>[^/]+)/_bulk", self.bulk_add),
+            ("POST", r"/replists/dynamic/(?P<key>[^/]+)/_delete", self.bulk_delete),
+            ("POST", r"/replists/dynamic/(?P<key>[^/]+)/(?P<value>[^/]+)", self.add_item),
+            ("DELETE", r"/replists/dynamic/(?P<key>[^/]+)/(?P<value>[^/]+)", self.delete_item),
+            ("GET", "/signatures/rules", self.rules),
+            ("GET", r"/signatures/rules/(?P<sid>\d+)", self.rule),
+            ("PATCH", r"/signatures/rules/(?P<sid>\d+)", self.update_rule),
+            ("GET", "/signatures/classes", self.rule_classes),
+            ("GET", "/signatures/stats", self.rule_stats),
+            ("POST", "/signatures/commit", lambda request: {"status": "ok"}),
+            ("POST", "/signatures/rollback", lambda request: {"status": "ok"}),
+            ("GET", "/sources", self.sources),
+            ("GET", r"/sources/(?P<id>\d+)", self.source),
+            ("POST", "/sources/save", self.save_flows),
+            ("GET", r"/tasks/(?P<id>[\w-]+)", self.task),
+            ("GET", "/monitoring/status", self.monitoring_status),
+            ("GET", "/monitoring/triggers", self.monitoring_triggers),
+        ]
+        for method, path, handler in routes:
+            self.add_route(method, f"{API}{path}/?", self._endpoint(handler, public=path == "/auth/login"))
+
+    def _endpoint(self, handler: Callable[[TransportRequest], Any], public: bool) -> Callable[[TransportRequest], Any]:
+        def endpoint(request: TransportRequest) -> Any:
+            try:
+                self._inject_error()
+                if not public:
+                    self._check_auth(request)
+                return handler(request)
+            except _HTTPError as e:
+                return e.status, {"detail": e.detail}
+        return endpoint
+
+    # Auth
+
+    def login(self, request: TransportRequest) -> Any:
+        try:
+            credentials = request.json() or {}
+        except ValueError:
+            raise _HTTPError(400, "Invalid JSON")
+        if self.config.username is not None and (credentials.get("username") != self.config.username
+                                                 or credentials.get("password") != self.config.password):
+            raise _HTTPError(401, "Invalid username or password.")
+        session = secrets.token_hex(16)
+        with self._lock:
+            ttl = self.config.session_ttl
+            self._sessions[session] = time.time() + ttl if ttl is not None else float("inf")
+        return 200, {}, [
+            ("Set-Cookie", f"csrftoken={secrets.token_hex(16)}; Path=/; SameSite=Lax"),
+            ("Set-Cookie", f"sessionid={session}; Path=/; HttpOnly; SameSite=Lax"),
+        ]
+
+    def logout(self, request: TransportRequest) -> Any:
+        with self._lock:
+            self._sessions.pop(_cookies(request).get("sessionid", ""), None)
+        return 200, {}
+
+    # BQL
+
+    def bql(self, request: TransportRequest) -> Any:
+        if request.query.get("source", "2") not in ("1", "2"):
+            return {"error": f"Unknown source {request.query['source']}"}
+        started = time.perf_counter()
+        try:
+            query = bql.parse(request.content.decode())
+            result = bql.execute(query, self.data)
+        except bql.BQLError as e:
+            return {"error": str(e)}
+        cost = self.config.scan_cost * result.scanned / 1_000_000
+        if cost > 0:
+            time.sleep(cost)
+        took = int((time.perf_counter() - started) * 1000)
+        return {"result": result.rows, "took": took, "total": result.total,
+                "debug": {"scanned": result.scanned, "total_estimated": result.estimated}}
+
+    # Hosts
+
+    def hosts(self, request: TransportRequest) -> Any:
+        limit, offset = _page_params(request, 100, self.config.max_page_size)
+        cursor = request.query.get("cursor")
+        if cursor:
+            try:
+                offset = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+            except ValueError:
+                raise _HTTPError(400, "Invalid cursor")
+        total = self.data.hosts
+        end = min(offset + limit, total)
+        results = [self.data.host(i) for i in range(offset, end)]
+        response = {"results": results, "next": None, "previous": None}
+        if "cursor" in request.query or "offset" not in request.query:
+            if end < total:
+                response["next"] = _page_url(request, cursor=base64.urlsafe_b64encode(str(end).encode()).decode())
+        else:
+            response["count"] = total
+            if end < total:
+                response["next"] = _page_url(request, offset=end)
+        return response
+
+    def host(self, request: TransportRequest) -> Any:
+        index = int(request.params["id"]) - 1
+        if not 0 <= index < self.data.hosts:
+            raise _HTTPError(404, "Not found.")
+        return self.data.host(index)
+
+    # Reputation lists
+
+    def replists(self, request: TransportRequest) -> Any:
+        limit, offset = _page_params(request, 100, self.config.max_page_size)
+        search = request.query.get("search", "").lower()
+        with self._lock:
+            lists = [dict(item) for item in self._replists.values()
+                     if not search or search in item["name"].lower() or search in item["description"].lower()]
+        ordering = request.query.get("ordering")
+        if ordering:
+            name = ordering.lstrip("-")
+            lists.sort(key=lambda item: (item.get(name) is None, item.get(name)), reverse=ordering.startswith("-"))
+        page = lists[offset:offset + limit]
+        return {
+            "count": len(lists),
+            "next": _page_url(request, offset=offset + limit) if offset + limit < len(lists) else None,
+            "previous": _page_url(request, offset=max(offset - limit, 0)) if offset else None,
+            "results": page,
+        }
+
+    def create_replist(self, request: TransportRequest) -> Any:
+        data = request.json() or {}
+        if not data.get("name"):
+            raise _HTTPError(400, "name is required")
+        now = int(time.time() * 1000)
+        with self._lock:
+            list_id = self._next_list_id
+            self._next_list_id += 1
+            item = {"id": list_id, "color": "0", "type": "ip", "description": "", "external_key": None,
+                    "content": None, **data, "created": now, "modified": now, "items_count": 0}
+            self._replists[list_id] = item
+            return 201, dict(item)
+
+    def _get_replist(self, request: TransportRequest) -> Dict[str, Any]:
+        item = self._replists.get(int(request.params["id"]))
+        if item is None:
+            raise _HTTPError(404, "Not found.")
+        return item
+
+    def replist(self, request: TransportRequest) -> Any:
+        with self._lock:
+            return dict(self._get_replist(request))
+
+    def update_replist(self, request: TransportRequest) -> Any:
+        data = request.json() or {}
+        with self._lock:
+            item = self._get_replist(request)
+            item.update(data, modified=int(time.time() * 1000))
+            return dict(item)
+
+    def delete_replist(self, request: TransportRequest) -> Any:
+        with self._lock:
+            item = self._get_replist(request)
+            del self._replists[item["id"]]
+            self._items.pop(item["external_key"] or "", None)
+        return 204, b""
+
+    def replist_stats(self, request: TransportRequest) -> Any:
+        with self._lock:
+            lists = list(self._replists.values())
+        return {"total": len(lists), "dynamic": sum(1 for item in lists if item["external_key"]),
+                "items": sum(item["items_count"] for item in lists)}
+
+    def _dynamic(self, key: str) -> Dict[str, Dict[str, Any]]:
+        """Items of a dynamic list by value; call with the lock held."""
+        if key not in self._items:
+            replist = next((item for item in self._replists.values() if item["external_key"] == key), None)
+            if replist is None:
+                raise _HTTPError(404, f"Dynamic list {key} not found.")
+            count = self.config.replist_items if replist["id"] <= self.config.replists else 0
+            self._items[key] = {item["value"]: item for item in self.data.replist_items(replist["id"], count)}
+        return self._items[key]
+
+    def _touch(self, key: str) -> None:
+        for item in self._replists.values():
+            if item["external_key"] == key:
+                item["items_count"] = len(self._items[key])
+                item["modified"] = int(time.time() * 1000)
+
+    def dynamic_items(self, request: TransportRequest) -> Any:
+        with self._lock:
+            items = list(self._dynamic(request.params["key"]).values())
+        ordering = request.query.get("ordering")
+        if ordering:
+            name = ordering.lstrip("-")
+            items.sort(key=lambda item: item.get(name), reverse=ordering.startswith("-"))
+        return {"count": len(items), "results": items}
+
+    def bulk_add(self, request: TransportRequest) -> Any:
+        payload = request.json()
+        if not isinstance(payload, list):
+            raise _HTTPError(400, "Expected a list of items")
+        now = int(time.time() * 1000)
+        key = request.params["key"]
+        with self._lock:
+            items = self._dynamic(key)
+            for entry in payload:
+                if not isinstance(entry, dict) or "value" not in entry:
+                    raise _HTTPError(400, "Every item needs a value")
+                items[str(entry["value"])] = {"value": str(entry["value"]), "attrs": entry.get("attrs") or {},
+                                              "modified": now}
+            self._touch(key)
+        return {"count": len(payload)}
+
+    def bulk_delete(self, request: TransportRequest) -> Any:
+        values = request.json()
+        if not isinstance(values, list):
+            raise _HTTPError(400, "Expected a list of values")
+        key = request.params["key"]
+        with self._lock:
+            items = self._dynamic(key)
+            for value in values:
+                items.pop(str(value), None)
+            self._touch(key)
+        return 204, b""
+
+    def add_item(self, request: TransportRequest) -> Any:
+        key, value = request.params["key"], request.params["value"]
+        with self._lock:
+            self._dynamic(key)[value] = {"value": value, "attrs": request.json() or {},
+                                         "modified": int(time.time() * 1000)}
+            self._touch(key)
+        return 201, {}
+
+    def delete_item(self, request: TransportRequest) -> Any:
+        key = request.params["key"]
+        with self._lock:
+            if self._dynamic(key).pop(request.params["value"], None) is None:
+                raise _HTTPError(404, "Not found.")
+            self._touch(key)
+        return 204, b""
+
+    # Signatures
+
+    def _rule(self, index: int) -> Dict[str, Any]:
+        rule = self.data.rule(index)
+        changes = self._rule_changes.get(rule["sid"])
+        if changes:
+            rule.update(changes, has_redef=True)
+        return rule
+
+    def rules(self, request: TransportRequest) -> Any:
+        limit, offset = _page_params(request, 100, self.config.max_page_size)
+        filters = (request.json() or {}).get("filter", {}) if request.body else {}
+        search = request.query.get("search", "").lower()
+        sids = filters.get("sid")
+        if sids is not None and not isinstance(sids, list):
+            sids = [sids]
+
+        def matches(rule: Dict[str, Any]) -> bool:
+            if search and search not in rule["msg"].lower():
+                return False
+            if sids is not None and rule["sid"] not in sids:
+                return False
+            if "enabled" in filters and rule["enabled"] != filters["enabled"]:
+                return False
+            if "priority" in filters and rule["priority"] < int(filters["priority"]):
+                return False
+            return all(rule.get(name) == filters[name] for name in ("vendor", "cls") if name in filters)
+
+        with self._lock:
+            if sids is not None:
+                indexes = sorted(sid - 10_000_000 for sid in sids if 0 <= sid - 10_000_000 < self.config.rules)
+            else:
+                indexes = range(self.config.rules)
+            if not search and not filters:
+                # Unfiltered pages are computed without scanning all rules
+                total = len(indexes)
+                page = [self._rule(i) for i in indexes[offset:offset + limit]]
+            else:
+                selected = [rule for rule in map(self._rule, indexes) if matches(rule)]
+                total = len(selected)
+                page = selected[offset:offset + limit]
+        return {
+            "count": total,
+            "next": _page_url(request, offset=offset + limit) if offset + limit < total else None,
+            "previous": _page_url(request, offset=max(offset - limit, 0)) if offset else None,
+            "results": page,
+        }
+
+    def _rule_index(self, request: TransportRequest) -> int:
+        index = int(request.params["sid"]) - 10_000_000
+        if not 0 <= index < self.config.rules:
+            raise _HTTPError(404, "Not found.")
+        return index
+
+    def rule(self, request: TransportRequest) -> Any:
+        index = self._rule_index(request)
+        with self._lock:
+            return self._rule(index)
+
+    def update_rule(self, request: TransportRequest) -> Any:
+        index = self._rule_index(request)
+        changes = request.json() or {}
+        with self._lock:
+            self._rule_changes.setdefault(10_000_000 + index, {}).update(changes)
+            return self._rule(index)
+
+    def rule_classes(self, request: TransportRequest) -> Any:
+        results = [{"id": i + 1, "name": name, "title": name.replace("-", " ").capitalize(), "priority": i % 4 + 1}
+                   for i, name in enumerate(RULE_CLASSES)]
+        return {"count": len(results), "results": results}
+
+    def rule_stats(self, request: TransportRequest) -> Any:
+        with self._lock:
+            redefined = len(self._rule_changes)
+        return {"total": self.config.rules, "has_redef": redefined}
+
+    # Sources and tasks
+
+    def sources(self, request: TransportRequest) -> Any:
+        results = [{"id": 1, "name": "persistent"}, {"id": 2, "name": "live"}]
+        return {"count": len(results), "results": results}
+
+    def source(self, request: TransportRequest) -> Any:
+        source_id = int(request.params["id"])
+        if source_id not in (1, 2):
+            raise _HTTPError(404, "Not found.")
+        return {"id": source_id, "name": "persistent" if source_id == 1 else "live"}
+
+    def save_flows(self, request: TransportRequest) -> Any:
+        data = request.json() or {}
+        missing = [name for name in ("id", "source", "start", "end", "target") if name not in data]
+        if missing:
+            raise _HTTPError(400, f"Missing fields: {', '.join(missing)}")
+        task_id = str(uuid.uuid4())
+        with self._lock:
+            self._tasks[task_id] = {"created": time.monotonic(), "flows": len(data["id"])}
+        return {"id": task_id, "state": "PENDING"}
+
+    def task(self, request: TransportRequest) -> Any:
+        with self._lock:
+            task = self._tasks.get(request.params["id"])
+        if task is None:
+            raise _HTTPError(404, "Not found.")
+        progress = (time.monotonic() - task["created"]) / self.config.task_duration if self.config.task_duration else 1
+        state = "SUCCESS" if progress >= 1 else "PROGRESS" if progress >= 0.5 else "STARTED"
+        return {"id": request.params["id"], "state": state, "result": {"saved": task["flows"]}
+                if state == "SUCCESS" else None}
+
+    # Monitoring
+
+    def monitoring_status(self, request: TransportRequest) -> Any:
+        return {"status": "green", "problems": []}
+
+    def monitoring_triggers(self, request: TransportRequest) -> Any:
+        updated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        results = [
+            {"id": "license", "type": "license", "status": "green", "template": "License is valid",
+             "vars": {}, "updated": updated},
+            {"id": "stats", "type": "stats", "status": "green", "template": "{flows} flows stored",
+             "vars": {"flows": self.config.flows}, "updated": updated},
+        ]
+        return {"count": len(results), "results": results}
@@ -0,0 +1,312 @@
+import calendar
+import itertools
+import math
+import operator
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from ptnad.emulator.data import SyntheticData
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<date>\d{4}\.\d{2}\.\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?)
+    | (?P<ip>\d{1,3}(?:\.\d{1,3}){3})
+    | (?P<number>-?\d+(?:\.\d+)?)
+    | '(?P<squoted>[^']*)'
+    | "(?P<dquoted>[^"]*)"
+    | (?P<logical>&&|\|\||!(?!=))
+    | (?P<op>==|!=|<>|<=|>=|=|<|>|\(|\)|,|\*)
+    | (?P<name>[A-Za-z_][\w.]*)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {"select", "from", "where", "and", "or", "not", "order", "by", "asc", "desc", "limit", "offset"}
+
+_LOGICAL = {"&&": "and", "||": "or", "!": "not"}
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne, "<>": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# Fields whose values grow with the flow index
+_MONOTONIC = ("id", "end")
+_BOUNDS = ("=", "==", "<", "<=", ">", ">=")
+
+# Larger ranges get an estimated total
+EXACT_TOTAL_LIMIT = 100_000
+TOTAL_SAMPLE_SIZE = 10_000
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+class BQLError(ValueError):
+    pass
+
+
+def _date(text: str) -> int:
+    date, _, clock = text.replace("T", " ").partition(" ")
+    year, month, day = (int(part) for part in date.split("."))
+    hour, minute, second = (int(part) for part in (clock.split(":") + ["0", "0", "0"])[:3]) if clock else (0, 0, 0)
+    return calendar.timegm((year, month, day, hour, minute, second)) * 1000
+
+
+def _tokenize(query: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if match is None or match.end() == position:
+            raise BQLError(f"Unexpected input at position {position}: {query[position:position + 20]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "date":
+            tokens.append(("value", _date(value)))
+        elif kind == "number":
+            tokens.append(("value", float(value) if "." in value else int(value)))
+        elif kind in ("ip", "squoted", "dquoted"):
+            tokens.append(("value", value))
+        elif kind == "logical":
+            tokens.append(("keyword", _LOGICAL[value]))
+        elif kind == "name" and value.lower() in _KEYWORDS:
+            tokens.append(("keyword", value.lower()))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+
+@dataclass
+class BQLQuery:
+    """A parsed query of the BQL subset understood by the emulator."""
+    fields: List[str]
+    table: str
+    predicate: Predicate | None = None
+    # Index range implied by top-level conditions on ``id`` and ``end``
+    bounds: List[Tuple[str, str, Any]] = field(default_factory=list)
+    # True when the predicate consists of the bounds only
+    bounds_only: bool = True
+    order: List[Tuple[str, bool]] = field(default_factory=list)
+    limit: int | None = None
+    offset: int = 0
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, Any]]) -> None:
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Tuple[str, Any] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self, kind: str, value: Any = None) -> Any:
+        token = self.peek()
+        if token is None or token[0] != kind or (value is not None and token[1] != value):
+            found = "end of query" if token is None else repr(token[1])
+            raise BQLError(f"Expected {value or kind}, found {found}")
+        self.position += 1
+        return token[1]
+
+    def accept(self, kind: str, value: Any = None) -> bool:
+        token = self.peek()
+        if token is not None and token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return True
+        return False
+
+    def query(self) -> BQLQuery:
+        self.take("keyword", "select")
+        fields = ["*"] if self.accept("op", "*") else [self.take("name")]
+        while fields != ["*"] and self.accept("op", ","):
+            fields.append(self.take("name"))
+        self.take("keyword", "from")
+        query = BQLQuery(fields=fields, table=self.take("name"))
+        if self.accept("keyword", "where"):
+            conjuncts = self.conjuncts()
+            for conjunct in conjuncts:
+                if (conjunct[0] == "cmp" and conjunct[1] in _MONOTONIC and conjunct[2] in _BOUNDS
+                        and isinstance(conjunct[3], (int, float))):
+                    query.bounds.append(conjunct[1:])
+                else:
+                    query.bounds_only = False
+            query.predicate = _compile(("and", conjuncts))
+        if self.accept("keyword", "order"):
+            self.take("keyword", "by")
+            while True:
+                name = self.take("name")
+                descending = self.accept("keyword", "desc")
+                if not descending:
+                    self.accept("keyword", "asc")
+                query.order.append((name, descending))
+                if not self.accept("op", ","):
+                    break
+        if self.accept("keyword", "limit"):
+            query.limit = self.integer()
+        if self.accept("keyword", "offset"):
+            query.offset = self.integer()
+        if self.peek() is not None:
+            raise BQLError(f"Unexpected {self.peek()[1]!r} at the end of the query")
+        return query
+
+    def integer(self) -> int:
+        value = self.take("value")
+        if not isinstance(value, int) or value < 0:
+            raise BQLError(f"Expected a non-negative integer, found {value!r}")
+        return value
+
+    def conjuncts(self) -> List[tuple]:
+        """Parse a WHERE expression, flattened into its top-level AND terms."""
+        expression = self.disjunction()
+        return list(expression[1]) if expression[0] == "and" else [expression]
+
+    def disjunction(self) -> tuple:
+        terms = [self.conjunction()]
+        while self.accept("keyword", "or"):
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else ("or", terms)
+
+    def conjunction(self) -> tuple:
+        terms = [self.negation()]
+        while self.accept("keyword", "and"):
+            terms.append(self.negation())
+        flattened = []
+        for term in terms:
+            flattened.extend(term[1] if term[0] == "and" else [term])
+        return flattened[0] if len(flattened) == 1 else ("and", flattened)
+
+    def negation(self) -> tuple:
+        if self.accept("keyword", "not"):
+            return ("not", self.negation())
+        if self.accept("op", "("):
+            expression = self.disjunction()
+            self.take("op", ")")
+            return expression
+        name = self.take("name")
+        op = self.take("op")
+        if op not in _COMPARISONS:
+            raise BQLError(f"Unsupported operator {op!r}")
+        return ("cmp", name, op, self.take("value"))
+
+
+def _compile(expression: tuple) -> Predicate:
+    kind = expression[0]
+    if kind == "cmp":
+        _, name, op, value = expression
+        compare = _COMPARISONS[op]
+
+        def predicate(row: Dict[str, Any]) -> bool:
+            field_value = row.get(name)
+            try:
+                return field_value is not None and compare(field_value, value)
+            except TypeError:
+                return False
+        return predicate
+    if kind == "not":
+        inner = _compile(expression[1])
+        return lambda row: not inner(row)
+    terms = [_compile(term) for term in expression[1]]
+    if kind == "and":
+        return lambda row: all(term(row) for term in terms)
+    return lambda row: any(term(row) for term in terms)
+
+
+def parse(query: str) -> BQLQuery:
+    """
+    Parse a query of the form ``SELECT fields FROM flow [WHERE ...] [ORDER BY ...]
+    [LIMIT n] [OFFSET n]``.
+
+    Conditions compare a field with a number, a quoted string, an IP address or a
+    date such as ``2025.02.25`` or ``2025.02.25 12:00`` (UTC, converted to
+    milliseconds), and combine with AND/``&&``, OR/``||``, NOT/``!`` and parentheses.
+
+    Raises:
+        BQLError: If the query is not in the supported subset.
+
+    """
+    return _Parser(_tokenize(query)).query()
+
+
+def _index_range(query: BQLQuery, data: SyntheticData) -> Tuple[int, int]:
+    lo, hi = 0, data.flows
+    for name, op, value in query.bounds:
+        if name == "id":
+            first = lambda v: min(max(v, 0), data.flows)
+        else:
+            first = data.flow_index_at
+        # Both fields are integers, so "> 1.5" means ">= 2" and "<= 1.5" means "< 2"
+        if op in (">=", "=", "=="):
+            lo = max(lo, first(math.ceil(value)))
+        if op == ">":
+            lo = max(lo, first(math.floor(value) + 1))
+        if op in ("<=", "=", "=="):
+            hi = min(hi, first(math.floor(value) + 1))
+        if op == "<":
+            hi = min(hi, first(math.ceil(value)))
+    return lo, max(lo, hi)
+
+
+@dataclass
+class BQLResult:
+    rows: List[Any]
+    total: int
+    # Flows in the index range of the query, which drives the simulated cost
+    scanned: int
+    # True when ``total`` was extrapolated from a sample
+    estimated: bool = False
+
+
+def _count(query: BQLQuery, data: SyntheticData, lo: int, hi: int) -> Tuple[int, bool]:
+    """Count matching flows exactly in small ranges, and from an even sample in large ones."""
+    if hi - lo <= EXACT_TOTAL_LIMIT:
+        return sum(1 for row in map(data.flow, range(lo, hi)) if query.predicate(row)), False
+    step = (hi - lo) / TOTAL_SAMPLE_SIZE
+    sample = (data.flow(lo + int(k * step)) for k in range(TOTAL_SAMPLE_SIZE))
+    matched = sum(1 for row in sample if query.predicate(row))
+    return round(matched * (hi - lo) / TOTAL_SAMPLE_SIZE), True
+
+
+def execute(query: BQLQuery, data: SyntheticData) -> BQLResult:
+    """
+    Run a parsed query against synthetic flows.
+
+    Rows of queries ordered by ``id`` or ``end`` (or not ordered) are produced by
+    walking the index range and stop at ``LIMIT``; other orderings sort all
+    matching flows. ``total`` is exact unless the query filters on more than
+    ``id``/``end`` over more than ``EXACT_TOTAL_LIMIT`` flows.
+
+    Raises:
+        BQLError: If the query uses an unknown table.
+
+    """
+    if query.table != "flow":
+        raise BQLError(f"Unknown table {query.table!r}")
+    lo, hi = _index_range(query, data)
+    natural = all(name in _MONOTONIC for name, _ in query.order) and len({d for _, d in query.order}) <= 1
+    descending = bool(query.order) and query.order[0][1]
+    end = None if query.limit is None else query.offset + query.limit
+    indexes = range(hi - 1, lo - 1, -1) if natural and descending else range(lo, hi)
+
+    if query.bounds_only and natural:
+        rows = [data.flow(i) for i in indexes[query.offset:end]]
+        return BQLResult([_project(row, query.fields) for row in rows], hi - lo, hi - lo)
+
+    matching: Iterator[Dict[str, Any]] = (row for row in map(data.flow, indexes)
+                                          if query.predicate is None or query.predicate(row))
+    if natural:
+        rows = list(itertools.islice(matching, query.offset, end))
+        total, estimated = _count(query, data, lo, hi)
+        total = max(total, query.offset + len(rows))
+    else:
+        rows = list(matching)
+        total, estimated = len(rows), False
+        for name, desc in reversed(query.order):
+            rows.sort(key=lambda row: (row.get(name) is None, row.get(name)), reverse=desc)
+        rows = rows[query.offset:end]
+    return BQLResult([_project(row, query.fields) for row in rows], total, hi - lo, estimated)
+
+
+def _project(row: Dict[str, Any], fields: List[str]) -> Any:
+    if fields == ["*"]:
+        return row
+    return [row.get(name) for name in fields]
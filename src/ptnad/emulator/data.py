@@ -0,0 +1,131 @@
+from typing import Any, Dict, List
+
+PROTOCOLS = ("tcp", "udp", "icmp")
+APP_PROTOCOLS = ("http", "tls", "dns", "smb", "ssh", "rdp", "kerberos", "ldap", None)
+SERVICE_PORTS = (80, 443, 53, 445, 22, 3389, 88, 389, 8080)
+HOST_TYPES = ("workstation", "server", "printer", "router", "unknown")
+ROLES = ("dns-server", "dc", "web-server", "proxy", "mail-server")
+VENDORS = ("ptsecurity", "et", "custom")
+RULE_CLASSES = ("trojan-activity", "attempted-recon", "policy-violation", "web-application-attack")
+
+
+def _mix(i: int, salt: int = 0) -> int:
+    """Cheap deterministic 32-bit hash of an index."""
+    x = (i * 2654435761 + salt * 40503) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 2246822519) & 0xFFFFFFFF
+    x ^= x >> 13
+    return x
+
+
+def _ip(i: int, network: int) -> str:
+    return f"{network}.{(i >> 16) & 0xFF}.{(i >> 8) & 0xFF}.{i & 0xFF}"
+
+
+class SyntheticData:
+    """
+    Deterministic synthetic NAD data, computed from the row index on demand.
+
+    Nothing is stored per flow or host, so millions of rows cost no memory. Flows
+    are numbered by ``id`` and spread evenly over ``[start, start + span)``, so
+    ``end`` never decreases with ``id`` and range conditions on either map to an
+    index range.
+
+    Args:
+        flows (int): Number of flows.
+        hosts (int): Number of hosts.
+        start (int): Time of the first flow end, in milliseconds since the epoch.
+        span (int): Length of the time range covered by flows, in milliseconds.
+        seed (int): Varies the generated values.
+
+    """
+
+    def __init__(self, flows: int, hosts: int, start: int, span: int, seed: int = 0) -> None:
+        self.flows = flows
+        self.hosts = hosts
+        self.start = start
+        self.span = span
+        self.seed = seed
+
+    def flow_end(self, i: int) -> int:
+        return self.start + i * self.span // max(self.flows, 1)
+
+    def flow_index_at(self, end: int) -> int:
+        """Smallest flow index whose ``end`` is at least ``end``."""
+        lo, hi = 0, self.flows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.flow_end(mid) < end:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def flow(self, i: int) -> Dict[str, Any]:
+        h = _mix(i, self.seed)
+        g = _mix(i, self.seed + 1)
+        end = self.flow_end(i)
+        proto = PROTOCOLS[h % 3] if h % 7 else "udp"
+        service = h % len(SERVICE_PORTS)
+        sent = g % 50_000 + 40
+        recv = (g >> 8) % 500_000 + 40
+        client = h % max(self.hosts, 1)
+        server = g % max(self.hosts, 1)
+        return {
+            "id": i,
+            "start": end - (h >> 12) % 60_000,
+            "end": end,
+            "proto": proto,
+            "src.ip": _ip(client, 10),
+            "src.port": 1024 + (g >> 4) % 64_000,
+            "dst.ip": _ip(server, 10) if h & 0x100 else _ip(g, 172),
+            "dst.port": SERVICE_PORTS[service],
+            "app_proto": APP_PROTOCOLS[service],
+            "bytes.sent": sent,
+            "bytes.recv": recv,
+            "bytes.total": sent + recv,
+            "pkts.sent": sent // 1400 + 1,
+            "pkts.recv": recv // 1400 + 1,
+            "pkts.total": sent // 1400 + recv // 1400 + 2,
+            "state": "closed" if g & 3 else "timeout",
+            "host.name": f"host-{client}.corp.local",
+        }
+
+    def host(self, i: int) -> Dict[str, Any]:
+        h = _mix(i, self.seed + 2)
+        last_seen = self.start + self.span - h % self.span if self.span else self.start
+        first_seen = last_seen - (h >> 8) % (30 * 86_400_000)
+        return {
+            "id": i + 1,
+            "ip": [{"ip": _ip(i, 10), "first_seen": first_seen, "last_seen": last_seen}],
+            "hostname": f"host-{i}.corp.local",
+            "user_hostname": None,
+            "type": HOST_TYPES[h % len(HOST_TYPES)],
+            "user_type": None,
+            "roles": [ROLES[h % len(ROLES)]] if h & 4 else [],
+            "groups": ["corp"] if h & 8 else [],
+            "os": [{"name": "Windows 10" if h & 16 else "Linux", "last_seen": last_seen}],
+            "comment": None,
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+        }
+
+    def rule(self, i: int) -> Dict[str, Any]:
+        h = _mix(i, self.seed + 3)
+        return {
+            "sid": 10_000_000 + i,
+            "rev": h % 5 + 1,
+            "vendor": VENDORS[h % len(VENDORS)],
+            "cls": RULE_CLASSES[h % len(RULE_CLASSES)],
+            "msg": f"Synthetic rule {i}",
+            "priority": h % 4 + 1,
+            "enabled": bool(h % 10),
+            "has_redef": False,
+            "has_exceptions": False,
+            "has_error": False,
+            "diff": "=",
+        }
+
+    def replist_items(self, list_index: int, count: int) -> List[Dict[str, Any]]:
+        return [{"value": _ip(_mix(j, self.seed + list_index) & 0xFFFFFF, 192),
+                 "attrs": {"score": j % 100}, "modified": self.start} for j in range(count)]
@@ -0,0 +1,95 @@
+import gzip
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+from ptnad.emulator.app import NADEmulator
+from ptnad.transport import TransportRequest
+
+
+class EmulatorServer(ThreadingHTTPServer):
+    """
+    HTTP/1.1 server in front of a :class:`NADEmulator`, one thread per connection.
+
+    Args:
+        address (Tuple[str, int]): Host and port to listen on; port 0 picks a free one.
+        emulator (NADEmulator): Emulator that answers the requests.
+        compress (bool): Gzip response bodies of at least 1 KiB for clients that accept it.
+        verbose (bool): Log every request to stderr.
+
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], emulator: NADEmulator,
+                 compress: bool = False, verbose: bool = False) -> None:
+        super().__init__(address, _Handler)
+        self.emulator = emulator
+        self.compress = compress
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: EmulatorServer
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _dispatch(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        parts = urlsplit(self.path)
+        request = TransportRequest(
+            method=self.command,
+            url=f"http://{self.headers.get('Host', 'localhost')}{self.path}",
+            path=parts.path,
+            query=dict(parse_qsl(parts.query, keep_blank_values=True)),
+            headers=CaseInsensitiveDict(self.headers.items()),
+            body=body,
+        )
+        emulator = self.server.emulator
+        status, content, headers = emulator.handle(request)
+        delay = emulator.delay(request)
+        if delay > 0:
+            time.sleep(delay)
+        if (self.server.compress and len(content) >= 1024
+                and "gzip" in request.headers.get("Accept-Encoding", "")):
+            content = gzip.compress(content, compresslevel=1)
+            headers.append(("Content-Encoding", "gzip"))
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+def serve(emulator: NADEmulator | None = None, host: str = "127.0.0.1", port: int = 8080,
+          compress: bool = False, verbose: bool = False) -> EmulatorServer:
+    """
+    Create an HTTP server for an emulator; call ``serve_forever()`` on the result.
+
+    Args:
+        emulator (Optional[NADEmulator]): Emulator to serve; one with default settings if omitted.
+        host (str): Address to listen on.
+        port (int): Port to listen on; 0 picks a free one (see ``EmulatorServer.url``).
+        compress (bool): Gzip large response bodies.
+        verbose (bool): Log every request.
+
+    Returns:
+        EmulatorServer: The bound server.
+
+    """
+    return EmulatorServer((host, port), emulator or NADEmulator(), compress=compress, verbose=verbose)
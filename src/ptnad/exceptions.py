@@ -2,15 +2,41 @@ class PTNADException(Exception):
     """Base exception for all PTNAD-related errors."""
 
 class PTNADAPIError(PTNADException):
-    """Exception raised for errors in the API."""
+    """Exception raised for errors in the API.
+
+    When the client that raised it has a metrics registry, the first ``operation``
+    set on the error (by the API method closest to the failed request) is counted
+    in ``ptnad_operation_errors_total``.
+    """
     def __init__(self, message, status_code=None, response=None, operation=None):
         self.message = message
         self.status_code = status_code
         self.response = response
+        self._metrics = None
+        self._counted = False
         self.operation = operation
 
         super().__init__(self.message)
 
+    @property
+    def operation(self):
+        return self._operation
+
+    @operation.setter
+    def operation(self, value):
+        self._operation = value
+        self._count()
+
+    def _track(self, metrics):
+        """Count this error in ``metrics`` once its operation is known."""
+        self._metrics = metrics
+        self._count()
+
+    def _count(self):
+        if self._operation and self._metrics is not None and not self._counted:
+            self._counted = True
+            self._metrics.record_operation_error(self._operation, type(self).__name__, self.status_code)
+
     def __str__(self):
         operation_prefix = f"Failed to {self.operation}. " if self.operation else ""
         base_message = super().__str__()
@@ -21,3 +47,16 @@ class AuthenticationError(PTNADException):
 
 class ValidationError(PTNADException):
     """Exception raised for validation errors."""
+
+class CircuitOpenError(PTNADAPIError):
+    """Exception raised without sending a request because the circuit breaker is open."""
+    def __init__(self, message, group=None, retry_after=None, operation=None):
+        self.group = group
+        self.retry_after = retry_after
+        super().__init__(message, operation=operation)
+
+class FederationError(PTNADAPIError):
+    """Exception raised when a fan-out call failed on one or more NAD instances."""
+    def __init__(self, message, errors=None, operation=None):
+        self.errors = errors or {}
+        super().__init__(message, operation=operation)
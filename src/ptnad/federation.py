@@ -0,0 +1,222 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from ptnad.client import PTNADClient
+from ptnad.exceptions import FederationError
+from ptnad.lazy import LazyAPI
+
+
+@dataclass
+class InstanceResult:
+    """Outcome of a call on one NAD instance.
+
+    Attributes:
+        instance: Name of the instance.
+        value: Return value of the call, None if it failed.
+        error: Exception raised by the call, or ``TimeoutError`` if it did not finish in time.
+        elapsed: Seconds the call took (or waited before timing out).
+    """
+    instance: str
+    value: Any = None
+    error: BaseException | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FederatedResult(List[InstanceResult]):
+    """Per-instance results of a fan-out call, in the order the instances were configured."""
+
+    @property
+    def succeeded(self) -> List[InstanceResult]:
+        return [result for result in self if result.ok]
+
+    @property
+    def failed(self) -> List[InstanceResult]:
+        return [result for result in self if not result.ok]
+
+    @property
+    def errors(self) -> Dict[str, BaseException]:
+        return {result.instance: result.error for result in self if not result.ok}
+
+    def values(self) -> Dict[str, Any]:
+        """Return values of the successful calls by instance name."""
+        return {result.instance: result.value for result in self if result.ok}
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over ``(instance, item)`` for every item of the successful list results."""
+        for result in self:
+            if result.ok and result.value is not None:
+                for item in result.value:
+                    yield result.instance, item
+
+    def raise_for_errors(self) -> "FederatedResult":
+        """
+        Raise if any instance failed.
+
+        Returns:
+            FederatedResult: self, for chaining.
+
+        Raises:
+            FederationError: With the per-instance exceptions in ``errors``.
+
+        """
+        errors = self.errors
+        if errors:
+            details = "; ".join(f"{name}: {error!r}" for name, error in errors.items())
+            raise FederationError(f"{len(errors)} of {len(self)} NAD instances failed: {details}", errors=errors)
+        return self
+
+
+class _FederatedNamespace:
+    """Proxy that calls a method of one API namespace on every instance."""
+
+    def __init__(self, federation: "FederatedPTNADClient", name: str) -> None:
+        self._federation = federation
+        self._name = name
+
+    def __getattr__(self, method: str) -> Callable[..., FederatedResult]:
+        namespace = self._name
+
+        def call(*args, **kwargs) -> FederatedResult:
+            return self._federation.run(lambda client: getattr(getattr(client, namespace), method)(*args, **kwargs))
+
+        call.__name__ = method
+        call.__qualname__ = f"{namespace}.{method}"
+        return call
+
+
+class FederatedPTNADClient:
+    """
+    Run the same call on many PT NAD instances in parallel.
+
+    API namespaces are mirrored: ``federation.bql.execute(query)`` runs
+    ``client.bql.execute(query)`` on every instance at once and returns a
+    :class:`FederatedResult` with one :class:`InstanceResult` per instance, so the
+    fleet-wide latency is that of the slowest instance rather than the sum of all.
+
+    A failing instance does not fail the call: its exception is stored in its
+    result (see :meth:`FederatedResult.raise_for_errors`). An instance that does not
+    answer within ``timeout`` gets a ``TimeoutError`` result; its request keeps
+    running in the background until the client's own socket timeout, so also set
+    ``PoolConfig.read_timeout`` on the clients.
+
+    Args:
+        clients (Mapping[str, PTNADClient]): Clients by instance name.
+        timeout (Optional[float | Mapping[str, float]]): Seconds to wait for each
+            instance, counted from the start of the call, either one value for all or
+            one per instance name. None waits indefinitely.
+        max_workers (Optional[int]): Worker threads; defaults to twice the number of
+            instances, so a hung instance does not starve the next calls.
+
+    Example:
+        federation = FederatedPTNADClient({
+            "msk": PTNADClient("https://nad-msk.example.com"),
+            "spb": PTNADClient("https://nad-spb.example.com"),
+        }, timeout=30)
+        federation.set_auth(username="user", password="pass")
+        federation.login().raise_for_errors()
+        for instance, row in federation.bql.execute("SELECT src.ip FROM flow LIMIT 10").items():
+            print(instance, row)
+
+    """
+
+    def __init__(self, clients: Mapping[str, PTNADClient],
+                 timeout: float | Mapping[str, float] | None = None,
+                 max_workers: int | None = None) -> None:
+        if not clients:
+            raise ValueError("At least one client is required")
+        self.clients: Dict[str, PTNADClient] = dict(clients)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or 2 * len(self.clients),
+            thread_name_prefix="ptnad-federation",
+        )
+
+    def __enter__(self) -> "FederatedPTNADClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker threads without waiting for timed-out calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __getattr__(self, name: str) -> _FederatedNamespace:
+        # Only called for attributes not found normally, i.e. API namespaces
+        if not isinstance(getattr(PTNADClient, name, None), LazyAPI):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return _FederatedNamespace(self, name)
+
+    def set_auth(self, auth_type: str = "local", **kwargs) -> None:
+        """Use the same credentials on every instance. See :meth:`PTNADClient.set_auth`."""
+        for client in self.clients.values():
+            client.set_auth(auth_type, **kwargs)
+
+    def login(self) -> FederatedResult:
+        return self.run(lambda client: client.login())
+
+    def logout(self) -> FederatedResult:
+        return self.run(lambda client: client.logout())
+
+    def _timeout_for(self, instance: str) -> float | None:
+        if isinstance(self.timeout, Mapping):
+            return self.timeout.get(instance)
+        return self.timeout
+
+    def run(self, fn: Callable[[PTNADClient], Any], instances: Iterable[str] | None = None) -> FederatedResult:
+        """
+        Call ``fn(client)`` for every instance in parallel.
+
+        Args:
+            fn (Callable[[PTNADClient], Any]): Function to run against each client.
+            instances (Optional[Iterable[str]]): Names of the instances to use; all by default.
+
+        Returns:
+            FederatedResult: One result per instance.
+
+        """
+        names = list(self.clients) if instances is None else list(instances)
+        started = time.monotonic()
+        futures: Dict[str, Future] = {name: self._executor.submit(self._timed, fn, self.clients[name])
+                                      for name in names}
+        deadlines = {name: started + timeout for name in names
+                     if (timeout := self._timeout_for(name)) is not None}
+        pending = set(futures.values())
+        timed_out = set()
+        while pending:
+            now = time.monotonic()
+            for name, deadline in deadlines.items():
+                future = futures[name]
+                if future in pending and deadline <= now:
+                    pending.discard(future)
+                    timed_out.add(name)
+                    future.cancel()
+            if not pending:
+                break
+            waiting = [deadlines[name] - now for name in deadlines if futures[name] in pending]
+            _, pending = wait(pending, timeout=min(waiting) if waiting else None, return_when=FIRST_COMPLETED)
+
+        results = FederatedResult()
+        for name in names:
+            if name in timed_out:
+                elapsed = self._timeout_for(name)
+                results.append(InstanceResult(name, error=TimeoutError(
+                    f"NAD instance {name!r} did not answer within {elapsed}s"), elapsed=elapsed))
+                continue
+            error, value, elapsed = futures[name].result()
+            results.append(InstanceResult(name, value=value, error=error, elapsed=elapsed))
+        return results
+
+    @staticmethod
+    def _timed(fn: Callable[[PTNADClient], Any], client: PTNADClient) -> Tuple[BaseException | None, Any, float]:
+        started = time.monotonic()
+        try:
+            return None, fn(client), time.monotonic() - started
+        except Exception as e:
+            return e, None, time.monotonic() - started
@@ -0,0 +1,63 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class LazyAPI:
+    """
+    Class attribute that builds an API namespace on first access.
+
+    The namespace module is imported and the namespace object is created the first
+    time the attribute is read on a client instance; the object is then stored in
+    the instance ``__dict__``, so later reads are plain attribute lookups.
+
+    Args:
+        target (str): ``"module:ClassName"`` of the namespace class. The class is
+            called with the client instance as its only argument.
+
+    Example:
+        class PTNADClient:
+            bql = LazyAPI("ptnad.api.bql:BQLAPI")
+
+    """
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        module, _, attr = self.target.partition(":")
+        api = getattr(importlib.import_module(module), attr)(instance)
+        # setdefault keeps the first object if two threads race on the first access
+        return instance.__dict__.setdefault(self.name, api)
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build PEP 562 ``__getattr__`` and ``__dir__`` functions for a package.
+
+    Args:
+        package (str): Name of the package, i.e. ``__name__`` of its ``__init__``.
+        exports (Dict[str, str]): Exported name -> module that defines it (absolute or
+            relative to ``package``).
+
+    Returns:
+        Tuple[Callable, Callable]: ``__getattr__`` and ``__dir__`` for the package.
+
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
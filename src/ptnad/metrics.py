@@ -0,0 +1,224 @@
+import bisect
+import re
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Ordered most specific first; the first match wins.
+ENDPOINT_TEMPLATES = (
+    (r"^replists/dynamic/[^/]+/_bulk$", "/replists/dynamic/{key}/_bulk"),
+    (r"^replists/dynamic/[^/]+/_delete$", "/replists/dynamic/{key}/_delete"),
+    (r"^replists/dynamic/[^/]+/[^/]+$", "/replists/dynamic/{key}/{value}"),
+    (r"^replists/dynamic/[^/]+$", "/replists/dynamic/{key}"),
+    (r"^replists/\d+$", "/replists/{id}"),
+    (r"^signatures/rules/[^/]+$", "/signatures/rules/{id}"),
+    (r"^(hosts|sensors|sources|variables|tasks)/(?!stats$)[^/]+$", r"/\1/{id}"),
+)
+_TEMPLATES = [(re.compile(pattern), template) for pattern, template in ENDPOINT_TEMPLATES]
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+_NUMBER = re.compile(r"\d+")
+
+
+def operation_label(operation: str) -> str:
+    """
+    Collapse the ``operation`` of an error into a metric label, e.g.
+    ``execute BQL query over window 1700-1800`` -> ``execute BQL query over window N-N``.
+    """
+    return _NUMBER.sub("N", operation)[:100]
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse a concrete endpoint into its template, e.g. ``hosts/10.0.0.1`` -> ``/hosts/{id}``.
+
+    Args:
+        endpoint (str): Endpoint relative to the API base URL.
+
+    Returns:
+        str: Endpoint template used as a metric label.
+
+    """
+    path = endpoint.strip("/").split("?", 1)[0]
+    for pattern, template in _TEMPLATES:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return "/" + path
+
+
+def _labels(labels: Dict[str, str]) -> LabelSet:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelSet, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket boundaries."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket that contains it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """
+    In-process registry of client request metrics.
+
+    Pass an instance to ``PTNADClient(metrics=...)`` and every request is recorded by
+    method and endpoint template. Export with :meth:`to_openmetrics`.
+
+    Recorded metrics:
+        ptnad_requests_total: Completed requests by method, endpoint and status code.
+        ptnad_request_errors_total: Requests that failed without a response, by error type.
+        ptnad_request_retries_total: Retries made by the retry policy.
+        ptnad_request_duration_seconds: Latency histogram, including retries.
+        ptnad_request_bytes_total / ptnad_response_bytes_total: Body sizes.
+        ptnad_operation_errors_total: Failed API operations by the ``operation`` of
+            their :class:`ptnad.exceptions.PTNADAPIError` (see :func:`operation_label`),
+            error type and status code. At most ``max_operations`` distinct operations
+            are kept; further ones are counted as ``other``.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = "ptnad",
+                 max_operations: int = 100) -> None:
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self.max_operations = max_operations
+        self._operations: set[str] = set()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def inc(self, name: str, value: float = 1, help: str = "", **labels) -> None:
+        """Increment a counter."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(self, name: str, value: float, help: str = "",
+                buckets: Iterable[float] | None = None, **labels) -> None:
+        """Record a histogram observation. ``buckets`` overrides the registry buckets for a new series."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets if buckets is None else buckets)
+            histogram.observe(value)
+            if help:
+                self._help.setdefault(name, help)
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def histogram(self, name: str, **labels) -> Histogram | None:
+        with self._lock:
+            return self._histograms.get(name, {}).get(_labels(labels))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._operations.clear()
+
+    def record_request(self, method: str, endpoint: str, status: int | None, duration: float,
+                       request_bytes: int = 0, response_bytes: int = 0, retries: int = 0,
+                       error: str | None = None) -> None:
+        """Record one logical client request (all of its attempts)."""
+        labels = {"method": method.upper(), "endpoint": endpoint_template(endpoint)}
+        if error is None:
+            self.inc("requests", help="Completed NAD API requests.", status=str(status), **labels)
+        else:
+            self.inc("request_errors", help="NAD API requests that failed without a response.",
+                     error=error, **labels)
+        if retries:
+            self.inc("request_retries", retries, help="Retries made by the retry policy.", **labels)
+        self.observe("request_duration_seconds", duration,
+                     help="NAD API request latency, including retries.", **labels)
+        self.inc("request_bytes", request_bytes, help="Request body bytes sent.", **labels)
+        self.inc("response_bytes", response_bytes, help="Response body bytes received.", **labels)
+
+    def record_operation_error(self, operation: str, error: str, status: int | None = None) -> None:
+        """Record an API operation that failed with ``error`` (an exception type name)."""
+        label = operation_label(operation)
+        with self._lock:
+            if label not in self._operations:
+                if len(self._operations) >= self.max_operations:
+                    label = "other"
+                else:
+                    self._operations.add(label)
+        self.inc("operation_errors", help="Failed API operations.", operation=label, error=error,
+                 status="" if status is None else str(status))
+
+    def to_openmetrics(self) -> str:
+        """
+        Render all metrics in the OpenMetrics text exposition format.
+
+        Returns:
+            str: Exposition text, terminated by ``# EOF``.
+
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                if name in self._help:
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{full_name}_total{_format_labels(labels)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                if name in self._help:
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{full_name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+                    lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+                    lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 from dataclasses import dataclass
 
 
@@ -8,125 +9,256 @@ class TimeRange:
     start: int
     end: int
 
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+    def split(self, parts: int) -> List["TimeRange"]:
+        """Split into ``parts`` adjacent windows of (almost) equal width.
+
+        Neighbouring windows share their boundary, so queries over them should treat
+        all windows but the last as half-open.
+        """
+        if parts < 1:
+            raise ValueError("parts must be positive")
+        parts = min(parts, max(self.duration, 1))
+        bounds = [self.start + self.duration * i // parts for i in range(parts)] + [self.end]
+        return [TimeRange(low, high) for low, high in zip(bounds, bounds[1:])]
+
+
+# Every field a flow can have, in the order PT NAD documents them
+FLOW_FIELDS: Tuple[str, ...] = (
+    "_prn.id",
+    "_prn.tx_id",
+    "_chld.id",
+    "_chld.type",
+    "proto",
+    "src.ip",
+    "src.port",
+    "src.mac",
+    "src.dns",
+    "src.geo.region",
+    "src.geo.city",
+    "src.geo.country",
+    "src.geo.asn",
+    "src.geo.org",
+    "src.groups",
+    "src.name",
+    "dst.ip",
+    "dst.port",
+    "dst.mac",
+    "dst.dns",
+    "dst.geo.region",
+    "dst.geo.city",
+    "dst.geo.country",
+    "dst.geo.asn",
+    "dst.geo.org",
+    "dst.groups",
+    "dst.name",
+    "host.ip",
+    "host.ip6",
+    "host.port",
+    "host.dns",
+    "host.groups",
+    "host.name",
+    "bytes.total",
+    "bytes.recv",
+    "bytes.sent",
+    "pkts.total",
+    "pkts.recv",
+    "pkts.sent",
+    "state",
+    "flags",
+    "errors",
+    "_reason",
+    "_state",
+    "tcp.flags",
+    "tcp.flags_tc",
+    "tcp.flags_ts",
+    "tcp._state",
+    "start",
+    "end",
+    "app_proto",
+    "app_service",
+    "pcaps",
+    "tunnels.level",
+    "tunnels.type",
+    "tunnels.vlan_id",
+    "tunnels.ip",
+    "tunnels.ip6",
+    "tunnels.endpoints.ip",
+    "tunnels.endpoints.ip6",
+    "tunnels.endpoints.port",
+    "banner.client",
+    "banner.server",
+    "os.client",
+    "os.server",
+    "os_fp.client",
+    "os_fp.server",
+    "os_pt.client",
+    "os_pt.server",
+    "credentials.login",
+    "credentials.password",
+    "credentials.valid",
+    "rpt.where",
+    "rpt.id",
+    "rpt.type",
+    "rpt.cat",
+    "rpt.color",
+    "rpt.verdict",
+    "rpt.rtime",
+    "_ltime",
+    "stag",
+    "_ndx",
+    "id",
+    "_type",
+    "_index",
+    "_sort",
+    "criticality",
+    "false_positive",
+    "has_files",
+)
+_KNOWN_FIELDS = frozenset(FLOW_FIELDS)
+
+
+@lru_cache(maxsize=256)
+def _schema(fields: Tuple[str, ...]) -> Dict[str, int]:
+    """Map each field of a projection to its position in a row; shared by all its flows."""
+    return {name: i for i, name in enumerate(fields)}
+
 
 class Flow:
-    """Flow data model."""
-    
+    """Flow data model.
+
+    A flow keeps only the fields its query selected: a tuple of values plus a
+    schema, shared by every flow of the same projection, that maps field names to
+    positions. Fields are read by their dotted names, as ``flow["src.ip"]`` or
+    ``getattr(flow, "src.ip")``, and plain names also as attributes (``flow.id``).
+    A known field that was not selected reads as None; an unknown one raises.
+
+    Assigning an attribute updates a selected field, and stores any other name
+    with the flow, where item access, ``get()`` and ``to_dict()`` see it too. As
+    before, flows compare and hash by identity; compare ``to_dict()`` to compare
+    their values.
+    """
+
+    # __dict__ is only allocated when an attribute outside the projection is set
+    __slots__ = ("__index", "__values", "__dict__")
+
     def __init__(self, obj: Dict[str, Any]):
         """Initialize Flow from dictionary.
-        
+
         Args:
-            obj: Dictionary with flow data
+            obj: Dictionary with flow data, keyed by dotted field names
         """
-        for field_name in self.get_all_fields():
-            if field_name in obj:
-                setattr(self, field_name, obj[field_name])
-            else:
-                setattr(self, field_name, None)
+        _set_index(self, _schema(tuple(obj)))
+        _set_values(self, tuple(obj.values()))
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any], fields: Sequence[str]) -> 'Flow':
+        """Create Flow instance from a row of values.
+
+        Args:
+            row: Field values, in the order of ``fields``
+            fields: Names of the selected fields
+
+        Returns:
+            Flow instance
+        """
+        return cls.from_rows((row,), fields)[0]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> List['Flow']:
+        """Create Flow instances from rows that share one projection.
+
+        Args:
+            rows: Rows of field values, each in the order of ``fields``
+            fields: Names of the selected fields
+
+        Returns:
+            List of Flow instances
+        """
+        index = _schema(tuple(fields))
+        new = object.__new__
+        flows = []
+        for row in rows:
+            flow = new(cls)
+            _set_index(flow, index)
+            _set_values(flow, tuple(row))
+            flows.append(flow)
+        return flows
 
     @staticmethod
     def get_all_fields() -> List[str]:
         """Get all possible flow fields."""
-        return [
-            "_prn.id",
-            "_prn.tx_id",
-            "_chld.id",
-            "_chld.type",
-            "proto",
-            "src.ip",
-            "src.port",
-            "src.mac",
-            "src.dns",
-            "src.geo.region",
-            "src.geo.city",
-            "src.geo.country",
-            "src.geo.asn",
-            "src.geo.org",
-            "src.groups",
-            "src.name",
-            "dst.ip",
-            "dst.port",
-            "dst.mac",
-            "dst.dns",
-            "dst.geo.region",
-            "dst.geo.city",
-            "dst.geo.country",
-            "dst.geo.asn",
-            "dst.geo.org",
-            "dst.groups",
-            "dst.name",
-            "host.ip",
-            "host.ip6",
-            "host.port",
-            "host.dns",
-            "host.groups",
-            "host.name",
-            "bytes.total",
-            "bytes.recv",
-            "bytes.sent",
-            "pkts.total",
-            "pkts.recv",
-            "pkts.sent",
-            "state",
-            "flags",
-            "errors",
-            "_reason",
-            "_state",
-            "tcp.flags",
-            "tcp.flags_tc",
-            "tcp.flags_ts",
-            "tcp._state",
-            "start",
-            "end",
-            "app_proto",
-            "app_service",
-            "pcaps",
-            "tunnels.level",
-            "tunnels.type",
-            "tunnels.vlan_id",
-            "tunnels.ip",
-            "tunnels.ip6",
-            "tunnels.endpoints.ip",
-            "tunnels.endpoints.ip6",
-            "tunnels.endpoints.port",
-            "banner.client",
-            "banner.server",
-            "os.client",
-            "os.server",
-            "os_fp.client",
-            "os_fp.server",
-            "os_pt.client",
-            "os_pt.server",
-            "credentials.login",
-            "credentials.password",
-            "credentials.valid",
-            "rpt.where",
-            "rpt.id",
-            "rpt.type",
-            "rpt.cat",
-            "rpt.color",
-            "rpt.verdict",
-            "rpt.rtime",
-            "_ltime",
-            "stag",
-            "_ndx",
-            "id",
-            "_type",
-            "_index",
-            "_sort",
-            "criticality",
-            "false_positive",
-            "has_files"
-        ]
+        return list(FLOW_FIELDS)
 
     @classmethod
     def from_dict(cls, dictionary: Dict[str, Any]) -> 'Flow':
         """Create Flow instance from dictionary.
-        
+
         Args:
             dictionary: Dictionary with flow data
-            
+
         Returns:
             Flow instance
         """
-        return cls(dictionary) 
\ No newline at end of file
+        return cls(dictionary)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Names of the fields this flow was built with."""
+        return tuple(self.__index)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get a field by its dotted name, or ``default`` if it was neither selected nor set."""
+        i = self.__index.get(name)
+        if i is not None:
+            return self.__values[i]
+        return self.__dict__.get(name, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the selected fields, and attributes set later, as a dictionary keyed by dotted names."""
+        fields = dict(zip(self.__index, self.__values))
+        fields.update(self.__dict__)
+        return fields
+
+    def __getitem__(self, name: str) -> Any:
+        i = self.__index.get(name)
+        if i is not None:
+            return self.__values[i]
+        extra = self.__dict__
+        if name in extra:
+            return extra[name]
+        if name in _KNOWN_FIELDS:
+            return None
+        raise KeyError(name)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names that are not slots, methods, properties or set attributes
+        if name[:7] == "_Flow__":
+            raise AttributeError(name)
+        i = self.__index.get(name)
+        if i is not None:
+            return self.__values[i]
+        if name in _KNOWN_FIELDS:
+            return None
+        raise AttributeError(f"'Flow' object has no attribute '{name}'")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Private slots are set directly, e.g. while unpickling, before the schema exists
+        i = None if name[:7] == "_Flow__" else self.__index.get(name)
+        if i is None:
+            object.__setattr__(self, name, value)
+            return
+        values = list(self.__values)
+        values[i] = value
+        _set_values(self, tuple(values))
+
+    def __repr__(self) -> str:
+        return f"Flow({self.to_dict()!r})"
+
+
+# Slot setters that bypass Flow.__setattr__
+_set_index = Flow._Flow__index.__set__
+_set_values = Flow._Flow__values.__set__
@@ -0,0 +1,134 @@
+import math
+import threading
+
+
+class AdaptivePlanner:
+    """
+    Sizes BQL pages and time windows from what earlier requests cost.
+
+    Every page records its server time (``took``), its payload size and its row
+    count. From these the planner estimates the cost of a row and picks the next
+    ``LIMIT`` so a request takes about ``target_time`` on the server and returns
+    about ``target_bytes``, whichever is reached first. For windowed reads it also
+    tracks flow density (rows per millisecond of ``end``), starting from a count
+    probe over the whole range, and sizes every window to hold one such page. Wide
+    windows at night and narrow ones at peak hours follow from that.
+
+    Sizes grow by at most ``max_growth`` per request but shrink at once, since an
+    oversized request risks a timeout while an undersized one costs only a round
+    trip. A planner keeps what it learned, so reusing one for the same kind of query
+    skips the ramp-up. It is safe to share between threads.
+
+    Args:
+        target_time (float): Server time per request, in seconds.
+        target_bytes (int): Response payload per request, in bytes.
+        initial_rows (int): Page size before anything has been measured.
+        min_rows (int): Smallest page size.
+        max_rows (int): Largest page size.
+        max_growth (float): Largest factor by which a page or window grows from one
+            request to the next.
+        smoothing (float): Weight of the latest measurement in the running estimates,
+            between 0 (ignore it) and 1 (use only it).
+
+    Example:
+        planner = AdaptivePlanner(target_time=1.0, target_bytes=4 * 1024 * 1024)
+        for row in client.bql.execute_windows(query, time_range, planner=planner):
+            process(row)
+
+    """
+
+    def __init__(self, target_time: float = 2.0, target_bytes: int = 8 * 1024 * 1024,
+                 initial_rows: int = 1000, min_rows: int = 100, max_rows: int = 100_000,
+                 max_growth: float = 4.0, smoothing: float = 0.5) -> None:
+        if not 0 < min_rows <= initial_rows <= max_rows:
+            raise ValueError("Expected 0 < min_rows <= initial_rows <= max_rows")
+        if max_growth <= 1:
+            raise ValueError("max_growth must be greater than 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        self.target_time = target_time
+        self.target_bytes = target_bytes
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.max_growth = max_growth
+        self.smoothing = smoothing
+        self._rows = initial_rows
+        self._time_per_row: float | None = None
+        self._bytes_per_row: float | None = None
+        self._density: float | None = None
+        self._width: int | None = None
+        self._lock = threading.Lock()
+
+    def _smooth(self, estimate: float | None, value: float) -> float:
+        return value if estimate is None else estimate + self.smoothing * (value - estimate)
+
+    def _bounded(self, current: float, wanted: float) -> float:
+        return min(wanted, current * self.max_growth)
+
+    @property
+    def page_size(self) -> int:
+        """Rows to request in the next page."""
+        return self._rows
+
+    @property
+    def density(self) -> float | None:
+        """Estimated flows per millisecond of ``end``; None before a probe or window."""
+        return self._density
+
+    def probe(self, total: int, duration: int | None = None) -> int:
+        """
+        Record a count probe: ``total`` matching rows, over ``duration`` milliseconds
+        of ``end`` when the read is windowed.
+
+        Returns:
+            int: Rows to request in the first page of the probed query, so a result
+            smaller than a page is fetched in a single request. The page size the
+            planner learned is left as it is for the next query.
+
+        """
+        with self._lock:
+            if duration is not None:
+                self._density = total / max(duration, 1)
+                self._width = None
+            return min(self._rows, max(total + 1, self.min_rows))
+
+    def observe(self, rows: int, took: float | None, size: int) -> None:
+        """
+        Record a page of ``rows`` rows that took ``took`` ms on the server and
+        ``size`` bytes in the response, and resize the next page.
+
+        Pages without rows say nothing about the cost of a row and are ignored.
+        """
+        if rows <= 0:
+            return
+        with self._lock:
+            if took is not None:
+                self._time_per_row = self._smooth(self._time_per_row, took / 1000 / rows)
+            self._bytes_per_row = self._smooth(self._bytes_per_row, size / rows)
+            wanted = math.inf
+            if self._time_per_row:
+                wanted = self.target_time / self._time_per_row
+            if self._bytes_per_row:
+                wanted = min(wanted, self.target_bytes / self._bytes_per_row)
+            wanted = self._bounded(self._rows, wanted)
+            self._rows = int(min(max(wanted, self.min_rows), self.max_rows))
+
+    def observe_window(self, rows: int, duration: int) -> None:
+        """Record that a window of ``duration`` milliseconds held ``rows`` rows."""
+        with self._lock:
+            self._density = self._smooth(self._density, rows / max(duration, 1))
+
+    def window_width(self, remaining: int) -> int:
+        """
+        Width in milliseconds of the next window, out of ``remaining`` milliseconds
+        left in the range, sized to hold about one page.
+        """
+        with self._lock:
+            if self._density:
+                wanted = self._rows / self._density
+            else:
+                wanted = remaining
+            if self._width is not None:
+                wanted = self._bounded(self._width, wanted)
+            self._width = max(1, min(int(wanted), remaining))
+            return self._width
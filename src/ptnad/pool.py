@@ -0,0 +1,72 @@
+import socket
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for the client session.
+
+    Attributes:
+        pool_connections: Number of per-host pools to keep.
+        pool_maxsize: Maximum number of connections kept open per host.
+        pool_block: Block when the pool is exhausted instead of opening throwaway connections.
+        keepalive: Enable TCP keep-alive probes on pooled sockets.
+        keepalive_idle: Seconds of idleness before the first keep-alive probe.
+        keepalive_interval: Seconds between keep-alive probes.
+        keepalive_count: Failed probes before the connection is dropped.
+        connect_timeout: Default connect timeout in seconds (None waits forever).
+        read_timeout: Default read timeout in seconds (None waits forever).
+        prewarm: Number of connections to open in parallel right after login (0 disables).
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keepalive: bool = True
+    keepalive_idle: int = 60
+    keepalive_interval: int = 15
+    keepalive_count: int = 4
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    prewarm: int = 0
+
+    @property
+    def timeout(self) -> Tuple[float | None, float | None] | None:
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return (self.connect_timeout, self.read_timeout)
+
+    def socket_options(self) -> List[Tuple[int, int, int]]:
+        options = list(HTTPConnection.default_socket_options)
+        if not self.keepalive:
+            return options
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # TCP_KEEP* constants are platform specific
+        for name, value in (
+            ("TCP_KEEPIDLE", self.keepalive_idle),
+            ("TCP_KEEPINTVL", self.keepalive_interval),
+            ("TCP_KEEPCNT", self.keepalive_count),
+        ):
+            if hasattr(socket, name):
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        return options
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter configured from a :class:`PoolConfig`."""
+
+    def __init__(self, config: PoolConfig, **kwargs) -> None:
+        self.pool_config = config
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+            **kwargs,
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs["socket_options"] = self.pool_config.socket_options()
+        super().init_poolmanager(*args, **kwargs)
@@ -0,0 +1,194 @@
+import hashlib
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, List, Sequence, Tuple
+
+from ptnad.codec import JSONCodec, get_codec
+from ptnad.credentials import default_cache_dir
+
+# Quoted literals are kept as they are; whitespace between other tokens is collapsed
+_TOKENS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\s+|[^'\"\s]+|['\"]")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace outside string literals and drop a trailing semicolon."""
+    parts = [" " if token.isspace() else token for token in _TOKENS.findall(query)]
+    return "".join(parts).strip().rstrip(";").rstrip()
+
+
+class BQLResultCache:
+    """
+    Persistent cache of BQL rows over closed time windows.
+
+    Flows that ended long enough ago no longer change, so rows whose ``end`` lies
+    before ``now - settle`` are stored in an SQLite database, keyed by the NAD
+    server, the source and the normalized query, and read back for any later query
+    that covers the same window. Only the uncovered part of a range and its open
+    tail (flows that ended less than ``settle`` seconds ago) are fetched from the
+    server. See ``BQLAPI.execute_range``.
+
+    Rows are stored in chunks of about ``chunk_rows`` rows, compressed with zlib.
+    Every chunk records the window of ``end`` times it covers completely, and is
+    written in its own transaction, so an interrupted read keeps what it fetched and
+    never leaves a partially stored window behind. Several processes can share one
+    database file.
+
+    Args:
+        path (Optional[str | Path]): Database file; defaults to ``bql.sqlite`` in
+            :func:`ptnad.credentials.default_cache_dir`.
+        settle (float): Seconds after which a flow's ``end`` is considered final.
+            Flows are indexed with a delay, so windows closer to now are never cached.
+        chunk_rows (int): Rows per stored chunk.
+        codec (JSONCodec | str): Codec used to serialize the stored rows.
+        compress_level (int): zlib level of the stored chunks, 0 to store them uncompressed.
+
+    Example:
+        client = PTNADClient(url, bql_cache=BQLResultCache("/var/cache/ptnad/bql.sqlite"))
+        rows = client.bql.execute_range("SELECT src.ip, bytes.total FROM flow", last_24h)
+
+    """
+
+    def __init__(self, path: str | Path | None = None, settle: float = 600.0, chunk_rows: int = 10_000,
+                 codec: JSONCodec | str = "auto", compress_level: int = 1) -> None:
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        # Imported here so that importing the client does not pay for it
+        import sqlite3
+
+        if path is None:
+            directory = default_cache_dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / "bql.sqlite"
+        self.path = str(path)
+        self.settle = settle
+        self.chunk_rows = chunk_rows
+        self.codec = get_codec(codec)
+        self.compress_level = compress_level
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bql_chunks(
+                key TEXT NOT NULL,
+                start INTEGER NOT NULL,
+                end INTEGER NOT NULL,
+                rows INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS bql_chunks_window ON bql_chunks(key, start)")
+
+    @staticmethod
+    def key(base_url: str, source: str, query: str) -> str:
+        """Cache key of a query template (without the window condition) on a server and source."""
+        text = f"{base_url}\0{source}\0{normalize_query(query)}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def closed_before(self) -> int:
+        """Time in milliseconds before which flow ``end`` times are final."""
+        return int((time.time() - self.settle) * 1000)
+
+    def plan(self, key: str, start: int, end: int) -> List[Tuple[int, int, bool]]:
+        """
+        Split the window ``[start, end)`` into pieces that are cached and pieces that
+        must be fetched.
+
+        Returns:
+            List[Tuple[int, int, bool]]: Adjacent ``(start, end, cached)`` pieces in
+            time order, covering the whole window.
+
+        """
+        with self._lock:
+            chunks = self._conn.execute(
+                "SELECT start, end FROM bql_chunks WHERE key = ? AND end > ? AND start < ? ORDER BY start",
+                (key, start, end),
+            ).fetchall()
+        pieces: List[Tuple[int, int, bool]] = []
+        position = start
+        for low, high in chunks:
+            high = min(high, end)
+            if high <= position:
+                continue
+            if low > position:
+                pieces.append((position, low, False))
+                position = low
+            if pieces and pieces[-1][2] and pieces[-1][1] == position:
+                pieces[-1] = (pieces[-1][0], high, True)
+            else:
+                pieces.append((position, high, True))
+            position = high
+        if position < end:
+            pieces.append((position, end, False))
+        return pieces
+
+    def read(self, key: str, start: int, end: int) -> Iterator[Any]:
+        """Yield the cached rows with ``end`` in ``[start, end)``, ordered by ``end`` and ``id``."""
+        with self._lock:
+            chunks = self._conn.execute(
+                "SELECT rowid, start, end FROM bql_chunks WHERE key = ? AND end > ? AND start < ? ORDER BY start",
+                (key, start, end),
+            ).fetchall()
+        # Chunks are loaded one at a time, so memory holds a single chunk
+        for rowid, low, high in chunks:
+            with self._lock:
+                (data,) = self._conn.execute("SELECT data FROM bql_chunks WHERE rowid = ?", (rowid,)).fetchone()
+            ends, rows = self.codec.loads(zlib.decompress(data))
+            if start <= low and high <= end:
+                yield from rows
+            else:
+                yield from (row for flow_end, row in zip(ends, rows) if start <= flow_end < end)
+
+    def store(self, key: str, start: int, end: int, ends: Sequence[int], rows: Sequence[Any]) -> bool:
+        """
+        Store all rows with ``end`` in ``[start, end)``, in ``end``/``id`` order.
+
+        Args:
+            key (str): Cache key from :meth:`key`.
+            start (int): Start of the covered window in milliseconds, inclusive.
+            end (int): End of the covered window in milliseconds, exclusive.
+            ends (Sequence[int]): ``end`` of every row.
+            rows (Sequence[Any]): The rows, as returned by the server.
+
+        Returns:
+            bool: False if another writer already cached part of the window.
+
+        """
+        data = zlib.compress(self.codec.dumps([list(ends), list(rows)]), self.compress_level)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO bql_chunks(key, start, end, rows, data) SELECT ?, ?, ?, ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM bql_chunks WHERE key = ? AND start < ? AND end > ?)",
+                (key, start, end, len(rows), data, key, end, start),
+            )
+            return cursor.rowcount == 1
+
+    def prune(self, before: int) -> int:
+        """
+        Drop chunks that only hold flows which ended before ``before`` (milliseconds).
+
+        Returns:
+            int: Number of dropped chunks.
+
+        """
+        with self._lock:
+            return self._conn.execute("DELETE FROM bql_chunks WHERE end <= ?", (before,)).rowcount
+
+    def clear(self) -> int:
+        """
+        Drop all cached rows.
+
+        Returns:
+            int: Number of dropped chunks.
+
+        """
+        with self._lock:
+            return self._conn.execute("DELETE FROM bql_chunks").rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
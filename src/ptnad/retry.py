@@ -0,0 +1,198 @@
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# POST endpoints that are safe to replay: BQL is read-only, bulk add/delete of
+# dynamic list items are upserts/removals keyed by value, filter compilation has no side effects.
+REPLAYABLE_POST_ENDPOINTS = (
+    r"^bql$",
+    r"^filters/compile$",
+    r"^replists/dynamic/[^/]+/_bulk$",
+    r"^replists/dynamic/[^/]+/_delete$",
+)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (Optional[str]): Header value, either delay-seconds or an HTTP-date.
+
+    Returns:
+        Optional[float]: Delay in seconds, or None if the header is missing or malformed.
+
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Per-client retry budget.
+
+    Every request deposits ``ratio`` tokens (up to ``max_tokens``) and every retry
+    withdraws one, so retries can never exceed roughly ``ratio`` of the traffic and
+    a struggling server is not hammered by a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Retry policy for client requests.
+
+    Clients only retry when given a policy (``retry=True`` or an instance).
+
+    Idempotent methods (GET/PUT/DELETE/...) and the replayable POST endpoints are
+    retried on connection errors and on any status in ``status_forcelist``. Other
+    requests are only retried when the server provably did not process them: the
+    connection could not be established, or the server answered 429/503.
+
+    POST is not idempotent in general, so only the endpoints listed in
+    ``replayable_endpoints`` are replayed after a failure that the server may have
+    processed. By default (:data:`REPLAYABLE_POST_ENDPOINTS`) these are:
+
+    - ``bql`` and ``filters/compile``, which only read data;
+    - ``replists/dynamic/{key}/_bulk`` and ``replists/dynamic/{key}/_delete``, which
+      add or remove items keyed by value, so a replay leaves the same list.
+
+    Pass ``replayable_endpoints=()`` to replay no POST request, or your own list.
+
+    Args:
+        max_retries (int): Maximum number of retries per request.
+        backoff_factor (float): Base delay in seconds, doubled on every attempt.
+        max_backoff (float): Upper bound for a single backoff delay.
+        jitter (bool): Use "full jitter" (random delay between 0 and the backoff).
+        status_forcelist (Iterable[int]): Status codes that trigger a retry.
+        respect_retry_after (bool): Honour the Retry-After header of 429/503 responses.
+        max_retry_after (float): Give up instead of waiting if Retry-After asks for more than this.
+        replayable_endpoints (Iterable[str]): Regexes of POST endpoints that are safe to replay.
+        budget (Optional[RetryBudget]): Retry budget shared by all requests of the client.
+
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        status_forcelist: Iterable[int] = (429, 502, 503, 504),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0,
+        replayable_endpoints: Iterable[str] = REPLAYABLE_POST_ENDPOINTS,
+        budget: RetryBudget | None = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self._replayable = [re.compile(pattern) for pattern in replayable_endpoints]
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_replayable(self, method: str, endpoint: str) -> bool:
+        """Check whether a request may be sent twice without changing the outcome."""
+        method = method.upper()
+        if method in IDEMPOTENT_METHODS:
+            return True
+        path = endpoint.strip("/").split("?", 1)[0]
+        return method == "POST" and any(pattern.match(path) for pattern in self._replayable)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff delay for the given attempt number (starting at 0)."""
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        status_code: int | None = None,
+        retry_after: str | None = None,
+        connect_error: bool = False,
+    ) -> float | None:
+        """
+        Decide whether a failed request should be retried.
+
+        Args:
+            method (str): HTTP method of the request.
+            endpoint (str): Endpoint relative to the API base URL.
+            attempt (int): Number of retries already made.
+            status_code (Optional[int]): Status of the failed response, None for transport errors.
+            retry_after (Optional[str]): Raw Retry-After header of the response.
+            connect_error (bool): True if the request failed before it reached the server.
+
+        Returns:
+            Optional[float]: Delay in seconds before the next attempt, or None to give up.
+
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if status_code is None:
+            retryable = connect_error or self.is_replayable(method, endpoint)
+        elif status_code not in self.status_forcelist:
+            retryable = False
+        else:
+            retryable = status_code in (429, 503) or self.is_replayable(method, endpoint)
+        if not retryable:
+            return None
+
+        delay = self.backoff(attempt)
+        if self.respect_retry_after and status_code in (429, 503):
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                if server_delay > self.max_retry_after:
+                    return None
+                delay = max(delay, server_delay)
+
+        if not self.budget.withdraw():
+            return None
+        return delay
+
+    def sleep(self, delay: float) -> None:
+        time.sleep(delay)
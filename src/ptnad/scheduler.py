@@ -0,0 +1,296 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, List, TypeVar
+
+from ptnad.cache import is_write
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a request; lower values are served first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+# None means no priority was chosen, so method defaults (with_priority) may apply
+_priority: contextvars.ContextVar[Priority | None] = contextvars.ContextVar("ptnad_priority", default=None)
+
+F = TypeVar("F", bound=Callable)
+
+
+def current_priority() -> Priority:
+    """Priority of the requests made from the current context."""
+    level = _priority.get()
+    return Priority.NORMAL if level is None else level
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """
+    Run the requests made inside the block with the given priority.
+
+    Overrides the default priority of API methods called inside the block.
+
+    Example:
+        with priority(Priority.BACKGROUND):
+            client.hosts.get_host("10.0.0.1")
+
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def with_priority(level: Priority) -> Callable[[F], F]:
+    """
+    Decorator that gives a function, or every step of a generator, a default priority.
+
+    The default only applies when the caller has not chosen a priority with
+    :func:`priority`. Generators get special handling because they run in their
+    caller's context: the priority is set around each resumption instead of leaking
+    to the caller between yields.
+    """
+    def decorator(func: F) -> F:
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                chosen = _priority.get()
+                gen = func(*args, **kwargs)
+                try:
+                    while True:
+                        token = _priority.set(level if chosen is None else chosen)
+                        try:
+                            item = next(gen)
+                        except StopIteration:
+                            return
+                        finally:
+                            _priority.reset(token)
+                        yield item
+                finally:
+                    gen.close()
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _priority.get() is not None:
+                return func(*args, **kwargs)
+            with priority(level):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def endpoint_class(method: str, endpoint: str) -> str:
+    """
+    Classify a request for rate limiting.
+
+    Returns:
+        str: ``"bql"`` for BQL queries, ``"bulk"`` for bulk dynamic replist writes,
+        ``"write"`` for other writes and ``"read"`` for everything else.
+
+    """
+    path = endpoint.strip("/").split("?", 1)[0]
+    if path == "bql":
+        return "bql"
+    if path.startswith("replists/dynamic/") and path.endswith(("/_bulk", "/_delete")):
+        return "bulk"
+    return "write" if is_write(method, endpoint) else "read"
+
+
+@dataclass
+class Limit:
+    """Limits of one endpoint class.
+
+    Attributes:
+        rate: Sustained requests per second (None for no rate limit).
+        burst: Requests that may be sent back to back before ``rate`` applies.
+        concurrency: Maximum requests in flight (None for no limit).
+    """
+    rate: float | None = None
+    burst: int = 1
+    concurrency: int | None = None
+
+
+DEFAULT_LIMITS = {
+    "bql": Limit(concurrency=4),
+    "bulk": Limit(rate=5, burst=2, concurrency=2),
+    "write": Limit(),
+    "read": Limit(),
+}
+
+
+# Longest a queued request sleeps before it checks the queue again
+_MAX_WAIT = 1.0
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst`` tokens. Not thread-safe."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+
+class _Waiter:
+    __slots__ = ("key", "cls", "granted")
+
+    def __init__(self, key, cls: str) -> None:
+        self.key = key
+        self.cls = cls
+        self.granted = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.key < other.key
+
+
+class RequestScheduler:
+    """
+    Rate and concurrency limiter with priority queues for client requests.
+
+    Each endpoint class (see :func:`endpoint_class`) has its own :class:`Limit`.
+    Requests that cannot be sent right away wait in a queue ordered by
+    :class:`Priority`, then arrival, so interactive lookups overtake queued
+    background work. Priority comes from the calling context: see :func:`priority`
+    and :func:`with_priority`. Long-running bulk methods of the API namespaces
+    (``get_all_hosts``, ``bulk_add_items``, ...) already run as ``BACKGROUND``.
+
+    Args:
+        limits (Optional[Dict[str, Limit]]): Limits per endpoint class, merged over
+            :data:`DEFAULT_LIMITS`.
+        max_concurrency (Optional[int]): Maximum requests in flight across all classes.
+            When it is reached, slots are handed out strictly by priority.
+
+    Example:
+        scheduler = RequestScheduler({"bulk": Limit(rate=2, concurrency=1)}, max_concurrency=8)
+        client = PTNADClient("https://1.3.3.7", scheduler=scheduler)
+
+    """
+
+    def __init__(self, limits: Dict[str, Limit] | None = None, max_concurrency: int | None = None) -> None:
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.max_concurrency = max_concurrency
+        self._buckets = {cls: TokenBucket(limit.rate, limit.burst)
+                         for cls, limit in self.limits.items() if limit.rate}
+        self._active: Dict[str, int] = {cls: 0 for cls in self.limits}
+        self._total_active = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._next_token: float | None = None
+
+    def in_flight(self, cls: str | None = None) -> int:
+        with self._cond:
+            return self._total_active if cls is None else self._active.get(cls, 0)
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def acquire(self, cls: str, level: Priority | None = None) -> float:
+        """
+        Block until a request of class ``cls`` may be sent.
+
+        Args:
+            cls (str): Endpoint class.
+            level (Optional[Priority]): Priority; defaults to :func:`current_priority`.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        """
+        if level is None:
+            level = current_priority()
+        started = time.monotonic()
+        with self._cond:
+            self._active.setdefault(cls, 0)
+            self.limits.setdefault(cls, Limit())
+            waiter = _Waiter((int(level), next(self._seq)), cls)
+            bisect.insort(self._queue, waiter)
+            try:
+                self._dispatch()
+                while not waiter.granted:
+                    # Bounded, so that a missed notification costs a delay rather than a hang
+                    timeout = _MAX_WAIT if self._next_token is None else min(self._next_token, _MAX_WAIT)
+                    self._cond.wait(timeout=timeout)
+                    self._dispatch()
+            except BaseException:
+                # Interrupted while queued: give the slot back or leave the queue
+                if waiter.granted:
+                    self._active[cls] -= 1
+                    self._total_active -= 1
+                    self._dispatch()
+                else:
+                    self._queue.remove(waiter)
+                raise
+        return time.monotonic() - started
+
+    def release(self, cls: str) -> None:
+        """Mark a request of class ``cls`` as finished."""
+        with self._cond:
+            self._active[cls] -= 1
+            self._total_active -= 1
+            self._dispatch()
+            # Waiters recompute their token deadlines even when no slot was granted
+            self._cond.notify_all()
+
+    def _dispatch(self) -> None:
+        """Grant slots to queued waiters in priority order. Must hold the lock."""
+        blocked = set()
+        granted = False
+        self._next_token = None
+        for waiter in self._queue:
+            if self.max_concurrency is not None and self._total_active >= self.max_concurrency:
+                break
+            if waiter.cls in blocked:
+                continue
+            limit = self.limits[waiter.cls]
+            if limit.concurrency is not None and self._active[waiter.cls] >= limit.concurrency:
+                blocked.add(waiter.cls)
+                continue
+            bucket = self._buckets.get(waiter.cls)
+            if bucket is not None:
+                if bucket.delay() > 0:
+                    blocked.add(waiter.cls)
+                    continue
+                bucket.take()
+            waiter.granted = True
+            granted = True
+            self._active[waiter.cls] += 1
+            self._total_active += 1
+        if granted:
+            self._queue = [waiter for waiter in self._queue if not waiter.granted]
+            self._cond.notify_all()
+        # Earliest refill among the classes still queued, including those that wait
+        # for a concurrency slot, so waiters wake up when a token becomes available
+        for cls in {waiter.cls for waiter in self._queue}:
+            bucket = self._buckets.get(cls)
+            if bucket is not None:
+                delay = bucket.delay()
+                if delay > 0:
+                    self._next_token = delay if self._next_token is None else min(self._next_token, delay)
@@ -0,0 +1,120 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from ptnad.cache import ResponseCache, is_write
+
+
+def request_key(method: str, endpoint: str, kwargs: Dict[str, Any],
+                dumps: Callable[[Any], bytes]) -> Hashable | None:
+    """
+    Build the coalescing key of a request, or None if it must not be shared.
+
+    Only reads are coalesced: non-streamed GET requests and POSTs to read-only
+    endpoints such as ``/bql`` whose body is bytes, a string or JSON. Both the
+    ``requests`` (``data=``) and ``httpx`` (``content=``) body arguments are understood.
+
+    Args:
+        method (str): HTTP method.
+        endpoint (str): Endpoint relative to the API base URL.
+        kwargs (Dict[str, Any]): Keyword arguments of the request call.
+        dumps (Callable[[Any], bytes]): Encoder for ``json=`` bodies.
+
+    Returns:
+        Optional[Hashable]: Key shared by identical requests.
+
+    """
+    method = method.upper()
+    if kwargs.get("stream") or kwargs.get("files"):
+        return None
+    if method != "GET" and (method != "POST" or is_write(method, endpoint)):
+        return None
+    if "json" in kwargs:
+        body = dumps(kwargs["json"])
+    else:
+        body = kwargs.get("data", kwargs.get("content"))
+        if body is not None and not isinstance(body, (bytes, str)):
+            return None
+    path, query = ResponseCache.key(endpoint, kwargs.get("params"))
+    headers = tuple(sorted((kwargs.get("headers") or {}).items()))
+    return (method, path, query, body, headers)
+
+
+def copy_response(response: Any) -> Any:
+    """
+    Give a caller its own copy of a shared, fully read response.
+
+    The body is immutable and shared; headers are copied, so one caller changing
+    the response does not affect the others. Works for ``requests`` and ``httpx``
+    responses.
+    """
+    clone = copy.copy(response)
+    clone.headers = response.headers.copy()
+    return clone
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between threads that ask for the same key.
+
+    The first caller of :meth:`do` for a key runs the function; callers arriving
+    while it is running wait for it and receive the same result or exception.
+    Nothing is remembered once the call has finished, so this never serves stale
+    data (see :class:`ptnad.cache.ResponseCache` for that).
+
+    Attributes:
+        shared (int): Number of calls that were served by another caller's request.
+    """
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` unless an identical call is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call.
+            fn (Callable[[], Any]): Function performing the call.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared with another caller.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
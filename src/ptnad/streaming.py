@@ -0,0 +1,229 @@
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from ptnad.exceptions import PTNADAPIError
+
+
+_WHITESPACE = b" \t\r\n"
+_SCALAR_END = b",]} \t\r\n"
+_OPEN = {ord("{"), ord("[")}
+_CLOSE = {ord("}"), ord("]")}
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+# A complete string, a bracket, or a lone quote that starts an incomplete string
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]|"', re.DOTALL)
+
+# Drop consumed bytes from the buffer once this many have accumulated
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class StreamDecodeError(PTNADAPIError):
+    """Raised when a streamed response is not the JSON document it was expected to be."""
+
+
+def _scan_string(buf: bytearray, pos: int) -> int | None:
+    """Return the index right after the string starting at ``pos``, or None if incomplete."""
+    i = pos + 1
+    end = len(buf)
+    while i < end:
+        quote = buf.find(b'"', i)
+        if quote == -1:
+            return None
+        # Count the backslashes in front of the quote to tell escaped quotes apart
+        backslashes = 0
+        j = quote - 1
+        while j > pos and buf[j] == _BACKSLASH:
+            backslashes += 1
+            j -= 1
+        if backslashes % 2 == 0:
+            return quote + 1
+        i = quote + 1
+    return None
+
+
+def _scan_value(buf: bytearray, pos: int, final: bool) -> int | None:
+    """Return the index right after the JSON value starting at ``pos``, or None if incomplete."""
+    first = buf[pos]
+    if first == _QUOTE:
+        return _scan_string(buf, pos)
+    if first in _OPEN:
+        depth = 0
+        i = pos
+        while True:
+            match = _TOKEN.search(buf, i)
+            if match is None:
+                return None
+            i = match.end()
+            c = buf[match.start()]
+            if c == _QUOTE:
+                if i - match.start() == 1:
+                    # A lone quote means the string is cut off at the end of the buffer
+                    return None
+                continue
+            depth += 1 if c in _OPEN else -1
+            if depth == 0:
+                return i
+    i = pos
+    while i < len(buf) and buf[i] not in _SCALAR_END:
+        i += 1
+    if i == len(buf) and not final:
+        return None
+    return i
+
+
+class JSONArrayStream:
+    """
+    Incrementally decode the array stored under ``key`` of a top-level JSON object.
+
+    Array elements are yielded one at a time as soon as their bytes have arrived, so
+    memory is bounded by the size of one element rather than the whole response. The
+    other top-level members (``total``, ``next``, ``error``, ...) are collected into
+    :attr:`fields`, which is complete once iteration has finished.
+
+    Args:
+        chunks (Iterable[bytes]): Raw response body chunks, e.g. ``response.iter_content()``.
+        key (str): Name of the array member to stream.
+        loads (Callable[[bytes], Any]): Decoder used for each element and field.
+
+    """
+
+    def __init__(self, chunks: Iterable[bytes], key: str,
+                 loads: Callable[[bytes], Any] = json.loads) -> None:
+        self.chunks = iter(chunks)
+        self.key = key
+        self.loads = loads
+        self.fields: Dict[str, Any] = {}
+        self._buf = bytearray()
+        self._pos = 0
+        self._final = False
+
+    def _fill(self) -> bool:
+        """Read one more chunk into the buffer. Returns False at end of stream."""
+        if self._final:
+            return False
+        if self._pos > _COMPACT_THRESHOLD:
+            del self._buf[:self._pos]
+            self._pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self._buf += chunk
+                return True
+        self._final = True
+        return False
+
+    def _skip_ws(self) -> None:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _expect(self, allowed: bytes) -> int:
+        self._skip_ws()
+        if self._pos >= len(self._buf):
+            raise StreamDecodeError("Unexpected end of streamed JSON response")
+        c = self._buf[self._pos]
+        if c not in allowed:
+            raise StreamDecodeError(
+                f"Unexpected character {chr(c)!r} at offset {self._pos} of streamed JSON response"
+            )
+        self._pos += 1
+        return c
+
+    def _read_value(self) -> bytes:
+        self._skip_ws()
+        while True:
+            if self._pos >= len(self._buf):
+                raise StreamDecodeError("Unexpected end of streamed JSON response")
+            end = _scan_value(self._buf, self._pos, self._final)
+            if end is not None:
+                value = bytes(self._buf[self._pos:end])
+                self._pos = end
+                return value
+            if not self._fill():
+                end = _scan_value(self._buf, self._pos, True)
+                if end is None:
+                    raise StreamDecodeError("Unexpected end of streamed JSON response")
+
+    def _read_batch(self) -> tuple[list, bool]:
+        """
+        Decode every array element already buffered, with at least one element.
+
+        Elements are decoded together in a single ``loads`` call, which is much cheaper
+        than one call per row. Returns the elements and whether the array has ended.
+        """
+        start = self._pos
+        buf = self._buf
+        end = None
+        done = False
+        while True:
+            # Skip whitespace inline; the buffer must not be refilled mid-batch
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            value_end = _scan_value(buf, pos, self._final) if pos < len(buf) else None
+            if value_end is None:
+                break
+            sep = value_end
+            while sep < len(buf) and buf[sep] in _WHITESPACE:
+                sep += 1
+            if sep >= len(buf):
+                break
+            if buf[sep] not in b",]":
+                raise StreamDecodeError(
+                    f"Unexpected character {chr(buf[sep])!r} at offset {sep} of streamed JSON response"
+                )
+            end = value_end
+            self._pos = sep + 1
+            if buf[sep] == ord("]"):
+                done = True
+                break
+        if end is None:
+            # Not even one complete element is buffered: fall back to the refilling path
+            value = self.loads(self._read_value())
+            return [value], self._expect(b",]") == ord("]")
+        return self.loads(b"[" + bytes(buf[start:end]) + b"]"), done
+
+    def __iter__(self) -> Iterator[Any]:
+        self._expect(b"{")
+        self._skip_ws()
+        if self._pos < len(self._buf) and self._buf[self._pos] == ord("}"):
+            self._pos += 1
+            return
+        while True:
+            name = self.loads(self._read_value())
+            self._expect(b":")
+            self._skip_ws()
+            if name == self.key and self._pos < len(self._buf) and self._buf[self._pos] == ord("["):
+                self._pos += 1
+                self._skip_ws()
+                if self._buf[self._pos:self._pos + 1] == b"]":
+                    self._pos += 1
+                else:
+                    done = False
+                    while not done:
+                        batch, done = self._read_batch()
+                        yield from batch
+            else:
+                self.fields[name] = self.loads(self._read_value())
+            if self._expect(b",}") == ord("}"):
+                return
+
+
+def stream_array(response: Any, key: str, chunk_size: int = 64 * 1024,
+                 loads: Callable[[bytes], Any] = json.loads) -> JSONArrayStream:
+    """
+    Wrap a ``stream=True`` response into a :class:`JSONArrayStream`.
+
+    Args:
+        response: Streaming HTTP response.
+        key (str): Name of the array member to stream.
+        chunk_size (int): Size of the chunks read from the socket.
+        loads (Callable[[bytes], Any]): Decoder used for each element and field.
+
+    Returns:
+        JSONArrayStream: Iterable of array elements.
+
+    """
+    return JSONArrayStream(response.iter_content(chunk_size=chunk_size), key, loads=loads)
@@ -0,0 +1,385 @@
+import base64
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, MutableMapping, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+
+# Latency injection: a fixed delay in seconds, or a function of the request
+Latency = float | Callable[["TransportRequest"], float] | None
+
+# Headers that describe the wire encoding of a recorded body, which is stored decoded
+_WIRE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+# Request headers that are never written to a cassette
+_SECRET_HEADERS = frozenset({"authorization", "cookie", "x-csrftoken"})
+# Body fields that carry credentials: left out of request keys, masked in recorded responses
+_SECRET_FIELDS = frozenset({"password", "client_secret", "refresh_token", "access_token", "id_token",
+                            "token", "apikey", "api_key"})
+# Login and token exchanges are small; larger bodies are not inspected for credentials
+_CREDENTIAL_BODY_LIMIT = 64 * 1024
+_REDACTED = "redacted"
+_COOKIE_VALUE = re.compile(r"^(\s*[^=;]+=)[^;]*")
+
+
+@dataclass
+class TransportRequest:
+    """Request as seen by in-memory handlers and latency functions."""
+    method: str
+    url: str
+    path: str
+    query: Dict[str, str]
+    headers: MutableMapping[str, str]
+    body: bytes = b""
+    params: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def content(self) -> bytes:
+        """The body with request compression undone."""
+        encoding = self.headers.get("Content-Encoding", "").lower()
+        if encoding == "gzip":
+            return gzip.decompress(self.body)
+        if encoding == "deflate":
+            return zlib.decompress(self.body)
+        return self.body
+
+    def json(self) -> Any:
+        """Decode the JSON body."""
+        body = self.content
+        return json.loads(body) if body else None
+
+    @property
+    def body_hash(self) -> str:
+        return hashlib.sha256(self.body).hexdigest()
+
+
+def _transport_request(prepared) -> TransportRequest:
+    url = prepared.url.decode() if isinstance(prepared.url, bytes) else prepared.url
+    parts = urlsplit(url)
+    body = prepared.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    elif not isinstance(body, bytes):
+        body = b"".join(chunk if isinstance(chunk, bytes) else chunk.encode() for chunk in body)
+    return TransportRequest(
+        method=prepared.method.upper(),
+        url=url,
+        path=parts.path,
+        query=dict(parse_qsl(parts.query, keep_blank_values=True)),
+        headers=CaseInsensitiveDict(prepared.headers),
+        body=body,
+    )
+
+
+class _OriginalResponse:
+    """Enough of ``http.client.HTTPResponse`` for requests to read Set-Cookie headers."""
+
+    def __init__(self, headers: List[Tuple[str, str]]) -> None:
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+
+    def isclosed(self) -> bool:
+        return True
+
+
+class Transport(BaseAdapter):
+    """
+    Base class for transports that answer requests without a network.
+
+    A transport is a ``requests`` adapter, so it slots in under the whole client
+    pipeline (retries, metrics, cookies, streaming). Pass one to
+    ``PTNADClient(transport=...)``.
+
+    Args:
+        latency (Optional[float | Callable[[TransportRequest], float]]): Delay injected
+            before every response, in seconds.
+
+    """
+
+    def __init__(self, latency: Latency = None) -> None:
+        super().__init__()
+        self.latency = latency
+
+    def handle(self, request: TransportRequest) -> Tuple[int, bytes, List[Tuple[str, str]]]:
+        """Produce ``(status, body, headers)`` for a request."""
+        raise NotImplementedError
+
+    def delay(self, request: TransportRequest) -> float:
+        if self.latency is None:
+            return 0.0
+        return self.latency(request) if callable(self.latency) else float(self.latency)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        transport_request = _transport_request(request)
+        status, body, headers = self.handle(transport_request)
+        delay = self.delay(transport_request)
+        if delay > 0:
+            time.sleep(delay)
+        return self.build_response(request, status, body, headers)
+
+    def build_response(self, request, status: int, body: bytes, headers: List[Tuple[str, str]]):
+        headers = [(name, value) for name, value in headers if name.lower() not in _WIRE_HEADERS]
+        headers.append(("Content-Length", str(len(body))))
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status,
+            reason=http.client.responses.get(status, ""),
+            preload_content=False,
+            decode_content=False,
+            original_response=_OriginalResponse(headers),
+        )
+        return HTTPAdapter.build_response(self, request, raw)
+
+    def close(self) -> None:
+        pass
+
+
+def _encode_body(body: Any) -> Tuple[bytes, List[Tuple[str, str]]]:
+    if isinstance(body, bytes):
+        return body, []
+    if isinstance(body, str):
+        return body.encode(), [("Content-Type", "text/plain; charset=utf-8")]
+    return json.dumps(body).encode(), [("Content-Type", "application/json")]
+
+
+class MemoryTransport(Transport):
+    """
+    Transport that routes requests to Python handler functions.
+
+    Handlers receive a :class:`TransportRequest` (with the named groups of the route
+    pattern in ``request.params``) and return either a JSON-serializable value
+    (sent with status 200), ``(status, body)`` or ``(status, body, headers)``, where
+    ``body`` is bytes, a string or a JSON-serializable value. Requests matching no
+    route get a 404.
+
+    Example:
+        transport = MemoryTransport()
+
+        @transport.route("GET", r"/api/v2/hosts/(?P<ip>[^/]+)")
+        def host(request):
+            return {"ip": request.params["ip"]}
+
+        client = PTNADClient("https://nad.test", transport=transport)
+
+    """
+
+    def __init__(self, latency: Latency = None) -> None:
+        super().__init__(latency)
+        self.routes: List[Tuple[str, re.Pattern, Callable[[TransportRequest], Any]]] = []
+        self.calls: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def route(self, method: str, pattern: str) -> Callable[[Callable], Callable]:
+        """Register a handler for a method (``"*"`` for any) and a full-match path pattern."""
+        def decorator(handler: Callable[[TransportRequest], Any]) -> Callable[[TransportRequest], Any]:
+            self.add_route(method, pattern, handler)
+            return handler
+        return decorator
+
+    def add_route(self, method: str, pattern: str, handler: Callable[[TransportRequest], Any]) -> None:
+        self.routes.append((method.upper(), re.compile(pattern), handler))
+
+    def handle(self, request: TransportRequest) -> Tuple[int, bytes, List[Tuple[str, str]]]:
+        for method, pattern, handler in self.routes:
+            if method not in ("*", request.method):
+                continue
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            self.calls[(request.method, pattern.pattern)] += 1
+            request.params = match.groupdict()
+            result = handler(request)
+            status, body, headers = 200, result, []
+            if isinstance(result, tuple):
+                status, body, *rest = result
+                headers = list(rest[0].items() if isinstance(rest[0], dict) else rest[0]) if rest else []
+            encoded, default_headers = _encode_body(body)
+            names = {name.lower() for name, _ in headers}
+            return status, encoded, headers + [h for h in default_headers if h[0].lower() not in names]
+        body = json.dumps({"detail": f"No route for {request.method} {request.path}"}).encode()
+        return 404, body, [("Content-Type", "application/json")]
+
+
+def _credential_fields(request: TransportRequest) -> Dict[str, Any] | None:
+    """Fields of a JSON or form body that contains credentials, None for any other body."""
+    if not request.body or len(request.body) > _CREDENTIAL_BODY_LIMIT:
+        return None
+    content_type = request.headers.get("Content-Type", "").lower()
+    try:
+        if "json" in content_type:
+            fields = json.loads(request.content)
+        elif "x-www-form-urlencoded" in content_type:
+            fields = dict(parse_qsl(request.content.decode(), keep_blank_values=True))
+        else:
+            return None
+    except (ValueError, OSError):
+        return None
+    if not isinstance(fields, dict) or not _SECRET_FIELDS.intersection(fields):
+        return None
+    return fields
+
+
+def _request_key(request: TransportRequest) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query.items()))
+    fields = _credential_fields(request)
+    if fields is None:
+        body = request.body_hash
+    else:
+        # Hash login and token requests without their secrets: a hash of a body with a
+        # password in it would let anyone holding the cassette check guessed passwords
+        public = {name: value for name, value in fields.items() if name not in _SECRET_FIELDS}
+        body = hashlib.sha256(json.dumps(public, sort_keys=True).encode()).hexdigest()
+    return f"{request.method} {request.path}?{query} {body}"
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {name: _REDACTED if name in _SECRET_FIELDS and isinstance(item, str) else _redact(item)
+                for name, item in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _redact_body(body: bytes, headers: List[Tuple[str, str]]) -> bytes:
+    """Replace token values in a small JSON response body with placeholders."""
+    content_type = next((value for name, value in headers if name.lower() == "content-type"), "")
+    if "json" not in content_type.lower() or len(body) > _CREDENTIAL_BODY_LIMIT:
+        return body
+    try:
+        decoded = json.loads(body)
+    except ValueError:
+        return body
+    redacted = _redact(decoded)
+    return body if redacted == decoded else json.dumps(redacted).encode()
+
+
+def _redact_headers(headers: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Replace the values of cookies set by the server with placeholders, keeping their attributes."""
+    return [(name, _COOKIE_VALUE.sub(lambda m: m.group(1) + _REDACTED, value) if name.lower() == "set-cookie"
+             else value) for name, value in headers]
+
+
+class RecordingTransport(Transport):
+    """
+    Transport that forwards requests to a real adapter and records the exchanges.
+
+    Every exchange is appended to ``cassette`` as one JSON line, with response
+    bodies stored decoded. Credentials are kept out of the cassette:
+
+    - credential request headers (``Authorization``, ``Cookie``, ``X-CSRFToken``) are
+      left out;
+    - request bodies are stored only as a SHA-256 hash, and for login and token
+      requests the hash is taken without the password, client secret and tokens,
+      so it cannot be used to confirm a guessed password;
+    - token fields in JSON responses (``access_token``, ``refresh_token``, ...) and
+      the values of cookies set by the server are replaced with the placeholder
+      ``"redacted"``, which replay returns in their place. Clients accept any
+      session cookie or token from a replay, so replays still work.
+
+    Args:
+        cassette (str | Path): JSON-lines file to append to.
+        adapter (Optional[BaseAdapter]): Adapter that talks to the server; a plain
+            ``HTTPAdapter`` by default.
+
+    """
+
+    def __init__(self, cassette: str | Path, adapter: BaseAdapter | None = None) -> None:
+        super().__init__()
+        self.cassette = Path(cassette)
+        self.adapter = adapter or HTTPAdapter()
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        transport_request = _transport_request(request)
+        started = time.perf_counter()
+        response = self.adapter.send(request, stream=False, timeout=timeout, verify=verify,
+                                     cert=cert, proxies=proxies)
+        body = response.content
+        elapsed = time.perf_counter() - started
+        headers = [(name, value) for name, value in response.raw.headers.items()]
+        recorded_headers = _redact_headers(headers)
+        entry = {
+            "key": _request_key(transport_request),
+            "method": transport_request.method,
+            "path": transport_request.path,
+            "request_headers": {name: value for name, value in transport_request.headers.items()
+                                if name.lower() not in _SECRET_HEADERS},
+            "status": response.status_code,
+            "headers": [[name, value] for name, value in recorded_headers if name.lower() not in _WIRE_HEADERS],
+            "body": base64.b64encode(_redact_body(body, headers)).decode(),
+            "elapsed": elapsed,
+        }
+        with self._lock:
+            self.cassette.parent.mkdir(parents=True, exist_ok=True)
+            with self.cassette.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return self.build_response(request, response.status_code, body, headers)
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Transport that answers requests from a cassette written by :class:`RecordingTransport`.
+
+    Requests are matched on method, path, query and body hash. Identical requests get
+    the recorded responses in recording order; once those are used up the last one is
+    repeated, so replays are deterministic. Unmatched requests get a 404.
+
+    Args:
+        cassette (str | Path): JSON-lines file to replay.
+        latency (Optional[float | Callable[[TransportRequest], float] | str]): Delay
+            injected before every response. ``"recorded"`` replays the latency measured
+            during recording, multiplied by ``speed``.
+        speed (float): Scale factor for ``latency="recorded"``; 0.5 halves the delays.
+
+    """
+
+    def __init__(self, cassette: str | Path, latency: Latency | str = None, speed: float = 1.0) -> None:
+        super().__init__(None if latency == "recorded" else latency)
+        self.replay_latency = latency == "recorded"
+        self.speed = speed
+        self._exchanges: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        with Path(cassette).open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._exchanges[entry["key"]].append(entry)
+
+    def _next(self, request: TransportRequest) -> Dict[str, Any] | None:
+        key = _request_key(request)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            return self._last.get(key)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        transport_request = _transport_request(request)
+        entry = self._next(transport_request)
+        if entry is None:
+            body = json.dumps({"detail": f"No recorded exchange for {transport_request.method} "
+                                         f"{transport_request.path}"}).encode()
+            return self.build_response(request, 404, body, [("Content-Type", "application/json")])
+        delay = entry["elapsed"] * self.speed if self.replay_latency else self.delay(transport_request)
+        if delay > 0:
+            time.sleep(delay)
+        headers = [(name, value) for name, value in entry["headers"]]
+        return self.build_response(request, entry["status"], base64.b64decode(entry["body"]), headers)
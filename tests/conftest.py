@@ -0,0 +1,32 @@
+import threading
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.emulator import EmulatorConfig, NADEmulator, serve
+
+START = 1_700_000_000_000
+
+
+@pytest.fixture
+def emulator():
+    return NADEmulator(EmulatorConfig(flows=1000, hosts=50, rules=50, replists=4, replist_items=20,
+                                      username="u", password="p", start=START, span=1000))
+
+
+@pytest.fixture
+def client(emulator):
+    client = PTNADClient("https://nad.test", transport=emulator)
+    client.set_auth(username="u", password="p")
+    client.login()
+    return client
+
+
+@pytest.fixture
+def server(emulator):
+    server = serve(emulator, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
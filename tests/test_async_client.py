@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.aio import AsyncPTNADClient
+from ptnad.circuit import CircuitBreaker
+from ptnad.exceptions import CircuitOpenError, PTNADAPIError
+from ptnad.retry import RetryPolicy
+
+
+def mocked(handler, **kwargs):
+    client = AsyncPTNADClient("https://nad.test", **kwargs)
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def sync_calls(client):
+    results = {
+        "status": client.monitoring.get_status().status,
+        "triggers": [trigger.id for trigger in client.monitoring.get_triggers()],
+        "bql": client.bql.execute("SELECT id, end FROM flow LIMIT 5"),
+        "raw": client.bql.execute_raw("SELECT id FROM flow LIMIT 2").result,
+        "hosts": len(client.hosts.get_all_hosts(limit=20)),
+        "host": client.hosts.get_host("7")["hostname"],
+        "lists": [replist["id"] for replist in client.replists.get_all_lists(limit=2)],
+        "rules": [rule["sid"] for rule in client.signatures.get_rules(limit=5)],
+        "classes": len(client.signatures.get_classes()),
+        "sources": [source["id"] for source in client.sources.get_sources()],
+    }
+    key = client.replists.get_all_lists()[0]["external_key"]
+    client.replists.bulk_add_items(key, [{"value": "9.9.9.9"}])
+    results["items"] = len(client.replists.get_dynamic_list_items(key))
+    client.replists.bulk_delete_items(key, ["9.9.9.9"])
+    with pytest.raises(PTNADAPIError) as info:
+        client.sensors.get_sensor(1)
+    results["error"] = (info.value.status_code, info.value.operation)
+    return results
+
+
+async def async_calls(client):
+    results = {
+        "status": (await client.monitoring.get_status()).status,
+        "triggers": [trigger.id for trigger in await client.monitoring.get_triggers()],
+        "bql": await client.bql.execute("SELECT id, end FROM flow LIMIT 5"),
+        "raw": (await client.bql.execute_raw("SELECT id FROM flow LIMIT 2")).result,
+        "hosts": len(await client.hosts.get_all_hosts(limit=20)),
+        "host": (await client.hosts.get_host("7"))["hostname"],
+        "lists": [replist["id"] for replist in await client.replists.get_all_lists(limit=2)],
+        "rules": [rule["sid"] for rule in await client.signatures.get_rules(limit=5)],
+        "classes": len(await client.signatures.get_classes()),
+        "sources": [source["id"] for source in await client.sources.get_sources()],
+    }
+    key = (await client.replists.get_all_lists())[0]["external_key"]
+    await client.replists.bulk_add_items(key, [{"value": "9.9.9.9"}])
+    results["items"] = len(await client.replists.get_dynamic_list_items(key))
+    await client.replists.bulk_delete_items(key, ["9.9.9.9"])
+    with pytest.raises(PTNADAPIError) as info:
+        await client.sensors.get_sensor(1)
+    results["error"] = (info.value.status_code, info.value.operation)
+    return results
+
+
+def test_async_client_matches_sync_client(server):
+    client = PTNADClient(server.url)
+    client.set_auth(username="u", password="p")
+    client.login()
+    expected = sync_calls(client)
+
+    async def main():
+        async with AsyncPTNADClient(server.url) as client:
+            client.set_auth(username="u", password="p")
+            await client.login()
+            return await async_calls(client)
+
+    assert asyncio.run(main()) == expected
+    assert expected["error"] == (404, "get sensor 1")
+
+
+def test_concurrent_queries(server):
+    async def main():
+        async with AsyncPTNADClient(server.url) as client:
+            client.set_auth(username="u", password="p")
+            await client.login()
+            return await asyncio.gather(*[client.bql.execute(f"SELECT id FROM flow WHERE id == {i}")
+                                          for i in range(20)])
+
+    assert asyncio.run(main()) == [[[i]] for i in range(20)]
+
+
+def test_auth_headers_are_sent_per_request():
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, request.headers.get("authorization")))
+        if request.url.host == "sso":
+            return httpx.Response(200, json={"access_token": "token"})
+        return httpx.Response(200, json={"status": "green", "problems": []})
+
+    async def main():
+        client = mocked(handler)
+        client.set_auth("sso", sso_url="https://sso", client_id="a", client_secret="b", username="u", password="p")
+        await client.login()
+        assert "authorization" not in client.session.headers
+        assert seen[-1] == ("/api/v2/monitoring/status", "Bearer token")
+        await client.get("sensors")
+        assert seen[-1][1] == "Bearer token"
+        await client.logout()
+        await client.get("sensors")
+        assert seen[-1][1] is None
+        client.set_auth("apikey", apikey="key")
+        await client.login()
+        assert seen[-1][1] == "Bearer key"
+        assert client.auth_headers == {"Authorization": "Bearer key"}
+        await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_async_retry():
+    statuses = [503, 503, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"result": [[1]], "took": 1, "total": 1})
+
+    async def main():
+        async with mocked(handler, retry=RetryPolicy(backoff_factor=0.001)) as client:
+            return await client.bql.execute("SELECT id FROM flow")
+
+    assert asyncio.run(main()) == [[1]]
+    assert statuses == []
+
+
+def test_async_circuit_breaker():
+    hits = 0
+
+    def handler(request):
+        nonlocal hits
+        hits += 1
+        return httpx.Response(503, json={})
+
+    async def main():
+        async with mocked(handler, circuit_breaker=CircuitBreaker(min_calls=2, open_for=60)) as client:
+            for _ in range(2):
+                with pytest.raises(PTNADAPIError):
+                    await client.get("hosts")
+            with pytest.raises(CircuitOpenError):
+                await client.get("hosts")
+
+    asyncio.run(main())
+    assert hits == 2
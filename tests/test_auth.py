@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+from ptnad import MetricsRegistry, PTNADClient
+from ptnad.emulator import EmulatorConfig, NADEmulator
+from ptnad.exceptions import PTNADAPIError
+
+from conftest import START
+
+LOGIN = ("POST", "/api/v2/auth/login/?")
+
+
+@pytest.fixture
+def emulator():
+    return NADEmulator(EmulatorConfig(flows=100, hosts=10, rules=10, replists=2, replist_items=5,
+                                      username="u", password="p", start=START, span=100, session_ttl=0.5))
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def expired(emulator, metrics):
+    """A logged-in client whose session has expired on the server."""
+    client = PTNADClient("https://nad.test", transport=emulator, metrics=metrics)
+    client.set_auth(username="u", password="p")
+    client.login()
+    time.sleep(0.55)
+    return client
+
+
+class SSOServer:
+    """SSO token endpoint on the emulator that accepts only the last access token it issued."""
+
+    def __init__(self, emulator):
+        self.emulator = emulator
+        self.grants = []
+        self.expires_in = 3600
+        emulator.add_route("POST", "/sso/connect/token", self.token)
+
+    def token(self, request):
+        form = dict(pair.split("=", 1) for pair in request.body.decode().split("&"))
+        if form["grant_type"] == "refresh_token" and form["refresh_token"] != f"refresh{len(self.grants)}":
+            return 400, {"error": "invalid_grant"}
+        self.grants.append(form["grant_type"])
+        self.emulator.config.api_key = f"access{len(self.grants)}"
+        return {"access_token": self.emulator.config.api_key, "refresh_token": f"refresh{len(self.grants)}",
+                "expires_in": self.expires_in, "token_type": "Bearer"}
+
+
+@pytest.fixture
+def sso(emulator):
+    return SSOServer(emulator)
+
+
+def sso_client(emulator, metrics=None):
+    client = PTNADClient("https://nad.test", transport=emulator, metrics=metrics)
+    client.session.mount("https://sso.test", client.adapter)
+    client.set_auth("sso", sso_url="https://sso.test/sso", client_id="cid", client_secret="secret",
+                    username="u", password="p")
+    return client
+
+
+@pytest.mark.parametrize("call", [
+    lambda client: client.hosts.get_host("3"),
+    lambda client: client.bql.execute("SELECT id FROM flow LIMIT 1"),
+    lambda client: client.replists.bulk_add_items("list-0", [{"value": "9.9.9.9"}]),
+], ids=["get", "bql", "bulk"])
+def test_replayable_requests_reauthenticate_on_401(expired, emulator, metrics, call):
+    call(expired)
+    assert emulator.calls[LOGIN] == 2
+    assert metrics.counter_value("auth_renewals", reason="unauthorized") == 1
+
+
+def test_non_replayable_post_is_not_replayed(expired, emulator, metrics):
+    with pytest.raises(PTNADAPIError) as info:
+        expired.replists.create_list("new", "ip", "1")
+    assert info.value.status_code == 401
+    assert emulator.calls[LOGIN] == 1
+    assert metrics.counter_value("auth_renewals", reason="unauthorized") == 0
+
+
+def test_reauthentication_happens_once_per_401(expired, emulator):
+    expired.hosts.get_host("3")
+    expired.hosts.get_host("4")
+    assert emulator.calls[LOGIN] == 2
+
+
+def test_sso_401_uses_refresh_token(emulator, sso, metrics):
+    client = sso_client(emulator, metrics)
+    client.login()
+    # The server rotates its key, so the first access token is rejected
+    emulator.config.api_key = "rotated"
+    assert client.hosts.get_host("3")
+    assert sso.grants == ["password", "refresh_token"]
+    assert client.auth_headers == {"Authorization": "Bearer access2"}
+    assert metrics.counter_value("auth_renewals", reason="unauthorized") == 1
+
+
+def test_sso_renews_before_expiry(emulator, sso, metrics):
+    sso.expires_in = 1
+    client = sso_client(emulator, metrics)
+    client.login()
+    deadline = time.monotonic() + 3
+    while not metrics.counter_value("auth_renewals", reason="expiry") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    client.logout()
+    assert sso.grants[:2] == ["password", "refresh_token"]
+    assert metrics.counter_value("auth_renewals", reason="expiry") >= 1
+
+
+def test_sso_falls_back_to_password_grant(emulator, sso):
+    client = sso_client(emulator)
+    client.login()
+    client.auth.strategy.refresh_token = "revoked"
+    emulator.config.api_key = "rotated"
+    client.hosts.get_host("3")
+    assert sso.grants == ["password", "password"]
+
+
+def test_auth_renewal_can_be_disabled(emulator, sso):
+    sso.expires_in = 1
+    client = sso_client(emulator)
+    client.auth_renewal = False
+    client.login()
+    assert client._renewal_timer is None
@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.cache import ResponseCache, is_write
+from ptnad.transport import MemoryTransport
+
+
+@pytest.fixture
+def transport():
+    transport = MemoryTransport()
+    transport.version = 1
+
+    @transport.route("GET", "/api/v2/(?P<path>sensors|variables)")
+    def listing(request):
+        etag = f'"v{transport.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return 304, b"", {"ETag": etag}
+        return 200, {"results": [{"id": 1, "version": transport.version}]}, {"ETag": etag}
+
+    @transport.route("PATCH", "/api/v2/variables/(?P<id>\\d+)")
+    def update(request):
+        transport.version += 1
+        return {"id": int(request.params["id"])}
+
+    return transport
+
+
+def sent(transport, method="GET"):
+    return sum(count for (verb, _), count in transport.calls.items() if verb == method)
+
+
+def test_fresh_entries_are_served_from_memory(transport):
+    cache = ResponseCache(ttls={"/sensors": 60})
+    client = PTNADClient("https://nad.test", transport=transport, cache=cache)
+    for _ in range(5):
+        assert client.sensors.get_sensors() == [{"id": 1, "version": 1}]
+    assert sent(transport) == 1
+    assert cache.hits == 4 and cache.misses == 1
+
+
+def test_uncached_endpoints_always_hit_the_server(transport):
+    client = PTNADClient("https://nad.test", transport=transport, cache=ResponseCache(ttls={}))
+    client.sensors.get_sensors()
+    client.sensors.get_sensors()
+    assert sent(transport) == 2
+
+
+def test_expired_entries_are_revalidated_with_etag(transport):
+    cache = ResponseCache(ttls={"/variables": 0.01})
+    client = PTNADClient("https://nad.test", transport=transport, cache=cache)
+    first = client.variables.get_groups()
+    time.sleep(0.02)
+    assert client.variables.get_groups() == first
+    assert sent(transport) == 2
+    assert cache.revalidations == 1
+
+
+def test_writes_invalidate_the_resource(transport):
+    cache = ResponseCache(ttls={"/variables": 60, "/sensors": 60})
+    client = PTNADClient("https://nad.test", transport=transport, cache=cache)
+    client.variables.get_groups()
+    client.sensors.get_sensors()
+    client.variables.update_group(1, value="x")
+    assert len(cache) == 1
+    assert client.variables.get_groups() == [{"id": 1, "version": 2}]
+    assert sent(transport) == 3
+
+
+def test_cached_responses_are_not_shared_mutable_state(transport):
+    client = PTNADClient("https://nad.test", transport=transport, cache=ResponseCache(ttls={"/sensors": 60}))
+    client.sensors.get_sensors()[0]["id"] = 99
+    assert client.sensors.get_sensors() == [{"id": 1, "version": 1}]
+
+
+def test_cached_response_objects_are_copies(transport):
+    cache = ResponseCache(ttls={"/variables": 0.05})
+    client = PTNADClient("https://nad.test", transport=transport, cache=cache)
+    client.get("variables")
+    hit = client.get("variables")
+    hit.headers["ETag"] = "changed"
+    hit.encoding = "latin-1"
+    time.sleep(0.06)
+    revalidated = client.get("variables")
+    assert cache.revalidations == 1
+    assert revalidated is not hit and revalidated.headers["ETag"] == '"v1"' and revalidated.encoding != "latin-1"
+    revalidated.headers["ETag"] = "changed"
+    assert client.get("variables").headers["ETag"] == '"v1"'
+
+
+def test_counters_are_exact_under_concurrency(transport):
+    cache = ResponseCache(ttls={"/sensors": 60})
+    client = PTNADClient("https://nad.test", transport=transport, cache=cache)
+    client.get("sensors")
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: client.get("sensors"), range(400)))
+    assert cache.hits == 400 and cache.misses == 1
+
+
+def test_key_ignores_parameter_order():
+    assert ResponseCache.key("/sensors/", {"b": 1, "a": 2}) == ResponseCache.key("sensors", [("a", 2), ("b", 1)])
+    assert ResponseCache.key("sensors") != ResponseCache.key("sensors", {"a": 1})
+
+
+def test_lru_eviction(transport):
+    cache = ResponseCache(ttls={"/sensors": 60, "/variables": 60}, max_entries=1)
+    client = PTNADClient("https://nad.test", transport=transport, cache=cache)
+    client.sensors.get_sensors()
+    client.variables.get_groups()
+    assert len(cache) == 1
+    client.sensors.get_sensors()
+    assert sent(transport) == 3
+
+
+def test_is_write():
+    assert is_write("PATCH", "variables/1")
+    assert is_write("POST", "replists")
+    assert not is_write("POST", "bql")
+    assert not is_write("GET", "sensors")
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.circuit import CircuitBreaker, CircuitState, endpoint_group
+from ptnad.exceptions import CircuitOpenError, PTNADAPIError
+from ptnad.retry import RetryPolicy
+from ptnad.transport import MemoryTransport
+
+URL = "https://nad.test/api/v2/"
+
+
+@pytest.fixture
+def transport():
+    transport = MemoryTransport()
+    transport.status = 503
+    transport.add_route("GET", r"/api/v2/hosts.*", lambda request: (transport.status, {}))
+    transport.add_route("GET", r"/api/v2/sensors.*", lambda request: {"results": []})
+    return transport
+
+
+def hits(transport, group):
+    return sum(count for (_, pattern), count in transport.calls.items() if group in pattern)
+
+
+def test_endpoint_group():
+    assert endpoint_group("hosts/10.0.0.1") == "hosts"
+    assert endpoint_group("/replists/3/items?limit=5") == "replists"
+
+
+def test_opens_after_failures_and_fails_fast(transport):
+    events = []
+    breaker = CircuitBreaker(min_calls=4, open_for=60, on_state_change=lambda *args: events.append(args[1:]))
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker)
+    for i in range(4):
+        with pytest.raises(PTNADAPIError) as info:
+            client.get(f"hosts/10.0.0.{i}")
+        assert info.value.status_code == 503
+    assert breaker.state(URL, "hosts") == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as info:
+        client.get("hosts/10.0.0.9")
+    assert info.value.group == "hosts" and 0 < info.value.retry_after <= 60
+    assert hits(transport, "hosts") == 4
+    assert events == [("hosts", CircuitState.OPEN)]
+    # Other endpoint groups keep working
+    client.get("sensors")
+    assert breaker.state(URL, "sensors") == CircuitState.CLOSED
+
+
+def test_client_errors_count_as_success(transport):
+    transport.status = 404
+    breaker = CircuitBreaker(min_calls=2)
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker)
+    for _ in range(4):
+        with pytest.raises(PTNADAPIError):
+            client.get("hosts/10.0.0.1")
+    assert breaker.state(URL, "hosts") == CircuitState.CLOSED
+
+
+def test_half_open_probe_closes(transport):
+    breaker = CircuitBreaker(min_calls=2, open_for=0.05)
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(PTNADAPIError):
+            client.get("hosts")
+    time.sleep(0.06)
+    assert breaker.state(URL, "hosts") == CircuitState.HALF_OPEN
+    transport.status = 200
+    client.get("hosts")
+    assert breaker.state(URL, "hosts") == CircuitState.CLOSED
+
+
+def test_failed_probe_reopens(transport):
+    breaker = CircuitBreaker(min_calls=2, open_for=0.05)
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(PTNADAPIError):
+            client.get("hosts")
+    time.sleep(0.06)
+    with pytest.raises(PTNADAPIError) as info:
+        client.get("hosts")
+    assert not isinstance(info.value, CircuitOpenError)
+    assert breaker.state(URL, "hosts") == CircuitState.OPEN
+
+
+def test_half_open_allows_limited_probes():
+    breaker = CircuitBreaker(min_calls=1, open_for=0.0)
+    breaker.allow(URL, "hosts")
+    breaker.record(URL, "hosts", 503, 0.0)
+    breaker.allow(URL, "hosts")
+    with pytest.raises(CircuitOpenError):
+        breaker.allow(URL, "hosts")
+    breaker.release(URL, "hosts")
+    breaker.allow(URL, "hosts")
+
+
+def test_slow_calls_open(transport):
+    breaker = CircuitBreaker(min_calls=2, slow_call_duration=0.0, slow_call_rate=1.0)
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker)
+    client.get("sensors")
+    client.get("sensors")
+    with pytest.raises(CircuitOpenError):
+        client.get("sensors")
+
+
+def test_open_circuit_stops_retries(transport):
+    breaker = CircuitBreaker(min_calls=2, open_for=60)
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker,
+                         retry=RetryPolicy(max_retries=5, backoff_factor=0.001))
+    with pytest.raises(CircuitOpenError):
+        client.get("hosts")
+    assert hits(transport, "hosts") == 2
+
+
+def test_reset(transport):
+    breaker = CircuitBreaker(min_calls=1, open_for=60)
+    client = PTNADClient("https://nad.test", transport=transport, circuit_breaker=breaker)
+    with pytest.raises(PTNADAPIError):
+        client.get("hosts")
+    assert breaker.state(URL, "hosts") == CircuitState.OPEN
+    breaker.reset()
+    assert breaker.state(URL, "hosts") == CircuitState.CLOSED
@@ -0,0 +1,95 @@
+import json
+import sys
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.codec import JSONCodec, StdlibCodec, available_codecs, get_codec
+from ptnad.transport import MemoryTransport
+
+INSTALLED = available_codecs()
+
+# Client payloads with the values that codecs treat differently: non-ASCII text,
+# slashes, floats, nulls, non-string keys and nested structures
+ITEMS = [
+    {"value": "10.0.0.1", "attributes": {"comment": "Прокси / VPN", "score": 0.75, "tags": None}},
+    {"value": "example.com/path", "attributes": {1: "port", "nested": [True, False, -1]}},
+]
+FIELDS = {"name": "Сканеры", "color": "3", "description": "a/b \"quoted\"  ", "content": None}
+
+
+def test_auto_picks_the_fastest_installed_codec():
+    assert get_codec().name == INSTALLED[0]
+    assert INSTALLED[-1] == "stdlib"
+
+
+def test_auto_falls_back_to_stdlib(monkeypatch):
+    # A None entry in sys.modules makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "ujson", None)
+    assert isinstance(get_codec("auto"), StdlibCodec)
+    assert available_codecs() == ["stdlib"]
+    with pytest.raises(ImportError):
+        get_codec("orjson")
+
+
+def test_auto_skips_a_missing_library(monkeypatch):
+    pytest.importorskip("ujson")
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert get_codec().name == "ujson"
+
+
+def test_explicit_selection():
+    codec = StdlibCodec()
+    assert get_codec(codec) is codec
+    assert get_codec("stdlib").name == "stdlib"
+    with pytest.raises(ValueError):
+        get_codec("simplejson")
+
+
+@pytest.fixture(params=INSTALLED)
+def codec(request):
+    return get_codec(request.param)
+
+
+def test_codecs_round_trip(codec):
+    data = {"rows": [[1, "10.0.0.1", 0.5, None, True]], "text": "Привет / \"world\""}
+    assert isinstance(codec.dumps(data), bytes)
+    assert codec.loads(codec.dumps(data)) == data
+    assert codec.loads(codec.dumps(data).decode()) == data
+
+
+def test_client_payloads_match_stdlib(codec):
+    bodies = []
+    transport = MemoryTransport()
+    transport.add_route("*", "/api/v2/replists/.*", lambda request: bodies.append(request.body) or {})
+    client = PTNADClient("https://nad.test", transport=transport, codec=codec)
+    client.replists.bulk_add_items("key", ITEMS)
+    client.replists.update_list(1, **FIELDS)
+    # Integer keys become strings, as in the stdlib json module
+    assert [json.loads(body) for body in bodies] == [json.loads(json.dumps(ITEMS)), FIELDS]
+
+
+@pytest.mark.skipif("orjson" not in INSTALLED, reason="orjson is not installed")
+def test_orjson_limits():
+    codec = get_codec("orjson")
+    with pytest.raises(TypeError):
+        codec.dumps({"id": 2**64})
+    assert isinstance(codec.loads(b'{"id": 18446744073709551616}')["id"], float)
+    assert StdlibCodec().loads(StdlibCodec().dumps({"id": 2**64})) == {"id": 2**64}
+
+
+def test_custom_codec():
+    class Codec(JSONCodec):
+        name = "custom"
+
+        def dumps(self, obj):
+            return json.dumps(obj).encode()
+
+        def loads(self, data):
+            return {"decoded": json.loads(data)}
+
+    transport = MemoryTransport()
+    transport.add_route("GET", "/api/v2/monitoring/status", lambda request: {"status": "green"})
+    client = PTNADClient("https://nad.test", transport=transport, codec=Codec())
+    assert client.decode(client.get("monitoring/status")) == {"decoded": {"status": "green"}}
@@ -0,0 +1,106 @@
+import pytest
+
+from ptnad import columnar
+from ptnad.columnar import CategoryColumn, ColumnarResult, IntColumn, IPColumn, ObjectColumn
+
+ROWS = [
+    [1, "10.0.0.1", "http", 80, 100],
+    [2, "10.0.0.2", "tls", 443, 300],
+    [3, "192.168.1.5", "http", 80, None],
+    [4, "2001:db8::1", "dns", 53, 50],
+    [5, "10.0.0.1", "tls", 443, 700],
+    [6, None, None, None, 10],
+]
+FIELDS = ["id", "src.ip", "app_proto", "dst.port", "bytes.total"]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "_numpy", lambda: None)
+    return request.param
+
+
+@pytest.fixture
+def result(backend):
+    return ColumnarResult.from_rows(ROWS, FIELDS, chunk_size=4)
+
+
+def test_column_types(result):
+    assert isinstance(result["id"], IntColumn)
+    assert isinstance(result["src.ip"], IPColumn)
+    assert isinstance(result["app_proto"], CategoryColumn)
+    assert result.to_rows() == ROWS
+    assert result.names == FIELDS and len(result) == 6
+
+
+def test_mixed_values_fall_back_to_objects(backend):
+    result = ColumnarResult({"value": [1, "a", [2]]})
+    assert isinstance(result["value"], ObjectColumn)
+    assert result["value"].to_list() == [1, "a", [2]]
+
+
+def test_dict_rows():
+    result = ColumnarResult.from_rows([{"a": 1}, {"a": 2, "b": "x"}], chunk_size=1)
+    assert result.to_dicts() == [{"a": 1, "b": None}, {"a": 2, "b": "x"}]
+
+
+def test_list_rows_need_fields():
+    with pytest.raises(ValueError):
+        ColumnarResult.from_rows([[1, 2]])
+    with pytest.raises(ValueError):
+        ColumnarResult.from_rows([[1, 2]], ["a"])
+
+
+def test_filters(result):
+    assert result.filter(result["dst.port"] == 443)["id"].to_list() == [2, 5]
+    assert result.filter(result["bytes.total"] > 90)["id"].to_list() == [1, 2, 5]
+    assert result.filter(result["bytes.total"].isnull())["id"].to_list() == [3]
+    assert result.filter(~(result["app_proto"] == "http"))["id"].to_list() == [2, 4, 5, 6]
+    assert result.filter(result["app_proto"].isin(["dns", "tls"]))["id"].to_list() == [2, 4, 5]
+    mask = (result["dst.port"] == 80) | (result["src.ip"] == "10.0.0.2")
+    assert result.filter(mask)["id"].to_list() == [1, 2, 3]
+
+
+def test_ip_networks(result):
+    assert result.filter(result["src.ip"].in_network("10.0.0.0/8"))["id"].to_list() == [1, 2, 5]
+    assert result.filter(result["src.ip"].in_network("2001:db8::/32"))["id"].to_list() == [4]
+    assert result.filter(result["src.ip"].isin(["10.0.0.1"]))["id"].to_list() == [1, 5]
+
+
+def test_sort(result):
+    assert result.sort("bytes.total", descending=True)["id"].to_list() == [5, 2, 1, 4, 6, 3]
+    assert result.sort("app_proto", "id", descending=[False, True])["id"].to_list() == [4, 3, 1, 5, 2, 6]
+
+
+def test_group_by(result):
+    totals = result.group_by("app_proto").agg(flows=("id", "count"), traffic=("bytes.total", "sum"),
+                                              largest=("bytes.total", "max"))
+    assert totals.to_rows() == [["http", 2, 100, 100], ["tls", 2, 1000, 700], ["dns", 1, 50, 50],
+                                [None, 1, 10, 10]]
+    assert result.group_by("dst.port").count()["count"].to_list() == [2, 2, 1, 1]
+    assert result["bytes.total"].mean() == 232.0
+
+
+def test_aggregation_errors(result):
+    with pytest.raises(ValueError):
+        result.group_by("app_proto").agg(x=("id", "median"))
+    with pytest.raises(TypeError):
+        result.group_by("id").sum("app_proto")
+
+
+def test_to_numpy(result, backend):
+    if backend != "numpy":
+        pytest.skip("numpy backend only")
+    arrays = result.to_numpy()
+    assert arrays["id"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert (result["dst.port"] == 443).to_numpy().sum() == 2
+
+
+def test_execute_columnar(client):
+    query = "SELECT id, src.ip, dst.port FROM flow LIMIT 50"
+    flows = client.bql.execute_columnar(query)
+    assert flows.names == ["id", "src.ip", "dst.port"]
+    assert flows.to_rows() == client.bql.execute(query)
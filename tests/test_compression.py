@@ -0,0 +1,104 @@
+import asyncio
+import gzip
+import json
+import os
+import zlib
+
+import httpx
+import pytest
+
+from ptnad import MetricsRegistry, PTNADClient
+from ptnad.aio import AsyncPTNADClient
+from ptnad.compression import CompressionConfig
+from ptnad.transport import MemoryTransport
+
+LARGE = {"items": [{"value": f"10.0.{i // 256}.{i % 256}"} for i in range(2000)]}
+
+
+@pytest.fixture
+def received():
+    return []
+
+
+@pytest.fixture
+def client(received):
+    transport = MemoryTransport()
+
+    @transport.route("*", "/api/v2/echo")
+    def echo(request):
+        received.append(request)
+        return {}
+
+    return PTNADClient("https://nad.test", transport=transport, compression=CompressionConfig(threshold=1024),
+                       metrics=MetricsRegistry())
+
+
+def test_large_bodies_are_gzipped(client, received):
+    client.post("echo", json=LARGE)
+    (request,) = received
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Accept-Encoding"] == "gzip, deflate"
+    assert json.loads(gzip.decompress(request.body)) == LARGE
+    assert len(request.body) < len(request.content)
+    assert client.metrics.counter_value("request_uncompressed_bytes", endpoint="/echo") == len(request.content)
+    assert client.metrics.counter_value("request_compressed_bytes", endpoint="/echo") == len(request.body)
+
+
+def test_deflate(received):
+    transport = MemoryTransport()
+    transport.add_route("POST", "/api/v2/echo", lambda request: received.append(request) or {})
+    client = PTNADClient("https://nad.test", transport=transport,
+                         compression=CompressionConfig(threshold=0, algorithm="deflate"))
+    client.post("echo", data=b"x" * 100)
+    assert received[0].headers["Content-Encoding"] == "deflate"
+    assert zlib.decompress(received[0].body) == b"x" * 100
+
+
+def test_small_bodies_are_sent_unchanged(client, received):
+    client.post("echo", json={"value": "10.0.0.1"})
+    (request,) = received
+    assert "Content-Encoding" not in request.headers
+    assert request.body == b'{"value": "10.0.0.1"}' or json.loads(request.body) == {"value": "10.0.0.1"}
+
+
+@pytest.mark.parametrize("data", [
+    {"value": "x" * 4096},
+    lambda: iter([b"x" * 4096]),
+], ids=["form", "iterator"])
+def test_non_bytes_bodies_are_sent_unchanged(client, received, data):
+    client.post("echo", data=data() if callable(data) else data)
+    (request,) = received
+    assert "Content-Encoding" not in request.headers
+    assert b"x" * 4096 in request.body
+
+
+def test_incompressible_bodies_are_sent_unchanged(client, received):
+    client.post("echo", data=os.urandom(4096))
+    assert "Content-Encoding" not in received[0].headers
+
+
+def test_explicit_content_encoding_is_respected(client, received):
+    client.post("echo", data=b"x" * 4096, headers={"Content-Encoding": "identity"})
+    assert received[0].headers["Content-Encoding"] == "identity"
+    assert received[0].body == b"x" * 4096
+
+
+def test_async_large_bodies_are_gzipped():
+    received = []
+
+    def handler(request):
+        received.append(request)
+        return httpx.Response(200, json={})
+
+    async def main():
+        client = AsyncPTNADClient("https://nad.test", compression=CompressionConfig(threshold=1024))
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.post("echo", json=LARGE)
+        await client.post("echo", json={"value": "10.0.0.1"})
+        await client.session.aclose()
+
+    asyncio.run(main())
+    large, small = received
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(large.content)) == LARGE
+    assert "Content-Encoding" not in small.headers
@@ -0,0 +1,85 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.exceptions import AuthenticationError
+
+Fernet = pytest.importorskip("cryptography.fernet").Fernet
+
+from ptnad.credentials import CredentialCache  # noqa: E402
+
+LOGIN = ("POST", "/api/v2/auth/login/?")
+URL = "https://nad.test/api/v2/"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CredentialCache(tmp_path, iterations=1000)
+
+
+def login(emulator, cache, password="p"):
+    client = PTNADClient("https://nad.test", transport=emulator, credential_cache=cache)
+    client.set_auth(username="u", password=password)
+    client.login()
+    return client
+
+
+def test_new_client_restores_the_session(emulator, cache):
+    first = login(emulator, cache)
+    second = login(emulator, cache)
+    assert emulator.calls[LOGIN] == 1
+    assert second.session.cookies.get("sessionid") == first.session.cookies.get("sessionid")
+    assert second.csrf_token == first.csrf_token
+    assert second.hosts.get_host("3")
+
+
+def test_entries_are_encrypted_and_private(emulator, cache, tmp_path):
+    client = login(emulator, cache)
+    (path,) = tmp_path.glob("*.session")
+    assert client.session.cookies.get("sessionid").encode() not in path.read_bytes()
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_wrong_password_does_not_restore(emulator, cache):
+    login(emulator, cache)
+    assert cache.load(URL, "local:u", "wrong") is None
+    client = PTNADClient("https://nad.test", transport=emulator, credential_cache=cache)
+    client.set_auth(username="u", password="wrong")
+    with pytest.raises(AuthenticationError):
+        client.login()
+    assert emulator.calls[LOGIN] == 2
+
+
+def test_wrong_key_does_not_restore(tmp_path):
+    state = {"cookies": [], "expires_at": time.time() + 600}
+    CredentialCache(tmp_path, key=Fernet.generate_key()).save(URL, "local:u", "p", state)
+    assert CredentialCache(tmp_path, key=Fernet.generate_key()).load(URL, "local:u", "p") is None
+
+
+def test_identity_mismatch_is_rejected(cache):
+    state = {"cookies": [], "expires_at": time.time() + 600}
+    cache.save(URL, "local:alice", "p", state)
+    assert cache.load(URL, "local:alice", "p")["identity"] == "local:alice"
+    # An entry moved to another identity's file, or read for another server, is ignored
+    shutil.copy(cache.path_for(URL, "local:alice"), cache.path_for(URL, "local:bob"))
+    assert cache.load(URL, "local:bob", "p") is None
+    shutil.copy(cache.path_for(URL, "local:alice"), cache.path_for("https://other/api/v2/", "local:alice"))
+    assert cache.load("https://other/api/v2/", "local:alice", "p") is None
+
+
+def test_expired_entries_are_dropped(cache):
+    cache.save(URL, "local:u", "p", {"expires_at": time.time() + 30})
+    assert cache.load(URL, "local:u", "p") is None
+    assert not cache.path_for(URL, "local:u").exists()
+
+
+def test_logout_deletes_the_entry(emulator, cache):
+    client = login(emulator, cache)
+    client.logout()
+    assert not cache.path_for(client.base_url, "local:u").exists()
+    login(emulator, cache)
+    assert emulator.calls[LOGIN] == 2
+
@@ -0,0 +1,56 @@
+import pytest
+
+from ptnad.models import TimeRange
+
+from conftest import START
+
+QUERY = "SELECT id, src.ip FROM flow WHERE proto == 'tcp'"
+RANGE = TimeRange(START + 100, START + 900)
+
+
+def between(query, time_range):
+    return f"{query} && end >= {time_range.start} && end <= {time_range.end}"
+
+
+@pytest.fixture
+def expected(client):
+    return client.bql.execute(between(QUERY, RANGE) + " LIMIT 1000")
+
+
+def test_iterate_pages_through_all_rows(client, emulator, expected):
+    cursor = client.bql.iterate(between(QUERY, RANGE), page_size=30)
+    assert list(cursor) == expected
+    assert cursor.rows == len(expected)
+    assert emulator.calls[("POST", "/api/v2/bql/?")] > len(expected) // 30
+
+
+def test_iterate_descending(client, expected):
+    rows = list(client.bql.iterate(between(QUERY, RANGE), page_size=30, descending=True))
+    assert rows == expected[::-1]
+
+
+def test_iterate_limit(client, expected):
+    assert list(client.bql.iterate(between(QUERY, RANGE) + " LIMIT 45", page_size=20)) == expected[:45]
+
+
+def test_checkpoint_resumes_after_last_row(client, expected):
+    cursor = client.bql.iterate(between(QUERY, RANGE), page_size=30)
+    head = [row for _, row in zip(range(40), cursor)]
+    token = cursor.checkpoint
+    resumed = client.bql.iterate(between(QUERY, RANGE), page_size=25, checkpoint=token)
+    assert head + list(resumed) == expected
+    assert resumed.rows == len(expected)
+
+
+def test_checkpoint_of_another_query_is_rejected(client):
+    cursor = client.bql.iterate(between(QUERY, RANGE), page_size=10)
+    next(iter(cursor))
+    with pytest.raises(ValueError):
+        client.bql.iterate("SELECT id FROM flow", checkpoint=cursor.checkpoint)
+    with pytest.raises(ValueError):
+        client.bql.iterate(QUERY, checkpoint="garbage")
+
+
+def test_iterate_rejects_order_by(client):
+    with pytest.raises(ValueError):
+        client.bql.iterate("SELECT id FROM flow ORDER BY id")
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from ptnad import FederatedPTNADClient, PTNADClient
+from ptnad.emulator import EmulatorConfig, NADEmulator
+from ptnad.exceptions import FederationError, PTNADAPIError
+
+from conftest import START
+
+
+def instance(**config):
+    emulator = NADEmulator(EmulatorConfig(flows=100, hosts=10, rules=10, replists=2, replist_items=5,
+                                          username="u", password="p", start=START, span=100, **config))
+    return PTNADClient("https://nad.test", transport=emulator)
+
+
+@pytest.fixture
+def federation():
+    # "slow" answers after a second, "broken" fails every request
+    clients = {"ok": instance(), "slow": instance(latency=1.0),
+               "broken": instance(error_rate=1.0, error_statuses=(500,))}
+    federation = FederatedPTNADClient(clients, timeout={"slow": 0.2})
+    federation.set_auth(username="u", password="p")
+    clients["ok"].login()
+    yield federation
+    federation.close()
+
+
+def test_calls_fan_out_to_every_instance():
+    federation = FederatedPTNADClient({"a": instance(latency=0.2), "b": instance(latency=0.2)})
+    federation.set_auth(username="u", password="p")
+    started = time.monotonic()
+    federation.login().raise_for_errors()
+    result = federation.hosts.get_host("3").raise_for_errors()
+    # Both instances are called at once, so two calls take about two latencies, not four
+    assert time.monotonic() - started < 0.7
+    assert [r.instance for r in result] == ["a", "b"]
+    assert result.values()["a"] == result.values()["b"]
+    rows = list(federation.bql.execute("SELECT id FROM flow LIMIT 2").items())
+    assert [name for name, _ in rows] == ["a", "a", "b", "b"]
+    federation.close()
+
+
+def test_slow_instance_times_out_without_delaying_the_others(federation):
+    started = time.monotonic()
+    result = federation.hosts.get_host("3")
+    assert time.monotonic() - started < 0.5
+    assert [r.instance for r in result] == ["ok", "slow", "broken"]
+    assert isinstance(result.errors["slow"], TimeoutError)
+    assert result[1].elapsed == 0.2
+
+
+def test_partial_failure_is_reported_per_instance(federation):
+    result = federation.hosts.get_host("3")
+    assert [r.instance for r in result.succeeded] == ["ok"]
+    assert [r.instance for r in result.failed] == ["slow", "broken"]
+    assert isinstance(result.errors["broken"], PTNADAPIError)
+    assert result.errors["broken"].status_code == 500
+    assert result.values() == {"ok": result[0].value}
+    with pytest.raises(FederationError) as info:
+        result.raise_for_errors()
+    assert set(info.value.errors) == {"slow", "broken"}
+
+
+def test_run_on_selected_instances(federation):
+    result = federation.run(lambda client: client.hosts.get_host("3"), instances=["ok"])
+    assert [r.instance for r in result] == ["ok"] and result[0].ok
+
+
+def test_only_api_namespaces_are_mirrored(federation):
+    with pytest.raises(AttributeError):
+        federation.no_such_api
@@ -0,0 +1,70 @@
+import pytest
+
+from ptnad import MetricsRegistry
+from ptnad.exceptions import PTNADAPIError
+from ptnad.metrics import endpoint_template, operation_label
+
+
+def test_endpoint_template():
+    assert endpoint_template("hosts/10.0.0.1") == "/hosts/{id}"
+    assert endpoint_template("/sensors/") == "/sensors"
+
+
+def test_operation_label():
+    assert operation_label("execute BQL query over window 1700-1800") == "execute BQL query over window N-N"
+    assert len(operation_label("x" * 500)) == 100
+
+
+def test_requests_are_recorded(client):
+    metrics = MetricsRegistry()
+    client.metrics = metrics
+    client.hosts.get_host("7")
+    with pytest.raises(PTNADAPIError):
+        client.sensors.get_sensor(1)
+    assert metrics.counter_value("requests", method="GET", endpoint="/hosts/{id}", status="200") == 1
+    assert metrics.histogram("request_duration_seconds", method="GET", endpoint="/hosts/{id}").count == 1
+    assert metrics.counter_value("operation_errors", operation="get sensor N", error="PTNADAPIError",
+                                 status="404") == 1
+
+
+def test_operation_errors_are_counted_once():
+    metrics = MetricsRegistry()
+    error = PTNADAPIError("x", status_code=500)
+    error._track(metrics)
+    assert "operation_errors_total{" not in metrics.to_openmetrics()
+    error.operation = "inner 1"
+    error.operation = "outer"
+    error._track(metrics)
+    text = metrics.to_openmetrics()
+    assert 'operation="inner N"' in text and "outer" not in text
+
+
+def test_operation_labels_are_bounded():
+    metrics = MetricsRegistry(max_operations=2)
+    for operation in ("a", "b", "c", "d"):
+        PTNADAPIError("x", operation=operation)._track(metrics)
+    assert metrics.counter_value("operation_errors", operation="other", error="PTNADAPIError", status="") == 2
+    metrics.reset()
+    PTNADAPIError("x", operation="c")._track(metrics)
+    assert metrics.counter_value("operation_errors", operation="c", error="PTNADAPIError", status="") == 1
+
+
+def test_openmetrics_output():
+    metrics = MetricsRegistry()
+    metrics.record_request("GET", "hosts/1", 200, 0.01)
+    text = metrics.to_openmetrics()
+    assert "# TYPE ptnad_requests counter" in text
+    assert 'ptnad_requests_total{endpoint="/hosts/{id}",method="GET",status="200"} 1' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_request_bytes(client):
+    metrics = MetricsRegistry()
+    client.metrics = metrics
+    key = client.replists.get_all_lists()[0]["external_key"]
+    client.post(f"replists/dynamic/{key}/_bulk_items", data=b'[{"value": "9.9.9.9"}]',
+                headers={"Content-Type": "application/json"})
+    # A streamed body is sent as it is, with no size known up front
+    client.post(f"replists/dynamic/{key}/_bulk_items", data=iter([b'[{"value": "9.9.9.8"}]']),
+                headers={"Content-Type": "application/json"})
+    assert metrics.counter_value("request_bytes", method="POST", endpoint="/replists/dynamic/{key}/{value}") == 22
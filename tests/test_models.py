@@ -0,0 +1,57 @@
+import copy
+import pickle
+
+import pytest
+
+from ptnad.models import FLOW_FIELDS, Flow, TimeRange
+
+
+def test_flow_access():
+    flow = Flow({"id": 1, "start": 2, "end": 3, "src.ip": "1.2.3.4", "custom": 5})
+    assert flow.id == 1 and flow["src.ip"] == "1.2.3.4" and getattr(flow, "src.ip") == "1.2.3.4"
+    assert flow["dst.ip"] is None and flow.app_proto is None
+    assert flow["custom"] == 5
+    with pytest.raises(KeyError):
+        flow["nope"]
+    with pytest.raises(AttributeError):
+        flow.nope
+
+
+def test_flows_from_rows_share_nothing_mutable():
+    flows = Flow.from_rows([(1, 2, 3), [4, 5, 6]], ["id", "start", "end"])
+    assert flows[1].end == 6 and flows[0].to_dict() == {"id": 1, "start": 2, "end": 3}
+    flow = Flow.from_row((1, 2, 3), ("id", "start", "end"))
+    flow.end = 9
+    flow.note = "x"
+    setattr(flow, "dst.ip", "5.5.5.5")
+    assert flow["end"] == 9 and flow["note"] == "x" and flow["dst.ip"] == "5.5.5.5"
+    assert flow.to_dict() == {"id": 1, "start": 2, "end": 9, "note": "x", "dst.ip": "5.5.5.5"}
+    assert flows[0].end == 3
+
+
+def test_flows_hash_by_identity():
+    first = Flow.from_row((1, 2, 3), ("id", "start", "end"))
+    second = Flow.from_row((1, 2, 3), ("id", "start", "end"))
+    assert first != second and first.to_dict() == second.to_dict()
+    assert len({first, second, first}) == 2
+
+
+@pytest.mark.parametrize("flow", [
+    Flow({"id": 1, "src.ip": "1.2.3.4"}),
+    Flow.from_row((1, 2), ("id", "end")),
+])
+def test_flows_pickle_and_copy(flow):
+    assert pickle.loads(pickle.dumps(flow)).to_dict() == flow.to_dict()
+    assert copy.copy(flow).to_dict() == flow.to_dict()
+
+
+def test_flow_fields():
+    assert len(Flow.get_all_fields()) == len(FLOW_FIELDS)
+    assert "start" in FLOW_FIELDS
+
+
+def test_time_range_split():
+    parts = TimeRange(0, 100).split(3)
+    assert len(parts) == 3
+    assert parts[0].start == 0 and parts[-1].end == 100
+    assert all(left.end == right.start for left, right in zip(parts, parts[1:]))
@@ -0,0 +1,75 @@
+import pytest
+
+from ptnad.models import TimeRange
+from ptnad.planner import AdaptivePlanner
+
+from conftest import START
+
+
+def test_probe_sizes_only_the_probed_query():
+    planner = AdaptivePlanner(initial_rows=1000, min_rows=10)
+    assert planner.probe(50) == 51
+    assert planner.probe(3) == 10
+    assert planner.probe(5000) == 1000
+    assert planner.page_size == 1000
+
+
+def test_probe_with_duration_sets_density():
+    planner = AdaptivePlanner(initial_rows=100, min_rows=10)
+    planner.probe(500, 1000)
+    assert planner.density == 0.5
+    assert planner.window_width(10_000) == 200
+    assert planner.page_size == 100
+
+
+def test_pages_shrink_at_once_and_grow_gradually():
+    planner = AdaptivePlanner(target_time=1.0, initial_rows=1000, min_rows=10, max_growth=2, smoothing=1)
+    planner.observe(1000, took=4000, size=100)
+    assert planner.page_size == 250
+    planner.observe(250, took=25, size=25)
+    assert planner.page_size == 500
+    planner.observe(0, took=None, size=0)
+    assert planner.page_size == 500
+
+
+def test_pages_are_sized_by_bytes_and_bounded():
+    planner = AdaptivePlanner(target_bytes=10_000, initial_rows=1000, min_rows=10, max_rows=1500)
+    planner.observe(1000, took=None, size=100_000)
+    assert planner.page_size == 100
+    planner = AdaptivePlanner(target_bytes=1, initial_rows=1000, min_rows=10)
+    planner.observe(1000, took=None, size=100_000)
+    assert planner.page_size == 10
+
+
+def test_windows_grow_gradually():
+    planner = AdaptivePlanner(initial_rows=100, min_rows=10, max_growth=2, smoothing=1)
+    planner.observe_window(100, 100)
+    assert planner.window_width(10_000) == 100
+    planner.observe_window(1, 100)
+    assert planner.window_width(10_000) == 200
+    assert planner.window_width(150) == 150
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"min_rows": 0}, {"initial_rows": 10, "min_rows": 20}, {"max_growth": 1}, {"smoothing": 0},
+])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        AdaptivePlanner(**kwargs)
+
+
+def test_reused_planner_keeps_its_page_size(client):
+    planner = AdaptivePlanner(initial_rows=500, min_rows=10)
+    small = client.bql.iterate("SELECT id FROM flow WHERE id < 20", planner=planner)
+    assert len(list(small)) == 20 and small.pages == 1
+    # The small query must not leave the next one starting from a 21-row page
+    assert planner.page_size >= 500
+    full = client.bql.iterate("SELECT id FROM flow", planner=planner)
+    assert len(list(full)) == 1000 and full.pages == 1
+
+
+def test_planned_windows_cover_the_range(client):
+    planner = AdaptivePlanner(initial_rows=100, min_rows=10)
+    rows = list(client.bql.execute_windows("SELECT id FROM flow", TimeRange(START, START + 999), planner=planner))
+    assert sorted(row if isinstance(row, int) else row[0] for row in rows) == list(range(1000))
+    assert planner.page_size >= 100
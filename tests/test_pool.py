@@ -0,0 +1,67 @@
+import http.server
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.pool import PoolConfig
+
+
+@pytest.fixture
+def counting_server():
+    connections = set()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def handle_one_request(self):
+            connections.add(self.client_address)
+            return super().handle_one_request()
+
+        def do_HEAD(self):
+            time.sleep(0.05)
+            self.send_response(401)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", connections
+    server.shutdown()
+    server.server_close()
+
+
+def test_prewarm_opens_reusable_connections(counting_server):
+    url, connections = counting_server
+    client = PTNADClient(url, pool=PoolConfig(pool_maxsize=32, connect_timeout=2, read_timeout=5))
+    assert client.prewarm(8) == 8
+    assert len(connections) == 8
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: client.get("monitoring/status"), range(8)))
+    assert len(connections) <= 9
+
+
+def test_prewarm_is_capped_by_pool_size(counting_server):
+    url, connections = counting_server
+    client = PTNADClient(url, pool=PoolConfig(pool_maxsize=2))
+    assert client.prewarm(8) == 2
+
+
+def test_prewarm_skips_custom_transports(emulator):
+    assert PTNADClient("https://nad.test", transport=emulator).prewarm(4) == 0
+
+
+def test_pool_timeout():
+    assert PoolConfig().timeout is None
+    assert PoolConfig(connect_timeout=1).timeout == (1, None)
@@ -0,0 +1,77 @@
+import pytest
+
+from ptnad.models import TimeRange
+from ptnad.resultcache import BQLResultCache, normalize_query
+
+from conftest import START
+
+QUERY = "SELECT id, end FROM flow WHERE proto == 'tcp'"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = BQLResultCache(tmp_path / "bql.sqlite", settle=0, chunk_rows=50)
+    yield cache
+    cache.close()
+
+
+def bql_requests(emulator):
+    return emulator.calls[("POST", "/api/v2/bql/?")]
+
+
+def test_normalize_query():
+    assert normalize_query("SELECT  id\n FROM flow ;") == "SELECT id FROM flow"
+    assert normalize_query("SELECT id FROM flow WHERE app == 'a  b'") == "SELECT id FROM flow WHERE app == 'a  b'"
+    assert BQLResultCache.key("u", "2", "SELECT id  FROM flow") == BQLResultCache.key("u", "2", "SELECT id FROM flow;")
+    assert BQLResultCache.key("u", "2", "SELECT id FROM flow") != BQLResultCache.key("u", "3", "SELECT id FROM flow")
+
+
+def test_plan_store_read(cache):
+    assert cache.plan("k", 0, 100) == [(0, 100, False)]
+    assert cache.store("k", 10, 20, [10, 15], ["a", "b"])
+    assert cache.store("k", 20, 30, [25], ["c"])
+    assert cache.plan("k", 0, 100) == [(0, 10, False), (10, 30, True), (30, 100, False)]
+    assert list(cache.read("k", 10, 30)) == ["a", "b", "c"]
+    # Partially covered chunks are filtered by end
+    assert list(cache.read("k", 12, 30)) == ["b", "c"]
+    # Overlapping windows are not stored twice
+    assert not cache.store("k", 15, 40, [], [])
+    assert cache.prune(20) == 1
+    assert cache.plan("k", 0, 100) == [(0, 20, False), (20, 30, True), (30, 100, False)]
+    assert cache.clear() == 1
+
+
+def test_execute_range_reuses_closed_windows(client, emulator, cache):
+    client.bql_cache = cache
+    time_range = TimeRange(START + 100, START + 599)
+    expected = client.bql.execute(f"{QUERY} && end >= {START + 100} && end <= {START + 599}")
+    assert list(client.bql.execute_range(QUERY, time_range, page_size=40)) == expected
+    sent = bql_requests(emulator)
+    assert list(client.bql.execute_range(QUERY, time_range, page_size=40)) == expected
+    assert bql_requests(emulator) == sent
+    # Only the uncovered tail of a longer range is fetched
+    longer = TimeRange(START + 100, START + 899)
+    expected = client.bql.execute(f"{QUERY} && end >= {START + 100} && end <= {START + 899}")
+    sent = bql_requests(emulator)
+    assert list(client.bql.execute_range(QUERY, longer, page_size=1000)) == expected
+    assert bql_requests(emulator) == sent + 1
+
+
+def test_execute_range_open_tail_is_not_stored(client, emulator, tmp_path):
+    cache = BQLResultCache(tmp_path / "bql.sqlite", settle=10 ** 10)
+    client.bql_cache = cache
+    time_range = TimeRange(START, START + 99)
+    list(client.bql.execute_range(QUERY, time_range))
+    assert cache.plan(cache.key(client.base_url, "2", QUERY), START, START + 100) == [(START, START + 100, False)]
+    cache.close()
+
+
+def test_execute_range_without_cache(client):
+    rows = list(client.bql.execute_range("SELECT id FROM flow WHERE end >= {start} && end < {end}",
+                                         TimeRange(START, START + 9)))
+    assert rows == client.bql.execute(f"SELECT id FROM flow WHERE end >= {START} && end <= {START + 9}")
+
+
+def test_execute_range_rejects_order_by(client):
+    with pytest.raises(ValueError):
+        client.bql.execute_range("SELECT id FROM flow ORDER BY id", TimeRange(START, START + 9))
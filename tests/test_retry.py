@@ -0,0 +1,119 @@
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.exceptions import PTNADAPIError
+from ptnad.retry import RetryBudget, RetryPolicy, parse_retry_after
+from ptnad.transport import MemoryTransport
+
+
+def scripted(method, pattern, statuses, headers=None):
+    """Transport answering ``pattern`` with the given statuses in turn."""
+    transport = MemoryTransport()
+    statuses = list(statuses)
+    transport.add_route(method, pattern, lambda request: (statuses.pop(0), {"result": [], "took": 1, "total": 0},
+                                                          headers or {}))
+    return transport
+
+
+def retrying(transport, **kwargs):
+    return PTNADClient("https://nad.test", transport=transport,
+                       retry=RetryPolicy(backoff_factor=0.001, jitter=False, **kwargs))
+
+
+def test_retry_is_opt_in():
+    transport = scripted("GET", "/api/v2/hosts", [503, 200])
+    client = PTNADClient("https://nad.test", transport=transport)
+    with pytest.raises(PTNADAPIError):
+        client.hosts.get_hosts()
+    assert sum(transport.calls.values()) == 1
+
+
+def test_idempotent_request_retried_until_success():
+    transport = scripted("GET", "/api/v2/hosts", [503, 502, 200])
+    retrying(transport).get("hosts")
+    assert sum(transport.calls.values()) == 3
+
+
+def test_replayable_post_retried():
+    transport = scripted("POST", "/api/v2/bql", [502, 200])
+    assert retrying(transport).bql.execute("SELECT id FROM flow") == []
+    assert sum(transport.calls.values()) == 2
+
+
+def test_non_replayable_post_not_retried_after_server_error():
+    transport = scripted("POST", "/api/v2/sources/save", [502, 200])
+    with pytest.raises(PTNADAPIError) as info:
+        retrying(transport).post("sources/save", json={})
+    assert info.value.status_code == 502
+    assert sum(transport.calls.values()) == 1
+
+
+def test_non_replayable_post_retried_on_503():
+    transport = scripted("POST", "/api/v2/sources/save", [503, 200])
+    retrying(transport).post("sources/save", json={})
+    assert sum(transport.calls.values()) == 2
+
+
+def test_status_outside_forcelist_not_retried():
+    transport = scripted("GET", "/api/v2/hosts", [500, 200])
+    with pytest.raises(PTNADAPIError):
+        retrying(transport).get("hosts")
+    assert sum(transport.calls.values()) == 1
+
+
+def test_retries_stop_at_max_retries():
+    transport = scripted("GET", "/api/v2/hosts", [503] * 5)
+    with pytest.raises(PTNADAPIError):
+        retrying(transport, max_retries=2).get("hosts")
+    assert sum(transport.calls.values()) == 3
+
+
+def test_long_retry_after_gives_up():
+    transport = scripted("GET", "/api/v2/hosts", [503, 200], headers={"Retry-After": "600"})
+    with pytest.raises(PTNADAPIError):
+        retrying(transport).get("hosts")
+    assert sum(transport.calls.values()) == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_next_delay_honours_retry_after():
+    policy = RetryPolicy(backoff_factor=0.001, jitter=False)
+    assert policy.next_delay("GET", "hosts", 0, status_code=429, retry_after="2") == 2.0
+    assert policy.next_delay("GET", "hosts", 0, status_code=502, retry_after="2") == 0.001
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_connection_errors():
+    policy = RetryPolicy()
+    assert policy.next_delay("POST", "sources/save", 0, connect_error=True) is not None
+    assert policy.next_delay("POST", "sources/save", 0) is None
+    assert policy.next_delay("GET", "hosts", 0) is not None
+
+
+def test_replayable_endpoints():
+    policy = RetryPolicy()
+    assert policy.is_replayable("post", "/bql")
+    assert policy.is_replayable("POST", "replists/dynamic/blocked/_bulk")
+    assert not policy.is_replayable("POST", "replists")
+    assert not policy.is_replayable("PATCH", "replists/3")
+    assert not RetryPolicy(replayable_endpoints=()).is_replayable("POST", "bql")
+
+
+def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    policy = RetryPolicy(budget=budget)
+    assert policy.next_delay("GET", "hosts", 0, status_code=503) is not None
+    assert policy.next_delay("GET", "hosts", 0, status_code=503) is None
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
@@ -0,0 +1,185 @@
+import threading
+import time
+
+from ptnad import PTNADClient
+from ptnad.scheduler import (
+    Limit,
+    Priority,
+    RequestScheduler,
+    current_priority,
+    endpoint_class,
+    priority,
+    with_priority,
+)
+from ptnad.transport import MemoryTransport
+
+
+def run(targets):
+    threads = [threading.Thread(target=target, daemon=True) for target in targets]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def join(threads, timeout=5):
+    for thread in threads:
+        thread.join(timeout)
+        assert not thread.is_alive(), "scheduler is stuck"
+
+
+def test_endpoint_class():
+    assert endpoint_class("POST", "bql") == "bql"
+    assert endpoint_class("POST", "/replists/dynamic/blocked/_bulk") == "bulk"
+    assert endpoint_class("POST", "replists/dynamic/blocked/_delete") == "bulk"
+    assert endpoint_class("PATCH", "replists/3") == "write"
+    assert endpoint_class("GET", "hosts/1.2.3.4") == "read"
+
+
+def test_priority_context():
+    assert current_priority() == Priority.NORMAL
+    with priority(Priority.BACKGROUND):
+        assert current_priority() == Priority.BACKGROUND
+        with priority(Priority.INTERACTIVE):
+            assert current_priority() == Priority.INTERACTIVE
+        assert current_priority() == Priority.BACKGROUND
+    assert current_priority() == Priority.NORMAL
+
+
+def test_with_priority_covers_generators():
+    @with_priority(Priority.BACKGROUND)
+    def levels():
+        yield current_priority()
+        yield current_priority()
+
+    iterator = levels()
+    assert next(iterator) == Priority.BACKGROUND
+    # The caller's priority is not changed between items
+    assert current_priority() == Priority.NORMAL
+    assert next(iterator) == Priority.BACKGROUND
+
+
+def test_queued_interactive_overtakes_background():
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire("read")
+    order = []
+
+    def worker(level, tag):
+        scheduler.acquire("read", level)
+        order.append(tag)
+        scheduler.release("read")
+
+    threads = run([lambda i=i: worker(Priority.BACKGROUND, f"background{i}") for i in range(3)])
+    while scheduler.queued() < 3:
+        time.sleep(0.005)
+    threads += run([lambda: worker(Priority.INTERACTIVE, "interactive")])
+    while scheduler.queued() < 4:
+        time.sleep(0.005)
+    scheduler.release("read")
+    join(threads)
+    assert order == ["interactive", "background0", "background1", "background2"]
+    assert scheduler.in_flight() == 0 and scheduler.queued() == 0
+
+
+def test_class_concurrency_limit():
+    scheduler = RequestScheduler({"bql": Limit(concurrency=2)})
+    lock = threading.Lock()
+    active = peak = 0
+
+    def worker():
+        nonlocal active, peak
+        scheduler.acquire("bql")
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        scheduler.release("bql")
+
+    join(run([worker] * 8))
+    assert peak == 2
+
+
+def test_limited_class_does_not_block_others():
+    scheduler = RequestScheduler({"bulk": Limit(concurrency=1)})
+    scheduler.acquire("bulk")
+    assert scheduler.acquire("read") < 0.1
+    scheduler.release("read")
+    scheduler.release("bulk")
+
+
+def test_rate_limit():
+    scheduler = RequestScheduler({"bulk": Limit(rate=50, burst=1)})
+    started = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire("bulk")
+        scheduler.release("bulk")
+    assert time.monotonic() - started >= 0.09
+
+
+def test_release_wakes_waiter_blocked_on_tokens():
+    # A waiter that was waiting for a concurrency slot must notice the refilled
+    # token bucket once the slot is released, instead of sleeping until the next poll
+    scheduler = RequestScheduler({"bulk": Limit(rate=5, burst=1)}, max_concurrency=1)
+    scheduler.acquire("bulk")
+    done = threading.Event()
+
+    def worker():
+        scheduler.acquire("bulk")
+        done.set()
+        scheduler.release("bulk")
+
+    threads = run([worker])
+    time.sleep(0.05)
+    scheduler.release("bulk")
+    assert done.wait(0.6)
+    join(threads)
+
+
+def test_interrupted_waiter_leaves_queue():
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire("read")
+    interrupted = []
+    main = threading.current_thread()
+    wait = scheduler._cond.wait
+
+    def interrupting_wait(timeout=None):
+        if threading.current_thread() is not main:
+            raise KeyboardInterrupt
+        return wait(timeout)
+
+    def worker():
+        try:
+            scheduler.acquire("read")
+        except KeyboardInterrupt:
+            interrupted.append(True)
+
+    scheduler._cond.wait = interrupting_wait
+    join(run([worker]))
+    assert interrupted
+    assert scheduler.queued() == 0
+    scheduler.release("read")
+    assert scheduler.in_flight() == 0
+
+
+def test_client_requests_respect_limits():
+    lock = threading.Lock()
+    active = peak = 0
+    transport = MemoryTransport()
+
+    @transport.route("POST", "/api/v2/bql")
+    def bql(request):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return {"result": [], "took": 1, "total": 0}
+
+    scheduler = RequestScheduler({"bql": Limit(concurrency=2)})
+    client = PTNADClient("https://nad.test", transport=transport, scheduler=scheduler)
+    join(run([lambda: client.bql.execute("SELECT id FROM flow")] * 6))
+    assert peak == 2
+    assert scheduler.in_flight() == 0
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from ptnad import MetricsRegistry, PTNADClient
+from ptnad.aio import AsyncPTNADClient
+from ptnad.aio.singleflight import AsyncSingleFlight
+from ptnad.exceptions import PTNADAPIError
+from ptnad.singleflight import SingleFlight, request_key
+from ptnad.transport import MemoryTransport
+
+
+def concurrently(fn, count=10):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(fn())
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+@pytest.fixture
+def transport():
+    transport = MemoryTransport(latency=0.1)
+    transport.add_route("GET", r"/api/v2/hosts/(?P<ip>[^/]+)", lambda request: {"ip": request.params["ip"]})
+    transport.add_route("GET", r"/api/v2/missing", lambda request: (404, {"detail": "Not found"}))
+    transport.add_route("POST", r"/api/v2/bql", lambda request: {"result": [[request.body.decode()]], "took": 1,
+                                                                  "total": 1})
+    transport.add_route("POST", r"/api/v2/replists", lambda request: {"id": 1})
+    return transport
+
+
+def sent(transport, pattern):
+    return sum(count for (_, route), count in transport.calls.items() if route == pattern)
+
+
+def test_single_flight_is_opt_in(transport):
+    assert PTNADClient("https://nad.test", transport=transport).single_flight is None
+
+
+def test_identical_reads_share_one_request(transport):
+    metrics = MetricsRegistry()
+    client = PTNADClient("https://nad.test", transport=transport, metrics=metrics, single_flight=True)
+    results = concurrently(lambda: client.hosts.get_host("10.0.0.1"))
+    assert results == [{"ip": "10.0.0.1"}] * 10
+    assert sent(transport, r"/api/v2/hosts/(?P<ip>[^/]+)") == 1
+    assert client.single_flight.shared == 9
+    assert len(client.single_flight) == 0
+    assert metrics.counter_value("coalesced_requests", method="GET", endpoint="/hosts/{id}") == 9
+
+
+def test_different_requests_are_not_shared(transport):
+    client = PTNADClient("https://nad.test", transport=transport, single_flight=True)
+    ips = iter(f"10.0.0.{i}" for i in range(10))
+    lock = threading.Lock()
+
+    def lookup():
+        with lock:
+            ip = next(ips)
+        return client.hosts.get_host(ip)
+
+    concurrently(lookup)
+    assert sent(transport, r"/api/v2/hosts/(?P<ip>[^/]+)") == 10
+
+
+def test_bql_queries_are_shared_but_writes_are_not(transport):
+    client = PTNADClient("https://nad.test", transport=transport, single_flight=True)
+    assert concurrently(lambda: client.bql.execute("SELECT 1")) == [[["SELECT 1"]]] * 10
+    assert sent(transport, "/api/v2/bql") == 1
+    concurrently(lambda: client.post("replists", json={"name": "x"}))
+    assert sent(transport, "/api/v2/replists") == 10
+
+
+def test_errors_are_shared(transport):
+    client = PTNADClient("https://nad.test", transport=transport, single_flight=True)
+    results = concurrently(lambda: client.get("missing"))
+    assert all(isinstance(result, PTNADAPIError) and result.status_code == 404 for result in results)
+    assert sent(transport, "/api/v2/missing") == 1
+
+
+def test_callers_get_their_own_response_objects(transport):
+    client = PTNADClient("https://nad.test", transport=transport, single_flight=True)
+    responses = concurrently(lambda: client.request("GET", "hosts/10.0.0.1"), count=8)
+    assert len({id(response) for response in responses}) == 8
+    assert len({id(response.headers) for response in responses}) == 8
+    responses[0].headers["X-Mine"] = "1"
+    assert all("X-Mine" not in response.headers for response in responses[1:])
+    assert {response.content for response in responses} == {b'{"ip": "10.0.0.1"}'}
+
+
+def test_request_key():
+    def dumps(value):
+        return json.dumps(value).encode()
+
+    assert request_key("GET", "hosts", {"params": {"a": 1, "b": 2}}, dumps) == \
+        request_key("GET", "/hosts/", {"params": {"b": 2, "a": 1}}, dumps)
+    assert request_key("POST", "bql", {"data": b"q"}, dumps) == request_key("POST", "bql", {"content": b"q"}, dumps)
+    assert request_key("POST", "replists", {"json": {}}, dumps) is None
+    assert request_key("GET", "hosts", {"stream": True}, dumps) is None
+
+
+def test_single_flight_runs_again_after_completion():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == (1, False)
+    assert flight.do("k", lambda: 2) == (2, False)
+    assert flight.shared == 0
+
+
+def test_async_single_flight_shares_and_survives_cancellation():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        flight = AsyncSingleFlight()
+        tasks = [asyncio.create_task(flight.do("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        tasks[0].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1:] == [("value", True), ("value", True)]
+        assert calls == 1 and len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_async_client_coalesces():
+    hits = 0
+
+    async def handler(request):
+        nonlocal hits
+        hits += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def main():
+        client = AsyncPTNADClient("https://nad.test", single_flight=True)
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            responses = await asyncio.gather(*[client.get("sensors/1") for _ in range(10)])
+        assert len({id(response) for response in responses}) == 10
+        assert {response.content for response in responses} == {b'{"path":"/api/v2/sensors/1"}'}
+        assert client.single_flight.shared == 9
+
+    asyncio.run(main())
+    assert hits == 1
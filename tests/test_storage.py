@@ -0,0 +1,40 @@
+import logging
+import sqlite3
+
+import pytest
+
+from ptnad.models import Flow
+
+
+@pytest.fixture
+def storage(client, tmp_path):
+    storage = client.storage
+    storage.db_file = str(tmp_path / "ptnad.db")
+    storage.logger = logging.getLogger("ptnad.test")
+    storage._create_db()
+    return storage
+
+
+def flows(ids):
+    return [Flow({"id": f"{i:016x}", "start": i, "end": i + 1}) for i in ids]
+
+
+def ids(flows):
+    return [int(flow.id, 16) for flow in flows]
+
+
+def test_filter_old_flows_saves_only_new_flows(storage):
+    assert ids(storage._filter_old_flows(flows(range(0, 10, 2)), "2", "1")) == [0, 2, 4, 6, 8]
+    assert ids(storage._filter_old_flows(flows(range(10)), "2", "1")) == [1, 3, 5, 7, 9]
+    assert storage._filter_old_flows(flows(range(10)), "2", "1") == []
+    with sqlite3.connect(storage.db_file) as conn:
+        assert conn.execute("SELECT count(*) FROM saved_flows").fetchone() == (10,)
+
+
+def test_filter_old_flows_is_atomic(storage):
+    storage._filter_old_flows(flows([5]), "2", "1")
+    # The same flow id saved for other storages violates the primary key
+    with pytest.raises(sqlite3.IntegrityError):
+        storage._filter_old_flows(flows(range(10)), "2", "3")
+    with sqlite3.connect(storage.db_file) as conn:
+        assert conn.execute("SELECT count(*) FROM saved_flows").fetchone() == (1,)
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from ptnad.exceptions import ValidationError
+from ptnad.scheduler import Priority, current_priority
+from ptnad.streaming import JSONArrayStream, StreamDecodeError
+
+DOCUMENT = {
+    "took": 5,
+    "result": [[i, 'a"b\\\\', {"x": [1, {"y": "}]"}]}, None, True, 1.5e3, "ü"] for i in range(200)],
+    "total": 200,
+    "debug": {"q": "x"},
+}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 1 << 20])
+def test_rows_and_fields_across_chunk_boundaries(size):
+    raw = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+    stream = JSONArrayStream(chunked(raw, size), "result")
+    assert list(stream) == DOCUMENT["result"]
+    assert stream.fields == {"took": 5, "total": 200, "debug": {"q": "x"}}
+
+
+def test_rows_are_yielded_before_the_body_is_complete():
+    raw = json.dumps({"result": [[1], [2], [3]], "total": 3}).encode()
+    consumed = []
+
+    def chunks():
+        for chunk in chunked(raw, 4):
+            consumed.append(chunk)
+            yield chunk
+
+    rows = iter(JSONArrayStream(chunks(), "result"))
+    assert next(rows) == [1]
+    assert len(b"".join(consumed)) < len(raw)
+
+
+def test_error_document():
+    stream = JSONArrayStream([b'{"error": "bad query"}'], "result")
+    assert list(stream) == []
+    assert stream.fields == {"error": "bad query"}
+
+
+def test_empty_array_and_whitespace():
+    stream = JSONArrayStream([b' { "result" : [ ] , "next" : null } '], "result")
+    assert list(stream) == []
+    assert stream.fields == {"next": None}
+
+
+@pytest.mark.parametrize("body", [b" 7", b'{"result": [1, 2', b'{"result": [1,, 2]}'])
+def test_malformed_documents(body):
+    with pytest.raises((StreamDecodeError, ValueError)):
+        list(JSONArrayStream([body], "result"))
+
+
+def test_bql_stream(client):
+    query = "SELECT id, end FROM flow WHERE end >= 1700000000100 && end < 1700000000200"
+    assert list(client.bql.stream(query, chunk_size=16)) == client.bql.execute(query)
+
+
+def test_bql_stream_reports_query_errors(client):
+    with pytest.raises(ValidationError):
+        list(client.bql.stream("SELECT id FROM nowhere"))
+
+
+@pytest.fixture
+def priorities(emulator, monkeypatch):
+    """Priorities of the requests received by the emulator."""
+    seen = []
+    handle = emulator.handle
+
+    def recording(request):
+        seen.append(current_priority())
+        return handle(request)
+
+    monkeypatch.setattr(emulator, "handle", recording)
+    return seen
+
+
+def test_iter_all_hosts_matches_get_all_hosts(client, emulator, priorities):
+    hosts = list(client.hosts.iter_all_hosts(limit=7, chunk_size=64))
+    pages = len(priorities)
+    assert pages == 8
+    assert hosts == client.hosts.get_all_hosts(limit=7)
+    assert len(hosts) == 50 and len({host["id"] for host in hosts}) == 50
+    assert priorities[:pages] == [Priority.BACKGROUND] * pages
+
+
+def test_iter_dynamic_list_items_matches_get_dynamic_list_items(client, priorities):
+    key = client.replists.get_all_lists()[0]["external_key"]
+    priorities.clear()
+    items = client.replists.iter_dynamic_list_items(key, ordering="-value", chunk_size=16)
+    first = next(items)
+    # Between items the caller keeps its own priority
+    assert current_priority() == Priority.NORMAL
+    streamed = [first, *items]
+    assert priorities == [Priority.BACKGROUND]
+    assert streamed == client.replists.get_dynamic_list_items(key, ordering="-value")
+    assert len(streamed) == 20
@@ -0,0 +1,61 @@
+import base64
+import json
+
+import pytest
+
+from ptnad import PTNADClient
+from ptnad.exceptions import PTNADAPIError
+from ptnad.transport import MemoryTransport, RecordingTransport, ReplayTransport
+
+SECRETS = ("SECRETSESSION", "SECRETACCESS", "SECRETREFRESH", "hunter2", "CLIENTSECRET", "abc123")
+
+
+def nad():
+    transport = MemoryTransport()
+    transport.add_route("POST", "/api/v2/auth/login", lambda request: (200, {}, [
+        ("Set-Cookie", "csrftoken=abc123; Path=/"),
+        ("Set-Cookie", "sessionid=SECRETSESSION; Path=/; HttpOnly"),
+    ]))
+    transport.add_route("POST", "/sso/connect/token", lambda request: {
+        "access_token": "SECRETACCESS", "refresh_token": "SECRETREFRESH", "expires_in": 3600, "token_type": "Bearer",
+    })
+    transport.add_route("GET", "/api/v2/monitoring/status", lambda request: {"status": "green", "problems": []})
+    transport.add_route("GET", "/api/v2/hosts/(?P<ip>[^/]+)", lambda request: {"ip": request.params["ip"]})
+    return transport
+
+
+def sso_login(client, client_secret, password):
+    client.session.mount("https://sso.test", client.adapter)
+    client.set_auth("sso", sso_url="https://sso.test/sso", client_id="cid", client_secret=client_secret,
+                    username="alice", password=password)
+    client.login()
+
+
+def test_memory_transport_routes():
+    client = PTNADClient("https://nad.test", transport=nad())
+    assert client.hosts.get_host("10.0.0.1") == {"ip": "10.0.0.1"}
+    with pytest.raises(PTNADAPIError) as info:
+        client.get("nowhere")
+    assert info.value.status_code == 404
+
+
+def test_cassettes_are_redacted_and_replayable(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    client = PTNADClient("https://nad.test", transport=RecordingTransport(path, adapter=nad()))
+    client.set_auth(username="alice", password="hunter2")
+    client.login()
+    client.hosts.get_host("10.0.0.1")
+    sso_login(PTNADClient("https://nad.test", transport=RecordingTransport(path, adapter=nad())),
+              "CLIENTSECRET", "hunter2")
+
+    text = path.read_text()
+    bodies = "".join(base64.b64decode(json.loads(line)["body"]).decode() for line in text.splitlines())
+    for secret in SECRETS:
+        assert secret not in text and secret not in bodies
+
+    replay = PTNADClient("https://nad.test", transport=ReplayTransport(path))
+    replay.set_auth(username="alice", password="another password")
+    replay.login()
+    assert replay.session.cookies.get("sessionid") == "redacted"
+    assert replay.hosts.get_host("10.0.0.1") == {"ip": "10.0.0.1"}
+    sso_login(PTNADClient("https://nad.test", transport=ReplayTransport(path)), "other", "other")
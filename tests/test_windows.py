@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from ptnad.exceptions import PTNADAPIError
+from ptnad.models import TimeRange
+from ptnad.scheduler import Priority, current_priority, priority
+
+from conftest import START
+
+QUERY = "SELECT id, src.ip FROM flow WHERE proto == 'tcp'"
+RANGE = TimeRange(START + 100, START + 900)
+
+
+def between(query, time_range):
+    return f"{query} && end >= {time_range.start} && end <= {time_range.end}"
+
+
+@pytest.fixture
+def expected(client):
+    return client.bql.execute(between(QUERY, RANGE) + " LIMIT 1000")
+
+
+@pytest.mark.parametrize("options", [{"windows": 13}, {"windows": 1}, {"window_size": 64}, {}])
+def test_execute_windows_matches_single_query(client, expected, options):
+    assert list(client.bql.execute_windows(QUERY, RANGE, page_size=20, **options)) == expected
+
+
+def test_execute_windows_placeholders(client, expected):
+    template = "SELECT id, src.ip FROM flow WHERE end >= {start} && end < {end} && proto == 'tcp'"
+    assert list(client.bql.execute_windows(template, RANGE, windows=7)) == expected
+
+
+def test_execute_windows_unordered(client, expected):
+    rows = list(client.bql.execute_windows(QUERY, RANGE, window_size=50, max_workers=3, ordered=False))
+    assert sorted(rows) == sorted(expected)
+
+
+def test_execute_windows_runs_concurrently_with_bounded_workers(client, expected):
+    lock = threading.Lock()
+    active = peak = 0
+    read_window = client.bql._read_window
+
+    def tracked(*args):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            return read_window(*args)
+        finally:
+            with lock:
+                active -= 1
+
+    client.bql._read_window = tracked
+    assert list(client.bql.execute_windows(QUERY, RANGE, windows=16, max_workers=3)) == expected
+    assert peak <= 3
+
+
+def test_execute_windows_keeps_the_caller_priority(client):
+    seen = set()
+    read_window = client.bql._read_window
+
+    def spy(*args):
+        seen.add(current_priority())
+        return read_window(*args)
+
+    client.bql._read_window = spy
+    with priority(Priority.BACKGROUND):
+        list(client.bql.execute_windows(QUERY, RANGE, windows=4))
+    assert seen == {Priority.BACKGROUND}
+
+
+def test_execute_windows_failure_cancels_remaining_windows(client):
+    started = []
+
+    def failing(query, window, *args):
+        started.append(window)
+        raise PTNADAPIError("boom")
+
+    client.bql._read_window = failing
+    with pytest.raises(PTNADAPIError):
+        list(client.bql.execute_windows(QUERY, RANGE, windows=50, max_workers=2))
+    assert len(started) < 50
+
+
+def test_execute_windows_options(client):
+    with pytest.raises(ValueError):
+        client.bql.execute_windows(QUERY, RANGE, windows=2, window_size=10)